@@ -1,7 +1,22 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from config import Config
+from utils.db import get_pool_stats
+from utils.email_queue import get_email_queue, get_email_queue_stats, stop_email_queue
+from utils.resume_parser import get_resume_worker
+from utils.analytics import ensure_schema as ensure_analytics_schema, get_analytics_refresher
+from utils.account_setup import ensure_account_setup
+from utils.drive_counters import ensure_drive_counters, get_drive_counter_reconciler
+from utils.notification_counters import ensure_notification_counters, get_notification_counter_reconciler
+from utils.notification_archive import ensure_notification_archive, get_notification_archiver
+from utils.search import get_search_stats
+from utils.schema import ensure_application_indexes, ensure_notification_indexes
+from utils.principal import get_principal_cache_stats
+from utils.notification_hub import get_notification_hub_stats
+from utils.http_cache import get_http_cache_stats
+from utils.passwords import get_password_hasher
+from utils.last_login import get_last_login_flusher
 import os
 from datetime import timedelta
 
@@ -43,14 +58,24 @@ def health_check():
     return jsonify({
         'status': 'success',
         'message': 'Backend is running!',
-        'database': 'connected'
+        'database': 'connected',
+        'db_pool': get_pool_stats(),
+        'email_queue': get_email_queue_stats(),
+        'resume_parser': get_resume_worker().stats(),
+        'search': get_search_stats(),
+        'principal_cache': get_principal_cache_stats(),
+        'notification_hub': get_notification_hub_stats(),
+        'notification_archive': get_notification_archiver().stats(),
+        'http_cache': get_http_cache_stats(),
+        'password_hasher': get_password_hasher().stats(),
+        'last_login': get_last_login_flusher().stats()
     }), 200
 
 
 # ============================================
 # IMPORT ROUTES
 # ============================================
-from routes.auth import auth_bp
+from routes.auth import auth_bp, password_change_allowed
 from routes.student import student_bp
 from routes.tpo import tpo_bp
 from routes.hod import hod_bp  # ADD THIS LINE
@@ -65,6 +90,41 @@ app.register_blueprint(tpo_bp, url_prefix='/api/tpo')
 app.register_blueprint(hod_bp, url_prefix='/api/hod')  # ADD THIS LINE
 
 
+# ============================================
+# BACKGROUND WORKERS
+# ============================================
+def start_background_workers():
+    # Schema steps that request handlers rely on run here, before serving:
+    # run from a handler they would wait on the handler's own locks
+    ensure_drive_counters()
+    ensure_notification_counters()
+    ensure_account_setup()
+    ensure_analytics_schema()
+    ensure_application_indexes()
+    ensure_notification_indexes()
+    ensure_notification_archive()
+    get_email_queue()
+    get_resume_worker().start()
+    get_analytics_refresher().start()
+    get_drive_counter_reconciler().start()
+    get_notification_counter_reconciler().start()
+    get_notification_archiver().start()
+    get_password_hasher().start()
+    get_last_login_flusher().start()
+
+
+def stop_background_workers():
+    """Stop the workers, flushing last_login writes and delivering due email"""
+    get_analytics_refresher().stop()
+    get_drive_counter_reconciler().stop()
+    get_notification_counter_reconciler().stop()
+    get_notification_archiver().stop()
+    get_resume_worker().stop()
+    get_last_login_flusher().stop()
+    get_password_hasher().shutdown()
+    stop_email_queue()
+
+
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
@@ -92,6 +152,17 @@ def missing_token_callback(error):
     return jsonify({'error': 'Authorization token is missing'}), 401
 
 
+# Imported accounts must change their password before anything else
+@jwt.token_verification_loader
+def password_change_check(jwt_header, jwt_data):
+    return password_change_allowed(jwt_data, request.endpoint)
+
+
+@jwt.token_verification_failed_loader
+def password_change_required_callback(jwt_header, jwt_data):
+    return jsonify({'error': 'Password change required', 'must_change_password': True}), 403
+
+
 if __name__ == '__main__':
     print("\n" + "="*60)
     print("🚀 PLACEMENT PORTAL - BACKEND SERVER")
@@ -105,4 +176,8 @@ if __name__ == '__main__':
     print("  /api/hod/*      - HOD Module ✨ NEW")
     print("="*60 + "\n")
     
+    # Start background workers (skip the reloader's parent process)
+    if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_workers()
+    
     app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
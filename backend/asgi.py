@@ -0,0 +1,141 @@
+"""Production entry point: the Flask app behind an ASGI server.
+
+    python asgi.py                          # uvicorn with the SERVER_* settings
+    uvicorn asgi:application --workers 4    # or any ASGI server
+
+Routes stay synchronous (PyMySQL, the bcrypt pool, Resend, Gemini) and run
+on SERVER_THREADS request threads per process. The notification stream,
+which is idle for nearly all of its life, runs on the event loop instead,
+so open streams hold no thread. On shutdown open streams are ended,
+in-flight requests get SERVER_GRACEFUL_TIMEOUT to finish, and then the
+background workers stop and due email is delivered.
+"""
+import asyncio
+import io
+import signal
+import threading
+import traceback
+from a2wsgi import WSGIMiddleware
+from a2wsgi.wsgi import build_environ
+from config import Config
+from app import app, start_background_workers, stop_background_workers
+from utils.notification_hub import get_notification_hub
+from utils.notifications import EventStream
+
+
+STREAM_PATH = '/api/student/notifications/stream'
+
+wsgi = WSGIMiddleware(app, workers=Config.SERVER_THREADS)
+
+
+def _dispatch(environ):
+    """Run a request through Flask on a request thread and return the
+    response without sending it"""
+    with app.request_context(environ):
+        try:
+            return app.full_dispatch_request()
+        except Exception as e:
+            return app.handle_exception(e)
+
+
+async def _start_response(send, response):
+    await send({
+        'type': 'http.response.start',
+        'status': response.status_code,
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                    for name, value in response.headers.items()],
+    })
+
+
+async def _close_on_disconnect(receive, stream):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+    stream.close()
+
+
+async def notification_stream(scope, receive, send):
+    """GET /api/student/notifications/stream, with authentication and the
+    subscription done by the Flask route and the waiting done here"""
+    loop = asyncio.get_running_loop()
+    try:
+        response = await loop.run_in_executor(wsgi.executor, _dispatch, build_environ(scope, io.BytesIO()))
+    except Exception as e:
+        print(f"Notification stream error: {e}")
+        traceback.print_exc()
+        response = app.response_class('{"error": "Failed to open notification stream"}',
+                                      status=500, mimetype='application/json')
+
+    stream = response.response
+    if not isinstance(stream, EventStream):
+        # Refused (401/403/500): an ordinary response
+        body = response.get_data()
+        response.close()
+        await _start_response(send, response)
+        await send({'type': 'http.response.body', 'body': body})
+        return
+
+    await _start_response(send, response)
+    watcher = asyncio.ensure_future(_close_on_disconnect(receive, stream))
+    try:
+        async for frame in stream:
+            await send({'type': 'http.response.body', 'body': frame.encode('utf-8'), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        watcher.cancel()
+        stream.close()
+
+
+def _end_streams_on(sig, loop):
+    """Close the hub as soon as shutdown is signalled. The server waits for
+    open connections before running lifespan shutdown, and streams would
+    otherwise keep it waiting until SERVER_GRACEFUL_TIMEOUT."""
+    previous = signal.getsignal(sig)
+
+    def handler(signum, frame):
+        loop.call_soon_threadsafe(get_notification_hub().close)
+        if callable(previous):
+            previous(signum, frame)
+
+    signal.signal(sig, handler)
+
+
+async def lifespan(receive, send):
+    loop = asyncio.get_running_loop()
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Signal handlers can only be installed from the main thread
+            if threading.current_thread() is threading.main_thread():
+                for sig in (signal.SIGINT, signal.SIGTERM):
+                    _end_streams_on(sig, loop)
+            await loop.run_in_executor(None, start_background_workers)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            get_notification_hub().close()
+            await loop.run_in_executor(None, stop_background_workers)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+    elif scope['type'] == 'http' and scope['method'] == 'GET' and scope['path'] == STREAM_PATH:
+        await notification_stream(scope, receive, send)
+    else:
+        await wsgi(scope, receive, send)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("\n" + "="*60)
+    print("🚀 PLACEMENT PORTAL - BACKEND SERVER (ASGI)")
+    print("="*60)
+    print(f"Server: http://{Config.SERVER_HOST}:{Config.SERVER_PORT}")
+    print(f"Workers: {Config.SERVER_WORKERS} process(es) x {Config.SERVER_THREADS} request threads")
+    print("="*60 + "\n")
+
+    uvicorn.run('asgi:application', host=Config.SERVER_HOST, port=Config.SERVER_PORT,
+                workers=Config.SERVER_WORKERS, lifespan='on',
+                timeout_graceful_shutdown=Config.SERVER_GRACEFUL_TIMEOUT)
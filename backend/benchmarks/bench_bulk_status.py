@@ -0,0 +1,84 @@
+"""Shortlisting N applications one at a time vs through the bulk endpoint.
+
+Both paths run the real TPO handlers against a RecordingConnection, with
+emails going to a throwaway on-disk EmailQueue (workers not started), so
+the figures cover DB round trips and outbox writes but not delivery. The
+per-item handler used to make five queries per application (lookup,
+update, notification, email lookup, name lookup); that legacy count is
+reported alongside.
+
+Run from the backend directory:
+    python -m benchmarks.bench_bulk_status [applications]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from app import app
+import routes.tpo as tpo_routes
+import utils.notifications as notifications
+import utils.email_queue as email_queue
+from benchmarks.recording_db import RecordingConnection
+
+LEGACY_QUERIES_PER_ITEM = 5
+TPO = {'user_id': 1, 'role': 'tpo'}
+
+
+def application(id):
+    return {'id': id, 'status': 'applied', 'drive_id': 1, 'user_id': 1000 + id,
+            'first_name': 'Student', 'last_name': str(id), 'email': f'student{id}@college.edu',
+            'job_role': 'Software Engineer', 'package_ctc': 1200000, 'company_name': 'Acme'}
+
+
+def respond(query, params):
+    if "FOR UPDATE" in query:
+        return [application(id) for id in params]
+    return []
+
+
+def call(view, body, *args):
+    conn = RecordingConnection(respond)
+    with app.test_request_context(json=body), \
+            mock.patch.object(tpo_routes, 'get_db_connection', return_value=conn), \
+            mock.patch.object(tpo_routes, 'get_jwt_identity', return_value=TPO), \
+            mock.patch.object(notifications, 'notification_counters_ready', return_value=True):
+        response, status = view.__wrapped__(*args)
+    assert status == 200, response.get_json()
+    return conn
+
+
+def run(applications=500):
+    ids = list(range(1, applications + 1))
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, fn in [
+            ('per item', lambda: [call(tpo_routes.update_application_status, {'status': 'shortlisted'}, id)
+                                  for id in ids]),
+            ('bulk', lambda: [call(tpo_routes.bulk_update_applications,
+                                   {'application_ids': ids, 'status': 'shortlisted'})]),
+        ]:
+            email_queue._queue = email_queue.EmailQueue(
+                str(Path(tmp) / f"{name.replace(' ', '_')}.db"), lambda *a: True)
+            started = time.perf_counter()
+            conns = fn()
+            elapsed = time.perf_counter() - started
+            queries = sum(len(c.queries) for c in conns)
+            rows.append((name, queries, sum(c.commits for c in conns),
+                         email_queue._queue.depth(), elapsed))
+        email_queue._queue = None
+
+    print(f"\n{'='*72}")
+    print(f"📊 Shortlisting {applications} applications")
+    print(f"{'='*72}")
+    print(f"{'path':<12}{'queries':>10}{'commits':>10}{'emails':>10}{'total ms':>12}")
+    print(f"{'legacy':<12}{applications * LEGACY_QUERIES_PER_ITEM:>10}{applications:>10}{applications:>10}{'-':>12}")
+    for name, queries, commits, emails, elapsed in rows:
+        print(f"{name:<12}{queries:>10}{commits:>10}{emails:>10}{elapsed * 1000:>12.1f}")
+    return rows
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    run(*args)
@@ -0,0 +1,114 @@
+"""Student drive listing: correlated COUNT subqueries vs stored counters.
+
+Seeds an in-memory SQLite database shaped like placement_drives /
+applications / rounds (with the same indexes MySQL has on the foreign keys),
+then times both forms of the GET /api/student/drives query and prints their
+query plans. SQLite stands in for MySQL only so the benchmark runs anywhere;
+the relative cost of N correlated subqueries vs a range scan carries over.
+
+Run from the backend directory:
+    python -m benchmarks.bench_drive_listing [drives] [applications_per_drive]
+"""
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+
+LEGACY_QUERY = """
+    SELECT pd.*, c.name as company_name, c.logo_url, c.industry,
+        (SELECT COUNT(*) FROM applications WHERE drive_id = pd.id) as total_applications,
+        (SELECT COUNT(*) FROM rounds WHERE drive_id = pd.id) as round_count
+    FROM placement_drives pd
+    JOIN companies c ON pd.company_id = c.id
+    WHERE pd.status = 'active' AND pd.application_deadline > ?
+    ORDER BY pd.application_deadline ASC
+"""
+
+COUNTER_QUERY = """
+    SELECT pd.*, c.name as company_name, c.logo_url, c.industry,
+        pd.application_count as total_applications
+    FROM placement_drives pd
+    JOIN companies c ON pd.company_id = c.id
+    WHERE pd.status = 'active' AND pd.application_deadline > ?
+    ORDER BY pd.application_deadline ASC
+"""
+
+
+def seed(drive_count, apps_per_drive, seed=11):
+    rng = random.Random(seed)
+    db = sqlite3.connect(':memory:')
+    db.row_factory = sqlite3.Row
+    db.executescript("""
+        CREATE TABLE companies (id INTEGER PRIMARY KEY, name TEXT, logo_url TEXT, industry TEXT);
+        CREATE TABLE placement_drives (
+            id INTEGER PRIMARY KEY, company_id INT, job_role TEXT, package_ctc REAL,
+            status TEXT, application_deadline TEXT,
+            application_count INT NOT NULL DEFAULT 0, round_count INT NOT NULL DEFAULT 0
+        );
+        CREATE TABLE applications (id INTEGER PRIMARY KEY, student_id INT, drive_id INT, status TEXT);
+        CREATE TABLE rounds (id INTEGER PRIMARY KEY, drive_id INT, round_number INT);
+        CREATE INDEX idx_applications_drive ON applications (drive_id);
+        CREATE INDEX idx_rounds_drive ON rounds (drive_id);
+        CREATE INDEX idx_drives_status_deadline ON placement_drives (status, application_deadline);
+    """)
+    now = datetime.now()
+    db.executemany("INSERT INTO companies VALUES (?, ?, ?, ?)",
+                   [(i, f'Company {i}', None, 'IT') for i in range(1, 201)])
+    db.executemany(
+        "INSERT INTO placement_drives (id, company_id, job_role, package_ctc, status, application_deadline) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(d, rng.randint(1, 200), 'SDE', rng.uniform(3, 30),
+          rng.choice(['active', 'active', 'closed', 'completed']),
+          (now + timedelta(days=rng.randint(-60, 60))).isoformat(' '))
+         for d in range(1, drive_count + 1)])
+    db.executemany("INSERT INTO applications (student_id, drive_id, status) VALUES (?, ?, 'applied')",
+                   ((rng.randint(1, 10000), rng.randint(1, drive_count))
+                    for _ in range(drive_count * apps_per_drive)))
+    db.executemany("INSERT INTO rounds (drive_id, round_number) VALUES (?, ?)",
+                   ((d, n) for d in range(1, drive_count + 1) for n in range(1, rng.randint(2, 5))))
+    # What ensure_drive_counters() backfills on MySQL
+    db.execute("""
+        UPDATE placement_drives SET
+            application_count = (SELECT COUNT(*) FROM applications WHERE drive_id = placement_drives.id),
+            round_count = (SELECT COUNT(*) FROM rounds WHERE drive_id = placement_drives.id)
+    """)
+    db.commit()
+    return db, now.isoformat(' ')
+
+
+def time_query(db, query, now, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        rows = db.execute(query, (now,)).fetchall()
+    return rows, (time.perf_counter() - started) / repeats
+
+
+def run(drive_count=2000, apps_per_drive=100, repeats=20):
+    db, now = seed(drive_count, apps_per_drive)
+    legacy_rows, legacy_time = time_query(db, LEGACY_QUERY, now, repeats)
+    counter_rows, counter_time = time_query(db, COUNTER_QUERY, now, repeats)
+    # The legacy subquery's round_count is the last column (pd.* has one too)
+    legacy = [(r['id'], r['total_applications'], r[-1]) for r in legacy_rows]
+    stored = [(r['id'], r['total_applications'], r['round_count']) for r in counter_rows]
+    assert legacy == stored, "counters disagree with COUNT(*)"
+
+    print(f"\n{'='*60}")
+    print(f"📊 Student drive listing: {drive_count} drives, "
+          f"{drive_count * apps_per_drive:,} applications ({len(counter_rows)} listed)")
+    print(f"{'='*60}")
+    print(f"Correlated subqueries: {legacy_time * 1000:>8.2f} ms/request")
+    print(f"Stored counters:       {counter_time * 1000:>8.2f} ms/request")
+    print(f"Speedup: {legacy_time / counter_time:.1f}x")
+    for label, query in (('legacy', LEGACY_QUERY), ('counters', COUNTER_QUERY)):
+        print(f"\nPlan ({label}):")
+        for row in db.execute("EXPLAIN QUERY PLAN " + query, (now,)):
+            print(f"  {row[-1]}")
+    return {'legacy_ms': legacy_time * 1000, 'counter_ms': counter_time * 1000,
+            'rows': len(counter_rows)}
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
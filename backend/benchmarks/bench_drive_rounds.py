@@ -0,0 +1,87 @@
+"""Query count and payload size of GET /api/tpo/drives/<id>/rounds.
+
+Run from the backend directory:
+    python -m benchmarks.bench_drive_rounds [applicants] [rounds]
+"""
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from unittest import mock
+
+from app import app
+import routes.tpo as tpo
+from benchmarks.recording_db import RecordingConnection
+
+
+def build_drive(applicant_count, round_count, seed=42):
+    rng = random.Random(seed)
+    drive = {'id': 1, 'company_id': 1, 'company_name': 'Acme', 'job_role': 'SDE',
+             'total_rounds': round_count, 'status': 'active'}
+    rounds = [{'id': n, 'drive_id': 1, 'round_number': n, 'round_name': f'Round {n}',
+               'round_type': 'technical'} for n in range(1, round_count + 1)]
+    applicants = []
+    for i in range(1, applicant_count + 1):
+        applicants.append({
+            'id': i, 'student_id': i, 'drive_id': 1,
+            'status': 'shortlisted', 'current_round': rng.randint(1, round_count),
+            'applied_at': datetime(2024, 1, 1), 'updated_at': datetime(2024, 1, 2),
+            'first_name': f'First{i}', 'last_name': f'Last{i:05d}',
+            'enrollment_number': f'CSE{i:06d}', 'cgpa': 7.5,
+            'department_name': 'Computer Science',
+        })
+    return drive, rounds, applicants
+
+
+def responder_for(drive, rounds, applicants):
+    def respond(query, params):
+        if 'FROM placement_drives pd' in query:
+            return [dict(drive)]
+        if 'FROM rounds' in query:
+            return [dict(r) for r in rounds]
+        if 'FROM applications a' in query:
+            min_round = params[1]
+            return [dict(a) for a in applicants if a['current_round'] >= min_round]
+        return []
+    return respond
+
+
+def legacy_payload(drive, rounds, applicants):
+    """Response shape of the per-round implementation: rows repeated per round"""
+    legacy_rounds = []
+    for r in rounds:
+        members = [a for a in applicants if a['current_round'] >= r['round_number']]
+        legacy_rounds.append({**r, 'applications': members})
+    return json.dumps({'drive': drive, 'rounds': legacy_rounds}, default=str)
+
+
+def run(applicant_count=2000, round_count=5):
+    drive, rounds, applicants = build_drive(applicant_count, round_count)
+    conn = RecordingConnection(responder_for(drive, rounds, applicants))
+
+    with app.test_request_context(), \
+            mock.patch.object(tpo, 'get_db_connection', return_value=conn), \
+            mock.patch.object(tpo, 'get_jwt_identity', return_value={'role': 'tpo'}):
+        started = time.perf_counter()
+        response, status = tpo.get_drive_rounds.__wrapped__(drive['id'])
+        elapsed = time.perf_counter() - started
+        body = response.get_data()
+
+    legacy = legacy_payload(drive, rounds, applicants).encode()
+
+    print(f"\n{'='*60}")
+    print(f"📊 Drive rounds: {applicant_count} applicants x {round_count} rounds")
+    print(f"{'='*60}")
+    print(f"Status: {status}")
+    print(f"Queries   legacy: {2 + round_count:>10}   bucketed: {len(conn.queries):>10}")
+    print(f"Payload   legacy: {len(legacy):>10}   bucketed: {len(body):>10} bytes")
+    print(f"Shrink factor: {len(legacy) / len(body):.2f}x")
+    print(f"Handler time (bucketed): {elapsed * 1000:.1f} ms")
+    return {'queries': len(conn.queries), 'legacy_queries': 2 + round_count,
+            'bytes': len(body), 'legacy_bytes': len(legacy)}
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
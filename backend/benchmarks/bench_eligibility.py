@@ -0,0 +1,129 @@
+"""Per-pair eligibility checks vs the batch engine in utils/eligibility.py.
+
+The legacy path is GET /api/student/check-eligibility/<drive_id> called once
+per (student, drive) pair: two SELECT * round trips plus the rule checks.
+The engine loads each side once and evaluates in a single pass.
+
+Run from the backend directory:
+    python -m benchmarks.bench_eligibility [students] [drives]
+"""
+import random
+import sys
+import time
+from unittest import mock
+
+from app import app
+import routes.student as student_routes
+from utils.eligibility import evaluate, evaluate_drive, evaluate_student, eligible_counts
+from benchmarks.recording_db import RecordingConnection
+
+
+def build_population(student_count, drive_count, seed=7):
+    rng = random.Random(seed)
+    students = []
+    for i in range(1, student_count + 1):
+        students.append({
+            'id': i, 'user_id': i,
+            'is_approved': rng.random() < 0.9,
+            'resume_url': f'/uploads/{i}.pdf' if rng.random() < 0.85 else None,
+            'cgpa': round(rng.uniform(5.0, 10.0), 2) if rng.random() < 0.95 else None,
+            'backlogs': rng.choice([0, 0, 0, 1, 2, 3]),
+        })
+    drives = [{'id': d, 'min_cgpa': round(rng.uniform(5.5, 8.5), 1),
+               'max_backlogs': rng.choice([0, 1, 2])}
+              for d in range(1, drive_count + 1)]
+    return students, drives
+
+
+def legacy_check(student, drive):
+    """The rule checks as check_eligibility ran them before the engine"""
+    eligible = True
+    issues = []
+    if not student['is_approved']:
+        eligible = False
+        issues.append({'type': 'critical', 'message': 'Profile not approved by HOD'})
+    if not student['resume_url']:
+        eligible = False
+        issues.append({'type': 'critical', 'message': 'Resume not uploaded'})
+    if student['cgpa']:
+        if float(student['cgpa']) < float(drive['min_cgpa']):
+            eligible = False
+            issues.append({'type': 'eligibility', 'message': 'CGPA too low'})
+    else:
+        eligible = False
+        issues.append({'type': 'profile', 'message': 'CGPA not updated in profile'})
+    if student['backlogs'] > drive['max_backlogs']:
+        eligible = False
+        issues.append({'type': 'eligibility', 'message': 'Too many backlogs'})
+    return eligible, issues
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def run(student_count=10000, drive_count=200):
+    students, drives = build_population(student_count, drive_count)
+    pairs = student_count * drive_count
+
+    # Legacy: rule cost for every pair (DB round trips counted, not simulated)
+    legacy, legacy_time = timed(lambda: {
+        d['id']: sum(1 for s in students if legacy_check(s, d)[0]) for d in drives
+    })
+
+    # Engine: TPO view of every drive, and the count-only matrix
+    engine, engine_time = timed(lambda: {
+        d['id']: len(evaluate_drive(d, students)) for d in drives
+    })
+    counts, counts_time = timed(lambda: eligible_counts(drives, students))
+    assert engine == legacy == counts, "engine disagrees with legacy rules"
+
+    # Spot-check per-pair agreement, including the issue lists
+    rng = random.Random(1)
+    for _ in range(1000):
+        s, d = rng.choice(students), rng.choice(drives)
+        assert evaluate(s, d)['eligible'] == legacy_check(s, d)[0]
+
+    # Student view through the real handler: one student, every active drive
+    student = students[0]
+
+    def respond(query, params):
+        if 'FROM students s' in query:
+            return [dict(student)]
+        if 'FROM placement_drives pd' in query:
+            return [dict(d) for d in drives]
+        return []
+
+    conn = RecordingConnection(respond)
+    with app.test_request_context(), \
+            mock.patch.object(student_routes, 'get_db_connection', return_value=conn), \
+            mock.patch.object(student_routes, 'get_jwt_identity',
+                              return_value={'role': 'student', 'user_id': student['user_id']}):
+        (response, status), handler_time = timed(
+            lambda: student_routes.get_eligibility.__wrapped__())
+    sample = students[:1000]
+    _, student_time = timed(lambda: [evaluate_student(s, drives) for s in sample])
+
+    print(f"\n{'='*60}")
+    print(f"📊 Eligibility: {student_count} students x {drive_count} drives ({pairs:,} pairs)")
+    print(f"{'='*60}")
+    print(f"Queries   legacy (2 per pair): {2 * pairs:>12,}")
+    print(f"Queries   engine (per drive):  {1 + drive_count:>12,}")
+    print(f"Queries   /eligibility:        {len(conn.queries):>12,}   (status {status})")
+    print(f"Rules     legacy per pair:     {legacy_time * 1000:>10.1f} ms")
+    print(f"Rules     evaluate_drive:      {engine_time * 1000:>10.1f} ms")
+    print(f"Rules     eligible_counts:     {counts_time * 1000:>10.1f} ms")
+    print(f"Rules     evaluate_student x{len(sample)} (with reasons): {student_time * 1000:.1f} ms")
+    print(f"Handler   /eligibility:        {handler_time * 1000:>10.1f} ms")
+    print(f"Speedup (rules only): {legacy_time / engine_time:.2f}x drive pass, "
+          f"{legacy_time / counts_time:.2f}x counts")
+    return {'legacy_time': legacy_time, 'engine_time': engine_time,
+            'counts_time': counts_time, 'legacy_queries': 2 * pairs,
+            'handler_queries': len(conn.queries)}
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,105 @@
+"""Response cache on the read-mostly listing endpoints.
+
+Runs the real GET /api/student/drives and GET /api/tpo/drives handlers
+(JWT decoding skipped, as in the other handler benchmarks) against an
+in-memory connection returning ``drives`` rows, and times three cases:
+
+* miss: the handler queries and serializes, as every request did before;
+* hit: the body comes from the per-role cache;
+* revalidate: the client sends the ETag it holds and gets a bodiless 304.
+
+Each hit and 304 runs no queries. The drive query takes real milliseconds
+in MySQL, which is not counted here, so the miss figures are a lower bound.
+
+Run from the backend directory:
+    python -m benchmarks.bench_http_cache [drives] [requests]
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+from app import app
+import routes.student as student_routes
+import routes.tpo as tpo_routes
+import utils.http_cache as http_cache
+from benchmarks.recording_db import RecordingConnection
+
+
+def drive_rows(count):
+    deadline = datetime(2030, 1, 1)
+    return [{
+        'id': i, 'company_id': i % 40 + 1, 'job_role': f'Engineer {i}', 'job_type': 'full_time',
+        'description': 'Build and operate services. ' * 8, 'package_ctc': 1200000 + i,
+        'package_base': 900000, 'min_cgpa': 7.5, 'status': 'active',
+        'application_deadline': deadline + timedelta(days=i), 'created_at': deadline,
+        'company_name': f'Company {i % 40}', 'logo_url': None, 'industry': 'Software',
+        'total_applications': i * 3, 'round_count': 3, 'application_count': i * 3,
+        'selected_count': i % 7,
+    } for i in range(1, count + 1)]
+
+
+SCENARIOS = [
+    ('student.get_drives', student_routes, student_routes.get_drives, 'student', '/api/student/drives'),
+    ('tpo.get_drives', tpo_routes, tpo_routes.get_drives, 'tpo', '/api/tpo/drives'),
+]
+
+
+def measure(module, view, role, path, rows, requests):
+    identity = {'user_id': 1, 'role': role}
+    queries = []
+
+    def connection():
+        conn = RecordingConnection(lambda query, params: rows if 'FROM placement_drives' in query else [])
+        queries.append(conn.queries)
+        return conn
+
+    def call(headers=None):
+        with app.test_request_context(path, headers=headers or {}):
+            return view.__wrapped__()
+
+    def timed(headers=None):
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = call(headers)
+        return (time.perf_counter() - started) / requests, response
+
+    with mock.patch.object(module, 'get_db_connection', side_effect=connection), \
+            mock.patch.object(module, 'get_jwt_identity', return_value=identity), \
+            mock.patch.object(module, 'drive_counters_ready', return_value=True, create=True), \
+            mock.patch.object(http_cache, 'get_jwt_identity', return_value=identity):
+        started = time.perf_counter()
+        for _ in range(requests):
+            http_cache.clear_http_cache()
+            response = call()
+        miss = (time.perf_counter() - started) / requests
+        assert response.status_code == 200, response.get_data()[:200]
+        size = len(response.get_data())
+
+        before = len(queries)
+        hit, response = timed()
+        assert response.status_code == 200
+        revalidate, response = timed({'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 304
+        cached_queries = len(queries) - before
+    return miss, hit, revalidate, size, cached_queries
+
+
+def run(drives=200, requests=200):
+    print(f"\n{'='*72}")
+    print(f"📊 HTTP response cache: {drives} drives, {requests} requests per case")
+    print(f"{'='*72}")
+    print(f"{'handler':<22}{'body':>10}{'miss ms':>10}{'hit ms':>10}{'304 ms':>10}{'queries':>10}")
+    rows = drive_rows(drives)
+    results = {}
+    for name, module, view, role, path in SCENARIOS:
+        miss, hit, revalidate, size, cached_queries = measure(module, view, role, path, rows, requests)
+        results[name] = (miss, hit, revalidate)
+        print(f"{name:<22}{size // 1024:>8}KB{miss * 1000:>10.2f}{hit * 1000:>10.3f}"
+              f"{revalidate * 1000:>10.3f}{cached_queries:>10}")
+    return results
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
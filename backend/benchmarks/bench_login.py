@@ -0,0 +1,124 @@
+"""Concurrent logins: bcrypt on request threads vs the hashing pool.
+
+Fires ``concurrency`` simultaneous POST /api/auth/login requests at the
+real handler, one thread each as under the threaded server, against an
+in-memory connection. Three configurations are measured:
+
+* inline: bcrypt on the request thread with no admission limit, as before;
+* pool: bcrypt on PASSWORD_HASH_PROCESSES worker processes, no limit;
+* pool + admission: the same, turning requests away with 429 once
+  ``max_pending`` hashes are queued.
+
+Reports p50/p99 latency of successful logins, throughput, 429s and
+database round trips per login (one principal query, no commit). The
+pool only adds throughput with spare cores; what admission buys on any
+machine is that accepted logins finish in bounded time and the rest are
+told when to retry instead of timing out in the queue.
+
+Run from the backend directory:
+    python -m benchmarks.bench_login [concurrency] [rounds] [max_pending]
+"""
+import os
+import sys
+import threading
+import time
+from unittest import mock
+
+from app import app
+import routes.auth as auth
+from config import Config
+from utils.passwords import PasswordHasher
+from benchmarks.recording_db import RecordingConnection
+
+PASSWORD = 'drive-day-2024'
+
+
+def responder(hashed):
+    row = {f'{alias}_{column}': None for alias, columns in auth.ROLE_COLUMNS.values() for column in columns}
+    row.update({'id': 1, 'password_hash': hashed, 'role': 'tpo', 'is_active': 1,
+                't_id': 3, 't_user_id': 1, 't_first_name': 'Asha', 't_last_name': 'Rao',
+                't_designation': 'TPO', 'department_name': None, 'department_code': None})
+
+    def respond(query, params):
+        if "FROM users u" in query:
+            return [dict(row, email=params[0])]
+        return []
+    return respond
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def measure(hasher, hashed, concurrency):
+    barrier = threading.Barrier(concurrency)
+    results = []
+    conns = []
+    lock = threading.Lock()
+
+    def connection():
+        conn = RecordingConnection(responder(hashed))
+        conns.append(conn)
+        return conn
+
+    def login(i):
+        barrier.wait()
+        started = time.perf_counter()
+        with app.test_request_context('/api/auth/login', method='POST',
+                                      json={'email': f'student{i}@college.edu', 'password': PASSWORD}):
+            response, status = auth.login()
+        with lock:
+            results.append((status, time.perf_counter() - started))
+
+    with mock.patch.object(auth, 'get_db_connection', side_effect=connection), \
+            mock.patch.object(auth, 'get_password_hasher', return_value=hasher):
+        started = time.perf_counter()
+        threads = [threading.Thread(target=login, args=(i,)) for i in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+    ok = [latency for status, latency in results if status == 200]
+    rejected = sum(1 for status, _ in results if status == 429)
+    return {'p50': percentile(ok, 0.5), 'p99': percentile(ok, 0.99), 'ok': len(ok),
+            'rejected': rejected, 'elapsed': elapsed,
+            'queries': sum(len(c.queries) for c in conns) / concurrency,
+            'commits': sum(c.commits for c in conns) / concurrency}
+
+
+def run(concurrency=200, rounds=10, max_pending=None):
+    max_pending = max_pending or Config.PASSWORD_HASH_MAX_PENDING
+    processes = Config.PASSWORD_HASH_PROCESSES
+    hashed = PasswordHasher(processes=0, rounds=rounds).hash(PASSWORD)
+    configs = [
+        ('inline', PasswordHasher(processes=0, rounds=rounds, max_pending=concurrency)),
+        (f'pool x{processes}', PasswordHasher(processes=processes, rounds=rounds, max_pending=concurrency)),
+        (f'pool x{processes}, max {max_pending}',
+         PasswordHasher(processes=processes, rounds=rounds, max_pending=max_pending)),
+    ]
+
+    print(f"\n{'='*72}")
+    print(f"📊 Login: {concurrency} concurrent requests, bcrypt cost {rounds}, {os.cpu_count()} CPU(s)")
+    print(f"{'='*72}")
+    print(f"{'configuration':<24}{'p50 ms':>10}{'p99 ms':>10}{'ok':>7}{'429':>7}{'logins/s':>10}"
+          f"{'queries':>9}{'commits':>9}")
+    results = {}
+    for name, hasher in configs:
+        try:
+            hasher.start()
+            result = measure(hasher, hashed, concurrency)
+        finally:
+            hasher.shutdown()
+        results[name] = result
+        print(f"{name:<24}{result['p50'] * 1000:>10.0f}{result['p99'] * 1000:>10.0f}{result['ok']:>7}"
+              f"{result['rejected']:>7}{result['ok'] / result['elapsed']:>10.1f}"
+              f"{result['queries']:>9.1f}{result['commits']:>9.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    run(*args)
@@ -0,0 +1,132 @@
+"""Load test for the live notification stream with thousands of subscribers.
+
+Each simulated student runs the real stream handler and event generator on
+its own thread, as under the threaded server (JWT decoding is skipped, as
+in the other handler benchmarks). The harness then measures:
+
+* database queries at connect time and while every client sits idle;
+* the CPU the process burns with all clients idle;
+* delivery latency when events are published to random students.
+
+Polling /api/student/notifications every 30s would cost two queries per
+student per poll however quiet the system is; that figure is printed
+alongside.
+
+Run from the backend directory:
+    python -m benchmarks.bench_notification_stream [subscribers] [events]
+"""
+import json
+import random
+import sys
+import threading
+import time
+from unittest import mock
+
+from app import app
+import routes.student as student_routes
+from utils.notification_hub import get_notification_hub
+from benchmarks.recording_db import RecordingConnection
+
+POLL_INTERVAL = 30   # seconds, what NotificationBell used to use
+IDLE_SECONDS = 3
+
+
+def respond(query, params):
+    if "COUNT(*) as unread_count" in query:
+        return [{'unread_count': 3}]
+    return []
+
+
+_identity = threading.local()
+
+
+class Subscriber(threading.Thread):
+    def __init__(self, user_id, stop):
+        super().__init__(daemon=True)
+        self.user_id = user_id
+        self.stop = stop
+        self.connected = threading.Event()
+        self.latencies = []
+
+    def run(self):
+        _identity.value = {'user_id': self.user_id, 'role': 'student'}
+        with app.test_request_context('/api/student/notifications/stream'):
+            response = student_routes.stream_notifications.__wrapped__()
+        assert response.status_code == 200, response.get_data()
+        # The generator yields one frame at a time
+        for frame in response.response:
+            if 'event: ready' in frame:
+                self.connected.set()
+            elif 'event: notification' in frame:
+                data = json.loads(frame.split('data: ', 1)[1])
+                self.latencies.append(time.perf_counter() - data['sent_at'])
+            if self.stop.is_set():
+                break
+        response.close()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def run(subscribers=2000, events=2000):
+    threading.stack_size(256 * 1024)
+    hub = get_notification_hub()
+    connect_conns = []
+
+    def connection():
+        conn = RecordingConnection(respond)
+        connect_conns.append(conn)
+        return conn
+
+    stop = threading.Event()
+    with mock.patch.object(student_routes, 'get_db_connection', side_effect=connection), \
+            mock.patch.object(student_routes, 'get_jwt_identity', side_effect=lambda: _identity.value):
+        started = time.perf_counter()
+        clients = [Subscriber(i, stop) for i in range(1, subscribers + 1)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.connected.wait(60)
+        connect_time = time.perf_counter() - started
+        connect_queries = sum(len(c.queries) for c in connect_conns)
+
+        # Everyone idle: no queries, and the CPU should stay near zero
+        before_queries = len(connect_conns)
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        time.sleep(IDLE_SECONDS)
+        idle_cpu = (time.process_time() - cpu_started) / (time.perf_counter() - wall_started)
+        idle_queries = sum(len(c.queries) for c in connect_conns[before_queries:])
+
+        rng = random.Random(11)
+        started = time.perf_counter()
+        for _ in range(events):
+            hub.publish(rng.randrange(1, subscribers + 1), 'notification',
+                        {'title': 'Status update', 'sent_at': time.perf_counter()}, 1)
+        deadline = time.monotonic() + 30
+        while sum(len(c.latencies) for c in clients) < events and time.monotonic() < deadline:
+            time.sleep(0.01)
+        publish_time = time.perf_counter() - started
+
+        stop.set()
+        hub.close()
+        for client in clients:
+            client.join(5)
+
+    latencies = [l for c in clients for l in c.latencies]
+    print(f"\n{'='*72}")
+    print(f"📊 Notification stream: {subscribers} subscribers, {events} events")
+    print(f"{'='*72}")
+    print(f"connect: {connect_time:.2f}s, {connect_queries} queries ({connect_queries / subscribers:.1f} per client)")
+    print(f"idle {IDLE_SECONDS}s: {idle_queries} queries, {idle_cpu * 100:.1f}% CPU")
+    print(f"polling every {POLL_INTERVAL}s instead: {subscribers * 2 * 60 // POLL_INTERVAL} queries/min while idle")
+    print(f"delivered {len(latencies)}/{events} in {publish_time:.2f}s; latency "
+          f"p50 {percentile(latencies, 0.5) * 1000:.1f}ms, p99 {percentile(latencies, 0.99) * 1000:.1f}ms")
+    return {'connect_queries': connect_queries, 'idle_queries': idle_queries, 'idle_cpu': idle_cpu,
+            'delivered': len(latencies), 'p50': percentile(latencies, 0.5), 'p99': percentile(latencies, 0.99)}
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
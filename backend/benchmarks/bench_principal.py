@@ -0,0 +1,87 @@
+"""Queries per request before and after the principal resolver.
+
+Calls real student and HOD handlers against a RecordingConnection and counts
+round trips on a cold cache (first request after login or restart) and a
+warm one (every request after), against the per-request profile lookup the
+handlers used to make.
+
+Run from the backend directory:
+    python -m benchmarks.bench_principal [requests]
+"""
+import sys
+import time
+from collections import defaultdict
+from unittest import mock
+
+from app import app
+import routes.student as student_routes
+import routes.hod as hod_routes
+import utils.principal as principal
+from benchmarks.recording_db import RecordingConnection
+
+PROFILE_LOOKUPS = ("FROM students WHERE user_id", "FROM hods WHERE user_id")
+
+
+class ZeroRow(defaultdict):
+    """Aggregate row where every column reads as 0"""
+
+    def __init__(self, **values):
+        super().__init__(int, values)
+
+
+def respond(query, params):
+    if "FROM students WHERE user_id" in query:
+        return [{'id': 7}]
+    if "FROM hods WHERE user_id" in query:
+        return [{'department_id': 3}]
+    if "COUNT(" in query and "GROUP BY" not in query:
+        return [ZeroRow()]
+    return []
+
+
+SCENARIOS = [
+    ('student', student_routes, 'get_stats'),
+    ('student', student_routes, 'get_my_applications'),
+    ('hod', hod_routes, 'get_hod_stats'),
+    ('hod', hod_routes, 'get_students'),
+]
+
+
+def measure(requests):
+    rows = []
+    for role, module, view in SCENARIOS:
+        identity = {'user_id': 42, 'role': role}
+        principal._principals.clear()
+        counts = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            conn = RecordingConnection(respond)
+            with app.test_request_context(), \
+                    mock.patch.object(module, 'get_db_connection', return_value=conn), \
+                    mock.patch.object(module, 'get_jwt_identity', return_value=identity):
+                response, status = getattr(module, view).__wrapped__()
+            assert status == 200, (view, status, response.get_json())
+            counts.append((len(conn.queries),
+                           sum(1 for q, _ in conn.queries if any(p in q for p in PROFILE_LOOKUPS))))
+        elapsed = (time.perf_counter() - started) / requests
+        rows.append((f"{role}.{view}", counts[0], counts[-1], elapsed))
+    return rows
+
+
+def run(requests=200):
+    rows = measure(requests)
+    print(f"\n{'='*72}")
+    print(f"📊 Principal resolution: {requests} requests per handler")
+    print(f"{'='*72}")
+    print(f"{'handler':<30}{'legacy':>8}{'cold':>8}{'warm':>8}{'removed':>9}{'ms/req':>9}")
+    for name, cold, warm, elapsed in rows:
+        # The legacy handlers paid the profile lookup on every request, as a cold request does
+        legacy = cold[0]
+        print(f"{name:<30}{legacy:>8}{cold[0]:>8}{warm[0]:>8}{legacy - warm[0]:>9}{elapsed * 1000:>9.2f}")
+    print(f"\nCache: {principal.get_principal_cache_stats()}")
+    return rows
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    run(*args)
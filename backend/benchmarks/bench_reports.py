@@ -0,0 +1,74 @@
+"""Batch PDF rendering: 1,000 offer letters per batch.
+
+Compares rendering in the request process one by one (what a naive loop in
+a handler would do) with ReportEngine's process pool, then re-requests the
+same batch to show cache hits. Output goes to a temporary cache directory.
+
+Run from the backend directory:
+    python -m benchmarks.bench_reports [documents] [processes]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+from utils.reports import ReportEngine, letter_items, render_to_file, report_key, report_path
+
+
+def build_items(count):
+    drive = {'id': 1, 'job_role': 'Software Engineer', 'location': 'Bengaluru',
+             'package_ctc': Decimal('1450000.00'), 'company_name': 'Acme Corp'}
+    applicants = [{'id': i, 'status': 'selected', 'current_round': 3,
+                   'enrollment_number': f'CSE{i:06d}', 'first_name': f'First{i}',
+                   'last_name': f'Last{i}', 'cgpa': Decimal('8.40'),
+                   'department_name': 'Computer Science'} for i in range(1, count + 1)]
+    return letter_items(drive, applicants)
+
+
+def run(documents=1000, processes=None):
+    processes = processes or os.cpu_count() or 2
+    items = build_items(documents)
+    workdir = tempfile.mkdtemp(prefix='bench_reports_')
+    try:
+        serial_dir = os.path.join(workdir, 'serial')
+        started = time.perf_counter()
+        for item in items:
+            render_to_file(('offer_letter', item,
+                            report_path(report_key('offer_letter', item), serial_dir)))
+        serial = time.perf_counter() - started
+
+        engine = ReportEngine(processes=processes, cache_dir=os.path.join(workdir, 'pool'))
+        try:
+            started = time.perf_counter()
+            engine._get_executor().submit(int).result()  # spawn workers outside the timing
+            spawn = time.perf_counter() - started
+
+            started = time.perf_counter()
+            results = engine.render_batch('offer_letter', items)
+            pooled = time.perf_counter() - started
+            assert all(error is None for _, _, error in results)
+
+            started = time.perf_counter()
+            engine.render_batch('offer_letter', items)
+            cached = time.perf_counter() - started
+        finally:
+            engine.shutdown()
+
+        size = sum(os.path.getsize(path) for _, path, _ in results)
+        print(f"\n{'='*60}")
+        print(f"📊 Offer letters: {documents} documents, {processes} worker processes")
+        print(f"{'='*60}")
+        print(f"Serial in-process: {serial:>8.2f}s  ({documents / serial:,.0f} docs/s)")
+        print(f"Process pool:      {pooled:>8.2f}s  ({documents / pooled:,.0f} docs/s, "
+              f"+{spawn:.2f}s one-off pool start)")
+        print(f"Cached re-request: {cached:>8.3f}s  ({engine.cache_hits} cache hits)")
+        print(f"Output: {size / 2**20:.1f} MiB, {size / documents / 1024:.1f} KiB per document")
+        return {'serial': serial, 'pooled': pooled, 'cached': cached, 'spawn': spawn}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:3]])
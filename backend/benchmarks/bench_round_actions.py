@@ -0,0 +1,83 @@
+"""Publishing a round's results: one call per candidate vs the bulk endpoints.
+
+Runs the real TPO handlers against a RecordingConnection, so the figures
+are DB round trips plus the handlers' own CPU time; with a real database
+each query adds one network round trip on top.
+
+Run from the backend directory:
+    python -m benchmarks.bench_round_actions [candidates]
+"""
+import sys
+import time
+from unittest import mock
+
+from app import app
+import routes.tpo as tpo_routes
+import utils.notifications as notifications
+from benchmarks.recording_db import RecordingConnection
+
+TPO = {'user_id': 1, 'role': 'tpo'}
+DRIVE_ID, ROUND, TOTAL_ROUNDS = 1, 2, 3
+
+
+def application(id):
+    return {'id': id, 'status': 'shortlisted', 'drive_id': DRIVE_ID, 'current_round': ROUND,
+            'total_rounds': TOTAL_ROUNDS, 'user_id': 1000 + id, 'first_name': 'Student',
+            'last_name': str(id), 'email': f'student{id}@college.edu', 'job_role': 'SDE',
+            'package_ctc': 1200000, 'company_name': 'Acme'}
+
+
+def respond(query, params):
+    if "FOR UPDATE" in query:
+        return [application(id) for id in params]
+    if "FROM placement_drives WHERE id" in query:
+        return [{'id': DRIVE_ID, 'total_rounds': TOTAL_ROUNDS}]
+    if "WHERE a.id = %s" in query:
+        # Single-item promote / reject lookups
+        return [application(params[0])]
+    return []
+
+
+def call(view, body, *args):
+    conn = RecordingConnection(respond)
+    with app.test_request_context(json=body), \
+            mock.patch.object(tpo_routes, 'get_db_connection', return_value=conn), \
+            mock.patch.object(tpo_routes, 'get_jwt_identity', return_value=TPO), \
+            mock.patch.object(notifications, 'notification_counters_ready', return_value=True):
+        response, status = view.__wrapped__(*args)
+    assert status == 200, response.get_json()
+    return conn
+
+
+def measure(name, fn):
+    started = time.perf_counter()
+    conns = fn()
+    elapsed = time.perf_counter() - started
+    return name, sum(len(c.queries) for c in conns), sum(c.commits for c in conns), elapsed
+
+
+def run(candidates=1000):
+    ids = list(range(1, candidates + 1))
+    half = candidates // 2
+    promote, reject = ids[:half], ids[half:]
+    rows = [
+        measure('per item', lambda: [call(tpo_routes.promote_to_next_round, {}, id) for id in promote] +
+                [call(tpo_routes.reject_in_round, {'feedback': ''}, id) for id in reject]),
+        measure('bulk', lambda: [
+            call(tpo_routes.promote_round_applications, {'application_ids': promote}, DRIVE_ID, ROUND),
+            call(tpo_routes.reject_round_applications, {'application_ids': reject}, DRIVE_ID, ROUND),
+        ]),
+    ]
+
+    print(f"\n{'='*72}")
+    print(f"📊 Round results for {candidates} candidates ({len(promote)} promoted, {len(reject)} rejected)")
+    print(f"{'='*72}")
+    print(f"{'path':<12}{'queries':>10}{'commits':>10}{'total ms':>12}")
+    for name, queries, commits, elapsed in rows:
+        print(f"{name:<12}{queries:>10}{commits:>10}{elapsed * 1000:>12.1f}")
+    return rows
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    run(*args)
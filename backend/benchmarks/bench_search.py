@@ -0,0 +1,82 @@
+"""LIKE '%term%' scans vs the in-process search index at 100k students.
+
+The LIKE side runs in an in-memory SQLite table with the three searched
+columns (standing in for MySQL, which cannot use an index for a leading
+wildcard either). The index side is utils.search.InvertedIndex built from
+the same rows.
+
+Run from the backend directory:
+    python -m benchmarks.bench_search [rows]
+"""
+import random
+import sqlite3
+import sys
+import time
+
+from utils.search import InvertedIndex
+
+FIRST = ['Rahul', 'Priya', 'Amit', 'Sneha', 'Vikram', 'Ananya', 'Rohit', 'Kavya', 'Arjun',
+         'Divya', 'Karthik', 'Meera', 'Siddharth', 'Pooja', 'Nikhil', 'Ishita', 'Aditya', 'Neha']
+LAST = ['Sharma', 'Verma', 'Iyer', 'Reddy', 'Nair', 'Patel', 'Gupta', 'Menon', 'Rao', 'Joshi',
+        'Kulkarni', 'Das', 'Chatterjee', 'Pillai', 'Mehta', 'Bose', 'Agarwal', 'Banerjee']
+DEPTS = ['CSE', 'ECE', 'MECH', 'CIVIL', 'EEE', 'IT']
+
+QUERIES = ['sharma', 'rahul verma', 'kulk', 'cse2021', 'chaterjee', 'priya iyer', 'zzz']
+
+
+def seed(rows, seed=5):
+    rng = random.Random(seed)
+    # Suffix surnames so the vocabulary is realistically large, not 18 tokens
+    return [(i, rng.randrange(6), rng.choice(FIRST),
+             rng.choice(LAST) + ('' if rng.random() < 0.7 else str(rng.randrange(2000))),
+             f"{rng.choice(DEPTS)}{2019 + rng.randrange(5)}{i:06d}")
+            for i in range(1, rows + 1)]
+
+
+def like_search(db, term):
+    like = f'%{term}%'
+    return [r[0] for r in db.execute(
+        "SELECT id FROM students WHERE first_name LIKE ? OR last_name LIKE ? OR enrollment_number LIKE ?",
+        (like, like, like))]
+
+
+def run(rows=100000, repeats=20):
+    students = seed(rows)
+    db = sqlite3.connect(':memory:')
+    db.execute("CREATE TABLE students (id INTEGER PRIMARY KEY, department_id INT, "
+               "first_name TEXT, last_name TEXT, enrollment_number TEXT)")
+    db.executemany("INSERT INTO students VALUES (?, ?, ?, ?, ?)", students)
+
+    started = time.perf_counter()
+    index = InvertedIndex({'first_name': 1.0, 'last_name': 1.0, 'enrollment_number': 1.0})
+    for id, dept, first, last, enrollment in students:
+        index.add(id, {'first_name': first, 'last_name': last, 'enrollment_number': enrollment}, dept)
+    build_time = time.perf_counter() - started
+    index.search('warmup')  # sorts the vocabulary once
+
+    print(f"\n{'='*72}")
+    print(f"📊 Student search: {rows:,} rows, {len(index.postings):,} tokens "
+          f"(index built in {build_time:.2f}s)")
+    print(f"{'='*72}")
+    print(f"{'query':<14}{'LIKE ms':>10}{'LIKE hits':>11}{'index ms':>11}{'index hits':>12}")
+    results = {}
+    for query in QUERIES:
+        # LIKE has no notion of multiple terms; it gets the raw string like the old handlers
+        started = time.perf_counter()
+        for _ in range(repeats):
+            like_hits = like_search(db, query)
+        like_ms = (time.perf_counter() - started) / repeats * 1000
+
+        started = time.perf_counter()
+        for _ in range(repeats):
+            index_hits = index.search(query, limit=1000)
+        index_ms = (time.perf_counter() - started) / repeats * 1000
+
+        print(f"{query:<14}{like_ms:>10.2f}{len(like_hits):>11}{index_ms:>11.2f}{len(index_hits):>12}")
+        results[query] = (like_ms, index_ms)
+    return {'build_time': build_time, 'queries': results}
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    run(*args)
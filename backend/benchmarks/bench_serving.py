@@ -0,0 +1,255 @@
+"""Dev server (app.run, a thread per connection) vs asgi.py under uvicorn.
+
+Each server runs in its own process with the routes' database calls
+replaced by an in-memory connection that sleeps ``latency`` per query
+behind a DB_POOL_MAX_SIZE semaphore, standing in for MySQL and the pool.
+The response cache is off so every request reaches the "database".
+
+Three measurements per server:
+
+* GET /api/auth/departments from ``concurrency`` keep-alive clients for
+  ``duration`` seconds: requests/s, p50/p99 latency, server threads mid-run;
+* the same with ``streams`` idle notification streams held open, which
+  the dev server serves with one thread each;
+* SIGTERM while slow requests are in flight: how many still complete and
+  how long the server takes to exit with streams open.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serving [concurrency] [streams] [duration] [latency_ms]
+"""
+import http.client
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from unittest import mock
+
+PATH = '/api/auth/departments'
+STREAM_PATH = '/api/student/notifications/stream'
+SERVERS = ('werkzeug', 'uvicorn')
+
+
+# ----------------------------------------------------------------------
+# server side (python -m benchmarks.bench_serving serve <server> <port>)
+# ----------------------------------------------------------------------
+def serve(server, port):
+    import flask_jwt_extended.view_decorators as view_decorators
+    from app import app
+    import asgi
+    import routes.auth as auth
+    import routes.student as student_routes
+    from config import Config
+    from benchmarks.recording_db import RecordingConnection
+
+    latency = float(os.environ['BENCH_QUERY_LATENCY'])
+    pool = threading.BoundedSemaphore(Config.DB_POOL_MAX_SIZE)
+    departments = [{'id': i, 'name': f'Department {i}', 'code': f'D{i}'} for i in range(1, 9)]
+
+    class PooledConnection(RecordingConnection):
+        def close(self):
+            pool.release()
+
+    def respond(query, params):
+        time.sleep(latency)
+        return departments
+
+    def connection():
+        pool.acquire()
+        return PooledConnection(respond)
+
+    for patch in (mock.patch.object(auth, 'get_db_connection', side_effect=connection),
+                  mock.patch.object(student_routes, 'get_db_connection', side_effect=connection),
+                  mock.patch.object(student_routes, 'get_unread_count', return_value=0),
+                  mock.patch.object(student_routes, 'get_jwt_identity',
+                                    return_value={'user_id': 1, 'role': 'student'}),
+                  mock.patch.object(view_decorators, 'verify_jwt_in_request'),
+                  # Background workers want MySQL; both servers run without them
+                  mock.patch.object(asgi, 'start_background_workers'),
+                  mock.patch.object(asgi, 'stop_background_workers')):
+        patch.start()
+
+    if server == 'werkzeug':
+        app.run(host='127.0.0.1', port=port, debug=True, use_reloader=False, threaded=True)
+    else:
+        import uvicorn
+        uvicorn.run(asgi.application, host='127.0.0.1', port=port, lifespan='on', log_level='warning',
+                    timeout_graceful_shutdown=Config.SERVER_GRACEFUL_TIMEOUT)
+
+
+# ----------------------------------------------------------------------
+# client side
+# ----------------------------------------------------------------------
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start(server, latency):
+    port = free_port()
+    env = dict(os.environ, BENCH_QUERY_LATENCY=str(latency), HTTP_CACHE_ROLE_TTLS='public:0')
+    process = subprocess.Popen([sys.executable, '-m', 'benchmarks.bench_serving', 'serve', server, str(port)],
+                               env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{server} did not start")
+
+
+def threads(process):
+    with open(f'/proc/{process.pid}/status') as status:
+        for line in status:
+            if line.startswith('Threads:'):
+                return int(line.split()[1])
+    return None
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def open_streams(port, count):
+    sockets = []
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(f"GET {STREAM_PATH} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+        sockets.append(sock)
+    for sock in sockets:
+        sock.settimeout(10)
+        received = b''
+        while b'event: ready' not in received:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise RuntimeError(f"stream closed: {received[:200]!r}")
+            received += chunk
+    return sockets
+
+
+def load(process, port, concurrency, duration):
+    latencies, errors, sampled = [], [], []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        mine, failed = [], 0
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            try:
+                conn.request('GET', PATH)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+                    continue
+                if response.getheader('Connection', '').lower() == 'close':
+                    conn.close()
+                mine.append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            errors.append(failed)
+
+    workers = [threading.Thread(target=client) for _ in range(concurrency)]
+    sampler = threading.Timer(duration / 2, lambda: sampled.append(threads(process)))
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    sampler.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    sampler.join()
+    return {'rps': len(latencies) / elapsed, 'p50': percentile(latencies, 0.5),
+            'p99': percentile(latencies, 0.99), 'errors': sum(errors), 'threads': sampled[0]}
+
+
+def shutdown(server, streams, in_flight=20, slow=1.0):
+    """SIGTERM with ``in_flight`` requests of ``slow`` seconds each running"""
+    process, port = start(server, slow)
+    sockets = open_streams(port, streams)
+    completed = []
+
+    def request():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        try:
+            conn.request('GET', PATH)
+            if conn.getresponse().status == 200:
+                completed.append(1)
+        except (OSError, http.client.HTTPException):
+            pass
+        finally:
+            conn.close()
+
+    clients = [threading.Thread(target=request) for _ in range(in_flight)]
+    for client in clients:
+        client.start()
+    time.sleep(slow / 4)
+    signalled = time.perf_counter()
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    exit_time = time.perf_counter() - signalled
+    for client in clients:
+        client.join()
+    for sock in sockets:
+        sock.close()
+    return len(completed), exit_time
+
+
+def run(concurrency=50, streams=200, duration=5, latency_ms=5):
+    latency = latency_ms / 1000
+    results = {}
+    for server in SERVERS:
+        process, port = start(server, latency)
+        try:
+            load(process, port, concurrency, 1)  # warm up
+            plain = load(process, port, concurrency, duration)
+            sockets = open_streams(port, streams)
+            try:
+                busy = load(process, port, concurrency, duration)
+            finally:
+                for sock in sockets:
+                    sock.close()
+        finally:
+            process.kill()
+            process.wait()
+        results[server] = {'plain': plain, 'streams': busy, 'shutdown': shutdown(server, streams)}
+
+    print(f"\n{'='*78}")
+    print(f"📊 Serving: {concurrency} clients, {latency_ms}ms per query, {duration}s runs, "
+          f"{os.cpu_count()} CPU(s)")
+    print(f"{'='*78}")
+    print(f"{'server':<10}{'idle streams':>13}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}{'threads':>9}")
+    for server, result in results.items():
+        for label, count in (('plain', 0), ('streams', streams)):
+            r = result[label]
+            print(f"{server:<10}{count:>13}{r['rps']:>9.0f}{r['p50'] * 1000:>9.1f}{r['p99'] * 1000:>9.1f}"
+                  f"{r['errors']:>8}{r['threads']:>9}")
+    print(f"\nSIGTERM with 20 one-second requests in flight and {streams} streams open:")
+    for server, result in results.items():
+        completed, exit_time = result['shutdown']
+        print(f"{server:<10}{completed:>3}/20 completed, exited after {exit_time:.1f}s")
+    return results
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['serve']:
+        serve(sys.argv[2], int(sys.argv[3]))
+    else:
+        args = [int(a) for a in sys.argv[1:5]]
+        run(*args)
@@ -0,0 +1,122 @@
+"""Onboarding N students: one /api/auth/register call each vs one import.
+
+Both paths run the real code against a RecordingConnection, hashing with
+the same bcrypt cost on the same process pool so only the request shape
+differs. The per-request path makes a duplicate lookup, two inserts and a
+commit per student, with each hash a separate pool round trip. The import
+makes one duplicate query per 1000 rows, two multi-row inserts plus an id
+read-back per chunk, and hashes in batches.
+
+Wall time here excludes network and MySQL, so the round-trip counts matter
+more than the seconds: at 0.5ms per round trip the estimate column adds
+that cost back. Welcome emails are left out of both paths.
+
+Run from the backend directory:
+    python -m benchmarks.bench_student_import [students] [rounds]
+"""
+import io
+import sys
+import time
+from unittest import mock
+
+from app import app
+import routes.auth as auth
+import utils.student_import as student_import
+from config import Config
+from utils.passwords import PasswordHasher
+from benchmarks.recording_db import RecordingConnection
+
+ROUND_TRIP = 0.0005  # seconds per query or commit on a LAN MySQL
+
+
+def student(i):
+    return {'email': f'student{i}@college.edu', 'first_name': 'Student', 'last_name': str(i),
+            'enrollment_number': f'ENR{i:06d}', 'department_id': 1 + i % 4, 'password': f'initial-{i}'}
+
+
+class Users:
+    def __init__(self):
+        self.next_id = 0
+
+    def respond(self, query, params):
+        if "FROM departments" in query:
+            return [{'id': i, 'name': f'Department {i}', 'code': f'D{i}'} for i in range(1, 5)]
+        if "SELECT id, email FROM users" in query:
+            rows = []
+            for email in params:
+                self.next_id += 1
+                rows.append({'id': self.next_id, 'email': email})
+            return rows
+        return []
+
+
+class RegisterConnection(RecordingConnection):
+    def cursor(self, *args):
+        cursor = super().cursor(*args)
+        cursor.lastrowid = len(self.queries) + 1
+        return cursor
+
+
+def per_request(students, hasher):
+    conns = []
+
+    def connection():
+        conn = RegisterConnection(Users().respond)
+        conns.append(conn)
+        return conn
+
+    started = time.perf_counter()
+    with mock.patch.object(auth, 'get_db_connection', side_effect=connection), \
+            mock.patch.object(auth, 'get_password_hasher', return_value=hasher), \
+            mock.patch.object(auth, 'touch_search'):
+        for s in students:
+            body = dict(s, role='student')
+            with app.test_request_context('/api/auth/register', method='POST', json=body):
+                response, status = auth.register()
+            assert status == 201, response.get_json()
+    elapsed = time.perf_counter() - started
+    return elapsed, sum(len(c.queries) for c in conns), sum(c.commits for c in conns)
+
+
+def bulk(students, hasher, rounds):
+    lines = ["email,first_name,last_name,enrollment_number,department,password"]
+    lines += [f"{s['email']},{s['first_name']},{s['last_name']},{s['enrollment_number']},"
+              f"{s['department_id']},{s['password']}" for s in students]
+    conn = RecordingConnection(Users().respond)
+
+    started = time.perf_counter()
+    with mock.patch.object(student_import, 'get_password_hasher', return_value=hasher), \
+            mock.patch.object(student_import, 'queue_emails'), \
+            mock.patch.object(Config, 'IMPORT_BCRYPT_ROUNDS', rounds):
+        rows = student_import.read_rows(io.BytesIO("\n".join(lines).encode()), 'csv')
+        report = student_import.import_students(conn, rows)
+    elapsed = time.perf_counter() - started
+    assert report['created'] == len(students), report['errors'][:3]
+    return elapsed, len(conn.queries), conn.commits
+
+
+def run(count=1000, rounds=6):
+    students = [student(i) for i in range(count)]
+    hasher = PasswordHasher(processes=Config.PASSWORD_HASH_PROCESSES, rounds=rounds)
+    try:
+        hasher.start()
+        results = {
+            'register x N': per_request(students, hasher),
+            'import': bulk(students, hasher, rounds),
+        }
+    finally:
+        hasher.shutdown()
+
+    print(f"\n{'='*72}")
+    print(f"📊 Onboarding {count} students, bcrypt cost {rounds}, {hasher.processes} hashing process(es)")
+    print(f"{'='*72}")
+    print(f"{'path':<16}{'seconds':>10}{'queries':>10}{'commits':>10}{'est. with RTT':>16}")
+    for name, (elapsed, queries, commits) in results.items():
+        estimate = elapsed + (queries + commits) * ROUND_TRIP
+        print(f"{name:<16}{elapsed:>10.2f}{queries:>10}{commits:>10}{estimate:>15.2f}s")
+    return results
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
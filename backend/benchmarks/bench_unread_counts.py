@@ -0,0 +1,65 @@
+"""Unread badge: COUNT(*) per poll vs the maintained per-user counter.
+
+An in-memory SQLite database stands in for MySQL with a notifications
+table of ``rows`` notifications spread over ``users`` students, most of
+them read, as after a few placement seasons. Three read paths are timed:
+
+* COUNT(*) with only the user_id index the table started with;
+* COUNT(*) on the (user_id, is_read) index the counters migration adds;
+* a primary-key read of notification_counters.
+
+Run from the backend directory:
+    python -m benchmarks.bench_unread_counts [rows] [users]
+"""
+import random
+import sqlite3
+import sys
+import time
+
+QUERIES = {
+    'COUNT(*), user_id index': (
+        "SELECT COUNT(*) FROM notifications INDEXED BY idx_user WHERE user_id = ? AND is_read = 0"),
+    'COUNT(*), user_id+is_read': (
+        "SELECT COUNT(*) FROM notifications INDEXED BY idx_user_read WHERE user_id = ? AND is_read = 0"),
+    'counter row': "SELECT unread_count FROM notification_counters WHERE user_id = ?",
+}
+
+
+def build(rows, users, seed=3):
+    rng = random.Random(seed)
+    db = sqlite3.connect(':memory:')
+    db.execute("CREATE TABLE notifications (id INTEGER PRIMARY KEY, user_id INT, is_read INT, message TEXT)")
+    db.executemany("INSERT INTO notifications (user_id, is_read, message) VALUES (?, ?, ?)",
+                   ((rng.randrange(1, users + 1), int(rng.random() < 0.95), 'Status update')
+                    for _ in range(rows)))
+    db.execute("CREATE INDEX idx_user ON notifications (user_id)")
+    db.execute("CREATE INDEX idx_user_read ON notifications (user_id, is_read)")
+    db.execute("CREATE TABLE notification_counters (user_id INTEGER PRIMARY KEY, unread_count INT)")
+    db.execute("""INSERT INTO notification_counters
+                  SELECT user_id, SUM(is_read = 0) FROM notifications GROUP BY user_id""")
+    return db
+
+
+def run(rows=1000000, users=5000, lookups=20000):
+    started = time.perf_counter()
+    db = build(rows, users)
+    print(f"\n{'='*72}")
+    print(f"📊 Unread count: {rows:,} notifications, {users:,} users "
+          f"(built in {time.perf_counter() - started:.1f}s)")
+    print(f"{'='*72}")
+    rng = random.Random(9)
+    probes = [rng.randrange(1, users + 1) for _ in range(lookups)]
+    results = {}
+    for name, query in QUERIES.items():
+        started = time.perf_counter()
+        counts = [db.execute(query, (user_id,)).fetchone()[0] for user_id in probes]
+        elapsed = (time.perf_counter() - started) / lookups
+        results[name] = (elapsed, counts)
+        print(f"{name:<28}{elapsed * 1e6:>10.1f} µs/lookup")
+    assert len({tuple(counts) for _, counts in results.values()}) == 1, "paths disagree"
+    return {name: elapsed for name, (elapsed, _) in results.items()}
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,350 @@
+"""Deterministic synthetic placement data for the benchmark suite.
+
+generate() builds departments, one TPO, students, companies, drives,
+rounds, applications and notifications from a seed, so a given seed,
+scale and anchor date always give the same rows. Dates are relative to
+``anchor`` (midnight today by default) so that drives with a future
+deadline stay open whenever the suite runs.
+
+SCHEMA is the base schema the routes expect, written so it runs on MySQL
+as is and on the SQLite stand-in after translation. The tables and
+columns that features add on first use (counters, snapshots, indexes)
+are left to the app's own ``ensure_*`` steps.
+"""
+import random
+from datetime import datetime, timedelta
+
+# bcrypt('bench-password') at cost 4; logins are not part of the scenarios
+PASSWORD_HASH = '$2b$04$AO1AnGUQcCM0h8MpBjbU/eYtFNjgRAfGEYBSJp6FgMZiat1hPkeme'
+
+SCALES = {
+    'tiny': dict(departments=3, students=60, companies=6, drives=12, max_rounds=3,
+                 applications_per_student=3, notifications_per_student=5),
+    'small': dict(departments=4, students=500, companies=20, drives=40, max_rounds=3,
+                  applications_per_student=5, notifications_per_student=10),
+    'medium': dict(departments=8, students=5000, companies=100, drives=300, max_rounds=4,
+                   applications_per_student=8, notifications_per_student=30),
+    'large': dict(departments=12, students=20000, companies=300, drives=1000, max_rounds=5,
+                  applications_per_student=10, notifications_per_student=50),
+}
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS departments (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        code VARCHAR(20) NOT NULL UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS users (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        email VARCHAR(255) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL,
+        role VARCHAR(20) NOT NULL,
+        is_verified BOOLEAN DEFAULT FALSE,
+        is_active BOOLEAN DEFAULT TRUE,
+        last_login DATETIME NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS students (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL UNIQUE,
+        department_id INT NOT NULL,
+        enrollment_number VARCHAR(50) NOT NULL UNIQUE,
+        first_name VARCHAR(100) NOT NULL,
+        last_name VARCHAR(100) NOT NULL,
+        phone VARCHAR(20),
+        date_of_birth DATE NULL,
+        gender VARCHAR(10),
+        cgpa DECIMAL(4,2) NULL,
+        year_of_study INT NULL,
+        backlogs INT DEFAULT 0,
+        skills TEXT,
+        bio TEXT,
+        resume_url VARCHAR(500) NULL,
+        is_approved BOOLEAN DEFAULT FALSE,
+        approved_at DATETIME NULL,
+        approved_by INT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS hods (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL UNIQUE,
+        department_id INT NOT NULL,
+        first_name VARCHAR(100) NOT NULL,
+        last_name VARCHAR(100) NOT NULL,
+        phone VARCHAR(20)
+    )""",
+    """CREATE TABLE IF NOT EXISTS tpos (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL UNIQUE,
+        first_name VARCHAR(100) NOT NULL,
+        last_name VARCHAR(100) NOT NULL,
+        phone VARCHAR(20),
+        designation VARCHAR(100)
+    )""",
+    """CREATE TABLE IF NOT EXISTS companies (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        description TEXT,
+        website VARCHAR(255),
+        industry VARCHAR(100),
+        location VARCHAR(255),
+        logo_url VARCHAR(500),
+        created_by INT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS placement_drives (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        company_id INT NOT NULL,
+        job_role VARCHAR(255) NOT NULL,
+        job_description TEXT,
+        package_ctc DECIMAL(10,2),
+        package_base DECIMAL(10,2),
+        package_stipend DECIMAL(10,2),
+        location VARCHAR(255),
+        job_type VARCHAR(50),
+        min_cgpa DECIMAL(4,2) DEFAULT 0,
+        max_backlogs INT NULL,
+        application_deadline DATETIME NOT NULL,
+        status VARCHAR(20) DEFAULT 'active',
+        total_rounds INT DEFAULT 3,
+        created_by INT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS rounds (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        drive_id INT NOT NULL,
+        round_number INT NOT NULL,
+        round_name VARCHAR(100),
+        round_type VARCHAR(50)
+    )""",
+    """CREATE TABLE IF NOT EXISTS applications (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT NOT NULL,
+        drive_id INT NOT NULL,
+        status VARCHAR(20) DEFAULT 'applied',
+        current_round INT DEFAULT 0,
+        applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME NULL,
+        UNIQUE (student_id, drive_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS notifications (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        title VARCHAR(255) NOT NULL,
+        message TEXT,
+        type VARCHAR(20) DEFAULT 'info',
+        related_entity_type VARCHAR(50) NULL,
+        related_entity_id INT NULL,
+        is_read BOOLEAN DEFAULT FALSE,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )""",
+]
+
+# Foreign-key lookups the base schema would have indexed
+INDEXES = [
+    ('students', 'idx_students_department', 'department_id'),
+    ('placement_drives', 'idx_drives_company', 'company_id'),
+    ('rounds', 'idx_rounds_drive', 'drive_id, round_number'),
+    ('applications', 'idx_applications_drive', 'drive_id'),
+    ('notifications', 'idx_notifications_user', 'user_id'),
+]
+
+# Insert order; each table's rows are dicts keyed by column
+TABLES = ('departments', 'users', 'students', 'tpos', 'companies', 'placement_drives',
+          'rounds', 'applications', 'notifications')
+
+DEPARTMENTS = [('Computer Science', 'CSE'), ('Electronics', 'ECE'), ('Mechanical', 'ME'),
+               ('Civil', 'CE'), ('Electrical', 'EEE'), ('Information Technology', 'IT'),
+               ('Chemical', 'CHE'), ('Biotechnology', 'BT'), ('Aerospace', 'AE'),
+               ('Metallurgy', 'MME'), ('Production', 'PE'), ('Instrumentation', 'EIE')]
+FIRST_NAMES = ['Aarav', 'Ananya', 'Arjun', 'Diya', 'Ishaan', 'Kavya', 'Meera', 'Nikhil', 'Priya',
+               'Rahul', 'Riya', 'Rohan', 'Saanvi', 'Siddharth', 'Sneha', 'Tanvi', 'Varun', 'Zara']
+LAST_NAMES = ['Agarwal', 'Bhat', 'Chopra', 'Das', 'Gupta', 'Iyer', 'Joshi', 'Kapoor', 'Menon',
+              'Nair', 'Patel', 'Rao', 'Reddy', 'Sharma', 'Singh', 'Verma']
+COMPANY_WORDS = ['Apex', 'Blue', 'Cedar', 'Delta', 'Ember', 'Falcon', 'Granite', 'Helix', 'Indigo',
+                 'Juniper', 'Kite', 'Lumen', 'Maple', 'Nimbus', 'Orbit', 'Pixel', 'Quartz', 'Radian']
+COMPANY_SUFFIXES = ['Systems', 'Labs', 'Technologies', 'Analytics', 'Networks', 'Motors', 'Infra']
+INDUSTRIES = ['IT Services', 'Product', 'Finance', 'Automotive', 'Consulting', 'Manufacturing', 'Telecom']
+LOCATIONS = ['Bengaluru', 'Hyderabad', 'Pune', 'Chennai', 'Mumbai', 'Gurugram', 'Noida']
+JOB_ROLES = ['Software Engineer', 'Data Analyst', 'Graduate Engineer Trainee', 'Design Engineer',
+             'Associate Consultant', 'Embedded Engineer', 'Site Engineer', 'Product Analyst']
+ROUND_NAMES = [('Online Assessment', 'aptitude'), ('Technical Interview', 'technical'),
+               ('Group Discussion', 'group_discussion'), ('Managerial Interview', 'technical'),
+               ('HR Interview', 'hr')]
+
+
+def _round_to_second(value):
+    return value.replace(microsecond=0)
+
+
+def generate(seed=42, scale='small', anchor=None, **overrides):
+    """Build the dataset; returns ``{table: [row dict, ...]}``.
+
+    ``scale`` names an entry in SCALES; keyword overrides replace its
+    sizes. The first user is the TPO; student users follow.
+    """
+    sizes = dict(SCALES[scale], **overrides)
+    rng = random.Random(seed)
+    anchor = anchor or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    data = {table: [] for table in TABLES}
+
+    for i, (name, code) in enumerate(DEPARTMENTS[:sizes['departments']], start=1):
+        data['departments'].append({'id': i, 'name': name, 'code': code})
+
+    data['users'].append({'id': 1, 'email': 'tpo@bench.edu', 'password_hash': PASSWORD_HASH,
+                          'role': 'tpo', 'is_verified': True, 'is_active': True,
+                          'created_at': anchor - timedelta(days=400)})
+    data['tpos'].append({'id': 1, 'user_id': 1, 'first_name': 'Placement', 'last_name': 'Officer',
+                         'phone': '9000000000', 'designation': 'Training & Placement Officer'})
+
+    for i in range(1, sizes['students'] + 1):
+        user_id = i + 1
+        department = data['departments'][rng.randrange(len(data['departments']))]
+        approved = rng.random() < 0.9
+        created_at = anchor - timedelta(days=rng.randint(120, 360), seconds=rng.randint(0, 86399))
+        data['users'].append({'id': user_id, 'email': f'student{i}@bench.edu', 'password_hash': PASSWORD_HASH,
+                              'role': 'student', 'is_verified': True, 'is_active': True,
+                              'created_at': created_at})
+        data['students'].append({
+            'id': i, 'user_id': user_id, 'department_id': department['id'],
+            'enrollment_number': f"{department['code']}{anchor.year - 3}{i:05d}",
+            'first_name': rng.choice(FIRST_NAMES), 'last_name': rng.choice(LAST_NAMES),
+            'phone': f'9{rng.randint(100000000, 999999999)}',
+            'cgpa': round(rng.uniform(5.5, 9.8), 2),
+            'year_of_study': rng.choice((3, 4)),
+            'backlogs': rng.choice((0, 0, 0, 0, 0, 0, 0, 1, 2, 3)),
+            'skills': ', '.join(rng.sample(['Python', 'Java', 'SQL', 'C++', 'React', 'MATLAB', 'AutoCAD'], 3)),
+            'resume_url': f'/uploads/resumes/student{i}.pdf' if rng.random() < 0.85 else None,
+            'is_approved': approved,
+            'approved_at': created_at + timedelta(days=2) if approved else None,
+            'created_at': created_at,
+        })
+
+    for i in range(1, sizes['companies'] + 1):
+        name = f"{COMPANY_WORDS[(i - 1) % len(COMPANY_WORDS)]} {rng.choice(COMPANY_SUFFIXES)} {i}"
+        data['companies'].append({
+            'id': i, 'name': name, 'description': f'{name} recruits graduates across roles.',
+            'website': f'https://company{i}.example.com', 'industry': rng.choice(INDUSTRIES),
+            'location': rng.choice(LOCATIONS), 'logo_url': None, 'created_by': 1,
+            'created_at': anchor - timedelta(days=rng.randint(200, 400)),
+        })
+
+    round_id = 0
+    for i in range(1, sizes['drives'] + 1):
+        # About 60% still open, the rest finished with results recorded
+        open_drive = rng.random() < 0.6
+        deadline = anchor + timedelta(days=rng.randint(1, 30)) if open_drive \
+            else anchor - timedelta(days=rng.randint(5, 120))
+        ctc = round(rng.uniform(3, 30), 2)
+        total_rounds = rng.randint(1, sizes['max_rounds'])
+        data['placement_drives'].append({
+            'id': i, 'company_id': rng.randint(1, sizes['companies']),
+            'job_role': rng.choice(JOB_ROLES), 'job_description': 'Role details for the benchmark.',
+            'package_ctc': ctc, 'package_base': round(ctc * 0.8, 2), 'package_stipend': None,
+            'location': rng.choice(LOCATIONS), 'job_type': rng.choice(('full_time', 'full_time', 'internship')),
+            'min_cgpa': rng.choice((0, 6.0, 6.5, 7.0, 7.5, 8.0)),
+            'max_backlogs': rng.choice((0, 1, 2, None)),
+            'application_deadline': deadline,
+            'status': 'active' if open_drive else rng.choice(('completed', 'closed')),
+            'total_rounds': total_rounds, 'created_by': 1,
+            'created_at': deadline - timedelta(days=rng.randint(15, 45)),
+        })
+        for number in range(1, total_rounds + 1):
+            round_id += 1
+            name, round_type = ROUND_NAMES[min(number - 1, len(ROUND_NAMES) - 1)]
+            data['rounds'].append({'id': round_id, 'drive_id': i, 'round_number': number,
+                                   'round_name': name, 'round_type': round_type})
+
+    drives = data['placement_drives']
+    application_id = notification_id = 0
+    for student in data['students']:
+        if not student['is_approved']:
+            continue
+        eligible = [d for d in drives
+                    if student['cgpa'] >= d['min_cgpa']
+                    and (d['max_backlogs'] is None or student['backlogs'] <= d['max_backlogs'])]
+        count = min(len(eligible), rng.randint(0, 2 * sizes['applications_per_student']))
+        for drive in rng.sample(eligible, count):
+            application_id += 1
+            applied_at = _round_to_second(drive['created_at'] + timedelta(
+                seconds=rng.randint(0, int((drive['application_deadline'] - drive['created_at']).total_seconds()))))
+            applied_at = min(applied_at, anchor - timedelta(minutes=1))
+            if drive['status'] == 'active':
+                current_round = 1 if rng.random() < 0.2 else 0
+                status = 'shortlisted' if current_round else 'applied'
+            else:
+                current_round = rng.randint(0, drive['total_rounds'])
+                if current_round == drive['total_rounds']:
+                    status = 'selected'
+                elif rng.random() < 0.6:
+                    status = 'rejected'
+                else:
+                    status = 'shortlisted' if current_round else 'applied'
+            data['applications'].append({
+                'id': application_id, 'student_id': student['id'], 'drive_id': drive['id'],
+                'status': status, 'current_round': current_round,
+                'applied_at': applied_at, 'updated_at': applied_at,
+            })
+
+    applications_by_student = {}
+    for application in data['applications']:
+        applications_by_student.setdefault(application['student_id'], []).append(application)
+
+    for student in data['students']:
+        mine = applications_by_student.get(student['id'], [])
+        count = rng.randint(0, 2 * sizes['notifications_per_student'])
+        created = sorted(anchor - timedelta(seconds=rng.randint(60, 180 * 86400)) for _ in range(count))
+        for position, created_at in enumerate(created):
+            notification_id += 1
+            application = rng.choice(mine) if mine else None
+            data['notifications'].append({
+                'id': notification_id, 'user_id': student['user_id'],
+                'title': 'Application Status Update' if application else 'Announcement',
+                'message': f"Update on application {application['id']}." if application
+                else 'Placement season schedule has been published.',
+                'type': rng.choice(('info', 'info', 'success', 'warning')),
+                'related_entity_type': 'application' if application else None,
+                'related_entity_id': application['id'] if application else None,
+                # Older notifications have mostly been read
+                'is_read': position < count - 5 and rng.random() < 0.8,
+                'created_at': created_at,
+            })
+
+    return data
+
+
+def create_schema(conn):
+    """Create the base tables and their foreign-key indexes"""
+    from utils.db import add_index_if_missing
+    cursor = conn.cursor()
+    try:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+        for table, index, columns in INDEXES:
+            add_index_if_missing(cursor, table, index, columns)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def load(conn, data, chunk_size=1000):
+    """Insert every table's rows with their ids; returns rows inserted"""
+    cursor = conn.cursor()
+    total = 0
+    try:
+        for table in TABLES:
+            rows = data[table]
+            if not rows:
+                continue
+            columns = list(rows[0])
+            query = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                     f"VALUES ({', '.join(['%s'] * len(columns))})")
+            for i in range(0, len(rows), chunk_size):
+                cursor.executemany(query, [tuple(row[c] for c in columns) for row in rows[i:i + chunk_size]])
+            total += len(rows)
+        conn.commit()
+        return total
+    finally:
+        cursor.close()
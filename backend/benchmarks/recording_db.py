@@ -0,0 +1,67 @@
+"""In-memory stand-in for a pooled connection that counts round trips.
+
+Benchmarks patch a route module's ``get_db_connection`` with
+``RecordingConnection(responder)``; ``responder(query, params)`` returns the
+rows the real query would have produced.
+"""
+
+
+class RecordingCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+        self.lastrowid = None
+        self.rowcount = 0
+
+    def execute(self, query, params=None):
+        self.conn.queries.append((query, params))
+        rows = self.conn.responder(query, params)
+        self._rows = list(rows or [])
+        self.rowcount = len(self._rows)
+        return self.rowcount
+
+    def executemany(self, query, seq):
+        seq = list(seq)
+        self.conn.queries.append((query, seq))
+        self.conn.responder(query, seq)
+        self.rowcount = len(seq)
+        return self.rowcount
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size=1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RecordingConnection:
+    def __init__(self, responder):
+        self.responder = responder
+        self.queries = []
+        self.commits = 0
+
+    def cursor(self, *args):
+        return RecordingCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,224 @@
+"""SQLite stand-in for the MySQL connection pool, for benchmarks only.
+
+SQLiteDatabase.get_db_connection() hands out connections to one SQLite
+file that behave like the pooled PyMySQL DictCursor connections the routes
+expect: ``%s`` placeholders, dict rows, DATETIME/DATE columns as datetime/date,
+``lastrowid``/``rowcount`` and pymysql.err.IntegrityError on duplicates.
+translate() rewrites the MySQL-only constructs the routes and ``ensure_*``
+steps use. Differences that remain:
+
+* ``FOR UPDATE`` is dropped; SQLite has one writer at a time instead of
+  row locks, so write-heavy scenarios serialise on the database file;
+* inline ``INDEX`` clauses in CREATE TABLE are dropped;
+* users.last_login batching (UPDATE ... JOIN over a VALUES list) is not
+  translated; no scenario logs in.
+"""
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+import pymysql
+
+from utils.drive_counters import RECONCILE_QUERY as DRIVE_RECONCILE_QUERY
+from utils.notification_counters import RECONCILE_QUERY as NOTIFICATION_RECONCILE_QUERY
+
+
+# Multi-table UPDATEs, rewritten as correlated subqueries
+REWRITES = {
+    DRIVE_RECONCILE_QUERY: """
+        UPDATE placement_drives
+        SET application_count = (SELECT COUNT(*) FROM applications a WHERE a.drive_id = placement_drives.id),
+            round_count = (SELECT COUNT(*) FROM rounds r WHERE r.drive_id = placement_drives.id)
+        WHERE application_count <> (SELECT COUNT(*) FROM applications a WHERE a.drive_id = placement_drives.id)
+           OR round_count <> (SELECT COUNT(*) FROM rounds r WHERE r.drive_id = placement_drives.id)
+    """,
+    NOTIFICATION_RECONCILE_QUERY: """
+        UPDATE notification_counters
+        SET unread_count = (SELECT COUNT(*) FROM notifications n
+                            WHERE n.user_id = notification_counters.user_id AND n.is_read = 0)
+        WHERE unread_count <> (SELECT COUNT(*) FROM notifications n
+                               WHERE n.user_id = notification_counters.user_id AND n.is_read = 0)
+    """,
+}
+
+COLUMN_LOOKUP = "SELECT COUNT(*) AS found FROM pragma_table_info(%s) WHERE name = %s"
+INDEX_LOOKUP = "SELECT COUNT(*) AS found FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s"
+
+# (pattern, replacement), applied in order
+PATTERNS = [
+    (re.compile(r"\s+FOR\s+UPDATE(\s+SKIP\s+LOCKED)?", re.I), ""),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)", re.I), r"excluded.\1"),
+    (re.compile(r"\bGREATEST\(", re.I), "MAX("),
+    (re.compile(r"\bLEAST\(", re.I), "MIN("),
+    (re.compile(r"\bNOW\(\)", re.I), "datetime('now', 'localtime')"),
+    (re.compile(r"\bDEFAULT\s+CURRENT_TIMESTAMP\b", re.I), "DEFAULT (datetime('now', 'localtime'))"),
+    (re.compile(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r",\s*(?:INDEX|KEY)\s+\w+\s*\([^)]*\)", re.I), ""),
+    (re.compile(r"%s"), "?"),
+]
+
+
+@lru_cache(maxsize=4096)
+def translate(query):
+    """MySQL query text -> SQLite query text"""
+    query = REWRITES.get(query, query)
+    if 'information_schema.COLUMNS' in query:
+        query = COLUMN_LOOKUP
+    elif 'information_schema.STATISTICS' in query:
+        query = INDEX_LOOKUP
+    for pattern, replacement in PATTERNS:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+def _format_datetime(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value.decode())
+
+
+def _parse_date(value):
+    return date.fromisoformat(value.decode()[:10])
+
+
+sqlite3.register_adapter(datetime, _format_datetime)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_converter('DATETIME', _parse_datetime)
+sqlite3.register_converter('DATE', _parse_date)
+
+
+class SQLiteCursor:
+    """DictCursor look-alike; results are fetched eagerly"""
+
+    def __init__(self, raw):
+        self._cursor = raw.cursor()
+        self._rows = []
+        self._position = 0
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def _run(self, method, query, params):
+        try:
+            method(translate(query), params)
+        except sqlite3.IntegrityError as e:
+            raise pymysql.err.IntegrityError(1062, str(e)) from e
+
+    def execute(self, query, params=None):
+        self._run(self._cursor.execute, query, tuple(params or ()))
+        self._position = 0
+        if self._cursor.description:
+            # Like PyMySQL, the first of duplicate column names wins (a.*, pd.*)
+            columns = {}
+            for index, column in enumerate(self._cursor.description):
+                columns.setdefault(column[0], index)
+            self._rows = [{name: row[index] for name, index in columns.items()}
+                          for row in self._cursor.fetchall()]
+            self.rowcount = len(self._rows)
+        else:
+            self._rows = []
+            self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        return self.rowcount
+
+    def executemany(self, query, seq_of_params):
+        self._run(self._cursor.executemany, query, [tuple(params) for params in seq_of_params])
+        self._rows, self._position = [], 0
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        return self.rowcount
+
+    def fetchone(self):
+        if self._position >= len(self._rows):
+            return None
+        self._position += 1
+        return self._rows[self._position - 1]
+
+    def fetchmany(self, size=1):
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SQLiteConnection:
+    """Checked-out connection; close() rolls back and returns it for reuse"""
+
+    def __init__(self, database, raw):
+        self._database = database
+        self.raw = raw
+
+    def cursor(self, *args):
+        return SQLiteCursor(self.raw)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        if self.raw is not None:
+            self.raw.rollback()
+            self._database.release(self.raw)
+            self.raw = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SQLiteDatabase:
+    """One database file with a free list of connections to it"""
+
+    def __init__(self, path, busy_timeout=30):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        raw = self._open()
+        raw.execute("PRAGMA journal_mode = WAL")
+        raw.close()
+
+    def _open(self):
+        raw = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False,
+                              detect_types=sqlite3.PARSE_DECLTYPES)
+        raw.execute("PRAGMA synchronous = NORMAL")
+        return raw
+
+    def release(self, raw):
+        with self._lock:
+            self._idle.append(raw)
+
+    def get_db_connection(self):
+        """Same contract as utils.db.get_db_connection"""
+        with self._lock:
+            raw = self._idle.pop() if self._idle else None
+        return SQLiteConnection(self, raw or self._open())
+
+    def close(self):
+        with self._lock:
+            while self._idle:
+                self._idle.pop().close()
@@ -0,0 +1,448 @@
+"""Load-test suite: scripted scenarios against a seeded synthetic dataset.
+
+The dataset comes from benchmarks.dataset and is loaded into either
+
+* ``--backend sqlite``: a temporary SQLite file behind benchmarks.sqlite_db
+  (no server needed; SQLite has one writer at a time, so write-heavy
+  scenarios serialise), or
+* ``--backend mysql``: the MySQL server from the DB_* settings, in a
+  separate database BENCH_DB_NAME (default placement_portal_bench) that is
+  dropped and recreated on every run. The app's own DB_NAME is refused.
+
+Requests go through the Flask app in-process (test client, one per
+worker thread) with the real routes, caches and ``ensure_*`` steps. JWT
+verification is skipped and each request carries its identity in an
+X-Bench-User header, so no login or bcrypt cost is in the figures.
+
+Scenarios:
+
+    student_dashboard   profile, stats, drives, applications, notifications
+    apply_storm         every eligible student applies to open drives at once
+    tpo_rounds          per drive: list applicants, promote round 0,
+                        load rounds, reject part of round 1
+    analytics_refresh   snapshot rebuild, snapshot read, live aggregation
+
+Each reports per endpoint: requests, errors (status >= 400), requests/s,
+p50/p95/p99 latency and database queries per request.
+
+Run from the backend directory:
+    python -m benchmarks.suite [--backend sqlite|mysql] [--scale small] [--seed 42]
+        [--concurrency 8] [--duration 10] [--scenario NAME ...] [--json results.json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from unittest import mock
+
+from benchmarks import dataset
+
+SCENARIOS = ('student_dashboard', 'apply_storm', 'tpo_rounds', 'analytics_refresh')
+IDENTITY_HEADER = 'X-Bench-User'
+TPO_USER_ID = 1
+
+
+# ----------------------------------------------------------------------
+# query counting
+# ----------------------------------------------------------------------
+_counter = threading.local()
+
+
+def _count(n=1):
+    _counter.queries = getattr(_counter, 'queries', 0) + n
+
+
+class CountingCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, *args, **kwargs):
+        _count()
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        _count()
+        return self._cursor.executemany(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+
+class CountingConnection:
+    """Counts statements (an executemany is one round trip) per thread"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args):
+        return CountingCursor(self._conn.cursor(*args))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._conn.close()
+
+
+# ----------------------------------------------------------------------
+# setup
+# ----------------------------------------------------------------------
+def _bench_identity():
+    from flask import request
+    role, user_id = request.headers[IDENTITY_HEADER].split(':')
+    return {'user_id': int(user_id), 'email': f'{role}{user_id}@bench.edu', 'role': role}
+
+
+def _sqlite_backend(workdir):
+    from benchmarks.sqlite_db import SQLiteDatabase
+    database = SQLiteDatabase(os.path.join(workdir, 'bench.db'))
+    return database.get_db_connection, database.close
+
+
+def _mysql_backend(patch):
+    import pymysql
+    from config import Config
+    import utils.db as db
+
+    name = os.getenv('BENCH_DB_NAME', 'placement_portal_bench')
+    if name == Config.DB_NAME:
+        raise SystemExit(f"BENCH_DB_NAME must not be the application database ({name}); it is dropped")
+    server = pymysql.connect(host=Config.DB_HOST, user=Config.DB_USER, password=Config.DB_PASSWORD,
+                             port=Config.DB_PORT)
+    try:
+        with server.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{name}`")
+            cursor.execute(f"CREATE DATABASE `{name}`")
+    finally:
+        server.close()
+    patch(mock.patch.object(Config, 'DB_NAME', name))
+    return db.get_db_connection, lambda: db.get_pool().close()
+
+
+def prepare(backend, scale, seed, workdir, anchor=None):
+    """Create and load the dataset, point the app at it and return
+    ``(data, teardown)``. Patches stay in place until ``teardown()``."""
+    from config import Config
+    import flask_jwt_extended.view_decorators as view_decorators
+
+    patches = []
+
+    def patch(p):
+        p.start()
+        patches.append(p)
+
+    # Queue email into a throwaway file and never send it
+    patch(mock.patch.object(Config, 'EMAIL_QUEUE_PATH', os.path.join(workdir, 'email_queue.db')))
+    patch(mock.patch.object(Config, 'EMAIL_QUEUE_WORKERS', 0))
+    patch(mock.patch.object(view_decorators, 'verify_jwt_in_request'))
+
+    connect, close = _sqlite_backend(workdir) if backend == 'sqlite' else _mysql_backend(patch)
+
+    from app import app  # noqa: F401  (registers every route module)
+    import utils.email_queue as email_queue
+    import utils.schema as schema
+    patch(mock.patch.object(email_queue, '_queue', None))
+    # A fresh database needs every first-use migration again
+    patch(mock.patch.object(schema, '_applied', set()))
+
+    def counting_connection():
+        conn = connect()
+        return CountingConnection(conn) if conn else conn
+
+    for module_name, module in list(sys.modules.items()):
+        if not module_name.startswith(('routes.', 'utils.')) or module is None:
+            continue
+        if getattr(module, 'get_db_connection', None) is not None:
+            patch(mock.patch.object(module, 'get_db_connection', side_effect=counting_connection))
+        if getattr(module, 'get_jwt_identity', None) is not None:
+            patch(mock.patch.object(module, 'get_jwt_identity', side_effect=_bench_identity))
+
+    data = dataset.generate(seed=seed, scale=scale, anchor=anchor)
+    conn = connect()
+    try:
+        dataset.create_schema(conn)
+        started = time.perf_counter()
+        rows = dataset.load(conn, data)
+        print(f"Loaded {rows} rows ({scale}, seed {seed}) into {backend} in {time.perf_counter() - started:.1f}s")
+    finally:
+        conn.close()
+
+    # In-process caches may still hold rows from another database
+    from utils.http_cache import clear_http_cache
+    from utils.principal import _principals
+    from utils.search import mark_search_stale
+    clear_http_cache()
+    _principals.clear()
+    for index in ('drives', 'companies', 'students'):
+        mark_search_stale(index)
+
+    # Run the first-use migrations and backfills now rather than in a timed request
+    from utils.drive_counters import ensure_drive_counters
+    from utils.notification_counters import ensure_notification_counters
+    from utils.notification_archive import ensure_notification_archive
+    from utils.schema import ensure_application_indexes, ensure_notification_indexes
+    from utils.analytics import ensure_schema
+    for step in (ensure_drive_counters, ensure_notification_counters, ensure_application_indexes,
+                 ensure_notification_indexes, ensure_notification_archive, ensure_schema):
+        if not step():
+            raise RuntimeError(f"{step.__name__} failed against {backend}")
+
+    def teardown():
+        for p in reversed(patches):
+            p.stop()
+        close()
+
+    return data, teardown
+
+
+# ----------------------------------------------------------------------
+# measurement
+# ----------------------------------------------------------------------
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)   # endpoint -> [(seconds, queries, ok)]
+
+    def measure(self, endpoint, fn):
+        _counter.queries = 0
+        started = time.perf_counter()
+        ok, result = fn()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.samples[endpoint].append((elapsed, _counter.queries, ok))
+        return result
+
+    def report(self, elapsed):
+        rows = {}
+        for endpoint, samples in self.samples.items():
+            latencies = [s[0] for s in samples]
+            rows[endpoint] = {
+                'requests': len(samples),
+                'errors': sum(1 for s in samples if not s[2]),
+                'rps': len(samples) / elapsed if elapsed else 0.0,
+                'p50_ms': percentile(latencies, 0.5) * 1000,
+                'p95_ms': percentile(latencies, 0.95) * 1000,
+                'p99_ms': percentile(latencies, 0.99) * 1000,
+                'queries_per_request': sum(s[1] for s in samples) / len(samples),
+            }
+        return rows
+
+
+class Session:
+    """One worker's test client"""
+
+    def __init__(self, app, recorder):
+        self.client = app.test_client()
+        self.recorder = recorder
+
+    def request(self, endpoint, method, path, user, body=None):
+        """``user`` is ``(role, user_id)``; returns the response"""
+        headers = {IDENTITY_HEADER: f'{user[0]}:{user[1]}'}
+
+        def call():
+            response = self.client.open(path, method=method, json=body, headers=headers)
+            return response.status_code < 400, response
+
+        return self.recorder.measure(endpoint, call)
+
+
+# ----------------------------------------------------------------------
+# scenarios: each returns an iterator of operations, op(session)
+# ----------------------------------------------------------------------
+def student_dashboard(data, rng):
+    students = [s for s in data['students'] if s['is_approved']]
+    rng.shuffle(students)
+
+    def visit(student):
+        user = ('student', student['user_id'])
+
+        def op(session):
+            for endpoint in ('profile', 'stats', 'drives', 'applications', 'notifications'):
+                session.request(f'GET /api/student/{endpoint}', 'GET', f'/api/student/{endpoint}', user)
+        return op
+
+    while True:
+        for student in students:
+            yield visit(student)
+
+
+def apply_storm(data, rng):
+    applied = {(a['student_id'], a['drive_id']) for a in data['applications']}
+    now = datetime.now()
+    drives = [d for d in data['placement_drives'] if d['status'] == 'active' and d['application_deadline'] > now]
+    pairs = [
+        (student, drive)
+        for student in data['students'] if student['is_approved'] and student['resume_url']
+        for drive in drives
+        if (student['id'], drive['id']) not in applied
+        and student['cgpa'] >= drive['min_cgpa']
+        and (drive['max_backlogs'] is None or student['backlogs'] <= drive['max_backlogs'])
+    ]
+    rng.shuffle(pairs)
+
+    def apply(student, drive):
+        def op(session):
+            session.request('POST /api/student/apply/<id>', 'POST', f"/api/student/apply/{drive['id']}",
+                            ('student', student['user_id']))
+        return op
+
+    for student, drive in pairs:
+        yield apply(student, drive)
+
+
+def tpo_rounds(data, rng):
+    with_applicants = {a['drive_id'] for a in data['applications'] if a['current_round'] == 0}
+    drives = [d for d in data['placement_drives']
+              if d['status'] == 'active' and d['total_rounds'] >= 2 and d['id'] in with_applicants]
+    rng.shuffle(drives)
+    tpo = ('tpo', TPO_USER_ID)
+
+    def manage(drive_id):
+        def op(session):
+            response = session.request('GET /api/tpo/applications?drive_id&status', 'GET',
+                                       f'/api/tpo/applications?drive_id={drive_id}&status=applied&limit=200', tpo)
+            pool = [a['id'] for a in (response.get_json() or {}).get('applications', [])]
+            if pool:
+                session.request('POST /api/tpo/drives/<id>/rounds/0/promote', 'POST',
+                                f'/api/tpo/drives/{drive_id}/rounds/0/promote', tpo,
+                                {'application_ids': pool[:max(1, len(pool) // 2)]})
+            response = session.request('GET /api/tpo/drives/<id>/rounds', 'GET',
+                                       f'/api/tpo/drives/{drive_id}/rounds', tpo)
+            first_round = [a['id'] for a in (response.get_json() or {}).get('applications', [])
+                           if a['current_round'] == 1 and a['status'] == 'shortlisted']
+            if first_round:
+                session.request('POST /api/tpo/drives/<id>/rounds/1/reject', 'POST',
+                                f'/api/tpo/drives/{drive_id}/rounds/1/reject', tpo,
+                                {'application_ids': first_round[:max(1, len(first_round) // 3)],
+                                 'feedback': 'Benchmark run'})
+        return op
+
+    for drive in drives:
+        yield manage(drive['id'])
+
+
+def analytics_refresh(data, rng):
+    from utils.analytics import get_analytics_refresher, mark_analytics_dirty
+    refresher = get_analytics_refresher()
+    tpo = ('tpo', TPO_USER_ID)
+
+    def rebuild():
+        mark_analytics_dirty()
+        return refresher.refresh() is not None, None
+
+    def op(session):
+        session.recorder.measure('analytics snapshot rebuild', rebuild)
+        session.request('GET /api/tpo/analytics', 'GET', '/api/tpo/analytics', tpo)
+        session.request('GET /api/tpo/analytics?fresh=1', 'GET', '/api/tpo/analytics?fresh=1', tpo)
+
+    while True:
+        yield op
+
+
+def run_scenario(app, name, data, seed, concurrency, duration):
+    """Run operations from ``concurrency`` threads until the scenario runs
+    out or ``duration`` seconds pass; returns (per-endpoint rows, seconds)"""
+    operations = globals()[name](data, random.Random(seed))
+    lock = threading.Lock()
+    recorder = Recorder()
+    failures = []
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        session = Session(app, recorder)
+        while time.perf_counter() < deadline:
+            with lock:
+                op = next(operations, None)
+            if op is None:
+                return
+            try:
+                op(session)
+            except Exception as e:
+                failures.append(e)
+                return
+
+    threads = [threading.Thread(target=worker, name=f'bench-{name}-{i}') for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if failures:
+        raise failures[0]
+    return recorder.report(elapsed), elapsed
+
+
+def run(backend='sqlite', scale='small', seed=42, concurrency=8, duration=10, scenarios=SCENARIOS,
+        json_path=None):
+    from app import app
+
+    with tempfile.TemporaryDirectory(prefix='placement-bench-') as workdir:
+        data, teardown = prepare(backend, scale, seed, workdir)
+        try:
+            results = {}
+            for name in scenarios:
+                rows, elapsed = run_scenario(app, name, data, seed, concurrency, duration)
+                results[name] = {'seconds': elapsed, 'endpoints': rows}
+        finally:
+            teardown()
+
+    print(f"\n{'='*104}")
+    print(f"📊 Benchmark suite: {backend}, scale {scale}, seed {seed}, {concurrency} threads, "
+          f"up to {duration}s per scenario, {os.cpu_count()} CPU(s)")
+    print(f"{'='*104}")
+    for name, result in results.items():
+        print(f"\n{name} ({result['seconds']:.1f}s)")
+        print(f"  {'endpoint':<46}{'requests':>9}{'errors':>7}{'req/s':>9}"
+              f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}")
+        for endpoint, r in result['endpoints'].items():
+            print(f"  {endpoint:<46}{r['requests']:>9}{r['errors']:>7}{r['rps']:>9.1f}"
+                  f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['queries_per_request']:>9.1f}")
+
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump({'backend': backend, 'scale': scale, 'seed': seed, 'concurrency': concurrency,
+                       'duration': duration, 'scenarios': results}, f, indent=2)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--backend', choices=('sqlite', 'mysql'), default='sqlite')
+    parser.add_argument('--scale', choices=tuple(dataset.SCALES), default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10, help='seconds per scenario at most')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, dest='scenarios',
+                        help='repeat to run several; default all')
+    parser.add_argument('--json', dest='json_path', help='also write the results here')
+    args = parser.parse_args(argv)
+    run(args.backend, args.scale, args.seed, args.concurrency, args.duration,
+        args.scenarios or SCENARIOS, args.json_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,14 @@ class Config:
     DB_NAME = os.getenv('DB_NAME', 'placement_portal')
     DB_PORT = int(os.getenv('DB_PORT', 3306))
     
+    # Database connection pool
+    DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 2))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 20))
+    DB_POOL_MAX_USES = int(os.getenv('DB_POOL_MAX_USES', 1000))          # recycle after N checkouts
+    DB_POOL_MAX_LIFETIME = int(os.getenv('DB_POOL_MAX_LIFETIME', 3600))  # recycle after T seconds
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))            # wait for a free connection
+    DB_POOL_PING_INTERVAL = int(os.getenv('DB_POOL_PING_INTERVAL', 30))  # ping if idle longer than this
+    
     # JWT - FIXED
     JWT_SECRET_KEY = 'placement_portal_super_secret_jwt_key_2024_hackathon'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=7)
@@ -27,9 +35,90 @@ class Config:
     MAX_FILE_SIZE = 5242880  # 5MB
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
     
+    # Background resume parsing
+    RESUME_PARSER_BATCH_SIZE = int(os.getenv('RESUME_PARSER_BATCH_SIZE', 20))
+    RESUME_PARSER_PROCESSES = int(os.getenv('RESUME_PARSER_PROCESSES', 2))
+    RESUME_PARSER_POLL_INTERVAL = float(os.getenv('RESUME_PARSER_POLL_INTERVAL', 5))
+    RESUME_PARSER_STALE_AFTER = int(os.getenv('RESUME_PARSER_STALE_AFTER', 600))  # requeue stuck rows
+    
+    # Listing totals are cached per filter set instead of counted per page
+    APPLICATION_COUNT_TTL = int(os.getenv('APPLICATION_COUNT_TTL', 60))
+    
+    # Analytics snapshots
+    ANALYTICS_REFRESH_INTERVAL = int(os.getenv('ANALYTICS_REFRESH_INTERVAL', 30))  # refresher tick
+    ANALYTICS_MAX_STALENESS = int(os.getenv('ANALYTICS_MAX_STALENESS', 300))       # staleness budget
+    
+    # Drive application/round counters are recounted on this interval to repair drift
+    DRIVE_COUNTER_RECONCILE_INTERVAL = int(os.getenv('DRIVE_COUNTER_RECONCILE_INTERVAL', 3600))
+    
+    # In-process search indexes (drives, companies, students)
+    SEARCH_INDEX_TTL = int(os.getenv('SEARCH_INDEX_TTL', 300))        # full rebuild after this many seconds
+    SEARCH_MAX_RESULTS = int(os.getenv('SEARCH_MAX_RESULTS', 1000))   # ids handed to SQL per search
+    
+    # JWT identity -> student id / HOD department / TPO id
+    PRINCIPAL_CACHE_SIZE = int(os.getenv('PRINCIPAL_CACHE_SIZE', 10000))
+    PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', 600))
+    
+    # Password hashing (bcrypt on a process pool; hashes at another cost are redone on login)
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    PASSWORD_HASH_PROCESSES = int(os.getenv('PASSWORD_HASH_PROCESSES', os.cpu_count() or 2))  # 0 hashes inline
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 64))  # beyond this, 429
+    
+    # Bulk student import (CSV/XLSX)
+    IMPORT_MAX_ROWS = int(os.getenv('IMPORT_MAX_ROWS', 10000))
+    IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 500))        # rows per insert transaction
+    IMPORT_BCRYPT_ROUNDS = int(os.getenv('IMPORT_BCRYPT_ROUNDS', 10))   # raised to BCRYPT_ROUNDS at first login
+    PASSWORD_SET_TOKEN_TTL_HOURS = int(os.getenv('PASSWORD_SET_TOKEN_TTL_HOURS', 72))  # emailed set-password links
+    
+    # users.last_login is written in batches by a background flusher
+    LAST_LOGIN_FLUSH_INTERVAL = float(os.getenv('LAST_LOGIN_FLUSH_INTERVAL', 5))  # seconds
+    
+    # Server-side response cache for read-mostly GET endpoints, kept per role
+    HTTP_CACHE_SIZE = int(os.getenv('HTTP_CACHE_SIZE', 1024))   # responses kept per role
+    HTTP_CACHE_TTL = int(os.getenv('HTTP_CACHE_TTL', 60))       # seconds, for roles not listed below
+    HTTP_CACHE_ROLE_TTLS = os.getenv('HTTP_CACHE_ROLE_TTLS', 'public:3600,student:60,tpo:30')
+    
+    # Live notifications (server-sent events from an in-process hub)
+    NOTIFICATION_STREAM_HEARTBEAT = int(os.getenv('NOTIFICATION_STREAM_HEARTBEAT', 25))   # keepalive comment
+    NOTIFICATION_STREAM_MAX_AGE = int(os.getenv('NOTIFICATION_STREAM_MAX_AGE', 3600))     # client reconnects after
+    NOTIFICATION_REPLAY_SIZE = int(os.getenv('NOTIFICATION_REPLAY_SIZE', 50))             # events kept per user
+    NOTIFICATION_HUB_USERS = int(os.getenv('NOTIFICATION_HUB_USERS', 50000))              # users tracked in memory
+    # Per-user unread counters are recounted on this interval to repair drift
+    NOTIFICATION_COUNTER_RECONCILE_INTERVAL = int(os.getenv('NOTIFICATION_COUNTER_RECONCILE_INTERVAL', 3600))
+    # Read notifications older than the retention window move to a compressed monthly archive
+    NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', 90))
+    NOTIFICATION_ARCHIVE_INTERVAL = int(os.getenv('NOTIFICATION_ARCHIVE_INTERVAL', 3600))
+    NOTIFICATION_ARCHIVE_BATCH_SIZE = int(os.getenv('NOTIFICATION_ARCHIVE_BATCH_SIZE', 2000))  # rows per transaction
+    
+    # Streaming exports
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))                  # rows per fetchmany
+    EXPORT_SPOOL_SIZE = int(os.getenv('EXPORT_SPOOL_SIZE', 8 * 1024 * 1024))      # xlsx kept in memory up to this
+    
+    # PDF reports (rendered on a process pool, cached by content hash)
+    REPORT_CACHE_DIR = os.getenv('REPORT_CACHE_DIR', os.path.join(UPLOAD_FOLDER, 'reports'))
+    REPORT_PROCESSES = int(os.getenv('REPORT_PROCESSES', os.cpu_count() or 2))
+    
+    # Production server (python asgi.py: uvicorn, WSGI routes on a thread pool)
+    SERVER_HOST = os.getenv('SERVER_HOST', '0.0.0.0')
+    SERVER_PORT = int(os.getenv('SERVER_PORT', 5000))
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', 1))                  # processes; the hub is per process
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', DB_POOL_MAX_SIZE))   # request threads per process
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))  # seconds to finish in-flight requests
+    EMAIL_DRAIN_TIMEOUT = float(os.getenv('EMAIL_DRAIN_TIMEOUT', 10))     # seconds to deliver due email on shutdown
+    
     # Gemini AI
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
+    GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', 8))
+    RESUME_ANALYSIS_CACHE_SIZE = int(os.getenv('RESUME_ANALYSIS_CACHE_SIZE', 512))
+    RESUME_ANALYSIS_CACHE_TTL = int(os.getenv('RESUME_ANALYSIS_CACHE_TTL', 86400))  # seconds
     
     # Email
     SENDGRID_API_KEY = os.getenv('SENDGRID_API_KEY', '')
     FROM_EMAIL = os.getenv('FROM_EMAIL', 'noreply@placementportal.com')
+    
+    # Outbound email queue (local SQLite file drained by background workers)
+    EMAIL_QUEUE_PATH = os.getenv('EMAIL_QUEUE_PATH', 'email_queue.db')
+    EMAIL_QUEUE_WORKERS = int(os.getenv('EMAIL_QUEUE_WORKERS', 2))
+    EMAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv('EMAIL_QUEUE_MAX_ATTEMPTS', 5))
+    EMAIL_QUEUE_BASE_DELAY = float(os.getenv('EMAIL_QUEUE_BASE_DELAY', 2.0))  # seconds, doubled per retry
+    EMAIL_QUEUE_LEASE = float(os.getenv('EMAIL_QUEUE_LEASE', 300))  # seconds before a claimed send is retried elsewhere
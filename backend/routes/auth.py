@@ -1,25 +1,31 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-import bcrypt
+from utils.account_setup import account_setup_ready, redeem_token
 from utils.db import get_db_connection
-from datetime import datetime
+from utils.passwords import get_password_hasher, PasswordHasherBusy
+from utils.last_login import get_last_login_flusher
+from utils.search import touch_search
+from utils.http_cache import cached_response
 
 
 auth_bp = Blueprint('auth', __name__)
 
 
 def hash_password(password):
-    """Hash password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    """Hash password using bcrypt on the hashing pool"""
+    return get_password_hasher().hash(password)
 
 
 def verify_password(password, hashed):
-    """Verify password against hash"""
-    try:
-        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-    except Exception as e:
-        print(f"Password verification error: {e}")
-        return False
+    """Verify password against hash on the hashing pool"""
+    return get_password_hasher().verify(password, hashed)
+
+
+def hasher_busy(e):
+    """429 for requests turned away while the hashing pool is saturated"""
+    response = jsonify({'error': 'Too many sign-ins in progress, please try again shortly'})
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 429
 
 
 # ============================================
@@ -57,7 +63,10 @@ def register():
             if cursor.fetchone():
                 return jsonify({'error': 'Email already registered'}), 409
 
-            password_hash = hash_password(password)
+            try:
+                password_hash = hash_password(password)
+            except PasswordHasherBusy as e:
+                return hasher_busy(e)
 
             cursor.execute(
                 "INSERT INTO users (email, password_hash, role, is_verified) VALUES (%s, %s, %s, %s)",
@@ -76,6 +85,7 @@ def register():
                     VALUES (%s, %s, %s, %s, %s, %s, %s)""",
                     (user_id, department_id, enrollment_number, first_name, last_name, phone, False)
                 )
+                student_id = cursor.lastrowid
 
             elif role == 'hod':
                 department_id = data.get('department_id', 1)
@@ -100,6 +110,8 @@ def register():
                 )
 
             conn.commit()
+            if role == 'student':
+                touch_search('students', student_id)
 
             # Send welcome email asynchronously could be added here if needed
 
@@ -125,6 +137,97 @@ def register():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+# Role profile columns returned by login and /me, read in the principal query
+ROLE_COLUMNS = {
+    'student': ('s', ['id', 'user_id', 'department_id', 'enrollment_number', 'first_name', 'last_name',
+                      'phone', 'date_of_birth', 'gender', 'cgpa', 'year_of_study', 'backlogs',
+                      'skills', 'bio', 'resume_url', 'is_approved']),
+    'hod': ('h', ['id', 'user_id', 'department_id', 'first_name', 'last_name', 'phone']),
+    'tpo': ('t', ['id', 'user_id', 'first_name', 'last_name', 'phone', 'designation']),
+}
+
+USER_COLUMNS = ['id', 'email', 'password_hash', 'role', 'is_active']
+
+# Endpoints a token flagged must_change_password may still reach
+PASSWORD_CHANGE_ENDPOINTS = {'auth.change_password', 'auth.get_current_user', 'auth.logout'}
+
+
+def _principal_query(user_columns):
+    return f"""
+    SELECT {', '.join(f"u.{column}" for column in user_columns)},
+        {', '.join(f"{alias}.{column} AS {alias}_{column}"
+                   for alias, columns in ROLE_COLUMNS.values() for column in columns)},
+        d.name AS department_name, d.code AS department_code
+    FROM users u
+    LEFT JOIN students s ON u.role = 'student' AND s.user_id = u.id
+    LEFT JOIN hods h ON u.role = 'hod' AND h.user_id = u.id
+    LEFT JOIN tpos t ON u.role = 'tpo' AND t.user_id = u.id
+    LEFT JOIN departments d ON d.id = COALESCE(s.department_id, h.department_id)
+"""
+
+
+# A user with whichever role row and department they have, in one round trip
+PRINCIPAL_QUERY = _principal_query(USER_COLUMNS)
+# users.must_change_password only exists once the account_setup step has run
+PRINCIPAL_QUERY_WITH_FLAG = _principal_query(USER_COLUMNS + ['must_change_password'])
+
+
+def load_principal(cursor, condition, value):
+    """Fetch a user row plus its role profile as ``(user, role_data)``.
+
+    ``role_data`` carries the role table's columns under their own names,
+    with department_name/department_code for students and HODs; it is empty
+    when the role row is missing. Returns ``(None, None)`` for no user.
+    """
+    query = PRINCIPAL_QUERY_WITH_FLAG if account_setup_ready() else PRINCIPAL_QUERY
+    cursor.execute(f"{query} WHERE {condition}", (value,))
+    row = cursor.fetchone()
+    if not row:
+        return None, None
+
+    user = {key: row[key] for key in USER_COLUMNS}
+    user['must_change_password'] = bool(row.get('must_change_password'))
+    role_data = {}
+    if row['role'] in ROLE_COLUMNS:
+        alias, columns = ROLE_COLUMNS[row['role']]
+        if row[f'{alias}_id'] is not None:
+            role_data = {column: row[f'{alias}_{column}'] for column in columns}
+            if row['role'] != 'tpo':
+                role_data['department_name'] = row['department_name']
+                role_data['department_code'] = row['department_code']
+    return user, role_data
+
+
+def access_token(user):
+    """JWT for a user row; tokens of accounts that must change their password
+    carry a claim that limits them to PASSWORD_CHANGE_ENDPOINTS"""
+    return create_access_token(
+        identity={
+            'user_id': user['id'],
+            'email': user['email'],
+            'role': user['role']
+        },
+        additional_claims={'must_change_password': True} if user['must_change_password'] else None
+    )
+
+
+def password_change_allowed(jwt_data, endpoint):
+    return not jwt_data.get('must_change_password') or endpoint in PASSWORD_CHANGE_ENDPOINTS
+
+
+def store_password_hash(user_id, password_hash):
+    conn = get_db_connection()
+    if not conn:
+        return
+    try:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE users SET password_hash = %s WHERE id = %s", (password_hash, user_id))
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
 # ============================================
 # LOGIN ENDPOINT
 # ============================================
@@ -144,105 +247,69 @@ def login():
         if not conn:
             return jsonify({'error': 'Database connection failed'}), 500
 
+        # The connection goes back to the pool before bcrypt runs
         try:
             cursor = conn.cursor()
+            user, role_data = load_principal(cursor, "u.email = %s", email)
+        finally:
+            cursor.close()
+            conn.close()
 
-            cursor.execute(
-                "SELECT id, email, password_hash, role, is_active FROM users WHERE email = %s",
-                (email,)
-            )
-            user = cursor.fetchone()
-
-            if not user:
-                return jsonify({'error': 'Invalid email or password'}), 401
-
-            if not user['is_active']:
-                return jsonify({'error': 'Account is deactivated'}), 403
-
-            if not verify_password(password, user['password_hash']):
-                return jsonify({'error': 'Invalid email or password'}), 401
-
-            # Get role-specific data
-            role_data = {}
-            if user['role'] == 'student':
-                cursor.execute(
-                    """SELECT s.*, d.name as department_name, d.code as department_code 
-                    FROM students s 
-                    JOIN departments d ON s.department_id = d.id 
-                    WHERE s.user_id = %s""",
-                    (user['id'],)
-                )
-                role_data = cursor.fetchone()
-
-            elif user['role'] == 'hod':
-                cursor.execute(
-                    """SELECT h.*, d.name as department_name, d.code as department_code 
-                    FROM hods h 
-                    JOIN departments d ON h.department_id = d.id 
-                    WHERE h.user_id = %s""",
-                    (user['id'],)
-                )
-                role_data = cursor.fetchone()
+        if not user:
+            return jsonify({'error': 'Invalid email or password'}), 401
 
-            elif user['role'] == 'tpo':
-                cursor.execute(
-                    "SELECT * FROM tpos WHERE user_id = %s",
-                    (user['id'],)
-                )
-                role_data = cursor.fetchone()
+        if not user['is_active']:
+            return jsonify({'error': 'Account is deactivated'}), 403
 
-            cursor.execute(
-                "UPDATE users SET last_login = %s WHERE id = %s",
-                (datetime.now(), user['id'])
-            )
-            conn.commit()
-
-            token = create_access_token(
-                identity={
-                    'user_id': user['id'],
-                    'email': user['email'],
-                    'role': user['role']
-                }
-            )
-
-            response_data = {
-                'message': 'Login successful',
-                'token': token,
-                'user': {
-                    'id': user['id'],
-                    'email': user['email'],
-                    'role': user['role'],
-                    'first_name': role_data.get('first_name', ''),
-                    'last_name': role_data.get('last_name', ''),
-                }
+        try:
+            valid, new_hash = get_password_hasher().verify_and_update(password, user['password_hash'])
+        except PasswordHasherBusy as e:
+            return hasher_busy(e)
+        if not valid:
+            return jsonify({'error': 'Invalid email or password'}), 401
+
+        if new_hash:
+            # Stored hash used an old cost factor; swap in the rehash
+            store_password_hash(user['id'], new_hash)
+        get_last_login_flusher().record(user['id'])
+
+        token = access_token(user)
+
+        response_data = {
+            'message': 'Login successful',
+            'token': token,
+            'user': {
+                'id': user['id'],
+                'email': user['email'],
+                'role': user['role'],
+                'first_name': role_data.get('first_name', ''),
+                'last_name': role_data.get('last_name', ''),
+                'must_change_password': user['must_change_password'],
             }
-
-            if user['role'] == 'student':
-                response_data['user'].update({
-                    'student_id': role_data['id'],
-                    'enrollment_number': role_data['enrollment_number'],
-                    'department_id': role_data['department_id'],
-                    'department_name': role_data['department_name'],
-                    'cgpa': float(role_data['cgpa']) if role_data['cgpa'] else None,
-                    'is_approved': role_data['is_approved']
-                })
-            elif user['role'] == 'hod':
-                response_data['user'].update({
-                    'hod_id': role_data['id'],
-                    'department_id': role_data['department_id'],
-                    'department_name': role_data['department_name']
-                })
-            elif user['role'] == 'tpo':
-                response_data['user'].update({
-                    'tpo_id': role_data['id'],
-                    'designation': role_data['designation']
-                })
-
-            return jsonify(response_data), 200
-
-        finally:
-            cursor.close()
-            conn.close()
+        }
+
+        if user['role'] == 'student':
+            response_data['user'].update({
+                'student_id': role_data['id'],
+                'enrollment_number': role_data['enrollment_number'],
+                'department_id': role_data['department_id'],
+                'department_name': role_data['department_name'],
+                'cgpa': float(role_data['cgpa']) if role_data['cgpa'] else None,
+                'is_approved': role_data['is_approved']
+            })
+        elif user['role'] == 'hod':
+            response_data['user'].update({
+                'hod_id': role_data['id'],
+                'department_id': role_data['department_id'],
+                'department_name': role_data['department_name']
+            })
+        elif user['role'] == 'tpo':
+            response_data['user'].update({
+                'tpo_id': role_data['id'],
+                'designation': role_data['designation']
+            })
+
+        return jsonify(response_data), 200
 
     except Exception as e:
         print(f"Login error: {e}")
@@ -266,49 +333,17 @@ def get_current_user():
 
         try:
             cursor = conn.cursor()
-
-            cursor.execute(
-                "SELECT id, email, role, is_active FROM users WHERE id = %s",
-                (user_id,)
-            )
-            user = cursor.fetchone()
+            user, role_data = load_principal(cursor, "u.id = %s", user_id)
 
             if not user:
                 return jsonify({'error': 'User not found'}), 404
 
-            role_data = {}
-            if user['role'] == 'student':
-                cursor.execute(
-                    """SELECT s.*, d.name as department_name 
-                    FROM students s 
-                    JOIN departments d ON s.department_id = d.id 
-                    WHERE s.user_id = %s""",
-                    (user_id,)
-                )
-                role_data = cursor.fetchone()
-
-            elif user['role'] == 'hod':
-                cursor.execute(
-                    """SELECT h.*, d.name as department_name 
-                    FROM hods h 
-                    JOIN departments d ON h.department_id = d.id 
-                    WHERE h.user_id = %s""",
-                    (user_id,)
-                )
-                role_data = cursor.fetchone()
-
-            elif user['role'] == 'tpo':
-                cursor.execute(
-                    "SELECT * FROM tpos WHERE user_id = %s",
-                    (user_id,)
-                )
-                role_data = cursor.fetchone()
-
             response = {
                 'id': user['id'],
                 'email': user['email'],
                 'role': user['role'],
                 'is_active': user['is_active'],
+                'must_change_password': user['must_change_password'],
                 **role_data
             }
 
@@ -323,6 +358,116 @@ def get_current_user():
         return jsonify({'error': 'Failed to get user data'}), 500
 
 
+# ============================================
+# SET / CHANGE PASSWORD
+# ============================================
+@auth_bp.route('/set-password', methods=['POST'])
+def set_password():
+    """Choose a password with the single-use link mailed to imported accounts"""
+    try:
+        data = request.get_json() or {}
+        token = data.get('token')
+        password = data.get('password') or ''
+
+        if not token:
+            return jsonify({'error': 'token is required'}), 400
+        if len(password) < 6:
+            return jsonify({'error': 'Password must be at least 6 characters'}), 400
+        if not account_setup_ready():
+            return jsonify({'error': 'Invalid or expired link'}), 400
+
+        # Hash before taking a connection, as login verifies after releasing one
+        try:
+            password_hash = hash_password(password)
+        except PasswordHasherBusy as e:
+            return hasher_busy(e)
+
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+
+        try:
+            cursor = conn.cursor()
+            user_id = redeem_token(cursor, token)
+            if user_id is None:
+                conn.rollback()
+                return jsonify({'error': 'Invalid or expired link'}), 400
+            cursor.execute(
+                "UPDATE users SET password_hash = %s, must_change_password = FALSE WHERE id = %s",
+                (password_hash, user_id)
+            )
+            conn.commit()
+            return jsonify({'message': 'Password set, please login'}), 200
+        finally:
+            cursor.close()
+            conn.close()
+
+    except Exception as e:
+        print(f"Set password error: {e}")
+        return jsonify({'error': 'Failed to set password'}), 500
+
+
+@auth_bp.route('/change-password', methods=['POST'])
+@jwt_required()
+def change_password():
+    """Replace the current password; returns a fresh token without the
+    must_change_password claim"""
+    try:
+        current_user = get_jwt_identity()
+        data = request.get_json() or {}
+        current_password = data.get('current_password') or ''
+        new_password = data.get('new_password') or ''
+
+        if len(new_password) < 6:
+            return jsonify({'error': 'Password must be at least 6 characters'}), 400
+        if new_password == current_password:
+            return jsonify({'error': 'New password must differ from the current one'}), 400
+
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        try:
+            cursor = conn.cursor()
+            user, _ = load_principal(cursor, "u.id = %s", current_user['user_id'])
+        finally:
+            cursor.close()
+            conn.close()
+
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+
+        try:
+            if not verify_password(current_password, user['password_hash']):
+                return jsonify({'error': 'Current password is incorrect'}), 401
+            password_hash = hash_password(new_password)
+        except PasswordHasherBusy as e:
+            return hasher_busy(e)
+
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        try:
+            cursor = conn.cursor()
+            if account_setup_ready():
+                cursor.execute(
+                    "UPDATE users SET password_hash = %s, must_change_password = FALSE WHERE id = %s",
+                    (password_hash, user['id'])
+                )
+            else:
+                cursor.execute("UPDATE users SET password_hash = %s WHERE id = %s", (password_hash, user['id']))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+        user['must_change_password'] = False
+        return jsonify({'message': 'Password changed', 'token': access_token(user)}), 200
+
+    except Exception as e:
+        print(f"Change password error: {e}")
+        return jsonify({'error': 'Failed to change password'}), 500
+
+
 # ============================================
 # LOGOUT ENDPOINT
 # ============================================
@@ -337,6 +482,7 @@ def logout():
 # GET DEPARTMENTS
 # ============================================
 @auth_bp.route('/departments', methods=['GET'])
+@cached_response('departments', public=True)
 def get_departments():
     """Get all departments"""
     try:
@@ -1,6 +1,14 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from utils.db import get_db_connection
+from utils.principal import resolve_principal
+from utils.notifications import insert_notification, publish_pending
+from utils.reports import get_report_engine, load_department_report
+from utils.search import search_ids, in_condition, rank_rows, mark_search_stale
+from utils.analytics import mark_analytics_dirty
+from utils.passwords import PasswordHasherBusy
+from utils.student_import import import_upload, ImportFormatError
+import traceback
 from datetime import datetime
 
 hod_bp = Blueprint('hod', __name__)
@@ -15,7 +23,6 @@ def get_hod_stats():
     """Get HOD dashboard statistics"""
     try:
         current_user = get_jwt_identity()
-        user_id = current_user.get('user_id')
         
         if current_user.get('role') != 'hod':
             return jsonify({'error': 'Access denied'}), 403
@@ -28,14 +35,10 @@ def get_hod_stats():
             cursor = conn.cursor()
             
             # Get HOD's department
-            cursor.execute("SELECT department_id FROM hods WHERE user_id = %s", (user_id,))
-            hod = cursor.fetchone()
-            
-            if not hod:
+            department_id = resolve_principal(cursor, current_user)
+            if not department_id:
                 return jsonify({'error': 'HOD profile not found'}), 404
             
-            department_id = hod['department_id']
-            
             # Get students count
             cursor.execute("""
                 SELECT 
@@ -107,7 +110,6 @@ def get_students():
     """Get all students in HOD's department"""
     try:
         current_user = get_jwt_identity()
-        user_id = current_user.get('user_id')
         
         if current_user.get('role') != 'hod':
             return jsonify({'error': 'Access denied'}), 403
@@ -123,14 +125,10 @@ def get_students():
             cursor = conn.cursor()
             
             # Get HOD's department
-            cursor.execute("SELECT department_id FROM hods WHERE user_id = %s", (user_id,))
-            hod = cursor.fetchone()
-            
-            if not hod:
+            department_id = resolve_principal(cursor, current_user)
+            if not department_id:
                 return jsonify({'error': 'HOD profile not found'}), 404
             
-            department_id = hod['department_id']
-            
             # Build query
             query = """
                 SELECT 
@@ -153,7 +151,12 @@ def get_students():
             elif status == 'approved':
                 query += " AND s.is_approved = 1"
             
-            if search:
+            ranked_ids = search_ids('students', search, scope=department_id) if search else None
+            if ranked_ids is not None:
+                condition, ids = in_condition('s.id', ranked_ids)
+                query += f" AND {condition}"
+                params.extend(ids)
+            elif search:
                 query += " AND (s.first_name LIKE %s OR s.last_name LIKE %s OR s.enrollment_number LIKE %s)"
                 params.extend([f'%{search}%', f'%{search}%', f'%{search}%'])
             
@@ -162,6 +165,9 @@ def get_students():
             cursor.execute(query, tuple(params))
             students = cursor.fetchall()
             
+            if ranked_ids:
+                rank_rows(students, ranked_ids)
+            
             # Convert decimals
             for student in students:
                 if student.get('cgpa'):
@@ -200,10 +206,8 @@ def approve_student(student_id):
             cursor = conn.cursor()
             
             # Get HOD's department
-            cursor.execute("SELECT department_id FROM hods WHERE user_id = %s", (user_id,))
-            hod = cursor.fetchone()
-            
-            if not hod:
+            department_id = resolve_principal(cursor, current_user)
+            if not department_id:
                 return jsonify({'error': 'HOD profile not found'}), 404
             
             # Get student
@@ -212,7 +216,7 @@ def approve_student(student_id):
                 FROM students s
                 JOIN users u ON s.user_id = u.id
                 WHERE s.id = %s AND s.department_id = %s
-            """, (student_id, hod['department_id']))
+            """, (student_id, department_id))
             
             student = cursor.fetchone()
             
@@ -227,17 +231,16 @@ def approve_student(student_id):
             """, (datetime.now(), user_id, student_id))
             
             # Create notification
-            cursor.execute("""
-                INSERT INTO notifications (user_id, title, message, type)
-                VALUES (%s, %s, %s, %s)
-            """, (
+            insert_notification(
+                cursor,
                 student['user_id'],
                 'Profile Approved',
                 'Your profile has been approved by the HOD. You can now apply to placement drives.',
                 'success'
-            ))
+            )
             
             conn.commit()
+            publish_pending()
             
             return jsonify({'message': 'Student approved successfully'}), 200
             
@@ -260,7 +263,6 @@ def reject_student(student_id):
     """Reject a student"""
     try:
         current_user = get_jwt_identity()
-        user_id = current_user.get('user_id')
         
         if current_user.get('role') != 'hod':
             return jsonify({'error': 'Access denied'}), 403
@@ -276,10 +278,8 @@ def reject_student(student_id):
             cursor = conn.cursor()
             
             # Get HOD's department
-            cursor.execute("SELECT department_id FROM hods WHERE user_id = %s", (user_id,))
-            hod = cursor.fetchone()
-            
-            if not hod:
+            department_id = resolve_principal(cursor, current_user)
+            if not department_id:
                 return jsonify({'error': 'HOD profile not found'}), 404
             
             # Get student
@@ -288,7 +288,7 @@ def reject_student(student_id):
                 FROM students s
                 JOIN users u ON s.user_id = u.id
                 WHERE s.id = %s AND s.department_id = %s
-            """, (student_id, hod['department_id']))
+            """, (student_id, department_id))
             
             student = cursor.fetchone()
             
@@ -303,17 +303,16 @@ def reject_student(student_id):
             """, (student_id,))
             
             # Create notification
-            cursor.execute("""
-                INSERT INTO notifications (user_id, title, message, type)
-                VALUES (%s, %s, %s, %s)
-            """, (
+            insert_notification(
+                cursor,
                 student['user_id'],
                 'Profile Needs Update',
                 reason,
                 'warning'
-            ))
+            )
             
             conn.commit()
+            publish_pending()
             
             return jsonify({'message': 'Student profile rejected'}), 200
             
@@ -381,3 +380,93 @@ def bulk_approve_students():
     except Exception as e:
         print(f"Bulk approve endpoint error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
+
+
+@hod_bp.route('/students/import', methods=['POST'])
+@jwt_required()
+def import_students():
+    """Create approved student accounts for this HOD's department from a CSV/XLSX sheet"""
+    try:
+        current_user = get_jwt_identity()
+        if current_user.get('role') != 'hod':
+            return jsonify({'error': 'Access denied'}), 403
+
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            return jsonify({'error': 'No file uploaded'}), 400
+        dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        try:
+            cursor = conn.cursor()
+            department_id = resolve_principal(cursor, current_user)
+        finally:
+            cursor.close()
+            conn.close()
+        if not department_id:
+            return jsonify({'error': 'HOD profile not found'}), 404
+
+        try:
+            report = import_upload(upload, department_id, approved_by=current_user.get('user_id'), dry_run=dry_run)
+        except ImportFormatError as e:
+            return jsonify({'error': str(e)}), 400
+        except PasswordHasherBusy as e:
+            response = jsonify({'error': 'Password hashing is busy, please retry shortly'})
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response, 429
+        if report is None:
+            return jsonify({'error': 'Database connection failed'}), 500
+
+        if report['created']:
+            mark_search_stale('students')
+            mark_analytics_dirty()
+        report['message'] = (f"{report['valid']} of {report['total']} rows valid" if dry_run
+                             else f"Imported {report['created']} of {report['total']} students")
+        if report['email_failed']:
+            report['message'] += f"; {len(report['email_failed'])} set-password email(s) could not be queued"
+        return jsonify(report), 200
+
+    except Exception as e:
+        print(f"Import students error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to import students'}), 500
+
+
+@hod_bp.route('/reports/placements', methods=['GET'])
+@jwt_required()
+def department_placement_report():
+    """Placement report PDF for the HOD's department"""
+    try:
+        current_user = get_jwt_identity()
+        
+        if current_user.get('role') != 'hod':
+            return jsonify({'error': 'Access denied'}), 403
+        
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        try:
+            cursor = conn.cursor()
+            
+            department_id = resolve_principal(cursor, current_user)
+            if not department_id:
+                return jsonify({'error': 'HOD profile not found'}), 404
+            
+            data = load_department_report(cursor, department_id)
+            if not data:
+                return jsonify({'error': 'Department not found'}), 404
+            
+        finally:
+            cursor.close()
+            conn.close()
+        
+        path = get_report_engine().render('department_placements', data)
+        return send_file(path, mimetype='application/pdf', as_attachment=True,
+                         download_name=f"department_{department_id}_placements.pdf")
+            
+    except Exception as e:
+        print(f"Department report error: {e}")
+        return jsonify({'error': 'Failed to generate report'}), 500
@@ -1,16 +1,30 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from utils.db import get_db_connection
-from utils.email_service import send_email, get_application_submitted_email
+from utils.email_service import get_application_submitted_email
+from utils.email_queue import queue_email
 from werkzeug.utils import secure_filename
 import os
 from config import Config
 from datetime import datetime
 import traceback
-import google.generativeai as genai
-import PyPDF2
 import io
 import json
+from utils.resume_analysis import analyze_resume_text
+from utils.analytics import mark_analytics_dirty
+from utils.principal import resolve_principal, invalidate_principal
+from utils.notifications import (insert_notification, publish_pending, stream_events,
+                                 probe_notifications, list_notifications)
+from utils.notification_hub import get_notification_hub
+from utils.notification_counters import notification_counters_ready, decrement_unread, get_unread_count
+from utils.http_cache import cached_response
+from utils.application_totals import invalidate_application_totals
+from utils.notification_archive import notification_archive_ready, archived_page
+from utils.search import search_ids, in_condition, rank_rows, touch_search
+from utils.drive_counters import drive_counters_ready, increment_application_count
+from utils.eligibility import STUDENT_COLUMNS, DRIVE_COLUMNS, evaluate, evaluate_student
+from utils.resume_parser import extract_text_from_bytes, find_parsed_text, notify_resume_uploaded
+import hashlib
 
 student_bp = Blueprint('student', __name__)
 
@@ -94,15 +108,9 @@ def update_profile():
         try:
             cursor = conn.cursor()
 
-            cursor.execute("SELECT id FROM students WHERE user_id = %s", (user_id,))
-            student = cursor.fetchone()
-
-            if not student:
-                return jsonify({'error': 'Student not found'}), 404
-
-            student_id = student.get('id')
+            student_id = resolve_principal(cursor, current_user)
             if not student_id:
-                return jsonify({'error': 'Student id missing'}), 500
+                return jsonify({'error': 'Student not found'}), 404
 
             update_fields = []
             update_values = []
@@ -123,6 +131,8 @@ def update_profile():
             query = f"UPDATE students SET {', '.join(update_fields)} WHERE id = %s"
             cursor.execute(query, tuple(update_values))
             conn.commit()
+            touch_search('students', student_id)
+            invalidate_principal(user_id)
 
             return jsonify({'message': 'Profile updated successfully'}), 200
 
@@ -150,7 +160,6 @@ def upload_resume():
     """Upload student resume"""
     try:
         current_user = get_jwt_identity()
-        user_id = current_user.get('user_id')
 
         if current_user.get('role') != 'student':
             return jsonify({'error': 'Access denied'}), 403
@@ -183,15 +192,9 @@ def upload_resume():
         try:
             cursor = conn.cursor()
 
-            cursor.execute("SELECT id FROM students WHERE user_id = %s", (user_id,))
-            student = cursor.fetchone()
-
-            if not student:
-                return jsonify({'error': 'Student not found'}), 404
-
-            student_id = student.get('id')
+            student_id = resolve_principal(cursor, current_user)
             if not student_id:
-                return jsonify({'error': 'Student id missing'}), 500
+                return jsonify({'error': 'Student not found'}), 404
 
             filename = secure_filename(file.filename)
             unique_filename = f"student_{student_id}_{filename}"
@@ -211,10 +214,12 @@ def upload_resume():
             )
 
             conn.commit()
+            notify_resume_uploaded()
 
             return jsonify({
                 'message': 'Resume uploaded successfully',
-                'file_name': filename
+                'file_name': filename,
+                'parsing_status': 'pending'
             }), 200
 
         except Exception as e:
@@ -241,7 +246,6 @@ def get_stats():
     """Get student dashboard statistics"""
     try:
         current_user = get_jwt_identity()
-        user_id = current_user.get('user_id')
 
         if current_user.get('role') != 'student':
             return jsonify({'error': 'Access denied'}), 403
@@ -253,10 +257,8 @@ def get_stats():
         try:
             cursor = conn.cursor()
 
-            cursor.execute("SELECT id FROM students WHERE user_id = %s", (user_id,))
-            student = cursor.fetchone()
-
-            if not student:
+            student_id = resolve_principal(cursor, current_user)
+            if not student_id:
                 return jsonify({
                     'stats': {
                         'total_applications': 0,
@@ -268,17 +270,6 @@ def get_stats():
                     }
                 }), 200
 
-            student_id = student.get('id')
-            if not student_id:
-                return jsonify({'stats': {
-                    'total_applications': 0,
-                    'pending': 0,
-                    'shortlisted': 0,
-                    'selected': 0,
-                    'rejected': 0,
-                    'active_drives': 0
-                }}), 200
-
             cursor.execute("""
                 SELECT 
                     COUNT(*) as total_applications,
@@ -335,6 +326,7 @@ def get_stats():
 # ============================================
 @student_bp.route('/drives', methods=['GET'])
 @jwt_required()
+@cached_response('drives', 'companies', 'applications')
 def get_drives():
     """Get all active placement drives"""
     try:
@@ -354,14 +346,19 @@ def get_drives():
         try:
             cursor = conn.cursor()
 
-            query = """
+            if drive_counters_ready():
+                counts = "pd.application_count as total_applications, pd.round_count"
+            else:
+                counts = """(SELECT COUNT(*) FROM applications WHERE drive_id = pd.id) as total_applications,
+                    (SELECT COUNT(*) FROM rounds WHERE drive_id = pd.id) as round_count"""
+
+            query = f"""
                 SELECT 
                     pd.*,
                     c.name as company_name,
                     c.logo_url,
                     c.industry,
-                    (SELECT COUNT(*) FROM applications WHERE drive_id = pd.id) as total_applications,
-                    (SELECT COUNT(*) FROM rounds WHERE drive_id = pd.id) as round_count
+                    {counts}
                 FROM placement_drives pd
                 JOIN companies c ON pd.company_id = c.id
                 WHERE pd.status = 'active' 
@@ -370,7 +367,12 @@ def get_drives():
 
             params = []
 
-            if search:
+            ranked_ids = search_ids('drives', search) if search else None
+            if ranked_ids is not None:
+                condition, ids = in_condition('pd.id', ranked_ids)
+                query += f" AND {condition}"
+                params.extend(ids)
+            elif search:
                 query += " AND (c.name LIKE %s OR pd.job_role LIKE %s)"
                 params.extend([f'%{search}%', f'%{search}%'])
 
@@ -387,6 +389,10 @@ def get_drives():
             cursor.execute(query, tuple(params))
             drives = cursor.fetchall()
 
+            # Best matches first when searching
+            if ranked_ids:
+                rank_rows(drives, ranked_ids)
+
             for drive in drives:
                 if drive.get('package_ctc'):
                     drive['package_ctc'] = float(drive['package_ctc'])
@@ -415,11 +421,11 @@ def get_drives():
 # ============================================
 @student_bp.route('/drives/<int:drive_id>', methods=['GET'])
 @jwt_required()
+@cached_response('drives', 'companies', 'applications', per_user=True)
 def get_drive_details(drive_id):
     """Get detailed information about a specific drive"""
     try:
         current_user = get_jwt_identity()
-        user_id = current_user.get('user_id')
 
         if current_user.get('role') != 'student':
             return jsonify({'error': 'Access denied'}), 403
@@ -431,7 +437,12 @@ def get_drive_details(drive_id):
         try:
             cursor = conn.cursor()
 
-            cursor.execute("""
+            if drive_counters_ready():
+                total_applications = "pd.application_count"
+            else:
+                total_applications = "(SELECT COUNT(*) FROM applications WHERE drive_id = pd.id)"
+
+            cursor.execute(f"""
                 SELECT 
                     pd.*,
                     c.name as company_name,
@@ -439,7 +450,7 @@ def get_drive_details(drive_id):
                     c.website as company_website,
                     c.logo_url,
                     c.industry,
-                    (SELECT COUNT(*) FROM applications WHERE drive_id = pd.id) as total_applications
+                    {total_applications} as total_applications
                 FROM placement_drives pd
                 JOIN companies c ON pd.company_id = c.id
                 WHERE pd.id = %s
@@ -466,14 +477,13 @@ def get_drive_details(drive_id):
             rounds = cursor.fetchall()
             drive['rounds'] = rounds
 
-            cursor.execute("SELECT id FROM students WHERE user_id = %s", (user_id,))
-            student = cursor.fetchone()
+            student_id = resolve_principal(cursor, current_user)
 
-            if student:
+            if student_id:
                 cursor.execute("""
                     SELECT * FROM applications 
                     WHERE student_id = %s AND drive_id = %s
-                """, (student['id'], drive_id))
+                """, (student_id, drive_id))
 
                 application = cursor.fetchone()
                 drive['has_applied'] = application is not None
@@ -556,19 +566,11 @@ def apply_to_drive(drive_id):
             if cursor.fetchone():
                 return jsonify({'error': 'You have already applied'}), 409
 
-            eligibility_errors = []
-
-            if student['cgpa']:
-                if float(student['cgpa']) < float(drive['min_cgpa']):
-                    eligibility_errors.append(f"Minimum CGPA required: {drive['min_cgpa']}")
-            else:
-                eligibility_errors.append("Please update your CGPA in profile")
-
-            if student['backlogs'] > drive['max_backlogs']:
-                eligibility_errors.append(f"Maximum backlogs allowed: {drive['max_backlogs']}")
-
-            if not student['resume_url']:
-                eligibility_errors.append("Please upload your resume")
+            # Approval was checked above with its own 403
+            eligibility_errors = [
+                issue['message'] for issue in evaluate(student, drive)['issues']
+                if issue['code'] != 'not_approved'
+            ]
 
             if eligibility_errors:
                 return jsonify({
@@ -576,6 +578,10 @@ def apply_to_drive(drive_id):
                     'details': eligibility_errors
                 }), 400
 
+            # Bumping the counter first also locks the drive row against delete_drive
+            if drive_counters_ready():
+                increment_application_count(cursor, drive_id)
+
             cursor.execute("""
                 INSERT INTO applications (student_id, drive_id, status, current_round)
                 VALUES (%s, %s, %s, %s)
@@ -583,21 +589,22 @@ def apply_to_drive(drive_id):
 
             application_id = cursor.lastrowid
 
-            cursor.execute("""
-                INSERT INTO notifications (user_id, title, message, type, related_entity_type, related_entity_id)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
+            insert_notification(
+                cursor,
                 user_id,
                 'Application Submitted',
                 f'Your application to {drive["company_name"]} has been submitted.',
                 'success',
                 'application',
                 application_id
-            ))
+            )
 
             conn.commit()
+            invalidate_application_totals()
+            mark_analytics_dirty()
+            publish_pending()
 
-            # Send confirmation email
+            # Queue confirmation email; delivery happens on the email workers
             try:
                 cursor.execute("SELECT email FROM users WHERE id = %s", (user_id,))
                 user_email = cursor.fetchone()['email']
@@ -607,9 +614,10 @@ def apply_to_drive(drive_id):
                     drive['company_name'],
                     drive['job_role']
                 )
-                send_email(user_email, "Application Submitted Successfully", email_html)
+                queue_email(user_email, "Application Submitted Successfully", email_html,
+                            user_id=user_id, event=f"application_submitted:{application_id}")
             except Exception as e:
-                print(f"Email send failed: {e}")
+                print(f"Email queue failed: {e}")
 
             return jsonify({
                 'message': 'Application submitted successfully',
@@ -652,46 +660,21 @@ def check_eligibility(drive_id):
         try:
             cursor = conn.cursor()
 
-            cursor.execute("SELECT * FROM students WHERE user_id = %s", (user_id,))
+            cursor.execute(f"SELECT {STUDENT_COLUMNS} FROM students s WHERE s.user_id = %s", (user_id,))
             student = cursor.fetchone()
 
             if not student:
                 return jsonify({'error': 'Student profile not found'}), 404
 
-            cursor.execute("SELECT * FROM placement_drives WHERE id = %s", (drive_id,))
+            cursor.execute(f"SELECT {DRIVE_COLUMNS} FROM placement_drives pd WHERE pd.id = %s", (drive_id,))
             drive = cursor.fetchone()
 
             if not drive:
                 return jsonify({'error': 'Drive not found'}), 404
 
-            eligible = True
-            issues = []
-
-            if not student['is_approved']:
-                eligible = False
-                issues.append({'type': 'critical', 'message': 'Profile not approved by HOD'})
-
-            if not student['resume_url']:
-                eligible = False
-                issues.append({'type': 'critical', 'message': 'Resume not uploaded'})
-
-            if student['cgpa']:
-                if float(student['cgpa']) < float(drive['min_cgpa']):
-                    eligible = False
-                    issues.append({
-                        'type': 'eligibility',
-                        'message': f"CGPA too low (Required: {drive['min_cgpa']}, Yours: {student['cgpa']})"
-                    })
-            else:
-                eligible = False
-                issues.append({'type': 'profile', 'message': 'CGPA not updated in profile'})
-
-            if student['backlogs'] > drive['max_backlogs']:
-                eligible = False
-                issues.append({
-                    'type': 'eligibility',
-                    'message': f"Too many backlogs (Allowed: {drive['max_backlogs']}, Yours: {student['backlogs']})"
-                })
+            result = evaluate(student, drive)
+            eligible = result['eligible']
+            issues = result['issues']
 
             return jsonify({
                 'eligible': eligible,
@@ -709,12 +692,12 @@ def check_eligibility(drive_id):
 
 
 # ============================================
-# GET MY APPLICATIONS
+# BULK ELIGIBILITY (ALL ACTIVE DRIVES)
 # ============================================
-@student_bp.route('/applications', methods=['GET'])
+@student_bp.route('/eligibility', methods=['GET'])
 @jwt_required()
-def get_my_applications():
-    """Get all applications of current student"""
+def get_eligibility():
+    """Check the current student against every active drive in one pass"""
     try:
         current_user = get_jwt_identity()
         user_id = current_user.get('user_id')
@@ -729,13 +712,58 @@ def get_my_applications():
         try:
             cursor = conn.cursor()
 
-            cursor.execute("SELECT id FROM students WHERE user_id = %s", (user_id,))
+            cursor.execute(f"SELECT {STUDENT_COLUMNS} FROM students s WHERE s.user_id = %s", (user_id,))
             student = cursor.fetchone()
 
             if not student:
-                return jsonify({'applications': []}), 200
+                return jsonify({'error': 'Student profile not found'}), 404
+
+            cursor.execute(f"""
+                SELECT {DRIVE_COLUMNS}
+                FROM placement_drives pd
+                WHERE pd.status = 'active' AND pd.application_deadline > NOW()
+            """)
+            drives = cursor.fetchall()
+
+            results = evaluate_student(student, drives)
+
+            return jsonify({
+                'eligibility': results,
+                'eligible_count': sum(1 for r in results if r['eligible']),
+                'count': len(results)
+            }), 200
+
+        finally:
+            cursor.close()
+            conn.close()
+
+    except Exception as e:
+        print(f"Bulk eligibility error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to check eligibility'}), 500
+
+
+# ============================================
+# GET MY APPLICATIONS
+# ============================================
+@student_bp.route('/applications', methods=['GET'])
+@jwt_required()
+def get_my_applications():
+    """Get all applications of current student"""
+    try:
+        current_user = get_jwt_identity()
+
+        if current_user.get('role') != 'student':
+            return jsonify({'error': 'Access denied'}), 403
 
-            student_id = student.get('id')
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+
+        try:
+            cursor = conn.cursor()
+
+            student_id = resolve_principal(cursor, current_user)
             if not student_id:
                 return jsonify({'applications': []}), 200
 
@@ -857,7 +885,13 @@ def get_application_details(application_id):
 @student_bp.route('/notifications', methods=['GET'])
 @jwt_required()
 def get_notifications():
-    """Get student notifications"""
+    """Get student notifications, newest first.
+
+    ``before_id`` pages back through older notifications; ``after_id``
+    returns only those newer than the last one the client has seen. Both
+    carry a weak ETag built from the newest id and the unread count, so a
+    poll with nothing new is answered 304 after a single indexed probe.
+    """
     try:
         current_user = get_jwt_identity()
         user_id = current_user.get('user_id')
@@ -865,6 +899,15 @@ def get_notifications():
         if current_user.get('role') != 'student':
             return jsonify({'error': 'Access denied'}), 403
 
+        try:
+            before_id = request.args.get('before_id', type=int)
+            after_id = request.args.get('after_id', type=int)
+            limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        except ValueError:
+            return jsonify({'error': 'Invalid pagination parameters'}), 400
+        if before_id is not None and after_id is not None:
+            return jsonify({'error': 'Use either before_id or after_id, not both'}), 400
+
         conn = get_db_connection()
         if not conn:
             return jsonify({'error': 'Database connection failed'}), 500
@@ -872,36 +915,135 @@ def get_notifications():
         try:
             cursor = conn.cursor()
 
-            cursor.execute("""
-                SELECT * FROM notifications 
-                WHERE user_id = %s 
-                ORDER BY created_at DESC 
-                LIMIT 20
-            """, (user_id,))
+            latest_id, unread_count = probe_notifications(cursor, user_id)
+            etag = f"{latest_id or 0}-{unread_count}-{before_id or ''}-{after_id or ''}-{limit}"
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                if after_id is not None and (latest_id is None or latest_id <= after_id):
+                    notifications, has_more = [], False
+                else:
+                    notifications, has_more = list_notifications(cursor, user_id, before_id, after_id, limit)
+
+                if after_id is not None:
+                    next_before_id = None
+                    next_after_id = notifications[0]['id'] if notifications else after_id
+                else:
+                    next_before_id = notifications[-1]['id'] if has_more else None
+                    next_after_id = notifications[0]['id'] if notifications else latest_id
+
+                response = jsonify({
+                    'notifications': notifications,
+                    'unread_count': unread_count,
+                    'latest_id': latest_id,
+                    'has_more': has_more,
+                    'next_before_id': next_before_id,
+                    'next_after_id': next_after_id
+                })
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+
+        finally:
+            cursor.close()
+            conn.close()
 
-            notifications = cursor.fetchall()
+    except Exception as e:
+        print(f"Get notifications error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to get notifications'}), 500
 
-            cursor.execute("""
-                SELECT COUNT(*) as unread_count 
-                FROM notifications 
-                WHERE user_id = %s AND is_read = 0
-            """, (user_id,))
 
-            unread = cursor.fetchone()
+@student_bp.route('/notifications/archive', methods=['GET'])
+@jwt_required()
+def get_archived_notifications():
+    """Page through notifications moved out by the retention sweep"""
+    try:
+        current_user = get_jwt_identity()
+        user_id = current_user.get('user_id')
+
+        if current_user.get('role') != 'student':
+            return jsonify({'error': 'Access denied'}), 403
+
+        try:
+            before_id = request.args.get('before_id', type=int)
+            limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        except ValueError:
+            return jsonify({'error': 'Invalid pagination parameters'}), 400
+
+        if not notification_archive_ready():
+            return jsonify({'notifications': [], 'next_before_id': None}), 200
 
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+
+        try:
+            cursor = conn.cursor()
+            notifications, next_before_id = archived_page(cursor, user_id, before_id, limit)
             return jsonify({
                 'notifications': notifications,
-                'unread_count': int(unread['unread_count'] or 0)
+                'next_before_id': next_before_id
             }), 200
-
         finally:
             cursor.close()
             conn.close()
 
     except Exception as e:
-        print(f"Get notifications error: {e}")
+        print(f"Get archived notifications error: {e}")
         traceback.print_exc()
-        return jsonify({'error': 'Failed to get notifications'}), 500
+        return jsonify({'error': 'Failed to get archived notifications'}), 500
+
+
+@student_bp.route('/notifications/stream', methods=['GET'])
+@jwt_required()
+def stream_notifications():
+    """Push new notifications and unread counts as server-sent events"""
+    try:
+        current_user = get_jwt_identity()
+        user_id = current_user.get('user_id')
+
+        if current_user.get('role') != 'student':
+            return jsonify({'error': 'Access denied'}), 403
+
+        try:
+            last_event_id = int(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+        except (TypeError, ValueError):
+            last_event_id = None
+
+        # Subscribe before counting so nothing published in between is lost
+        hub = get_notification_hub()
+        subscription = hub.subscribe(user_id, last_event_id)
+        try:
+            unread_count = hub.unread(user_id)
+            if unread_count is None:
+                conn = get_db_connection()
+                if not conn:
+                    hub.unsubscribe(subscription)
+                    return jsonify({'error': 'Database connection failed'}), 500
+                try:
+                    cursor = conn.cursor()
+                    unread_count = get_unread_count(cursor, user_id)
+                    hub.set_unread(user_id, unread_count)
+                finally:
+                    cursor.close()
+                    conn.close()
+        except Exception:
+            hub.unsubscribe(subscription)
+            raise
+
+        events = stream_events(subscription, unread_count,
+                               heartbeat=Config.NOTIFICATION_STREAM_HEARTBEAT,
+                               max_age=Config.NOTIFICATION_STREAM_MAX_AGE)
+        return Response(events, mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        })
+
+    except Exception as e:
+        print(f"Notification stream error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to open notification stream'}), 500
 
 
 @student_bp.route('/notifications/<int:notification_id>/read', methods=['POST'])
@@ -925,10 +1067,16 @@ def mark_notification_read(notification_id):
             cursor.execute("""
                 UPDATE notifications 
                 SET is_read = 1 
-                WHERE id = %s AND user_id = %s
+                WHERE id = %s AND user_id = %s AND is_read = 0
             """, (notification_id, user_id))
+            changed = cursor.rowcount
+            if notification_counters_ready():
+                decrement_unread(cursor, user_id, changed)
 
             conn.commit()
+            if changed:
+                get_notification_hub().publish(user_id, 'read', {'notification_id': notification_id},
+                                               unread_delta=-changed)
 
             return jsonify({'message': 'Notification marked as read'}), 200
 
@@ -963,10 +1111,15 @@ def mark_all_read():
             cursor.execute("""
                 UPDATE notifications 
                 SET is_read = 1 
-                WHERE user_id = %s
+                WHERE user_id = %s AND is_read = 0
             """, (user_id,))
+            # By the rows actually changed, so notifications arriving meanwhile stay counted
+            changed = cursor.rowcount
+            if notification_counters_ready():
+                decrement_unread(cursor, user_id, changed)
 
             conn.commit()
+            get_notification_hub().publish(user_id, 'read', {'all': True}, unread_delta=-changed)
 
             return jsonify({'message': 'All notifications marked as read'}), 200
 
@@ -983,6 +1136,22 @@ def mark_all_read():
 # ============================================
 # ANALYZE RESUME
 # ============================================
+def load_parsed_resume_text(content_hash=None, user_id=None):
+    """Look up text stored by the resume parsing worker; None if unavailable"""
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor()
+        return find_parsed_text(cursor, content_hash=content_hash, user_id=user_id)
+    except Exception as e:
+        print(f"Parsed resume lookup error: {e}")
+        return None
+    finally:
+        cursor.close()
+        conn.close()
+
+
 @student_bp.route('/resume/analyze', methods=['POST'])
 @jwt_required()
 def analyze_resume():
@@ -997,135 +1166,54 @@ def analyze_resume():
         if not Config.GEMINI_API_KEY:
             return jsonify({'error': 'Gemini API key not configured. Please set GEMINI_API_KEY in environment variables.'}), 500
 
-        # Configure Gemini
-        genai.configure(api_key=Config.GEMINI_API_KEY)
-        model = genai.GenerativeModel('gemini-pro')
-
-        # Get file and job role from request
-        if 'resumeContent' not in request.files:
-            return jsonify({'error': 'Resume file is required'}), 400
-        
-        file = request.files['resumeContent']
+        # Get file and job role from request; without a file the student's
+        # latest background-parsed resume is used
+        file = request.files.get('resumeContent')
         job_role = request.form.get('jobRole', '')
+        has_file = bool(file and file.filename)
 
-        if not file or file.filename == '':
-            return jsonify({'error': 'Resume file is required'}), 400
+        if not has_file:
+            resume_content = load_parsed_resume_text(user_id=current_user.get('user_id'))
+            if resume_content is None:
+                return jsonify({'error': 'Resume file is required'}), 400
 
         if not job_role or len(job_role) < 3:
             return jsonify({'error': 'Job role must be at least 3 characters'}), 400
 
-        if file.content_type != 'application/pdf':
-            return jsonify({'error': 'Only PDF files are allowed'}), 400
-
-        # Check file size
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)
-        
-        if file_size > Config.MAX_FILE_SIZE:
-            return jsonify({'error': f'File size must be less than {Config.MAX_FILE_SIZE / 1024 / 1024}MB'}), 400
+        if has_file:
+            if file.content_type != 'application/pdf':
+                return jsonify({'error': 'Only PDF files are allowed'}), 400
 
-        # Extract text from PDF
-        try:
-            pdf_reader = PyPDF2.PdfReader(file)
-            resume_content = ""
-            for page in pdf_reader.pages:
-                resume_content += page.extract_text() + "\n"
-            
-            if len(resume_content.strip()) < 100:
-                return jsonify({'error': 'Could not extract enough text from the PDF. Please ensure it is a text-based PDF.'}), 400
-        except Exception as e:
-            print(f"PDF extraction error: {e}")
-            return jsonify({'error': 'Failed to extract text from PDF. Please ensure it is a valid PDF file.'}), 400
+            # Check file size
+            file.seek(0, os.SEEK_END)
+            file_size = file.tell()
+            file.seek(0)
 
-        # Analysis 1: Score Resume
-        score_prompt = f"""You are an expert resume reviewer. Analyze the following resume content against the specified job role.
+            if file_size > Config.MAX_FILE_SIZE:
+                return jsonify({'error': f'File size must be less than {Config.MAX_FILE_SIZE / 1024 / 1024}MB'}), 400
 
-Resume Content:
-{resume_content}
+            data = file.read()
 
-Job Role: {job_role}
+            # Reuse text the parsing worker already extracted from this exact file
+            resume_content = load_parsed_resume_text(content_hash=hashlib.sha256(data).hexdigest())
+            if resume_content is None:
+                try:
+                    resume_content, _ = extract_text_from_bytes(data, 'pdf')
+                except Exception as e:
+                    print(f"PDF extraction error: {e}")
+                    return jsonify({'error': 'Failed to extract text from PDF. Please ensure it is a valid PDF file.'}), 400
 
-Provide your analysis in the following JSON format:
-{{
-    "importantInfo": ["list", "of", "important", "information", "extracted", "from", "resume"],
-    "resumeScore": <number from 0 to 100>,
-    "scoreRationale": "brief explanation for the score",
-    "improvementSuggestions": ["suggestion 1", "suggestion 2", "suggestion 3"]
-}}
-
-Important: Return ONLY valid JSON, no additional text or markdown formatting."""
-
-        # Analysis 2: Analyze Resume Against Role
-        analysis_prompt = f"""You are a career advisor. Analyze the following resume content against the specified job role and provide feedback.
-
-Resume Content:
-{resume_content}
-
-Job Role: {job_role}
-
-Provide your analysis in the following JSON format:
-{{
-    "overallSuitability": "assessment of overall suitability",
-    "skillsGapAnalysis": "analysis of skills gap",
-    "feedback": "specific feedback on how to improve"
-}}
-
-Important: Return ONLY valid JSON, no additional text or markdown formatting."""
+        if len(resume_content.strip()) < 100:
+            return jsonify({'error': 'Could not extract enough text from the PDF. Please ensure it is a text-based PDF.'}), 400
 
         try:
-            # Get both analyses
-            score_response = model.generate_content(score_prompt)
-            analysis_response = model.generate_content(analysis_prompt)
-
-            # Parse JSON responses
-            score_text = score_response.text.strip()
-            analysis_text = analysis_response.text.strip()
-
-            # Clean up JSON (remove markdown code blocks if present)
-            if score_text.startswith('```'):
-                score_text = score_text.split('```')[1]
-                if score_text.startswith('json'):
-                    score_text = score_text[4:]
-                score_text = score_text.strip()
-            
-            if analysis_text.startswith('```'):
-                analysis_text = analysis_text.split('```')[1]
-                if analysis_text.startswith('json'):
-                    analysis_text = analysis_text[4:]
-                analysis_text = analysis_text.strip()
-
-            score_data = json.loads(score_text)
-            analysis_data = json.loads(analysis_text)
-
-            # Combine results
-            result = {
-                **score_data,
-                **analysis_data
-            }
-
-            # Ensure all required fields are present
-            if 'resumeScore' not in result:
-                result['resumeScore'] = 0
-            if 'scoreRationale' not in result:
-                result['scoreRationale'] = 'Score not available'
-            if 'importantInfo' not in result:
-                result['importantInfo'] = []
-            if 'improvementSuggestions' not in result:
-                result['improvementSuggestions'] = []
-            if 'overallSuitability' not in result:
-                result['overallSuitability'] = 'Analysis not available'
-            if 'skillsGapAnalysis' not in result:
-                result['skillsGapAnalysis'] = 'Skills gap analysis not available'
-            if 'feedback' not in result:
-                result['feedback'] = 'Feedback not available'
-
+            # Score and role analysis run concurrently; repeats are served from cache
+            result, cached = analyze_resume_text(resume_content, job_role)
+            result['cached'] = cached
             return jsonify(result), 200
 
         except json.JSONDecodeError as e:
             print(f"JSON parsing error: {e}")
-            print(f"Score response: {score_response.text if 'score_response' in locals() else 'N/A'}")
-            print(f"Analysis response: {analysis_response.text if 'analysis_response' in locals() else 'N/A'}")
             return jsonify({'error': 'Failed to parse AI response. Please try again.'}), 500
         except Exception as e:
             print(f"Gemini API error: {e}")
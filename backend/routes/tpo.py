@@ -1,15 +1,47 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from utils.db import get_db_connection
 from utils.db import execute_query
-from utils.email_service import (
-    send_email,
-    get_shortlisted_email,
-    get_selected_email,
-    get_rejected_email
+from utils.status_transitions import (
+    STATUSES,
+    NOT_FOUND,
+    transition_applications,
+    queue_status_emails,
+    promote_round,
+    reject_round
 )
+from utils.passwords import PasswordHasherBusy
+from utils.student_import import import_upload, ImportFormatError
+from utils.http_cache import cached_response, bump
+from utils.application_totals import application_totals, invalidate_application_totals
+from utils.notifications import insert_notification, publish_pending
+from utils.export import (
+    APPLICATION_EXPORT_COLUMNS,
+    APPLICATION_EXPORT_QUERY,
+    EXPORT_FORMATS,
+    stream_export
+)
+from utils.reports import (
+    get_report_engine,
+    load_drive,
+    load_drive_applicants,
+    letter_items,
+    zip_reports
+)
+from utils.search import search_ids, in_condition, rank_rows, touch_search, mark_search_stale
+from utils.drive_counters import drive_counters_ready, set_round_count
+from utils.eligibility import STUDENT_COLUMNS, DRIVE_COLUMNS, evaluate_drive
+from utils.analytics import (
+    compute_live,
+    read_snapshot,
+    get_analytics_refresher,
+    mark_analytics_dirty,
+    analytics_schema_ready
+)
+from config import Config
 from datetime import datetime
 import traceback
+import base64
 
 tpo_bp = Blueprint('tpo', __name__)
 
@@ -19,6 +51,7 @@ tpo_bp = Blueprint('tpo', __name__)
 
 @tpo_bp.route('/companies', methods=['GET'])
 @jwt_required()
+@cached_response('companies', 'drives', 'applications')
 def get_companies():
     try:
         current_user = get_jwt_identity()
@@ -33,12 +66,17 @@ def get_companies():
             COUNT(DISTINCT pd.id) AS total_drives,
             COUNT(DISTINCT a.id) AS total_applications
             FROM companies c
-            LEFT JOIN placementdrives pd ON c.id = pd.companyid
-            LEFT JOIN applications a ON pd.id = a.driveid
+            LEFT JOIN placement_drives pd ON pd.company_id = c.id
+            LEFT JOIN applications a ON a.drive_id = pd.id
         """
         params = []
         conditions = []
-        if search:
+        ranked_ids = search_ids('companies', search) if search else None
+        if ranked_ids is not None:
+            condition, ids = in_condition('c.id', ranked_ids)
+            conditions.append(condition)
+            params.extend(ids)
+        elif search:
             conditions.append("(c.name LIKE %s OR c.industry LIKE %s)")
             params.extend([f"%{search}%", f"%{search}%"])
         if conditions:
@@ -51,6 +89,9 @@ def get_companies():
         if companies is None:
             return jsonify({'error': 'Failed to fetch companies'}), 500
 
+        if ranked_ids:
+            rank_rows(companies, ranked_ids)
+
         return jsonify({'companies': companies, 'count': len(companies)}), 200
 
     except Exception as e:
@@ -136,6 +177,9 @@ def create_company():
             ))
             company_id = cursor.lastrowid
             conn.commit()
+            bump('companies')
+            mark_analytics_dirty()
+            touch_search('companies', company_id)
             return jsonify({'message': 'Company created successfully', 'company_id': company_id}), 201
         except Exception as e:
             conn.rollback()
@@ -179,6 +223,11 @@ def update_company(company_id):
             query = f"UPDATE companies SET {', '.join(update_fields)} WHERE id = %s"
             cursor.execute(query, tuple(update_values))
             conn.commit()
+            bump('companies')
+            touch_search('companies', company_id)
+            if 'name' in data:
+                # Company name is indexed on every one of its drives
+                mark_search_stale('drives')
             return jsonify({'message': 'Company updated successfully'}), 200
         except Exception as e:
             conn.rollback()
@@ -215,6 +264,10 @@ def delete_company(company_id):
                 return jsonify({'error': 'Cannot delete company with active drives'}), 400
             cursor.execute("DELETE FROM companies WHERE id = %s", (company_id,))
             conn.commit()
+            bump('companies', 'drives')
+            mark_analytics_dirty()
+            touch_search('companies', company_id)
+            mark_search_stale('drives')
             return jsonify({'message': 'Company deleted successfully'}), 200
         except Exception as e:
             conn.rollback()
@@ -318,6 +371,7 @@ def get_tpo_stats():
 
 @tpo_bp.route('/drives', methods=['GET'])
 @jwt_required()
+@cached_response('drives', 'companies', 'applications')
 def get_drives():
     try:
         current_user = get_jwt_identity()
@@ -536,7 +590,13 @@ def create_drive():
                     round_data.get('type', 'technical')
                 ))
 
+            if drive_counters_ready():
+                set_round_count(cursor, drive_id, len(rounds))
+
             conn.commit()
+            bump('drives')
+            mark_analytics_dirty()
+            touch_search('drives', drive_id)
 
             return jsonify({
                 'message': 'Drive created successfully',
@@ -597,6 +657,9 @@ def update_drive(drive_id):
             query = f"UPDATE placement_drives SET {', '.join(update_fields)} WHERE id = %s"
             cursor.execute(query, tuple(update_values))
             conn.commit()
+            bump('drives')
+            mark_analytics_dirty()
+            touch_search('drives', drive_id)
 
             return jsonify({'message': 'Drive updated successfully'}), 200
 
@@ -630,6 +693,13 @@ def delete_drive(drive_id):
             
         try:
             cursor = conn.cursor()
+
+            # Lock the drive row: apply_to_drive bumps its application_count in the
+            # same transaction as the insert, so no application can slip in here
+            cursor.execute("SELECT id FROM placement_drives WHERE id = %s FOR UPDATE", (drive_id,))
+            if not cursor.fetchone():
+                return jsonify({'error': 'Drive not found'}), 404
+
             cursor.execute("""
                 SELECT COUNT(*) as app_count 
                 FROM applications 
@@ -643,6 +713,9 @@ def delete_drive(drive_id):
             cursor.execute("DELETE FROM rounds WHERE drive_id = %s", (drive_id,))
             cursor.execute("DELETE FROM placement_drives WHERE id = %s", (drive_id,))
             conn.commit()
+            bump('drives')
+            mark_analytics_dirty()
+            touch_search('drives', drive_id)
 
             return jsonify({'message': 'Drive deleted successfully'}), 200
 
@@ -660,11 +733,150 @@ def delete_drive(drive_id):
         traceback.print_exc()
         return jsonify({'error': 'Internal server error'}), 500
 
+@tpo_bp.route('/drives/<int:drive_id>/eligible-students', methods=['GET'])
+@jwt_required()
+def get_eligible_students(drive_id):
+    """Every student eligible for a drive; ?all=1 also lists the ineligible with reasons"""
+    try:
+        current_user = get_jwt_identity()
+
+        if current_user.get('role') != 'tpo':
+            return jsonify({'error': 'Access denied'}), 403
+
+        include_ineligible = request.args.get('all') in ('1', 'true')
+
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute(f"SELECT {DRIVE_COLUMNS} FROM placement_drives pd WHERE pd.id = %s", (drive_id,))
+            drive = cursor.fetchone()
+
+            if not drive:
+                return jsonify({'error': 'Drive not found'}), 404
+
+            cursor.execute(f"""
+                SELECT {STUDENT_COLUMNS}, s.enrollment_number, s.first_name, s.last_name,
+                       d.name as department_name
+                FROM students s
+                JOIN departments d ON s.department_id = d.id
+                ORDER BY s.id
+            """)
+            students = cursor.fetchall()
+            by_id = {s['id']: s for s in students}
+
+            results = evaluate_drive(drive, students, include_ineligible=include_ineligible)
+            for result in results:
+                student = by_id[result['student_id']]
+                result.update({
+                    'enrollment_number': student['enrollment_number'],
+                    'first_name': student['first_name'],
+                    'last_name': student['last_name'],
+                    'department_name': student['department_name'],
+                    'cgpa': float(student['cgpa']) if student['cgpa'] is not None else None,
+                    'backlogs': student['backlogs']
+                })
+
+            eligible_count = sum(1 for r in results if r['eligible'])
+
+            return jsonify({
+                'students': results,
+                'eligible_count': eligible_count,
+                'total_students': len(students)
+            }), 200
+
+        finally:
+            cursor.close()
+            conn.close()
+
+    except Exception as e:
+        print(f"Eligible students error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to fetch eligible students'}), 500
+
 # ... Continue with application management, rounds, and analytics functions in next response
 # ============================================
 # APPLICATION MANAGEMENT
 # ============================================
 
+# Columns a client may request with ?fields=, and the table alias each needs
+APPLICATION_FIELDS = {
+    'id': ('a.id', 'a'),
+    'student_id': ('a.student_id', 'a'),
+    'drive_id': ('a.drive_id', 'a'),
+    'status': ('a.status', 'a'),
+    'current_round': ('a.current_round', 'a'),
+    'applied_at': ('a.applied_at', 'a'),
+    'updated_at': ('a.updated_at', 'a'),
+    'enrollment_number': ('s.enrollment_number', 's'),
+    'first_name': ('s.first_name', 's'),
+    'last_name': ('s.last_name', 's'),
+    'cgpa': ('s.cgpa', 's'),
+    'phone': ('s.phone', 's'),
+    'resume_url': ('s.resume_url', 's'),
+    'department_name': ('d.name as department_name', 'd'),
+    'job_role': ('pd.job_role', 'pd'),
+    'package_ctc': ('pd.package_ctc', 'pd'),
+    'company_name': ('c.name as company_name', 'c'),
+}
+
+APPLICATION_JOINS = [
+    ('s', "JOIN students s ON a.student_id = s.id"),
+    ('d', "JOIN departments d ON s.department_id = d.id"),
+    ('pd', "JOIN placement_drives pd ON a.drive_id = pd.id"),
+    ('c', "JOIN companies c ON pd.company_id = c.id"),
+]
+
+# Aliases that must be joined for another alias to be reachable
+JOIN_DEPENDENCIES = {'d': {'s'}, 'c': {'pd'}}
+
+
+def encode_cursor(applied_at, application_id):
+    raw = f"{applied_at.isoformat()}|{application_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor_value):
+    raw = base64.urlsafe_b64decode(cursor_value.encode()).decode()
+    applied_at, application_id = raw.rsplit('|', 1)
+    return datetime.fromisoformat(applied_at), int(application_id)
+
+
+def application_joins(aliases):
+    needed = set(aliases)
+    for alias in list(needed):
+        needed |= JOIN_DEPENDENCIES.get(alias, set())
+    return "\n".join(sql for alias, sql in APPLICATION_JOINS if alias in needed)
+
+
+def application_filters(drive_id, status, search):
+    conditions, params, aliases = [], [], set()
+
+    if drive_id:
+        conditions.append("a.drive_id = %s")
+        params.append(drive_id)
+
+    if status:
+        conditions.append("a.status = %s")
+        params.append(status)
+
+    if search:
+        student_ids = search_ids('students', search)
+        if student_ids is not None:
+            condition, ids = in_condition('a.student_id', student_ids)
+            conditions.append(condition)
+            params.extend(ids)
+        else:
+            conditions.append("(s.first_name LIKE %s OR s.last_name LIKE %s OR s.enrollment_number LIKE %s)")
+            params.extend([f'%{search}%', f'%{search}%', f'%{search}%'])
+            aliases.add('s')
+
+    return conditions, params, aliases
+
+
 @tpo_bp.route('/applications', methods=['GET'])
 @jwt_required()
 def get_applications():
@@ -676,6 +888,38 @@ def get_applications():
         drive_id = request.args.get('drive_id', '')
         status = request.args.get('status', '')
         search = request.args.get('search', '')
+        fields = request.args.get('fields', '')
+        page_cursor = request.args.get('cursor', '')
+
+        try:
+            limit = min(max(int(request.args.get('limit', 50)), 1), 200)
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+
+        if fields:
+            requested = [f.strip() for f in fields.split(',') if f.strip()]
+            unknown = [f for f in requested if f not in APPLICATION_FIELDS]
+            if unknown:
+                return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+            # id and applied_at are always returned; the cursor is built from them
+            requested = list(dict.fromkeys(['id', 'applied_at'] + requested))
+            columns = [APPLICATION_FIELDS[f][0] for f in requested]
+            aliases = {APPLICATION_FIELDS[f][1] for f in requested} - {'a'}
+        else:
+            columns = ['a.*'] + [expr for name, (expr, alias) in APPLICATION_FIELDS.items() if alias != 'a']
+            aliases = {'s', 'd', 'pd', 'c'}
+
+        conditions, params, filter_aliases = application_filters(drive_id, status, search)
+
+        page_conditions = list(conditions)
+        page_params = list(params)
+        if page_cursor:
+            try:
+                cursor_applied_at, cursor_id = decode_cursor(page_cursor)
+            except Exception:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            page_conditions.append("(a.applied_at < %s OR (a.applied_at = %s AND a.id < %s))")
+            page_params.extend([cursor_applied_at, cursor_applied_at, cursor_id])
 
         conn = get_db_connection()
         if not conn:
@@ -684,49 +928,40 @@ def get_applications():
         try:
             cursor = conn.cursor()
 
-            query = """
-                SELECT 
-                    a.*,
-                    s.enrollment_number,
-                    s.first_name,
-                    s.last_name,
-                    s.cgpa,
-                    s.phone,
-                    s.resume_url,
-                    d.name as department_name,
-                    pd.job_role,
-                    pd.package_ctc,
-                    c.name as company_name
+            query = f"""
+                SELECT {', '.join(columns)}
                 FROM applications a
-                JOIN students s ON a.student_id = s.id
-                JOIN departments d ON s.department_id = d.id
-                JOIN placement_drives pd ON a.drive_id = pd.id
-                JOIN companies c ON pd.company_id = c.id
+                {application_joins(aliases | filter_aliases)}
             """
+            if page_conditions:
+                query += " WHERE " + " AND ".join(page_conditions)
+            query += " ORDER BY a.applied_at DESC, a.id DESC LIMIT %s"
 
-            params = []
-            conditions = []
-
-            if drive_id:
-                conditions.append("a.drive_id = %s")
-                params.append(drive_id)
-
-            if status:
-                conditions.append("a.status = %s")
-                params.append(status)
-
-            if search:
-                conditions.append("(s.first_name LIKE %s OR s.last_name LIKE %s OR s.enrollment_number LIKE %s)")
-                params.extend([f'%{search}%', f'%{search}%', f'%{search}%'])
-
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-
-            query += " ORDER BY a.applied_at DESC"
-
-            cursor.execute(query, tuple(params))
+            cursor.execute(query, tuple(page_params + [limit + 1]))
             applications = cursor.fetchall()
 
+            has_more = len(applications) > limit
+            applications = applications[:limit]
+            next_cursor = None
+            if has_more:
+                last = applications[-1]
+                next_cursor = encode_cursor(last['applied_at'], last['id'])
+
+            # The total is computed once per filter set and cached, never per page
+            total_key = (drive_id, status, search)
+            total = application_totals.get(total_key)
+            if total is None:
+                count_query = f"""
+                    SELECT COUNT(*) as total
+                    FROM applications a
+                    {application_joins(filter_aliases)}
+                """
+                if conditions:
+                    count_query += " WHERE " + " AND ".join(conditions)
+                cursor.execute(count_query, tuple(params))
+                total = int(cursor.fetchone()['total'] or 0)
+                application_totals.set(total_key, total)
+
             for app in applications:
                 if app.get('cgpa') is not None:
                     app['cgpa'] = float(app['cgpa'])
@@ -735,7 +970,10 @@ def get_applications():
 
             return jsonify({
                 'applications': applications,
-                'count': len(applications)
+                'count': len(applications),
+                'total': total,
+                'has_more': has_more,
+                'next_cursor': next_cursor
             }), 200
 
         finally:
@@ -748,6 +986,196 @@ def get_applications():
         return jsonify({'error': 'Failed to get applications'}), 500
 
 
+# ============================================
+# EXPORTS
+# ============================================
+
+@tpo_bp.route('/drives/<int:drive_id>/export', methods=['GET'])
+@jwt_required()
+def export_drive_applications(drive_id):
+    """Download a drive's applicants (optionally one status) as CSV or XLSX"""
+    try:
+        current_user = get_jwt_identity()
+        if current_user.get('role') != 'tpo':
+            return jsonify({'error': 'Access denied'}), 403
+
+        export_format = request.args.get('format', 'xlsx')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': 'format must be xlsx or csv'}), 400
+        status = request.args.get('status', '')
+        # The status ends up in the Content-Disposition filename
+        if status and status not in STATUSES:
+            return jsonify({'error': 'Invalid status'}), 400
+
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT pd.id, pd.job_role, c.name as company_name
+                FROM placement_drives pd
+                JOIN companies c ON pd.company_id = c.id
+                WHERE pd.id = %s
+            """, (drive_id,))
+            drive = cursor.fetchone()
+            cursor.close()
+        except Exception:
+            conn.close()
+            raise
+
+        if not drive:
+            conn.close()
+            return jsonify({'error': 'Drive not found'}), 404
+
+        conditions, params, _ = application_filters(drive_id, status, '')
+        query = APPLICATION_EXPORT_QUERY + " WHERE " + " AND ".join(conditions) + " ORDER BY a.id"
+        filename = f"drive_{drive_id}_{status or 'all'}_applications"
+
+        # The response owns the connection from here and releases it when done
+        return stream_export(conn, query, tuple(params), APPLICATION_EXPORT_COLUMNS,
+                             export_format, filename,
+                             sheet_title=f"{drive['company_name']} - {drive['job_role']}")
+
+    except Exception as e:
+        print(f"Export drive applications error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to export applications'}), 500
+
+
+@tpo_bp.route('/applications/export', methods=['GET'])
+@jwt_required()
+def export_applications():
+    """Download applications matching the listing filters as CSV or XLSX"""
+    try:
+        current_user = get_jwt_identity()
+        if current_user.get('role') != 'tpo':
+            return jsonify({'error': 'Access denied'}), 403
+
+        export_format = request.args.get('format', 'xlsx')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': 'format must be xlsx or csv'}), 400
+        status = request.args.get('status', '')
+        if status and status not in STATUSES:
+            return jsonify({'error': 'Invalid status'}), 400
+
+        conditions, params, _ = application_filters(
+            request.args.get('drive_id', ''),
+            status,
+            request.args.get('search', '')
+        )
+        query = APPLICATION_EXPORT_QUERY
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY a.id"
+
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+
+        return stream_export(conn, query, tuple(params), APPLICATION_EXPORT_COLUMNS,
+                             export_format, f"applications_{datetime.now():%Y%m%d_%H%M%S}")
+
+    except Exception as e:
+        print(f"Export applications error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to export applications'}), 500
+
+
+# ============================================
+# PDF REPORTS
+# ============================================
+
+# Which applicants each per-student document is issued to
+LETTER_REPORTS = {
+    'offer-letters': ('offer_letter', 'selected'),
+    'admit-cards': ('admit_card', 'shortlisted'),
+}
+
+
+@tpo_bp.route('/drives/<int:drive_id>/reports/results', methods=['GET'])
+@jwt_required()
+def drive_results_report(drive_id):
+    """Result sheet PDF for one drive"""
+    try:
+        current_user = get_jwt_identity()
+        if current_user.get('role') != 'tpo':
+            return jsonify({'error': 'Access denied'}), 403
+
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+
+        try:
+            cursor = conn.cursor()
+            drive = load_drive(cursor, drive_id)
+            if not drive:
+                return jsonify({'error': 'Drive not found'}), 404
+            applications = load_drive_applicants(cursor, drive_id)
+        finally:
+            cursor.close()
+            conn.close()
+
+        path = get_report_engine().render('drive_results', {
+            'drive': drive, 'applications': applications
+        })
+        return send_file(path, mimetype='application/pdf', as_attachment=True,
+                         download_name=f"drive_{drive_id}_results.pdf")
+
+    except Exception as e:
+        print(f"Drive results report error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to generate report'}), 500
+
+
+@tpo_bp.route('/drives/<int:drive_id>/reports/<report>', methods=['GET'])
+@jwt_required()
+def drive_letters_report(drive_id, report):
+    """Zip of offer letters (selected) or admit cards (shortlisted), one PDF per student"""
+    try:
+        current_user = get_jwt_identity()
+        if current_user.get('role') != 'tpo':
+            return jsonify({'error': 'Access denied'}), 403
+
+        if report not in LETTER_REPORTS:
+            return jsonify({'error': 'Unknown report'}), 404
+        kind, status = LETTER_REPORTS[report]
+
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Database connection failed'}), 500
+
+        try:
+            cursor = conn.cursor()
+            drive = load_drive(cursor, drive_id)
+            if not drive:
+                return jsonify({'error': 'Drive not found'}), 404
+            applicants = load_drive_applicants(cursor, drive_id, status)
+        finally:
+            cursor.close()
+            conn.close()
+
+        if not applicants:
+            return jsonify({'error': f'No {status} applicants in this drive'}), 404
+
+        items = letter_items(drive, applicants)
+        results = get_report_engine().render_batch(kind, items)
+        failed = [item['enrollment_number'] for item, (_, _, error) in zip(items, results) if error]
+        if failed:
+            print(f"{kind} rendering failed for {len(failed)} student(s): {failed[:10]}")
+            return jsonify({'error': 'Failed to generate some documents', 'failed': failed}), 500
+
+        names = [f"{item['enrollment_number']}_{kind}.pdf" for item in items]
+        return send_file(zip_reports(results, names), mimetype='application/zip',
+                         as_attachment=True, download_name=f"drive_{drive_id}_{report}.zip")
+
+    except Exception as e:
+        print(f"Drive letters report error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to generate report'}), 500
+
+
 @tpo_bp.route('/applications/<int:application_id>', methods=['GET'])
 @jwt_required()
 def get_application_details(application_id):
@@ -815,9 +1243,7 @@ def update_application_status(application_id):
             return jsonify({'error': 'Status is required'}), 400
 
         new_status = data['status']
-        valid_statuses = ['applied', 'shortlisted', 'selected', 'rejected', 'on_hold']
-
-        if new_status not in valid_statuses:
+        if new_status not in STATUSES:
             return jsonify({'error': 'Invalid status'}), 400
 
         conn = get_db_connection()
@@ -826,92 +1252,20 @@ def update_application_status(application_id):
 
         try:
             cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT a.*, s.user_id, pd.job_role, pd.package_ctc, c.name as company_name
-                FROM applications a
-                JOIN students s ON a.student_id = s.id
-                JOIN placement_drives pd ON a.drive_id = pd.id
-                JOIN companies c ON pd.company_id = c.id
-                WHERE a.id = %s
-            """, (application_id,))
-
-            application = cursor.fetchone()
-
-            if not application:
+            # A TPO editing one application may correct it to any status;
+            # TRANSITIONS only guards the bulk path
+            results, changed = transition_applications(cursor, [application_id], new_status,
+                                                       check_transitions=False)
+            if results[application_id][0] == NOT_FOUND:
                 return jsonify({'error': 'Application not found'}), 404
 
-            cursor.execute("""
-                UPDATE applications 
-                SET status = %s, updated_at = %s 
-                WHERE id = %s
-            """, (new_status, datetime.now(), application_id))
-
-            notification_messages = {
-                'shortlisted': f'Congratulations! You have been shortlisted for {application["job_role"]} at {application["company_name"]}.',
-                'selected': f'🎉 Congratulations! You have been SELECTED for {application["job_role"]} at {application["company_name"]}!',
-                'rejected': f'Your application for {application["job_role"]} at {application["company_name"]} has been rejected.',
-                'on_hold': f'Your application for {application["job_role"]} at {application["company_name"]} is on hold.'
-            }
-
-            if new_status in notification_messages:
-                cursor.execute("""
-                    INSERT INTO notifications (user_id, title, message, type, related_entity_type, related_entity_id)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """, (
-                    application['user_id'],
-                    'Application Status Update',
-                    notification_messages[new_status],
-                    'info' if new_status != 'selected' else 'success',
-                    'application',
-                    application_id
-                ))
-
             conn.commit()
-
-            # Send email notifications
-            try:
-                cursor.execute("SELECT email FROM users WHERE id = %s", (application['user_id'],))
-                user_email = cursor.fetchone()['email']
-
-                cursor.execute("""
-                    SELECT s.first_name, s.last_name 
-                    FROM students s 
-                    WHERE user_id = %s
-                """, (application['user_id'],))
-                student_name_data = cursor.fetchone()
-                student_name = f"{student_name_data['first_name']} {student_name_data['last_name']}"
-
-                if new_status == 'shortlisted':
-                    email_html = get_shortlisted_email(
-                        student_name,
-                        application['company_name'],
-                        application['job_role'],
-                        'Next Round'
-                    )
-                    send_email(user_email, "You're Shortlisted! ⭐", email_html)
-
-                elif new_status == 'selected':
-                    package = f"{float(application['package_ctc'])/100000:.1f} LPA" if application.get('package_ctc') else "N/A"
-                    email_html = get_selected_email(
-                        student_name,
-                        application['company_name'],
-                        application['job_role'],
-                        package
-                    )
-                    send_email(user_email, "🎉 Congratulations! You're SELECTED!", email_html)
-
-                elif new_status == 'rejected':
-                    email_html = get_rejected_email(
-                        student_name,
-                        application['company_name'],
-                        application['job_role']
-                    )
-                    send_email(user_email, "Application Update", email_html)
-
-            except Exception as e:
-                print(f"Email send failed: {e}")
-                traceback.print_exc()
+            if changed:
+                invalidate_application_totals()
+                mark_analytics_dirty()
+                publish_pending()
+                # Delivery happens on the email workers
+                queue_status_emails(changed, new_status)
 
             return jsonify({'message': 'Application status updated successfully', 'new_status': new_status}), 200
 
@@ -943,25 +1297,40 @@ def bulk_update_applications():
         if 'application_ids' not in data or 'status' not in data:
             return jsonify({'error': 'application_ids and status are required'}), 400
         
-        application_ids = data['application_ids']
         new_status = data['status']
-        
+        if new_status not in STATUSES:
+            return jsonify({'error': 'Invalid status'}), 400
+
+        try:
+            application_ids = [int(i) for i in data['application_ids']]
+        except (TypeError, ValueError):
+            return jsonify({'error': 'application_ids must be a list of ids'}), 400
+
         if not application_ids:
             return jsonify({'error': 'No applications selected'}), 400
-        
+
         conn = get_db_connection()
         if not conn:
             return jsonify({'error': 'Database connection failed'}), 500
-        
+
         try:
             cursor = conn.cursor()
-            placeholders = ','.join(['%s'] * len(application_ids))
-            query = f"UPDATE applications SET status = %s WHERE id IN ({placeholders})"
-            cursor.execute(query, [new_status] + application_ids)
+            results, changed = transition_applications(cursor, application_ids, new_status)
             conn.commit()
+            if changed:
+                invalidate_application_totals()
+                mark_analytics_dirty()
+                publish_pending()
+                queue_status_emails(changed, new_status)
+
             return jsonify({
-                'message': f'{len(application_ids)} applications updated successfully',
-                'count': len(application_ids)
+                'message': f'{len(changed)} applications updated successfully',
+                'count': len(changed),
+                'skipped': len(results) - len(changed),
+                'results': [
+                    {'application_id': application_id, 'result': outcome, 'previous_status': previous}
+                    for application_id, (outcome, previous) in results.items()
+                ]
             }), 200
         except Exception as e:
             conn.rollback()
@@ -977,6 +1346,28 @@ def bulk_update_applications():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+def bucket_round_applicants(rounds, applications):
+    """Attach to each round the ids of the applications that reached it.
+
+    An application belongs to every round up to its current_round, so the
+    applicant rows are shipped once and rounds only reference them by id.
+    """
+    rounds_by_number = sorted(rounds, key=lambda r: r['round_number'])
+    for round_data in rounds_by_number:
+        round_data['application_ids'] = []
+
+    for app in applications:
+        current_round = app.get('current_round') or 0
+        for round_data in rounds_by_number:
+            if round_data['round_number'] > current_round:
+                break
+            round_data['application_ids'].append(app['id'])
+
+    for round_data in rounds_by_number:
+        round_data['application_count'] = len(round_data['application_ids'])
+    return rounds
+
+
 @tpo_bp.route('/drives/<int:drive_id>/rounds', methods=['GET'])
 @jwt_required()
 def get_drive_rounds(drive_id):
@@ -1008,7 +1399,9 @@ def get_drive_rounds(drive_id):
             """, (drive_id,))
             rounds = cursor.fetchall()
             
-            for round_data in rounds:
+            # One pass over the drive's applicants; rounds reference them by id
+            applications = []
+            if rounds:
                 cursor.execute("""
                     SELECT 
                         a.*,
@@ -1022,12 +1415,15 @@ def get_drive_rounds(drive_id):
                     JOIN departments d ON s.department_id = d.id
                     WHERE a.drive_id = %s AND a.current_round >= %s
                     ORDER BY s.last_name
-                """, (drive_id, round_data['round_number']))
-                round_data['applications'] = cursor.fetchall()
+                """, (drive_id, rounds[0]['round_number']))
+                applications = cursor.fetchall()
+            
+            bucket_round_applicants(rounds, applications)
             
             return jsonify({
                 'drive': drive,
-                'rounds': rounds
+                'rounds': rounds,
+                'applications': applications
             }), 200
         finally:
             cursor.close()
@@ -1078,12 +1474,14 @@ def promote_to_next_round(application_id):
             
             message = 'Congratulations! You have been SELECTED!' if new_status == 'selected' else f'You have been shortlisted for Round {new_round}.'
             
-            cursor.execute("""
-                INSERT INTO notifications (user_id, title, message, type)
-                VALUES (%s, %s, %s, %s)
-            """, (application['user_id'], 'Round Update', message, 'success' if new_status == 'selected' else 'info'))
+            insert_notification(cursor, application['user_id'], 'Round Update', message,
+                                'success' if new_status == 'selected' else 'info',
+                                'application', application_id)
             
             conn.commit()
+            invalidate_application_totals()
+            mark_analytics_dirty()
+            publish_pending()
             
             return jsonify({'message': 'Promoted to next round', 'new_round': new_round, 'new_status': new_status}), 200
         except Exception as e:
@@ -1127,11 +1525,12 @@ def reject_in_round(application_id):
             message = 'Unfortunately, you were not selected for the next round.'
             if feedback:
                 message += f' Feedback: {feedback}'
-            cursor.execute("""
-                INSERT INTO notifications (user_id, title, message, type)
-                VALUES (%s, %s, %s, %s)
-            """, (application['user_id'], 'Application Update', message, 'warning'))
+            insert_notification(cursor, application['user_id'], 'Application Update', message,
+                                'warning', 'application', application_id)
             conn.commit()
+            invalidate_application_totals()
+            mark_analytics_dirty()
+            publish_pending()
             return jsonify({'message': 'Application rejected'}), 200
         except Exception as e:
             conn.rollback()
@@ -1147,6 +1546,131 @@ def reject_in_round(application_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 
+
+def _round_action(drive_id, round_number, action):
+    """Shared body of the bulk round endpoints; ``action(cursor, ids, data)``
+    applies the change and returns ``(results, changed)``"""
+    current_user = get_jwt_identity()
+    if current_user.get('role') != 'tpo':
+        return jsonify({'error': 'Access denied'}), 403
+
+    data = request.get_json() or {}
+    try:
+        application_ids = [int(i) for i in data.get('application_ids') or []]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'application_ids must be a list of ids'}), 400
+    if not application_ids:
+        return jsonify({'error': 'No applications selected'}), 400
+
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, total_rounds FROM placement_drives WHERE id = %s", (drive_id,))
+        drive = cursor.fetchone()
+        if not drive:
+            return jsonify({'error': 'Drive not found'}), 404
+        # Round 0 is the applicant pool, before the first round
+        if not 0 <= round_number <= (drive['total_rounds'] or 0):
+            return jsonify({'error': 'Round not found'}), 404
+
+        results, changed = action(cursor, application_ids, data)
+        conn.commit()
+        if changed:
+            invalidate_application_totals()
+            mark_analytics_dirty()
+            publish_pending()
+
+        return jsonify({
+            'message': f'{len(changed)} applications updated',
+            'count': len(changed),
+            'skipped': len(results) - len(changed),
+            'results': [
+                {'application_id': application_id, 'result': outcome, 'status': status}
+                for application_id, (outcome, status) in results.items()
+            ]
+        }), 200
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+@tpo_bp.route('/drives/<int:drive_id>/rounds/<int:round_number>/promote', methods=['POST'])
+@jwt_required()
+def promote_round_applications(drive_id, round_number):
+    try:
+        return _round_action(drive_id, round_number, lambda cursor, ids, data: promote_round(
+            cursor, drive_id, round_number, ids))
+    except Exception as e:
+        print(f"Bulk promote error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to promote'}), 500
+
+
+@tpo_bp.route('/drives/<int:drive_id>/rounds/<int:round_number>/reject', methods=['POST'])
+@jwt_required()
+def reject_round_applications(drive_id, round_number):
+    try:
+        return _round_action(drive_id, round_number, lambda cursor, ids, data: reject_round(
+            cursor, drive_id, round_number, ids, (data.get('feedback') or '').strip()))
+    except Exception as e:
+        print(f"Bulk reject error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to reject'}), 500
+
+# ============================================
+# STUDENT IMPORT
+# ============================================
+
+@tpo_bp.route('/students/import', methods=['POST'])
+@jwt_required()
+def import_students():
+    """Create student accounts in bulk from a CSV/XLSX sheet; ?dry_run=1 only validates.
+
+    Columns: email, first_name, last_name, enrollment_number, department
+    (id, code or name), optional phone and password. Imported students still
+    await HOD approval.
+    """
+    try:
+        current_user = get_jwt_identity()
+        if current_user.get('role') != 'tpo':
+            return jsonify({'error': 'Access denied'}), 403
+
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            return jsonify({'error': 'No file uploaded'}), 400
+        dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+
+        try:
+            report = import_upload(upload, department_id=None, dry_run=dry_run)
+        except ImportFormatError as e:
+            return jsonify({'error': str(e)}), 400
+        except PasswordHasherBusy as e:
+            response = jsonify({'error': 'Password hashing is busy, please retry shortly'})
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response, 429
+        if report is None:
+            return jsonify({'error': 'Database connection failed'}), 500
+
+        if report['created']:
+            mark_search_stale('students')
+            mark_analytics_dirty()
+        report['message'] = (f"{report['valid']} of {report['total']} rows valid" if dry_run
+                             else f"Imported {report['created']} of {report['total']} students")
+        if report['email_failed']:
+            report['message'] += f"; {len(report['email_failed'])} set-password email(s) could not be queued"
+        return jsonify(report), 200
+
+    except Exception as e:
+        print(f"Import students error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to import students'}), 500
+
+
 # ============================================
 # ANALYTICS
 # ============================================
@@ -1158,67 +1682,34 @@ def get_analytics():
         current_user = get_jwt_identity()
         if current_user.get('role') != 'tpo':
             return jsonify({'error': 'Access denied'}), 403
+
+        fresh = request.args.get('fresh') == '1'
+        refresher = get_analytics_refresher()
+        use_snapshot = not fresh and analytics_schema_ready()
+
         conn = get_db_connection()
         if not conn:
             return jsonify({'error': 'Database connection failed'}), 500
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    c.name as company_name,
-                    COUNT(a.id) as application_count
-                FROM companies c
-                LEFT JOIN placement_drives pd ON c.id = pd.company_id
-                LEFT JOIN applications a ON pd.id = a.drive_id
-                GROUP BY c.id, c.name
-                ORDER BY application_count DESC
-                LIMIT 5
-            """)
-            company_stats = cursor.fetchall()
-
-            cursor.execute("""
-                SELECT 
-                    SUM(CASE WHEN status = 'applied' THEN 1 ELSE 0 END) as applied,
-                    SUM(CASE WHEN status = 'shortlisted' THEN 1 ELSE 0 END) as shortlisted,
-                    SUM(CASE WHEN status = 'selected' THEN 1 ELSE 0 END) as selected,
-                    SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as rejected
-                FROM applications
-            """)
-            status_stats = cursor.fetchone()
-
-            cursor.execute("""
-                SELECT 
-                    d.name as department_name,
-                    COUNT(DISTINCT CASE WHEN a.status = 'selected' THEN s.id END) as placed_count
-                FROM departments d
-                LEFT JOIN students s ON d.id = s.department_id
-                LEFT JOIN applications a ON s.id = a.student_id
-                GROUP BY d.id, d.name
-                ORDER BY placed_count DESC
-            """)
-            department_stats = cursor.fetchall()
-
-            cursor.execute("SELECT COUNT(*) as total FROM applications")
-            total_apps = cursor.fetchone()
-
-            cursor.execute("SELECT COUNT(DISTINCT student_id) as total FROM applications WHERE status = 'selected'")
-            total_placed = cursor.fetchone()
-
-            cursor.execute("SELECT COUNT(*) as total FROM placement_drives WHERE status = 'active'")
-            active_drives = cursor.fetchone()
 
-            cursor.execute("SELECT COUNT(*) as total FROM companies")
-            total_companies = cursor.fetchone()
-
-            return jsonify({
-                'company_stats': company_stats,
-                'status_stats': status_stats,
-                'department_stats': department_stats,
-                'total_applications': int(total_apps.get('total', 0)),
-                'total_placed': int(total_placed.get('total', 0)),
-                'active_drives': int(active_drives.get('total', 0)),
-                'total_companies': int(total_companies.get('total', 0))
-            }), 200
+            analytics = read_snapshot(cursor) if use_snapshot else None
+            if use_snapshot and (analytics is None or refresher.is_stale(analytics['snapshot_at'])):
+                # End this read transaction so the rebuilt snapshot is visible
+                conn.commit()
+                refresher.refresh()
+                analytics = read_snapshot(cursor)
+
+            if analytics is None:
+                analytics = compute_live(cursor)
+                analytics['source'] = 'live'
+            else:
+                analytics['source'] = 'snapshot'
+                analytics['stale_seconds'] = int(
+                    (datetime.now() - analytics['snapshot_at']).total_seconds()
+                )
+
+            return jsonify(analytics), 200
 
         finally:
             cursor.close()
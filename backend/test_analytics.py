@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+import utils.analytics as analytics
+from benchmarks.recording_db import RecordingConnection
+from utils.analytics import AnalyticsRefresher, refresh_snapshots
+
+
+def test_failed_refresh_leaves_the_snapshot_dirty():
+    refresher = AnalyticsRefresher(interval=60, max_staleness=60)
+    refresher._dirty.clear()
+    refresher.mark_dirty()
+    with mock.patch.object(analytics, 'ensure_schema', return_value=True), \
+            mock.patch.object(analytics, 'get_db_connection'), \
+            mock.patch.object(analytics, 'refresh_snapshots', side_effect=RuntimeError('lock wait timeout')):
+        with pytest.raises(RuntimeError):
+            refresher.refresh()
+    assert refresher._dirty.is_set() and refresher.refreshes == 0
+
+    with mock.patch.object(analytics, 'ensure_schema', return_value=True), \
+            mock.patch.object(analytics, 'get_db_connection'), \
+            mock.patch.object(analytics, 'refresh_snapshots', return_value='now'):
+        assert refresher.refresh() == 'now'
+    assert not refresher._dirty.is_set()
+
+
+def test_idle_snapshot_is_refreshed_before_it_outlives_the_budget():
+    refresher = AnalyticsRefresher(interval=30, max_staleness=300)
+    refresher._dirty.clear()
+    refresher.last_refresh = datetime.now() - timedelta(seconds=200)
+    assert not refresher._due()
+    refresher.last_refresh = datetime.now() - timedelta(seconds=280)
+    assert refresher._due()
+
+
+def test_rebuild_reads_without_insert_select():
+    def respond(query, params):
+        if "FROM companies c" in query:
+            return [{'id': 1, 'name': 'Acme', 'application_count': 4, 'selected_count': 1}]
+        if "FROM departments d" in query:
+            return [{'id': 2, 'name': 'CSE', 'student_count': 9, 'placed_count': 1}]
+        if "GROUP BY status" in query:
+            return [{'status': 'applied', 'application_count': 3}, {'status': 'selected', 'application_count': 1}]
+        if "total_applications" in query:
+            return [{'total_applications': 4, 'total_placed': 1, 'active_drives': 1, 'total_companies': 1}]
+        return []
+
+    conn = RecordingConnection(respond)
+    refresh_snapshots(conn)
+    inserts = {query.split('(')[0].split()[-1]: params for query, params in conn.queries if "INSERT" in query}
+    assert not any("INSERT" in query and "SELECT" in query for query, _ in conn.queries)
+    assert inserts['analytics_company_stats'] == [(1, 'Acme', 4, 1)]
+    assert inserts['analytics_status_stats'] == [('applied', 3), ('selected', 1)]
+    assert conn.commits == 1
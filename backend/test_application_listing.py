@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from app import app
+import routes.student as student_routes
+import routes.tpo as tpo_routes
+from routes.tpo import encode_cursor, decode_cursor, application_joins
+from utils.application_totals import application_totals
+from test_drive_counters import respond
+from benchmarks.recording_db import RecordingConnection
+
+
+def test_apply_drops_cached_totals():
+    application_totals.set(('', '', ''), 41)
+    with mock.patch.object(student_routes, 'get_db_connection', return_value=RecordingConnection(respond)), \
+            mock.patch.object(student_routes, 'get_jwt_identity', return_value={'user_id': 7, 'role': 'student'}), \
+            mock.patch.object(student_routes, 'drive_counters_ready', return_value=False), \
+            mock.patch.object(student_routes, 'insert_notification'), \
+            mock.patch.object(student_routes, 'queue_email'):
+        with app.test_request_context(method='POST'):
+            _, status = student_routes.apply_to_drive.__wrapped__(5)
+    assert status == 201
+    assert application_totals.get(('', '', '')) is None
+
+
+TPO = {'user_id': 1, 'role': 'tpo'}
+START = datetime(2024, 3, 1, 12, 0)
+
+
+def listing_rows(count):
+    """Applications newest first, as the ORDER BY returns them"""
+    return [{'id': 100 - i, 'applied_at': START - timedelta(minutes=i), 'cgpa': None} for i in range(count)]
+
+
+def list_applications(rows, total=7, **args):
+    def respond(query, params):
+        if "COUNT(*)" in query:
+            return [{'total': total}]
+        return rows[:params[-1]]
+
+    conn = RecordingConnection(respond)
+    with mock.patch.object(tpo_routes, 'get_db_connection', return_value=conn), \
+            mock.patch.object(tpo_routes, 'get_jwt_identity', return_value=TPO):
+        with app.test_request_context(query_string=args):
+            response, status = tpo_routes.get_applications.__wrapped__()
+    return response.get_json(), status, conn.queries
+
+
+def setup_function():
+    application_totals.clear()
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(START, 42)) == (START, 42)
+
+
+def test_malformed_cursor_is_rejected():
+    body, status, queries = list_applications([], cursor='not-a-cursor')
+    assert status == 400 and body['error'] == 'Invalid cursor' and not queries
+
+
+def test_joins_pull_in_the_aliases_they_depend_on():
+    joins = application_joins({'c', 'd'})
+    assert all(table in joins for table in ('students s', 'departments d', 'placement_drives pd', 'companies c'))
+    assert application_joins({'pd'}).strip() == "JOIN placement_drives pd ON a.drive_id = pd.id"
+    assert application_joins(set()) == ""
+
+
+def test_fields_projection_selects_only_what_was_asked():
+    body, status, queries = list_applications(listing_rows(1), fields='company_name,status')
+    assert status == 200
+    select = queries[0][0]
+    assert "SELECT a.id, a.applied_at, c.name as company_name, a.status" in select
+    assert "JOIN placement_drives pd" in select and "students s" not in select
+
+    body, status, _ = list_applications([], fields='status,password_hash')
+    assert status == 400 and 'password_hash' in body['error']
+
+
+def test_pages_follow_the_cursor_and_stop_on_the_last_page():
+    rows = listing_rows(5)
+    body, status, queries = list_applications(rows, limit=3)
+    assert status == 200 and body['has_more'] and body['count'] == 3
+    assert queries[0][1][-1] == 4   # one extra row says whether another page exists
+    assert decode_cursor(body['next_cursor']) == (rows[2]['applied_at'], rows[2]['id'])
+
+    body, status, queries = list_applications(rows[3:], limit=3, cursor=body['next_cursor'])
+    assert status == 200 and body['count'] == 2
+    assert not body['has_more'] and body['next_cursor'] is None
+    assert queries[0][1][:3] == (rows[2]['applied_at'], rows[2]['applied_at'], rows[2]['id'])
+
+
+def test_total_is_counted_once_per_filter_set():
+    first, _, queries = list_applications(listing_rows(2), total=7, status='applied')
+    assert first['total'] == 7 and any("COUNT(*)" in q for q, _ in queries)
+
+    second, _, queries = list_applications(listing_rows(2), total=99, status='applied')
+    assert second['total'] == 7 and not any("COUNT(*)" in q for q, _ in queries)
+
+    other, _, _ = list_applications(listing_rows(2), total=3, status='selected')
+    assert other['total'] == 3
@@ -0,0 +1,88 @@
+import asyncio
+import json
+from unittest import mock
+
+import flask_jwt_extended.view_decorators as view_decorators
+
+import asgi
+import routes.student as student_routes
+from utils.notification_hub import get_notification_hub
+
+
+def scope(path, method='GET'):
+    return {'type': 'http', 'method': method, 'path': path, 'raw_path': path.encode(), 'root_path': '',
+            'query_string': b'', 'headers': [], 'http_version': '1.1', 'scheme': 'http',
+            'server': ('testserver', 80), 'client': ('127.0.0.1', 5000)}
+
+
+class Client:
+    """Plays the server side of one ASGI request"""
+
+    def __init__(self):
+        self.messages = []
+        self.received = asyncio.Event()
+        self.gone = asyncio.Event()
+        self._requested = False
+
+    async def receive(self):
+        if not self._requested:
+            self._requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.gone.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        self.messages.append(message)
+        self.received.set()
+
+    def body(self):
+        return b''.join(m.get('body', b'') for m in self.messages if m['type'] == 'http.response.body').decode()
+
+    async def wait_for(self, text):
+        while text not in self.body():
+            self.received.clear()
+            await asyncio.wait_for(self.received.wait(), 5)
+
+
+def identity(role):
+    return mock.patch.object(student_routes, 'get_jwt_identity', return_value={'user_id': 41, 'role': role})
+
+
+def test_stream_runs_on_the_event_loop_until_the_client_leaves():
+    hub = get_notification_hub()
+    hub.set_unread(41, 3)
+    client = Client()
+
+    async def scenario():
+        task = asyncio.ensure_future(asgi.application(scope(asgi.STREAM_PATH), client.receive, client.send))
+        await client.wait_for('event: ready')
+        assert hub.stats()['subscribers'] == 1
+        # Published from another thread, as request threads do
+        await asyncio.get_running_loop().run_in_executor(
+            None, hub.publish, 41, 'notification', {'title': 'Shortlisted'})
+        await client.wait_for('Shortlisted')
+        client.gone.set()
+        await asyncio.wait_for(task, 5)
+
+    with mock.patch.object(view_decorators, 'verify_jwt_in_request'), identity('student'):
+        asyncio.run(scenario())
+
+    start = client.messages[0]
+    assert start['status'] == 200 and (b'content-type', b'text/event-stream; charset=utf-8') in start['headers']
+    assert '"unread_count": 3' in client.body()
+    assert hub.stats()['subscribers'] == 0
+
+
+def test_refused_stream_is_an_ordinary_response():
+    client = Client()
+    with mock.patch.object(view_decorators, 'verify_jwt_in_request'), identity('tpo'):
+        asyncio.run(asgi.application(scope(asgi.STREAM_PATH), client.receive, client.send))
+    assert client.messages[0]['status'] == 403
+    assert json.loads(client.body()) == {'error': 'Access denied'}
+
+
+def test_other_routes_go_through_the_wsgi_bridge():
+    client = Client()
+    asyncio.run(asgi.application(scope('/api/no-such-route'), client.receive, client.send))
+    assert client.messages[0]['status'] == 404
+    assert json.loads(client.body()) == {'error': 'Not found'}
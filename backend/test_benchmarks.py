@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from app import app
+from benchmarks import dataset, suite
+from benchmarks.sqlite_db import translate
+from utils.drive_counters import RECONCILE_QUERY
+
+ANCHOR = datetime(2026, 1, 15)
+
+
+def test_dataset_is_deterministic_for_a_seed():
+    first = dataset.generate(seed=7, scale='tiny', anchor=ANCHOR)
+    assert first == dataset.generate(seed=7, scale='tiny', anchor=ANCHOR)
+    assert first != dataset.generate(seed=8, scale='tiny', anchor=ANCHOR)
+    assert len(first['students']) == dataset.SCALES['tiny']['students']
+    assert first['users'][0]['role'] == 'tpo'
+
+
+def test_dataset_applications_are_consistent():
+    data = dataset.generate(seed=7, scale='tiny', anchor=ANCHOR)
+    students = {s['id']: s for s in data['students']}
+    drives = {d['id']: d for d in data['placement_drives']}
+    pairs = set()
+    for application in data['applications']:
+        student, drive = students[application['student_id']], drives[application['drive_id']]
+        assert student['is_approved'] and student['cgpa'] >= drive['min_cgpa']
+        assert 0 <= application['current_round'] <= drive['total_rounds']
+        if application['status'] == 'selected':
+            assert application['current_round'] == drive['total_rounds']
+        pairs.add((student['id'], drive['id']))
+    assert len(pairs) == len(data['applications'])
+
+
+def test_translate_rewrites_mysql_constructs():
+    assert translate("SELECT id FROM t WHERE id = %s FOR UPDATE SKIP LOCKED") == "SELECT id FROM t WHERE id = ?"
+    assert translate("INSERT IGNORE INTO t (a) SELECT a FROM u") == "INSERT OR IGNORE INTO t (a) SELECT a FROM u"
+    assert translate("INSERT INTO t (a, n) VALUES (%s, %s) ON DUPLICATE KEY UPDATE n = n + VALUES(n)") == \
+        "INSERT INTO t (a, n) VALUES (?, ?) ON CONFLICT DO UPDATE SET n = n + excluded.n"
+    assert translate("UPDATE t SET n = GREATEST(n - %s, 0)") == "UPDATE t SET n = MAX(n - ?, 0)"
+    assert "JOIN" not in translate(RECONCILE_QUERY)
+    assert "pragma_table_info" in translate(
+        "SELECT COUNT(*) as found FROM information_schema.COLUMNS WHERE TABLE_NAME = %s AND COLUMN_NAME = %s")
+
+
+def test_every_scenario_runs_against_the_sqlite_stand_in(tmp_path):
+    data, teardown = suite.prepare('sqlite', 'tiny', 7, str(tmp_path))
+    try:
+        for name in suite.SCENARIOS:
+            rows, _ = suite.run_scenario(app, name, data, 7, concurrency=2, duration=1)
+            assert rows, name
+            for endpoint, row in rows.items():
+                assert row['errors'] == 0, (name, endpoint)
+                assert row['p50_ms'] <= row['p99_ms']
+        assert rows['GET /api/tpo/analytics?fresh=1']['queries_per_request'] == 7
+    finally:
+        teardown()
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from utils.db import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.open = True
+        self.server_status = 0
+        self.pings = 0
+        self.rollbacks = 0
+        self.dead = False
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if self.dead:
+            raise ConnectionError("gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.open = False
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    kwargs.setdefault('min_size', 0)
+    kwargs.setdefault('max_size', 2)
+    kwargs.setdefault('timeout', 0.2)
+    return ConnectionPool(connect, **kwargs), created
+
+
+def test_connections_are_reused():
+    pool, created = make_pool()
+    for _ in range(5):
+        conn = pool.acquire()
+        conn.close()
+    assert len(created) == 1
+    assert pool.stats()['idle'] == 1
+    assert pool.stats()['checked_out'] == 0
+
+
+def test_min_size_warms_pool():
+    pool, created = make_pool(min_size=2, max_size=4)
+    assert len(created) == 2
+    assert pool.stats()['idle'] == 2
+
+
+def test_exhausted_pool_times_out():
+    pool, _ = make_pool(max_size=1, timeout=0.05)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    stats = pool.stats()
+    assert stats['waits'] == 1
+    assert stats['timeouts'] == 1
+    assert stats['wait_time'] > 0
+    held.close()
+
+
+def test_waiter_gets_released_connection():
+    pool, created = make_pool(max_size=1, timeout=2)
+    held = pool.acquire()
+    got = []
+
+    def worker():
+        conn = pool.acquire()
+        got.append(conn.raw)
+        conn.close()
+
+    t = threading.Thread(target=worker)
+    t.start()
+    time.sleep(0.05)
+    held.close()
+    t.join()
+    assert got == [created[0]]
+    assert pool.stats()['waits'] == 1
+
+
+def test_recycles_after_max_uses():
+    pool, created = make_pool(max_uses=2)
+    for _ in range(4):
+        pool.acquire().close()
+    assert len(created) == 2
+    assert not created[0].open
+    assert pool.stats()['recycled'] == 2
+
+
+def test_dead_connection_is_discarded_on_checkout():
+    pool, created = make_pool(ping_interval=0)
+    pool.acquire().close()
+    created[0].dead = True
+    conn = pool.acquire()
+    assert conn.raw is created[1]
+    assert pool.stats()['discarded'] == 1
+    conn.close()
+
+
+def test_open_transaction_rolled_back_on_release():
+    pool, created = make_pool()
+    conn = pool.acquire()
+    conn.raw.server_status = 1  # SERVER_STATUS_IN_TRANS
+    conn.close()
+    assert created[0].rollbacks == 1
+    conn.close()  # double close is a no-op
+    assert pool.stats()['idle'] == 1
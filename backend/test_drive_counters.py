@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from app import app
+import routes.student as student_routes
+import utils.drive_counters as drive_counters
+import utils.schema as schema
+from benchmarks.recording_db import RecordingConnection
+
+STUDENT = {'user_id': 7, 'role': 'student'}
+
+
+def respond(query, params):
+    if "FROM students s" in query:
+        return [{'id': 3, 'user_id': 7, 'is_approved': 1, 'resume_url': 'r.pdf', 'cgpa': 8.0,
+                 'backlogs': 0, 'first_name': 'A', 'last_name': 'B'}]
+    if "FROM placement_drives pd" in query:
+        return [{'id': 5, 'status': 'active', 'application_deadline': datetime.now() + timedelta(days=1),
+                 'min_cgpa': 6.0, 'max_backlogs': None, 'company_name': 'Acme', 'job_role': 'SDE'}]
+    if "SELECT email" in query:
+        return [{'email': 'a@b.c'}]
+    return []
+
+
+def apply(applied):
+    conn = RecordingConnection(respond)
+    with mock.patch.object(schema, '_applied', applied), \
+            mock.patch.object(drive_counters, 'ensure', side_effect=AssertionError('migrated in a request')), \
+            mock.patch.object(student_routes, 'get_db_connection', return_value=conn), \
+            mock.patch.object(student_routes, 'get_jwt_identity', return_value=STUDENT), \
+            mock.patch.object(student_routes, 'insert_notification'), \
+            mock.patch.object(student_routes, 'queue_email'):
+        with app.test_request_context(method='POST'):
+            response, status = student_routes.apply_to_drive.__wrapped__(5)
+    assert status == 201, response.get_json()
+    return [query for query, _ in conn.queries]
+
+
+def test_apply_skips_the_counter_until_startup_has_added_it():
+    queries = apply(set())
+    assert not any('application_count' in q for q in queries)
+
+
+def test_apply_bumps_the_counter_once_ready():
+    queries = apply({'drive_counters'})
+    assert any('application_count = application_count + %s' in q for q in queries)
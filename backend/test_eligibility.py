@@ -0,0 +1,39 @@
+from utils.eligibility import evaluate, evaluate_drive, evaluate_student, eligible_counts
+
+
+def student(id, cgpa=8.0, backlogs=0, approved=True, resume='/uploads/r.pdf'):
+    return {'id': id, 'user_id': id, 'is_approved': approved, 'resume_url': resume,
+            'cgpa': cgpa, 'backlogs': backlogs}
+
+
+DRIVES = [{'id': 1, 'min_cgpa': 7.0, 'max_backlogs': 0},
+          {'id': 2, 'min_cgpa': 8.5, 'max_backlogs': 2}]
+
+
+def test_evaluate_reports_every_issue():
+    result = evaluate(student(1, cgpa=6.0, backlogs=1, approved=False, resume=None), DRIVES[0])
+    assert result['eligible'] is False
+    codes = [i['code'] for i in result['issues']]
+    assert codes == ['not_approved', 'no_resume', 'cgpa_below_min', 'too_many_backlogs']
+
+
+def test_missing_cgpa_is_a_profile_issue_only():
+    result = evaluate(student(1, cgpa=None), DRIVES[0])
+    assert [i['code'] for i in result['issues']] == ['no_cgpa']
+
+
+def test_student_and_drive_views_agree():
+    students = [student(1), student(2, cgpa=9.0, backlogs=1), student(3, approved=False),
+                student(4, cgpa=None)]
+    per_student = {s['id']: {r['drive_id']: r['eligible'] for r in evaluate_student(s, DRIVES)}
+                   for s in students}
+    for drive in DRIVES:
+        eligible = {r['student_id'] for r in evaluate_drive(drive, students)}
+        assert eligible == {sid for sid, by_drive in per_student.items() if by_drive[drive['id']]}
+    assert eligible_counts(DRIVES, students) == {1: 1, 2: 1}
+
+
+def test_evaluate_drive_can_include_reasons():
+    results = evaluate_drive(DRIVES[0], [student(1), student(2, cgpa=6.5)], include_ineligible=True)
+    assert [r['eligible'] for r in results] == [True, False]
+    assert results[1]['issues'][0]['code'] == 'cgpa_below_min'
@@ -0,0 +1,111 @@
+from utils.email_queue import EmailQueue
+
+
+class StubTransport:
+    """Records deliveries; fails the first ``failures`` calls"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+        self.calls = 0
+
+    def __call__(self, to_email, subject, html):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("provider unavailable")
+        self.sent.append((to_email, subject))
+        return True
+
+
+def make_queue(tmp_path, transport, **kwargs):
+    kwargs.setdefault('base_delay', 0)
+    return EmailQueue(str(tmp_path / "queue.db"), transport, **kwargs)
+
+
+def test_enqueued_email_is_delivered(tmp_path):
+    transport = StubTransport()
+    queue = make_queue(tmp_path, transport)
+    assert queue.enqueue("a@x.edu", "Hi", "<p>hi</p>") is not None
+    assert queue.depth() == 1
+    assert queue.process_due() == 1
+    assert transport.sent == [("a@x.edu", "Hi")]
+    assert queue.depth() == 0
+    assert queue.stats()['sent'] == 1
+
+
+def test_idempotency_key_suppresses_duplicates(tmp_path):
+    transport = StubTransport()
+    queue = make_queue(tmp_path, transport)
+    assert queue.enqueue("a@x.edu", "Hi", "", idempotency_key="7:applied:1")
+    assert queue.enqueue("a@x.edu", "Hi", "", idempotency_key="7:applied:1") is None
+    queue.process_due()
+    # Still suppressed once the original has been sent
+    assert queue.enqueue("a@x.edu", "Hi", "", idempotency_key="7:applied:1") is None
+    assert len(transport.sent) == 1
+
+
+def test_failed_send_is_retried_with_backoff(tmp_path):
+    transport = StubTransport(failures=1)
+    queue = make_queue(tmp_path, transport, base_delay=60)
+    queue.enqueue("a@x.edu", "Hi", "")
+    queue.process_due()
+    assert transport.sent == []
+    # Backoff pushes the retry into the future
+    assert queue.process_due() == 0
+    assert queue.depth() == 1
+    queue._conn().execute("UPDATE email_outbox SET next_attempt_at = 0")
+    queue.process_due()
+    assert transport.sent == [("a@x.edu", "Hi")]
+
+
+def test_exhausted_retries_go_to_dead_letters(tmp_path):
+    transport = StubTransport(failures=10)
+    queue = make_queue(tmp_path, transport, max_attempts=3)
+    queue.enqueue("a@x.edu", "Hi", "")
+    for _ in range(3):
+        queue.process_due()
+    stats = queue.stats()
+    assert stats['depth'] == 0
+    assert stats['dead_letters'] == 1
+    assert stats['failed_attempts'] == 3
+
+
+def test_workers_drain_queue_in_background(tmp_path):
+    transport = StubTransport()
+    queue = make_queue(tmp_path, transport, workers=3, poll_interval=0.05)
+    queue.start()
+    for i in range(20):
+        queue.enqueue(f"s{i}@x.edu", "Hi", "", idempotency_key=f"{i}:welcome")
+    queue.stop(drain=True, timeout=5)
+    assert len(transport.sent) == 20
+    assert queue.depth() == 0
+
+
+def test_jobs_left_sending_are_recovered_once_their_lease_expires(tmp_path):
+    transport = StubTransport()
+    queue = make_queue(tmp_path, transport, lease=60)
+    queue.enqueue("a@x.edu", "Hi", "")
+    queue._claim()  # simulate a crash after claiming
+    # Another worker process starting up leaves the live claim alone
+    other = make_queue(tmp_path, transport, lease=60)
+    assert other.process_due() == 0 and transport.sent == []
+
+    queue._conn().execute("UPDATE email_outbox SET claimed_at = claimed_at - 61")
+    assert other.process_due() == 1
+    assert transport.sent == [("a@x.edu", "Hi")]
+
+
+def test_enqueue_many_skips_duplicates_and_sent_keys(tmp_path):
+    transport = StubTransport()
+    queue = make_queue(tmp_path, transport)
+    queue.enqueue("a@x.edu", "Hi", "", idempotency_key="1:sent")
+    queue.process_due()
+    queued = queue.enqueue_many([
+        ("a@x.edu", "Hi", "", "1:sent"),
+        ("b@x.edu", "Hi", "", "2:new"),
+        ("b@x.edu", "Hi", "", "2:new"),
+        ("c@x.edu", "Hi", "", None),
+    ])
+    assert queued == 2
+    assert queue.depth() == 2
+    assert queue.enqueue_many([]) == 0
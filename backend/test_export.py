@@ -0,0 +1,91 @@
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+from openpyxl import load_workbook
+
+import routes.tpo as tpo_routes
+from app import app
+from utils.export import csv_chunks, xlsx_chunks, iter_rows, stream_export
+
+COLUMNS = [('ID', 'id'), ('Name', 'name'), ('CGPA', 'cgpa'), ('Applied', 'applied_at')]
+
+
+def rows(count):
+    return ({'id': i, 'name': f'Student {i}', 'cgpa': Decimal('8.50'),
+             'applied_at': datetime(2024, 1, 1)} for i in range(1, count + 1))
+
+
+class Cursor:
+    def __init__(self, count):
+        self.source = rows(count)
+        self.closed = False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchmany(self, size):
+        return [row for _, row in zip(range(size), self.source)]
+
+    def close(self):
+        self.closed = True
+
+
+class Connection:
+    def __init__(self, count):
+        self.last_cursor = Cursor(count)
+        self.closes = 0
+
+    def cursor(self, *args):
+        return self.last_cursor
+
+    def close(self):
+        self.closes += 1
+
+
+def test_iter_rows_reads_in_batches():
+    assert [r['id'] for r in iter_rows(Cursor(5), batch_size=2)] == [1, 2, 3, 4, 5]
+
+
+def test_csv_is_chunked_with_header_and_bom():
+    chunks = list(csv_chunks(rows(1200), COLUMNS, rows_per_chunk=500))
+    assert len(chunks) == 3
+    text = b''.join(chunks).decode('utf-8')
+    assert text.startswith('\ufeffID,Name,CGPA,Applied')
+    parsed = list(csv.reader(io.StringIO(text.lstrip('\ufeff'))))
+    assert len(parsed) == 1201 and parsed[-1][:3] == ['1200', 'Student 1200', '8.50']
+
+
+def test_xlsx_round_trips_through_openpyxl():
+    data = b''.join(xlsx_chunks(rows(50), COLUMNS, sheet_title='Acme: SDE [2024]'))
+    sheet = load_workbook(io.BytesIO(data)).active
+    assert sheet.title == 'Acme- SDE -2024-'
+    values = list(sheet.iter_rows(values_only=True))
+    assert values[0] == ('ID', 'Name', 'CGPA', 'Applied')
+    assert values[50][:3] == (50, 'Student 50', 8.5)
+
+
+def test_stream_export_releases_connection():
+    conn = Connection(10)
+    response = stream_export(conn, "SELECT 1", (), COLUMNS, 'csv', 'out')
+    assert response.headers['Content-Disposition'] == 'attachment; filename="out.csv"'
+    body = b''.join(response.response)
+    response.close()
+    assert body.count(b'\n') == 11
+    assert conn.last_cursor.closed and conn.closes >= 1
+
+    unread = Connection(10)
+    stream_export(unread, "SELECT 1", (), COLUMNS, 'xlsx', 'out').close()
+    assert unread.closes == 1
+
+
+def test_export_routes_reject_unknown_statuses():
+    with mock.patch.object(tpo_routes, 'get_jwt_identity', return_value={'user_id': 1, 'role': 'tpo'}), \
+            mock.patch.object(tpo_routes, 'get_db_connection') as connect:
+        for view, args in ((tpo_routes.export_drive_applications, (5,)), (tpo_routes.export_applications, ())):
+            with app.test_request_context(query_string={'status': 'x"\r\nSet-Cookie: a=b'}):
+                response, status = view.__wrapped__(*args)
+            assert status == 400 and response.get_json()['error'] == 'Invalid status'
+    connect.assert_not_called()
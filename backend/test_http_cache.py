@@ -0,0 +1,137 @@
+from unittest import mock
+
+from flask import Flask, jsonify
+
+import routes.student as student_routes
+import routes.tpo as tpo_routes
+import utils.db as db
+import utils.http_cache as http_cache
+from app import app as portal
+from benchmarks.recording_db import RecordingConnection
+from utils.application_totals import invalidate_application_totals
+from utils.http_cache import cached_response, bump
+
+app = Flask(__name__)
+calls = []
+
+
+@app.route('/widgets')
+@cached_response('widgets')
+def list_widgets():
+    calls.append('widgets')
+    return jsonify({'widgets': [1, 2, 3]}), 200
+
+
+@app.route('/mine')
+@cached_response('widgets', per_user=True)
+def my_widgets():
+    calls.append('mine')
+    return jsonify({'mine': len(calls)}), 200
+
+
+@app.route('/denied')
+@cached_response('widgets')
+def denied():
+    return jsonify({'error': 'Access denied'}), 403
+
+
+PATHS = {list_widgets: '/widgets', my_widgets: '/mine', denied: '/denied'}
+
+
+def get(view, identity, headers=None, query=''):
+    with mock.patch.object(http_cache, 'get_jwt_identity', return_value=identity):
+        return app.test_client().get(PATHS[view] + query, headers=headers or {})
+
+
+def setup_function():
+    http_cache.clear_http_cache()
+    calls.clear()
+
+
+def test_cached_until_an_entity_is_bumped():
+    tpo = {'user_id': 1, 'role': 'tpo'}
+    first = get(list_widgets, tpo)
+    assert first.status_code == 200 and first.get_json() == {'widgets': [1, 2, 3]}
+    assert get(list_widgets, tpo).get_data() == first.get_data()
+    assert calls == ['widgets']
+
+    bump('widgets')
+    get(list_widgets, tpo)
+    assert calls == ['widgets', 'widgets']
+
+
+def test_conditional_requests_get_304():
+    tpo = {'user_id': 1, 'role': 'tpo'}
+    first = get(list_widgets, tpo)
+    etag = first.headers['ETag']
+    assert not etag.startswith('W/') and 'private' in first.headers['Cache-Control']
+
+    response = get(list_widgets, tpo, {'If-None-Match': etag})
+    assert response.status_code == 304 and response.get_data() == b''
+
+    response = get(list_widgets, tpo, {'If-Modified-Since': first.headers['Last-Modified']})
+    assert response.status_code == 304
+
+    # Rebuilding identical content keeps the same strong tag
+    bump('widgets')
+    assert get(list_widgets, tpo, {'If-None-Match': etag}).status_code == 304
+    assert calls == ['widgets', 'widgets']
+
+
+def test_roles_and_users_do_not_share_entries():
+    get(list_widgets, {'user_id': 1, 'role': 'tpo'})
+    get(list_widgets, {'user_id': 2, 'role': 'student'})
+    assert calls == ['widgets', 'widgets']
+
+    a = get(my_widgets, {'user_id': 3, 'role': 'student'}).get_json()
+    b = get(my_widgets, {'user_id': 4, 'role': 'student'}).get_json()
+    assert a != b
+    assert get(my_widgets, {'user_id': 3, 'role': 'student'}).get_json() == a
+
+
+def test_query_string_is_part_of_the_key():
+    tpo = {'user_id': 1, 'role': 'tpo'}
+    get(list_widgets, tpo, query='?status=active')
+    get(list_widgets, tpo, query='?status=closed')
+    get(list_widgets, tpo, query='?status=active')
+    assert calls == ['widgets', 'widgets']
+
+
+def test_errors_are_not_cached():
+    response = get(denied, {'user_id': 1, 'role': 'student'})
+    assert response.status_code == 403 and 'ETag' not in response.headers
+    assert http_cache.get_http_cache_stats()['student']['size'] == 0
+
+
+def cached_view_calls(module, view, path, identity, rows, connect_module=None):
+    """Call a route's cached view (below the JWT check) three times, with an
+    apply in between the second and third; returns the query count per call"""
+    conn = RecordingConnection(lambda query, params: rows)
+    counts = []
+    with mock.patch.object(connect_module or module, 'get_db_connection', return_value=conn), \
+            mock.patch.object(module, 'get_jwt_identity', return_value=identity), \
+            mock.patch.object(http_cache, 'get_jwt_identity', return_value=identity):
+        for step in range(3):
+            if step == 2:
+                invalidate_application_totals()
+            before = len(conn.queries)
+            with portal.test_request_context(path):
+                response = view.__wrapped__()
+            assert response.status_code == 200
+            counts.append(len(conn.queries) - before)
+    return counts
+
+
+def test_company_listing_is_cached_until_an_application_lands():
+    rows = [{'id': 1, 'name': 'Acme', 'total_drives': 1, 'total_applications': 3}]
+    counts = cached_view_calls(tpo_routes, tpo_routes.get_companies, '/api/tpo/companies',
+                               {'user_id': 1, 'role': 'tpo'}, rows, connect_module=db)
+    assert counts == [1, 0, 1]
+
+
+def test_student_drive_list_is_rebuilt_after_an_apply():
+    rows = [{'id': 5, 'company_name': 'Acme', 'total_applications': 3, 'round_count': 2}]
+    with mock.patch.object(student_routes, 'drive_counters_ready', return_value=True):
+        counts = cached_view_calls(student_routes, student_routes.get_drives, '/api/student/drives',
+                                   {'user_id': 7, 'role': 'student'}, rows)
+    assert counts == [1, 0, 1]
@@ -0,0 +1,79 @@
+from datetime import datetime
+from unittest import mock
+
+import routes.auth as auth
+import utils.last_login as last_login
+from utils.last_login import LastLoginFlusher
+from benchmarks.recording_db import RecordingConnection
+
+
+def principal_row(role, **values):
+    row = {f'{alias}_{column}': None for alias, columns in auth.ROLE_COLUMNS.values() for column in columns}
+    row.update({'id': 1, 'email': 'a@college.edu', 'password_hash': 'x', 'role': role, 'is_active': 1,
+                'department_name': None, 'department_code': None})
+    row.update(values)
+    return row
+
+
+def test_load_principal_picks_the_role_columns():
+    row = principal_row('student', s_id=11, s_user_id=1, s_first_name='Ravi', s_cgpa=8.1,
+                        s_department_id=2, department_name='CSE', department_code='CS')
+    conn = RecordingConnection(lambda query, params: [row])
+    user, role_data = auth.load_principal(conn.cursor(), "u.email = %s", 'a@college.edu')
+
+    assert len(conn.queries) == 1 and "LEFT JOIN students" in conn.queries[0][0]
+    assert user['id'] == 1 and user['role'] == 'student'
+    assert role_data['id'] == 11 and role_data['first_name'] == 'Ravi' and role_data['cgpa'] == 8.1
+    assert role_data['department_name'] == 'CSE' and 'designation' not in role_data
+
+
+def test_load_principal_without_a_role_row_or_user():
+    conn = RecordingConnection(lambda query, params: [principal_row('tpo')])
+    assert auth.load_principal(conn.cursor(), "u.id = %s", 1)[1] == {}
+    conn = RecordingConnection(lambda query, params: [])
+    assert auth.load_principal(conn.cursor(), "u.id = %s", 1) == (None, None)
+
+
+def test_flusher_keeps_the_latest_login_per_user():
+    flusher = LastLoginFlusher(interval=60)
+    flusher.record(2, datetime(2024, 1, 1, 10, 0))
+    flusher.record(1, datetime(2024, 1, 1, 9, 0))
+    flusher.record(2, datetime(2024, 1, 1, 9, 30))
+
+    conn = RecordingConnection(lambda query, params: [])
+    with mock.patch.object(last_login, 'get_db_connection', return_value=conn):
+        assert flusher.run_once() == 2
+        assert flusher.run_once() == 0
+    query, params = conn.queries[0]
+    assert query.count("UNION ALL") == 1
+    assert params == [1, datetime(2024, 1, 1, 9, 0), 2, datetime(2024, 1, 1, 10, 0)]
+    assert conn.commits == 1
+
+
+def test_failed_flush_is_retried():
+    flusher = LastLoginFlusher(interval=60)
+    flusher.record(1, datetime(2024, 1, 1, 9, 0))
+    with mock.patch.object(last_login, 'get_db_connection', return_value=None):
+        assert flusher.run_once() == 0
+    assert flusher.stats()['pending'] == 1
+
+
+def test_flagged_tokens_reach_only_the_password_change_endpoints():
+    assert auth.password_change_allowed({}, 'student.get_profile')
+    assert not auth.password_change_allowed({'must_change_password': True}, 'student.get_profile')
+    assert auth.password_change_allowed({'must_change_password': True}, 'auth.change_password')
+
+
+def test_set_password_redeems_the_token_once():
+    from app import app
+    conn = RecordingConnection(lambda query, params: [{'user_id': 4}] if "FROM password_set_tokens" in query else [])
+    with mock.patch.object(auth, 'account_setup_ready', return_value=True), \
+            mock.patch.object(auth, 'hash_password', return_value='hashed'), \
+            mock.patch.object(auth, 'get_db_connection', return_value=conn):
+        with app.test_request_context(method='POST', json={'token': 't0k', 'password': 'longenough'}):
+            response, status = auth.set_password()
+    assert status == 200, response.get_json()
+    queries = [query for query, _ in conn.queries]
+    assert any("SET used_at" in q for q in queries)
+    assert conn.queries[-1][1] == ('hashed', 4) and "must_change_password = FALSE" in queries[-1]
+    assert conn.commits == 1
@@ -0,0 +1,97 @@
+from datetime import datetime
+from unittest import mock
+
+from app import app
+import routes.student as student_routes
+import utils.schema as schema
+from utils.notification_archive import pack, unpack, archive_batch, archived_page
+
+
+def notification(id, user_id=1, created_at=datetime(2024, 3, 5, 10, 0)):
+    return {'id': id, 'user_id': user_id, 'title': 'Round Update', 'message': f'Message {id}',
+            'type': 'info', 'related_entity_type': 'application', 'related_entity_id': id,
+            'created_at': created_at}
+
+
+class Cursor:
+    """Answers queries by matching a fragment of the SQL"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.queries = []
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.queries.append((query, params))
+        self.rows = next((rows(params) if callable(rows) else rows
+                          for fragment, rows in self.answers if fragment in query), [])
+
+    def executemany(self, query, seq):
+        self.queries.append((query, list(seq)))
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+def test_pack_round_trip_is_newest_first():
+    entries = [{'id': 1}, {'id': 3}, {'id': 2}]
+    assert [e['id'] for e in unpack(pack(entries))] == [3, 2, 1]
+
+
+def test_archive_batch_groups_by_user_and_month_and_merges():
+    rows = [notification(1), notification(2, created_at=datetime(2024, 4, 1)), notification(3, user_id=2)]
+    existing = {'user_id': 1, 'month': '2024-03', 'payload': pack([{'id': 0, 'title': 'Old'}])}
+    cursor = Cursor([("FROM notifications", rows), ("FROM notification_archive", [existing])])
+
+    assert archive_batch(cursor, datetime(2024, 6, 1), 100) == 3
+
+    chunks = {(c[0], c[1]): c for c in cursor.queries[2][1]}
+    assert sorted(chunks) == [(1, '2024-03'), (1, '2024-04'), (2, '2024-03')]
+    user, month, first_id, last_id, count, payload, _ = chunks[(1, '2024-03')]
+    assert (first_id, last_id, count) == (0, 1, 2)
+    assert [e['id'] for e in unpack(payload)] == [1, 0]
+    assert unpack(payload)[0]['created_at'] == '2024-03-05T10:00:00'
+    assert cursor.queries[3][0].startswith("DELETE FROM notifications") and cursor.queries[3][1] == [1, 2, 3]
+
+
+def test_archive_batch_with_nothing_due():
+    cursor = Cursor([])
+    assert archive_batch(cursor, datetime(2024, 6, 1), 100) == 0
+    assert len(cursor.queries) == 1
+
+
+def test_archived_page_walks_overlapping_chunks():
+    payloads = {
+        '2024-04': pack([{'id': i} for i in (30, 28, 26, 9)]),
+        '2024-03': pack([{'id': i} for i in (27, 25, 8, 7)]),
+        '2024-01': pack([{'id': i} for i in (3, 2, 1)]),
+    }
+    chunks = [{'month': '2024-04', 'last_id': 30}, {'month': '2024-03', 'last_id': 27},
+              {'month': '2024-01', 'last_id': 3}]
+    cursor = Cursor([
+        ("SELECT month, last_id", lambda params: chunks),
+        ("SELECT payload", lambda params: [{'payload': payloads[params[1]]}]),
+    ])
+
+    page, next_before_id = archived_page(cursor, 1, limit=4)
+    assert [n['id'] for n in page] == [30, 28, 27, 26] and next_before_id == 26
+    # The January chunk could not beat id 26, so its payload was never read
+    assert sum("SELECT payload" in q for q, _ in cursor.queries) == 2
+    assert all(n['is_read'] == 1 for n in page)
+
+    page, next_before_id = archived_page(cursor, 1, before_id=8, limit=4)
+    assert [n['id'] for n in page] == [7, 3, 2, 1] and next_before_id == 1
+
+
+def test_archive_endpoint_is_empty_until_startup_creates_the_table():
+    with mock.patch.object(schema, '_applied', set()), \
+            mock.patch.object(schema, 'ensure', side_effect=AssertionError('migrated in a request')), \
+            mock.patch.object(student_routes, 'get_db_connection') as connect, \
+            mock.patch.object(student_routes, 'get_jwt_identity', return_value={'user_id': 7, 'role': 'student'}):
+        with app.test_request_context('/api/student/notifications/archive'):
+            response, status = student_routes.get_archived_notifications.__wrapped__()
+    assert status == 200 and response.get_json() == {'notifications': [], 'next_before_id': None}
+    connect.assert_not_called()
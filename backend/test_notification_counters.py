@@ -0,0 +1,60 @@
+from unittest import mock
+
+import utils.notification_counters as counters
+import utils.notifications as notifications
+
+
+class Cursor:
+    def __init__(self, row=None):
+        self.row = row
+        self.queries = []
+
+    def execute(self, query, params=None):
+        self.queries.append((query, params))
+
+    def executemany(self, query, seq):
+        self.queries.append((query, list(seq)))
+
+    def fetchone(self):
+        return self.row
+
+
+def test_increment_aggregates_per_user_in_order():
+    cursor = Cursor()
+    counters.increment_unread(cursor, [9, 3, 9, 9, 3, 5])
+    query, rows = cursor.queries[0]
+    assert "ON DUPLICATE KEY UPDATE" in query
+    assert rows == [(3, 2), (5, 1), (9, 3)]
+    counters.increment_unread(cursor, [])
+    assert len(cursor.queries) == 1
+
+
+def test_decrement_skips_when_nothing_changed():
+    cursor = Cursor()
+    counters.decrement_unread(cursor, 4, 0)
+    counters.decrement_unread(cursor, 4, 2)
+    assert cursor.queries == [(mock.ANY, (2, 4))]
+    assert "GREATEST" in cursor.queries[0][0]
+
+
+def test_unread_count_reads_counter_or_falls_back():
+    with mock.patch.object(counters, 'notification_counters_ready', return_value=True):
+        cursor = Cursor({'unread_count': 6})
+        assert counters.get_unread_count(cursor, 1) == 6
+        assert "FROM notification_counters" in cursor.queries[0][0]
+        assert counters.get_unread_count(Cursor(None), 1) == 0
+    with mock.patch.object(counters, 'notification_counters_ready', return_value=False):
+        cursor = Cursor({'unread_count': 2})
+        assert counters.get_unread_count(cursor, 1) == 2
+        assert "COUNT(*)" in cursor.queries[0][0]
+
+
+def test_insert_notifications_counts_in_the_same_transaction():
+    cursor = Cursor()
+    with mock.patch.object(notifications, 'notification_counters_ready', return_value=True):
+        notifications.insert_notifications(cursor, [
+            (1, 'Round Update', 'Round 2', 'info', 'application', 10),
+            (2, 'Round Update', 'Round 2', 'info', 'application', 11),
+        ])
+    assert "INSERT INTO notifications" in cursor.queries[0][0]
+    assert cursor.queries[1][1] == [(1, 1), (2, 1)]
@@ -0,0 +1,119 @@
+import threading
+from collections import deque
+from unittest import mock
+
+from flask import Flask
+
+from app import app
+from benchmarks.recording_db import RecordingConnection
+import routes.student as student_routes
+from utils.notification_hub import NotificationHub, format_sse
+import utils.notifications as notifications
+
+
+def test_publish_wakes_only_that_users_subscribers():
+    hub = NotificationHub()
+    alice, bob = hub.subscribe(1), hub.subscribe(2)
+    received = []
+    waiter = threading.Thread(target=lambda: received.extend(alice.wait(5)))
+    waiter.start()
+    hub.publish(1, 'notification', {'title': 'Shortlisted'})
+    waiter.join(5)
+    assert [e['data']['title'] for e in received] == ['Shortlisted']
+    assert bob.wait(0) is None
+    hub.unsubscribe(alice)
+    hub.unsubscribe(bob)
+    assert hub.stats()['subscribers'] == 0
+
+
+def test_unread_counter_follows_events_once_seeded():
+    hub = NotificationHub()
+    hub.publish(1, 'notification', {}, unread_delta=1)
+    assert hub.unread(1) is None
+    hub.set_unread(1, 4)
+    sub = hub.subscribe(1)
+    hub.publish_many([(1, 'notification', {}, 1), (1, 'read', {}, -2)])
+    assert [e['data']['unread_count'] for e in sub.wait(0)] == [5, 3]
+
+
+def test_reconnect_replays_missed_events_or_resets():
+    hub = NotificationHub(replay=3)
+    first = hub.subscribe(1)
+    hub.publish(1, 'notification', {'n': 1})
+    last_seen = first.wait(0)[-1]['id']
+    hub.unsubscribe(first)
+
+    hub.publish(1, 'notification', {'n': 2})
+    hub.publish(1, 'notification', {'n': 3})
+    resumed = hub.subscribe(1, last_seen)
+    assert [e['data']['n'] for e in resumed.wait(0)] == [2, 3]
+    assert not resumed.reset
+
+    hub.publish(1, 'notification', {'n': 4})
+    hub.publish(1, 'notification', {'n': 5})
+    assert hub.subscribe(1, last_seen).reset            # n=2 fell out of the buffer
+    assert hub.subscribe(2, last_seen).events == deque()
+    assert hub.subscribe(1, hub.first_id - 10).reset     # id from an earlier process
+
+
+def test_slow_subscriber_is_reset_on_overflow():
+    hub = NotificationHub(queue_size=2)
+    sub = hub.subscribe(1)
+    for i in range(3):
+        hub.publish(1, 'notification', {})
+    assert sub.reset
+
+
+def test_stream_frames():
+    hub = notifications.get_notification_hub()
+    sub = hub.subscribe(99)
+    hub.publish(99, 'notification', {'title': 'Hi'})
+    frames = list(notifications.stream_events(sub, 2, heartbeat=0.01, max_age=0.05))
+    assert frames[0].startswith('retry:')
+    assert frames[1] == 'event: ready\ndata: {"unread_count": 2, "reset": false}\n\n'
+    assert frames[2].startswith('id: ') and '"title": "Hi"' in frames[2]
+    assert ': keepalive\n\n' in frames
+    assert hub.stats()['subscribers'] == 0
+    assert format_sse({'id': None, 'event': 'x', 'data': {}}) == 'event: x\ndata: {}\n\n'
+
+
+class Cursor:
+    def __init__(self):
+        self.batches = []
+
+    def executemany(self, query, rows):
+        self.batches.append(list(rows))
+
+
+def test_inserted_notifications_publish_after_commit():
+    hub = notifications.get_notification_hub()
+    sub = hub.subscribe(7)
+    cursor = Cursor()
+    with Flask(__name__).test_request_context():
+        notifications.insert_notification(cursor, 7, 'Approved', 'You can apply now', 'success')
+        assert sub.wait(0) is None
+        assert notifications.publish_pending() == 1
+        assert notifications.publish_pending() == 0
+    event, = sub.wait(0)
+    assert event['data']['title'] == 'Approved' and event['data']['type'] == 'success'
+    assert cursor.batches == [[(7, 'Approved', 'You can apply now', 'success', None, None)]]
+    hub.unsubscribe(sub)
+
+
+def test_mark_all_read_decrements_the_cached_count_by_rows_changed():
+    hub = NotificationHub()
+    hub.set_unread(7, 5)
+    sub = hub.subscribe(7)
+    # Three rows were unread when the UPDATE ran; two arrived after it
+    conn = RecordingConnection(lambda query, params: [{}] * 3 if query.lstrip().startswith("UPDATE") else [])
+    with mock.patch.object(student_routes, 'get_db_connection', return_value=conn), \
+            mock.patch.object(student_routes, 'get_notification_hub', return_value=hub), \
+            mock.patch.object(student_routes, 'notification_counters_ready', return_value=False), \
+            mock.patch.object(student_routes, 'get_jwt_identity', return_value={'user_id': 7, 'role': 'student'}):
+        with app.test_request_context('/api/student/notifications/read-all', method='PUT'):
+            _, status = student_routes.mark_all_read.__wrapped__()
+    assert status == 200 and conn.commits == 1
+    event, = sub.wait(0)
+    assert event['data'] == {'all': True, 'unread_count': 2}
+    assert hub.unread(7) == 2
+    hub.unsubscribe(sub)
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from app import app
+import routes.student as student_routes
+import utils.notifications as notifications
+import utils.schema as schema
+from benchmarks.recording_db import RecordingConnection
+
+STUDENT = {'user_id': 7, 'role': 'student'}
+
+
+def responder(stored, unread=2):
+    def respond(query, params):
+        if "MAX(id)" in query:
+            return [{'latest_id': max(stored) if stored else None, 'unread_count': unread}]
+        if "FROM notifications" in query:
+            user_id, *bounds, limit = params
+            if "id > %s" in query:
+                ids = sorted(i for i in stored if i > bounds[0])
+            else:
+                ids = sorted((i for i in stored if not bounds or i < bounds[0]), reverse=True)
+            return [{'id': i, 'title': f'N{i}', 'is_read': 0} for i in ids[:limit]]
+        return []
+    return respond
+
+
+def get(stored, query_string='', headers=None):
+    conn = RecordingConnection(responder(stored))
+    with mock.patch.object(student_routes, 'get_db_connection', return_value=conn), \
+            mock.patch.object(student_routes, 'get_jwt_identity', return_value=STUDENT), \
+            mock.patch.object(schema, 'ensure', side_effect=AssertionError('migrated in a request')), \
+            mock.patch.object(notifications, 'notification_counters_ready', return_value=True):
+        with app.test_request_context(f'/api/student/notifications{query_string}', headers=headers or {}):
+            response = student_routes.get_notifications.__wrapped__()
+    return response, conn.queries
+
+
+def test_first_page_and_keyset_continuation():
+    stored = list(range(1, 26))
+    response, _ = get(stored, '?limit=10')
+    body = response.get_json()
+    assert [n['id'] for n in body['notifications']] == list(range(25, 15, -1))
+    assert body['has_more'] and body['next_before_id'] == 16 and body['latest_id'] == 25
+
+    body = get(stored, '?limit=10&before_id=6')[0].get_json()
+    assert [n['id'] for n in body['notifications']] == [5, 4, 3, 2, 1]
+    assert not body['has_more'] and body['next_before_id'] is None
+
+
+def test_delta_returns_only_newer_newest_first():
+    body = get(list(range(1, 31)), '?after_id=24&limit=3')[0].get_json()
+    assert [n['id'] for n in body['notifications']] == [27, 26, 25]
+    assert body['has_more'] and body['next_after_id'] == 27
+
+
+def test_delta_with_nothing_new_skips_the_page_query():
+    response, queries = get([1, 2, 3], '?after_id=3')
+    body = response.get_json()
+    assert body['notifications'] == [] and body['next_after_id'] == 3 and body['unread_count'] == 2
+    assert len(queries) == 1
+
+
+def test_unchanged_etag_is_answered_304_after_the_probe():
+    response, _ = get([1, 2, 3], '?after_id=2')
+    etag = response.headers['ETag']
+    assert etag.startswith('W/') and 'no-cache' in response.headers['Cache-Control']
+
+    response, queries = get([1, 2, 3], '?after_id=2', {'If-None-Match': etag})
+    assert response.status_code == 304 and response.get_data() == b''
+    assert len(queries) == 1
+
+    # A new notification changes the tag
+    response, _ = get([1, 2, 3, 4], '?after_id=2', {'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+
+
+def test_before_and_after_together_is_rejected():
+    response = get([1], '?after_id=1&before_id=5')[0]
+    assert response[1] == 400
@@ -0,0 +1,73 @@
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from utils.passwords import PasswordHasher, PasswordHasherBusy, hash_rounds
+
+
+def test_hash_and_verify_inline():
+    hasher = PasswordHasher(processes=0, rounds=4)
+    hashed = hasher.hash('secret123')
+    assert hash_rounds(hashed) == 4
+    assert hasher.verify('secret123', hashed)
+    assert not hasher.verify('wrong', hashed)
+    assert not hasher.verify('secret123', 'not a hash')
+
+
+def test_rehash_when_cost_changes():
+    old = PasswordHasher(processes=0, rounds=4).hash('secret123')
+    hasher = PasswordHasher(processes=0, rounds=5)
+
+    ok, new_hash = hasher.verify_and_update('secret123', old)
+    assert ok and hash_rounds(new_hash) == 5 and hasher.verify('secret123', new_hash)
+    assert hasher.verify_and_update('secret123', new_hash) == (True, None)
+    # A wrong password never produces a rehash
+    assert hasher.verify_and_update('wrong', old) == (False, None)
+    assert hasher.rehashed == 1
+
+
+def test_rejects_past_max_pending():
+    hasher = PasswordHasher(processes=0, rounds=4, max_pending=1)
+    entered, release = threading.Event(), threading.Event()
+
+    def slow():
+        entered.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=hasher._run, args=(slow,))
+    worker.start()
+    entered.wait(5)
+    with pytest.raises(PasswordHasherBusy) as busy:
+        hasher.hash('secret123')
+    assert busy.value.retry_after >= 1
+    release.set()
+    worker.join()
+
+    assert hasher.verify('secret123', hasher.hash('secret123'))
+    assert hasher.stats()['rejected'] == 1
+
+
+def test_process_pool():
+    hasher = PasswordHasher(processes=1, rounds=4)
+    try:
+        hasher.start()
+        assert hasher.verify('secret123', hasher.hash('secret123'))
+    finally:
+        hasher.shutdown()
+
+
+def test_a_broken_pool_is_replaced():
+    hasher = PasswordHasher(processes=1, rounds=4)
+    try:
+        hasher.start()
+        broken = hasher._get_executor()
+        # A worker dying takes the whole pool down with it
+        with pytest.raises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result()
+        assert hasher.verify('secret123', hasher.hash('secret123'))
+        assert hasher._executor is not broken
+        assert len(hasher.hash_many(['a' * 6, 'b' * 6])) == 2
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,54 @@
+from flask import Flask
+
+import utils.principal as principal
+from utils.principal import resolve_principal, invalidate_principal
+
+
+class Cursor:
+    def __init__(self, row):
+        self.row = row
+        self.queries = []
+
+    def execute(self, query, params=None):
+        self.queries.append((query, params))
+
+    def fetchone(self):
+        return self.row
+
+
+def setup_function():
+    principal._principals.clear()
+
+
+def test_resolves_each_role_and_caches_across_requests():
+    app = Flask(__name__)
+    student = {'user_id': 1, 'role': 'student'}
+    cursor = Cursor({'id': 11})
+    with app.test_request_context():
+        assert resolve_principal(cursor, student) == 11
+        assert resolve_principal(cursor, student) == 11
+    with app.test_request_context():
+        assert resolve_principal(cursor, student) == 11
+    assert len(cursor.queries) == 1
+
+    hod = Cursor({'department_id': 4})
+    assert resolve_principal(hod, {'user_id': 2, 'role': 'hod'}) == 4
+    assert "FROM hods" in hod.queries[0][0]
+
+
+def test_missing_profile_is_not_cached():
+    cursor = Cursor(None)
+    identity = {'user_id': 3, 'role': 'student'}
+    assert resolve_principal(cursor, identity) is None
+    cursor.row = {'id': 30}
+    assert resolve_principal(cursor, identity) == 30
+
+
+def test_invalidate_forces_a_fresh_lookup():
+    cursor = Cursor({'id': 5})
+    identity = {'user_id': 9, 'role': 'student'}
+    resolve_principal(cursor, identity)
+    invalidate_principal(9)
+    cursor.row = {'id': 6}
+    assert resolve_principal(cursor, identity) == 6
+    assert resolve_principal(Cursor(None), {'user_id': 9, 'role': 'admin'}) is None
@@ -0,0 +1,53 @@
+import io
+from decimal import Decimal
+
+from utils.reports import ReportEngine, report_key, letter_items, _render_offer_letter
+
+DRIVE = {'id': 1, 'job_role': 'SDE', 'location': 'Pune', 'package_ctc': Decimal('1200000.00'),
+         'company_name': 'AT&T Labs'}
+
+
+def applicants(count):
+    return [{'id': i, 'status': 'selected', 'current_round': 3, 'enrollment_number': f'CSE{i:04d}',
+             'first_name': f'First{i}', 'last_name': 'Last', 'cgpa': Decimal('8.10'),
+             'department_name': 'Computer Science'} for i in range(1, count + 1)]
+
+
+def test_key_changes_with_content_only():
+    items = letter_items(DRIVE, applicants(2))
+    assert report_key('offer_letter', items[0]) == report_key('offer_letter', dict(items[0]))
+    assert report_key('offer_letter', items[0]) != report_key('offer_letter', items[1])
+    assert report_key('offer_letter', items[0]) != report_key('admit_card', items[0])
+
+
+def test_renders_every_kind_and_serves_repeats_from_cache(tmp_path):
+    engine = ReportEngine(processes=2, cache_dir=str(tmp_path))
+    try:
+        path = engine.render('drive_results', {'drive': DRIVE, 'applications': applicants(60)})
+        with open(path, 'rb') as f:
+            assert f.read(5) == b'%PDF-'
+        engine.render('department_placements', {
+            'department': {'id': 1, 'name': 'Computer Science'},
+            'generated_on': '2024-05-01',
+            'students': [{'enrollment_number': 'CSE1', 'first_name': 'A', 'last_name': 'B',
+                          'cgpa': None, 'application_count': 2, 'placed_company': 'AT&T Labs'}],
+        })
+
+        items = letter_items(DRIVE, applicants(12))
+        first = engine.render_batch('offer_letter', items)
+        assert all(error is None for _, _, error in first)
+        assert len({path for _, path, _ in first}) == 12
+        rendered = engine.rendered
+
+        again = engine.render_batch('offer_letter', items)
+        assert again == first
+        assert engine.rendered == rendered and engine.cache_hits == 12
+    finally:
+        engine.shutdown()
+
+
+def test_offer_letter_without_a_package():
+    (item,) = letter_items(dict(DRIVE, package_ctc=None), applicants(1))
+    buffer = io.BytesIO()
+    _render_offer_letter(buffer, item)
+    assert buffer.getvalue()[:5] == b'%PDF-'
@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+
+import pytest
+
+from utils import resume_analysis
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Answers both prompts after ``delay`` seconds and records concurrency"""
+
+    def __init__(self, delay=0.0, score_text=None):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.score_text = score_text
+
+    def generate_content(self, prompt):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if 'expert resume reviewer' in prompt:
+            text = self.score_text or json.dumps({'resumeScore': 82, 'scoreRationale': 'solid'})
+            return FakeResponse(text)
+        return FakeResponse('```json\n' + json.dumps({'feedback': 'add metrics'}) + '\n```')
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    resume_analysis.get_analysis_cache().clear()
+    yield
+
+
+def test_prompts_run_concurrently_and_merge():
+    model = FakeModel(delay=0.2)
+    started = time.perf_counter()
+    result, cached = resume_analysis.analyze_resume_text("resume text", "Backend Engineer", model=model)
+    elapsed = time.perf_counter() - started
+    assert not cached
+    assert model.max_active == 2
+    assert elapsed < 0.35
+    assert result['resumeScore'] == 82
+    assert result['feedback'] == 'add metrics'
+    assert result['skillsGapAnalysis'] == 'Skills gap analysis not available'
+
+
+def test_repeat_analysis_is_served_from_cache():
+    model = FakeModel()
+    resume_analysis.analyze_resume_text("resume text", "Backend Engineer", model=model)
+    result, cached = resume_analysis.analyze_resume_text("resume text", "  backend   ENGINEER ", model=model)
+    assert cached
+    assert model.calls == 2
+    assert result['resumeScore'] == 82
+
+
+def test_cache_key_changes_with_text_and_prompt_version(monkeypatch):
+    key = resume_analysis.cache_key("resume text", "SDE")
+    assert key != resume_analysis.cache_key("resume text v2", "SDE")
+    monkeypatch.setattr(resume_analysis, 'PROMPT_VERSION', resume_analysis.PROMPT_VERSION + 1)
+    assert key != resume_analysis.cache_key("resume text", "SDE")
+
+
+def test_invalid_json_is_not_cached():
+    model = FakeModel(score_text="not json")
+    with pytest.raises(json.JSONDecodeError):
+        resume_analysis.analyze_resume_text("resume text", "SDE", model=model)
+    assert len(resume_analysis.get_analysis_cache()) == 0
@@ -0,0 +1,74 @@
+import hashlib
+from unittest import mock
+
+import docx
+from reportlab.pdfgen import canvas
+
+import utils.resume_parser as resume_parser
+import utils.schema as schema
+from benchmarks.recording_db import RecordingConnection
+from utils.resume_parser import extract_resume, store_results, find_parsed_text, _extract_safely
+
+
+def make_pdf(path, pages):
+    c = canvas.Canvas(str(path))
+    for text in pages:
+        c.drawString(72, 720, text)
+        c.showPage()
+    c.save()
+
+
+def test_extracts_pdf_text_pages_and_hash(tmp_path):
+    path = tmp_path / "resume.pdf"
+    make_pdf(path, ["Python Flask MySQL", "Projects and internships"])
+    parsed = extract_resume(str(path))
+    assert "Python Flask MySQL" in parsed['extracted_text']
+    assert parsed['page_count'] == 2
+    assert parsed['content_hash'] == hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_extracts_docx_text(tmp_path):
+    path = tmp_path / "resume.docx"
+    document = docx.Document()
+    document.add_paragraph("Data Structures and Algorithms")
+    document.save(str(path))
+    parsed = extract_resume(str(path))
+    assert "Data Structures and Algorithms" in parsed['extracted_text']
+    assert parsed['page_count'] is None
+
+
+def test_unsupported_format_reports_error(tmp_path):
+    path = tmp_path / "resume.doc"
+    path.write_bytes(b"legacy word file")
+    parsed, error = _extract_safely(str(path))
+    assert parsed is None
+    assert "Unsupported" in error
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.calls = []
+
+    def executemany(self, query, rows):
+        self.calls.append((query, list(rows)))
+
+
+def test_store_results_batches_by_outcome():
+    cursor = RecordingCursor()
+    parsed = {'extracted_text': 'text', 'page_count': 1, 'content_hash': 'ab'}
+    done, failed = store_results(cursor, [(1, parsed, None), (2, parsed, None), (3, None, 'bad pdf')])
+    assert (done, failed) == (2, 1)
+    assert len(cursor.calls) == 2
+    assert "parsing_status = 'done'" in cursor.calls[0][0]
+    assert [row[-1] for row in cursor.calls[0][1]] == [1, 2]
+    assert cursor.calls[1][1][0][0] == 'bad pdf'
+
+
+def test_find_parsed_text_waits_for_the_worker_to_add_the_columns():
+    conn = RecordingConnection(lambda query, params: [{'extracted_text': 'Python'}])
+    with mock.patch.object(resume_parser, 'ensure', side_effect=AssertionError('migrated in a request')):
+        with mock.patch.object(schema, '_applied', set()):
+            assert find_parsed_text(conn.cursor(), content_hash='ab') is None
+        with mock.patch.object(schema, '_applied', {'resume_parse_jobs'}):
+            assert find_parsed_text(conn.cursor(), content_hash='ab') == 'Python'
+    assert len(conn.queries) == 1
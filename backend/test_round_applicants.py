@@ -0,0 +1,41 @@
+from routes.tpo import bucket_round_applicants
+
+
+def rounds(*numbers):
+    return [{'id': 10 + n, 'round_number': n} for n in numbers]
+
+
+def test_applicants_are_bucketed_into_every_round_they_reached():
+    # Rounds arrive out of order and round 4 has nobody in it
+    drive_rounds = rounds(3, 1, 4, 2)
+    applications = [
+        {'id': 7, 'current_round': 3},
+        {'id': 5, 'current_round': 1},
+        {'id': 9, 'current_round': 2},
+        {'id': 8, 'current_round': None},   # applied, no round yet
+    ]
+    result = bucket_round_applicants(drive_rounds, applications)
+
+    assert result is drive_rounds and [r['round_number'] for r in result] == [3, 1, 4, 2]
+    by_number = {r['round_number']: r for r in result}
+    # Ids keep the order the applications were listed in
+    assert by_number[1]['application_ids'] == [7, 5, 9]
+    assert by_number[2]['application_ids'] == [7, 9]
+    assert by_number[3]['application_ids'] == [7]
+    assert by_number[4]['application_ids'] == [] and by_number[4]['application_count'] == 0
+    assert by_number[1]['application_count'] == 3
+
+
+def test_current_round_without_a_matching_round():
+    # Round 2 was deleted; an applicant left in it still counts for round 1 only,
+    # and one past the last round counts for all of them
+    drive_rounds = rounds(1, 3)
+    bucket_round_applicants(drive_rounds, [{'id': 1, 'current_round': 2}, {'id': 2, 'current_round': 6}])
+    assert [(r['round_number'], r['application_ids']) for r in drive_rounds] == [(1, [1, 2]), (3, [2])]
+
+
+def test_no_rounds_or_no_applicants():
+    assert bucket_round_applicants([], [{'id': 1, 'current_round': 1}]) == []
+    drive_rounds = rounds(1)
+    bucket_round_applicants(drive_rounds, [])
+    assert drive_rounds[0]['application_ids'] == [] and drive_rounds[0]['application_count'] == 0
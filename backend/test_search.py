@@ -0,0 +1,149 @@
+import sqlite3
+from unittest import mock
+
+import routes.tpo as tpo_routes
+import utils.db as db
+import utils.search as search
+from app import app
+from benchmarks import dataset
+from benchmarks.sqlite_db import SQLiteDatabase
+from config import Config
+from utils.search import InvertedIndex, SearchIndex, search_ids
+
+
+STUDENTS = [
+    (1, 10, 'Rahul', 'Sharma', 'CSE2021001'),
+    (2, 10, 'Priya', 'Rahane', 'CSE2021002'),
+    (3, 20, 'Rahul', 'Verma', 'ECE2021003'),
+    (4, 20, 'Ananya', 'Iyer', 'ECE2021004'),
+]
+
+WEIGHTS = {'first_name': 1.0, 'last_name': 1.0, 'enrollment_number': 1.0}
+
+
+def build_index():
+    index = InvertedIndex(WEIGHTS)
+    for id, dept, first, last, enrollment in STUDENTS:
+        index.add(id, {'first_name': first, 'last_name': last, 'enrollment_number': enrollment}, dept)
+    return index
+
+
+def test_exact_matches_rank_above_prefix_matches():
+    # "rahul" is exact for 1 and 3; it is not a prefix of "rahane"
+    assert build_index().search('rahul') == [1, 3]
+    # "rah" prefixes both Rahul and Rahane
+    assert build_index().search('rah') == [1, 2, 3]
+
+
+def test_terms_are_anded_and_scoped():
+    index = build_index()
+    assert index.search('rahul verma') == [3]
+    assert index.search('rahul', scope=10) == [1]
+    assert index.search('cse2021') == [1, 2]
+
+
+def test_typo_tolerance_within_one_edit():
+    index = build_index()
+    assert index.search('rahl') == [1, 3]       # missing letter
+    assert index.search('ananyaa') == [4]       # extra letter
+    assert index.search('sharna') == [1]        # substituted letter
+    assert index.search('xyzzy') == []
+
+
+def test_remove_and_readd_keep_postings_clean():
+    index = build_index()
+    index.remove(1)
+    assert index.search('sharma') == []
+    index.add(1, {'first_name': 'Rohit', 'last_name': 'Sharma', 'enrollment_number': 'CSE1'}, 10)
+    assert index.search('rohit') == [1]
+    assert 'rahul' in index.postings and 1 not in index.postings['rahul']
+
+
+def sqlite_index():
+    """SearchIndex over a SQLite students table, standing in for MySQL"""
+    db = sqlite3.connect(':memory:')
+    db.row_factory = lambda cursor, row: {c[0]: v for c, v in zip(cursor.description, row)}
+    db.execute("CREATE TABLE students (id INTEGER PRIMARY KEY, department_id INT, "
+               "first_name TEXT, last_name TEXT, enrollment_number TEXT)")
+    db.executemany("INSERT INTO students VALUES (?, ?, ?, ?, ?)", STUDENTS)
+
+    def load(cursor, ids):
+        query = ("SELECT id, department_id as scope, first_name, last_name, enrollment_number "
+                 "FROM students")
+        if ids is not None:
+            query += f" WHERE id IN ({','.join('?' * len(ids))})"
+        return db.execute(query, ids or ()).fetchall()
+
+    index = SearchIndex('students', WEIGHTS, load, ttl=3600)
+    index._fetch = lambda ids=None: load(None, ids)
+    return db, index
+
+
+def test_touch_rereads_changed_and_deleted_rows():
+    db, index = sqlite_index()
+    assert index.search('verma') == [3]
+    db.execute("UPDATE students SET last_name = 'Kapoor' WHERE id = 3")
+    db.execute("DELETE FROM students WHERE id = 4")
+    index.touch(3, 4)
+    assert index.search('verma') == []
+    assert index.search('kapoor') == [3]
+    assert index.search('ananya') == []
+
+
+def test_rows_touched_during_a_rebuild_survive_the_swap():
+    db, index = sqlite_index()
+    assert index.search('verma') == [3]
+    load = index._fetch
+
+    def fetch(ids=None):
+        if ids is not None:
+            return load(ids)
+        rows = load()
+        # A write lands after the full load read its rows, and a search
+        # applies it to the old index before the swap
+        db.execute("UPDATE students SET last_name = 'Kapoor' WHERE id = 3")
+        index.touch(3)
+        index._apply_pending()
+        return rows
+
+    index._fetch = fetch
+    assert index.rebuild()
+    assert index.search('kapoor') == [3]
+
+
+def test_search_ids_falls_back_for_empty_and_broad_queries():
+    _, index = sqlite_index()
+    with mock.patch.dict(search._indexes, {'students': index}), \
+            mock.patch.object(Config, 'SEARCH_MAX_RESULTS', 1):
+        assert search_ids('students', 'verma') == [3]
+        assert search_ids('students', 'rahul') is None   # 2 matches, over the cap
+        assert search_ids('students', '--') is None
+
+
+
+def test_company_listing_search_runs_against_the_real_schema(tmp_path):
+    database = SQLiteDatabase(str(tmp_path / "portal.db"))
+    data = dataset.generate(seed=7, scale='tiny')
+    conn = database.get_db_connection()
+    dataset.create_schema(conn)
+    dataset.load(conn, data)
+    conn.close()
+
+    companies = SearchIndex('companies', {'name': 1.0, 'industry': 0.6}, search._load_companies)
+    name = data['companies'][0]['name']
+    # Skip the JWT and HTTP cache layers
+    view = tpo_routes.get_companies.__wrapped__.__wrapped__
+    try:
+        with mock.patch.object(db, 'get_db_connection', side_effect=database.get_db_connection), \
+                mock.patch.object(search, 'get_db_connection', side_effect=database.get_db_connection), \
+                mock.patch.dict(search._indexes, {'companies': companies}), \
+                mock.patch.object(tpo_routes, 'get_jwt_identity', return_value={'user_id': 1, 'role': 'tpo'}):
+            with app.test_request_context(query_string={'search': name}):
+                response, status = view()
+            assert status == 200 and response.get_json()['companies'][0]['name'] == name
+            # Punctuation only: the LIKE fallback
+            with app.test_request_context(query_string={'search': '--'}):
+                response, status = view()
+            assert status == 200 and response.get_json()['count'] == 0
+    finally:
+        database.close()
@@ -0,0 +1,150 @@
+from datetime import datetime
+from unittest import mock
+
+import utils.status_transitions as status_transitions
+from utils.status_transitions import (
+    NOT_FOUND,
+    UNCHANGED,
+    INVALID_TRANSITION,
+    UPDATED,
+    PROMOTED,
+    REJECTED,
+    NOT_IN_ROUND,
+    FINAL_ROUND,
+    CLOSED,
+    can_transition,
+    transition_applications,
+    promote_round,
+    reject_round,
+    status_email,
+    queue_status_emails
+)
+
+
+def application(id, status, current_round=1, total_rounds=3):
+    return {'id': id, 'status': status, 'drive_id': 1, 'user_id': 100 + id,
+            'current_round': current_round, 'total_rounds': total_rounds,
+            'first_name': 'Asha', 'last_name': 'Rao', 'email': f's{id}@x.edu',
+            'job_role': 'SDE', 'package_ctc': 1200000, 'company_name': 'Acme'}
+
+
+class Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def execute(self, query, params=None):
+        self.queries.append((query, params))
+
+    def executemany(self, query, seq):
+        self.queries.append((query, list(seq)))
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_transition_rules():
+    assert can_transition('applied', 'shortlisted')
+    assert can_transition('rejected', 'on_hold')
+    assert not can_transition('selected', 'applied')
+    assert not can_transition('shortlisted', 'applied')
+
+
+def test_bulk_transition_uses_constant_statements():
+    rows = [application(i, 'applied') for i in range(1, 501)]
+    rows[0]['status'] = 'shortlisted'
+    rows[1]['status'] = 'selected'
+    cursor = Cursor(rows)
+
+    results, changed = transition_applications(cursor, list(range(1, 502)) + [3], 'shortlisted')
+
+    assert len(cursor.queries) == 3
+    select, update, insert = cursor.queries
+    assert "FOR UPDATE" in select[0]
+    assert update[1][0] == 'shortlisted' and update[1][2:] == list(range(3, 501))
+    assert len(insert[1]) == 498 and insert[1][0][0] == 103
+    assert results[1] == (UNCHANGED, 'shortlisted')
+    assert results[2] == (INVALID_TRANSITION, 'selected')
+    assert results[3] == (UPDATED, 'applied')
+    assert results[501] == (NOT_FOUND, None)
+    assert [row['id'] for row in changed] == list(range(3, 501))
+
+
+def test_nothing_to_change_skips_writes():
+    cursor = Cursor([application(1, 'rejected')])
+    results, changed = transition_applications(cursor, [1], 'rejected')
+    assert changed == [] and len(cursor.queries) == 1
+
+
+def test_transition_stamps_the_rows_it_changed():
+    cursor = Cursor([application(1, 'applied')])
+    _, changed = transition_applications(cursor, [1], 'rejected')
+    # The value written to updated_at, which the email key is built from
+    assert changed[0]['updated_at'] == cursor.queries[1][1][1]
+
+
+def test_repeat_transitions_get_their_own_email_key():
+    keys = []
+    # rejected -> on_hold -> rejected: the second rejection is a new email
+    for updated_at in (datetime(2024, 3, 1, 9, 0), datetime(2024, 3, 4, 16, 30)):
+        row = dict(application(1, 'on_hold'), updated_at=updated_at)
+        with mock.patch.object(status_transitions, 'queue_emails', side_effect=len) as queue:
+            assert queue_status_emails([row], 'rejected') == 1
+            assert queue_status_emails([row], 'rejected') == 1
+        first, retry = (call[0][0][0][4] for call in queue.call_args_list)
+        assert first == retry
+        keys.append(first)
+    assert keys == ['application_status:1:rejected:20240301090000000000',
+                    'application_status:1:rejected:20240304163000000000']
+
+
+def test_bulk_path_enforces_transitions_but_the_single_edit_does_not():
+    for current, new in (('rejected', 'selected'), ('selected', 'shortlisted'), ('shortlisted', 'applied')):
+        results, changed = transition_applications(Cursor([application(1, current)]), [1], new)
+        assert results[1] == (INVALID_TRANSITION, current) and changed == []
+
+        cursor = Cursor([application(1, current)])
+        results, changed = transition_applications(cursor, [1], new, check_transitions=False)
+        assert results[1] == (UPDATED, current) and len(changed) == 1
+        assert cursor.queries[1][1][0] == new
+
+
+def test_status_email_templates():
+    subject, html = status_email(application(1, 'shortlisted'), 'selected')
+    assert 'SELECTED' in subject and '12.0 LPA' in html
+    assert status_email(application(1, 'applied'), 'on_hold') is None
+
+
+def test_promote_round_moves_only_open_candidates():
+    rows = [application(i, 'shortlisted', current_round=2) for i in range(1, 1001)]
+    rows[0]['current_round'] = 1
+    rows[1]['status'] = 'rejected'
+    rows[2]['drive_id'] = 9
+    cursor = Cursor(rows)
+
+    results, promoted = promote_round(cursor, 1, 2, list(range(1, 1001)))
+
+    assert len(cursor.queries) == 3
+    update, insert = cursor.queries[1:]
+    assert update[1][:2] == ['selected', 3] and len(update[1]) == 3 + 997
+    assert insert[1][0][2] == 'Congratulations! You have been SELECTED!'
+    assert results[1] == (NOT_IN_ROUND, 'shortlisted')
+    assert results[2] == (CLOSED, 'rejected')
+    assert results[3] == (NOT_FOUND, None)
+    assert results[4] == (PROMOTED, 'selected')
+    assert len(promoted) == 997
+
+
+def test_promote_from_final_round_is_refused():
+    cursor = Cursor([application(1, 'shortlisted', current_round=3)])
+    results, promoted = promote_round(cursor, 1, 3, [1])
+    assert results[1] == (FINAL_ROUND, 'shortlisted') and promoted == []
+    assert len(cursor.queries) == 1
+
+
+def test_reject_round_adds_feedback():
+    cursor = Cursor([application(1, 'applied'), application(2, 'applied')])
+    results, rejected = reject_round(cursor, 1, 1, [1, 2], feedback='Weak DSA')
+    assert results == {1: (REJECTED, 'rejected'), 2: (REJECTED, 'rejected')}
+    insert = cursor.queries[-1][1]
+    assert insert[0][2].endswith('Feedback: Weak DSA') and insert[0][3] == 'warning'
@@ -0,0 +1,159 @@
+import hashlib
+import io
+from unittest import mock
+
+import pymysql
+from openpyxl import Workbook
+
+import utils.student_import as student_import
+from config import Config
+from utils.passwords import PasswordHasher, hash_rounds
+from utils.student_import import read_rows, validate_rows, import_students, ImportFormatError
+from benchmarks.recording_db import RecordingConnection
+
+DEPARTMENTS = [{'id': 1, 'name': 'Computer Science', 'code': 'CSE'},
+               {'id': 2, 'name': 'Mechanical', 'code': 'ME'}]
+
+CSV = (
+    "Email,First Name,Last Name,Enrollment Number,Department,Password\n"
+    "a@college.edu,Asha,Rao,E1,CSE,\n"
+    "bad-email,Bo,Lee,E2,CSE,\n"
+    "\n"
+    "c@college.edu,Cy,Das,E3,Mechanical,secret99\n"
+    "A@college.edu,Dup,Row,E4,2,\n"
+    "d@college.edu,Di,Roy,E5,Physics,\n"
+    "e@college.edu,Ed,Kim,E6,1,short\n"
+)
+
+
+def departments():
+    return student_import.load_departments(RecordingConnection(lambda q, p: DEPARTMENTS).cursor())
+
+
+def test_read_csv_and_validate():
+    rows = read_rows(io.BytesIO(CSV.encode()), 'csv')
+    students, errors = validate_rows(rows, departments())
+
+    assert [(s['row'], s['email'], s['department_id']) for s in students] == \
+        [(2, 'a@college.edu', 1), (5, 'c@college.edu', 2)]
+    assert students[1]['password'] == 'secret99' and students[0]['password'] is None
+    assert {e['row']: e['errors'][0] for e in errors} == {
+        3: "email is not valid",
+        6: "email repeats row 2",
+        7: "unknown department 'Physics'",
+        8: "password must be at least 6 characters",
+    }
+
+
+def test_read_xlsx_with_numeric_cells():
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['email', 'first_name', 'last_name', 'enrollment_number', 'phone'])
+    sheet.append(['x@college.edu', 'Xi', 'Wu', 2021001.0, 9876543210])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+
+    students, errors = validate_rows(read_rows(buffer, 'xlsx'), departments(), department_id=2)
+    assert not errors
+    assert students[0]['enrollment_number'] == '2021001' and students[0]['phone'] == '9876543210'
+    assert students[0]['department_id'] == 2
+
+
+def test_hod_import_rejects_other_departments():
+    rows = [(2, {'email': 'a@college.edu', 'first_name': 'A', 'last_name': 'B',
+                 'enrollment_number': 'E1', 'department': 'ME'})]
+    students, errors = validate_rows(rows, departments(), department_id=1)
+    assert not students and errors[0]['errors'] == ["department is not yours"]
+
+
+def test_missing_columns_are_a_format_error():
+    try:
+        list(read_rows(io.BytesIO(b"email,first_name\n"), 'csv'))
+    except ImportFormatError as e:
+        assert 'last_name' in str(e)
+    else:
+        raise AssertionError("expected ImportFormatError")
+
+
+class Database:
+    """Answers the import's queries; users already holding an email or
+    enrollment number are reported as existing"""
+
+    def __init__(self, existing_emails=(), existing_enrollments=(), collide_on=None):
+        self.existing = [{'field': 'email', 'value': e} for e in existing_emails] + \
+            [{'field': 'enrollment_number', 'value': e} for e in existing_enrollments]
+        self.collide_on = collide_on
+        self.next_id = 100
+
+    def __call__(self, query, params):
+        if "FROM departments" in query:
+            return DEPARTMENTS
+        if "UNION ALL" in query:
+            return self.existing
+        if "INSERT INTO users" in query and self.collide_on in [row[0] for row in params]:
+            raise pymysql.err.IntegrityError(1062, "Duplicate entry")
+        if "SELECT id, email FROM users" in query:
+            rows = []
+            for email in params:
+                self.next_id += 1
+                rows.append({'id': self.next_id, 'email': email})
+            return rows
+        return []
+
+
+def run_import(database, text=CSV, queued=len, **kwargs):
+    conn = RecordingConnection(database)
+    conn.rollback = lambda: None
+    with mock.patch.object(student_import, 'get_password_hasher', return_value=PasswordHasher(processes=0)), \
+            mock.patch.object(student_import, 'queue_emails', side_effect=queued) as queue, \
+            mock.patch.object(Config, 'IMPORT_BCRYPT_ROUNDS', 4):
+        report = import_students(conn, read_rows(io.BytesIO(text.encode()), 'csv'), chunk_size=1, **kwargs)
+    return report, conn, queue
+
+
+def test_import_inserts_in_chunks_and_reports_per_row():
+    report, conn, queue = run_import(Database(existing_enrollments=['E3']))
+
+    assert report['total'] == 6 and report['created'] == 1 and report['failed'] == 5
+    assert [e['row'] for e in report['errors']] == [3, 5, 6, 7, 8]
+    assert "enrollment_number is already registered" in report['errors'][1]['errors']
+
+    users = [params for query, params in conn.queries if "INSERT INTO users" in query]
+    assert len(users) == 1 and users[0][0][0] == 'a@college.edu' and hash_rounds(users[0][0][1]) == 4
+    assert users[0][0][3] is True  # must_change_password
+    students = [params for query, params in conn.queries if "INSERT INTO students" in query]
+    assert students[0][0][:3] == (101, 1, 'E1') and students[0][0][6] is False
+    assert conn.commits == 1
+
+    # Only the token's hash is stored; the mail carries the token, never a password
+    (tokens,) = [params for query, params in conn.queries if "INSERT INTO password_set_tokens" in query]
+    (message,) = queue.call_args[0][0]
+    assert message[0] == 'a@college.edu' and 'set-password?token=' in message[2]
+    token = message[2].split('set-password?token=')[1].split('"')[0]
+    assert tokens[0][:2] == (hashlib.sha256(token.encode()).hexdigest(), 101)
+    assert token not in str(conn.queries)
+    assert report['email_failed'] == []
+
+
+def test_rows_whose_email_could_not_be_queued_are_reported():
+    report, _, _ = run_import(Database(), queued=lambda messages: 0)
+    assert report['created'] == 2
+    assert report['email_failed'] == [{'row': 2, 'email': 'a@college.edu'}, {'row': 5, 'email': 'c@college.edu'}]
+
+
+def test_collision_after_the_check_fails_only_that_row():
+    text = "email,first_name,last_name,enrollment_number,department\n" \
+           "a@college.edu,A,B,E1,CSE\nb@college.edu,C,D,E2,CSE\n"
+    report, conn, _ = run_import(Database(collide_on='b@college.edu'), text, approved_by=7)
+    assert report['created'] == 1
+    assert report['errors'] == [{'row': 3, 'email': 'b@college.edu',
+                                 'errors': ["email or enrollment_number is already registered"]}]
+    students = [params for query, params in conn.queries if "INSERT INTO students" in query]
+    assert students[0][0][6] is True and students[0][0][8] == 7
+
+
+def test_dry_run_writes_nothing():
+    report, conn, queue = run_import(Database(), dry_run=True)
+    assert report['valid'] == 2 and report['created'] == 0
+    assert not any("INSERT" in query for query, _ in conn.queries) and not queue.called
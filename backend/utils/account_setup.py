@@ -0,0 +1,67 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from config import Config
+from utils.db import add_column_if_missing
+from utils.schema import ensure, is_applied
+
+
+def _add_account_setup(cursor):
+    # Accounts created by staff must pick their own password before using the portal
+    add_column_if_missing(cursor, 'users', 'must_change_password', 'BOOLEAN NOT NULL DEFAULT FALSE')
+    # Only a hash of each set-password token is kept; the token itself is in the email alone
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS password_set_tokens (
+            token_hash CHAR(64) PRIMARY KEY,
+            user_id INT NOT NULL,
+            expires_at DATETIME NOT NULL,
+            used_at DATETIME NULL,
+            created_at DATETIME NOT NULL,
+            INDEX idx_password_set_tokens_user (user_id)
+        )
+    """)
+
+
+def ensure_account_setup():
+    return ensure('account_setup', _add_account_setup)
+
+
+def account_setup_ready():
+    return is_applied('account_setup')
+
+
+def _token_hash(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def issue_tokens(cursor, user_ids):
+    """Create one single-use set-password token per user inside the caller's
+    transaction; returns ``{user_id: token}``"""
+    now = datetime.now()
+    expires_at = now + timedelta(hours=Config.PASSWORD_SET_TOKEN_TTL_HOURS)
+    tokens = {user_id: secrets.token_urlsafe(32) for user_id in user_ids}
+    if tokens:
+        cursor.executemany("""
+            INSERT INTO password_set_tokens (token_hash, user_id, expires_at, created_at)
+            VALUES (%s, %s, %s, %s)
+        """, [(_token_hash(token), user_id, expires_at, now) for user_id, token in tokens.items()])
+    return tokens
+
+
+def redeem_token(cursor, token):
+    """Use up a token inside the caller's transaction; returns its user id,
+    or None when the token is unknown, used or expired. Every other open
+    token of the user is retired with it."""
+    cursor.execute("""
+        SELECT user_id FROM password_set_tokens
+        WHERE token_hash = %s AND used_at IS NULL AND expires_at > %s
+        FOR UPDATE
+    """, (_token_hash(token), datetime.now()))
+    row = cursor.fetchone()
+    if not row:
+        return None
+    cursor.execute(
+        "UPDATE password_set_tokens SET used_at = %s WHERE user_id = %s AND used_at IS NULL",
+        (datetime.now(), row['user_id'])
+    )
+    return row['user_id']
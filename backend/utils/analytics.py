@@ -0,0 +1,328 @@
+import threading
+from datetime import datetime
+from config import Config
+from utils.db import get_db_connection
+from utils.schema import ensure, is_applied
+
+
+def _create_tables(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analytics_company_stats (
+            company_id INT PRIMARY KEY,
+            company_name VARCHAR(255) NOT NULL,
+            application_count INT NOT NULL DEFAULT 0,
+            selected_count INT NOT NULL DEFAULT 0,
+            INDEX idx_analytics_company_apps (application_count)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analytics_department_stats (
+            department_id INT PRIMARY KEY,
+            department_name VARCHAR(255) NOT NULL,
+            student_count INT NOT NULL DEFAULT 0,
+            placed_count INT NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analytics_status_stats (
+            status VARCHAR(32) PRIMARY KEY,
+            application_count INT NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analytics_totals (
+            metric VARCHAR(64) PRIMARY KEY,
+            value BIGINT NOT NULL DEFAULT 0,
+            refreshed_at DATETIME NOT NULL
+        )
+    """)
+
+
+def ensure_schema():
+    """Create the snapshot tables; run at startup, never from a request"""
+    return ensure('analytics_snapshots', _create_tables)
+
+
+def analytics_schema_ready():
+    return is_applied('analytics_snapshots')
+
+
+# ============================================
+# LIVE COMPUTATION (used for ?fresh=1)
+# ============================================
+
+def compute_live(cursor):
+    """Aggregate straight from the base tables; cost grows with applications"""
+    cursor.execute("""
+        SELECT
+            c.name as company_name,
+            COUNT(a.id) as application_count
+        FROM companies c
+        LEFT JOIN placement_drives pd ON c.id = pd.company_id
+        LEFT JOIN applications a ON pd.id = a.drive_id
+        GROUP BY c.id, c.name
+        ORDER BY application_count DESC
+        LIMIT 5
+    """)
+    company_stats = cursor.fetchall()
+
+    cursor.execute("""
+        SELECT
+            SUM(CASE WHEN status = 'applied' THEN 1 ELSE 0 END) as applied,
+            SUM(CASE WHEN status = 'shortlisted' THEN 1 ELSE 0 END) as shortlisted,
+            SUM(CASE WHEN status = 'selected' THEN 1 ELSE 0 END) as selected,
+            SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as rejected
+        FROM applications
+    """)
+    status_stats = cursor.fetchone()
+
+    cursor.execute("""
+        SELECT
+            d.name as department_name,
+            COUNT(DISTINCT CASE WHEN a.status = 'selected' THEN s.id END) as placed_count
+        FROM departments d
+        LEFT JOIN students s ON d.id = s.department_id
+        LEFT JOIN applications a ON s.id = a.student_id
+        GROUP BY d.id, d.name
+        ORDER BY placed_count DESC
+    """)
+    department_stats = cursor.fetchall()
+
+    cursor.execute("SELECT COUNT(*) as total FROM applications")
+    total_apps = cursor.fetchone()
+
+    cursor.execute("SELECT COUNT(DISTINCT student_id) as total FROM applications WHERE status = 'selected'")
+    total_placed = cursor.fetchone()
+
+    cursor.execute("SELECT COUNT(*) as total FROM placement_drives WHERE status = 'active'")
+    active_drives = cursor.fetchone()
+
+    cursor.execute("SELECT COUNT(*) as total FROM companies")
+    total_companies = cursor.fetchone()
+
+    return {
+        'company_stats': company_stats,
+        'status_stats': status_stats,
+        'department_stats': department_stats,
+        'total_applications': int(total_apps.get('total', 0)),
+        'total_placed': int(total_placed.get('total', 0)),
+        'active_drives': int(active_drives.get('total', 0)),
+        'total_companies': int(total_companies.get('total', 0))
+    }
+
+
+# ============================================
+# SNAPSHOTS
+# ============================================
+
+def refresh_snapshots(conn):
+    """Rebuild every summary table in one transaction.
+
+    The aggregates are computed with plain SELECTs, which are consistent
+    non-locking reads, and the rows written back from here: INSERT ... SELECT
+    would take shared locks on the applications it reads and hold up applies
+    and status changes until the rebuild commits.
+    """
+    now = datetime.now()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT c.id, c.name, COUNT(a.id) as application_count,
+                   COALESCE(SUM(CASE WHEN a.status = 'selected' THEN 1 ELSE 0 END), 0) as selected_count
+            FROM companies c
+            LEFT JOIN placement_drives pd ON c.id = pd.company_id
+            LEFT JOIN applications a ON pd.id = a.drive_id
+            GROUP BY c.id, c.name
+        """)
+        companies = [(r['id'], r['name'], int(r['application_count']), int(r['selected_count']))
+                     for r in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT d.id, d.name, COUNT(DISTINCT s.id) as student_count,
+                   COUNT(DISTINCT CASE WHEN a.status = 'selected' THEN s.id END) as placed_count
+            FROM departments d
+            LEFT JOIN students s ON d.id = s.department_id
+            LEFT JOIN applications a ON s.id = a.student_id
+            GROUP BY d.id, d.name
+        """)
+        departments = [(r['id'], r['name'], int(r['student_count']), int(r['placed_count']))
+                       for r in cursor.fetchall()]
+
+        cursor.execute("SELECT status, COUNT(*) as application_count FROM applications GROUP BY status")
+        statuses = [(r['status'], int(r['application_count'])) for r in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM applications) as total_applications,
+                (SELECT COUNT(DISTINCT student_id) FROM applications WHERE status = 'selected') as total_placed,
+                (SELECT COUNT(*) FROM placement_drives WHERE status = 'active') as active_drives,
+                (SELECT COUNT(*) FROM companies) as total_companies
+        """)
+        totals = cursor.fetchone()
+
+        cursor.execute("DELETE FROM analytics_company_stats")
+        if companies:
+            cursor.executemany("""
+                INSERT INTO analytics_company_stats (company_id, company_name, application_count, selected_count)
+                VALUES (%s, %s, %s, %s)
+            """, companies)
+        cursor.execute("DELETE FROM analytics_department_stats")
+        if departments:
+            cursor.executemany("""
+                INSERT INTO analytics_department_stats (department_id, department_name, student_count, placed_count)
+                VALUES (%s, %s, %s, %s)
+            """, departments)
+        cursor.execute("DELETE FROM analytics_status_stats")
+        if statuses:
+            cursor.executemany(
+                "INSERT INTO analytics_status_stats (status, application_count) VALUES (%s, %s)", statuses
+            )
+        cursor.executemany("""
+            REPLACE INTO analytics_totals (metric, value, refreshed_at) VALUES (%s, %s, %s)
+        """, [(metric, int(value or 0), now) for metric, value in totals.items()])
+
+        conn.commit()
+        return now
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def read_snapshot(cursor):
+    """Read the summary tables; cost is O(departments + companies)"""
+    cursor.execute("SELECT metric, value, refreshed_at FROM analytics_totals")
+    rows = cursor.fetchall()
+    if not rows:
+        return None
+    totals = {row['metric']: int(row['value']) for row in rows}
+    refreshed_at = min(row['refreshed_at'] for row in rows)
+
+    cursor.execute("""
+        SELECT company_name, application_count
+        FROM analytics_company_stats
+        ORDER BY application_count DESC
+        LIMIT 5
+    """)
+    company_stats = cursor.fetchall()
+
+    cursor.execute("SELECT status, application_count FROM analytics_status_stats")
+    by_status = {row['status']: int(row['application_count']) for row in cursor.fetchall()}
+    status_stats = {s: by_status.get(s, 0) for s in ('applied', 'shortlisted', 'selected', 'rejected')}
+
+    cursor.execute("""
+        SELECT department_name, placed_count
+        FROM analytics_department_stats
+        ORDER BY placed_count DESC
+    """)
+    department_stats = cursor.fetchall()
+
+    return {
+        'company_stats': company_stats,
+        'status_stats': status_stats,
+        'department_stats': department_stats,
+        'total_applications': totals.get('total_applications', 0),
+        'total_placed': totals.get('total_placed', 0),
+        'active_drives': totals.get('active_drives', 0),
+        'total_companies': totals.get('total_companies', 0),
+        'snapshot_at': refreshed_at,
+    }
+
+
+class AnalyticsRefresher:
+    """Keeps the snapshot within its staleness budget.
+
+    Writes call mark_dirty(); the background thread rebuilds the snapshot on
+    its next tick when dirty, and also when it is about to outlive the budget
+    so that an idle spell does not leave the rebuild to the next reader.
+    Readers refresh inline (single-flight) only when the snapshot is older
+    than the budget anyway, e.g. before the thread has run.
+    """
+
+    def __init__(self, interval=None, max_staleness=None):
+        self.interval = interval or Config.ANALYTICS_REFRESH_INTERVAL
+        self.max_staleness = max_staleness or Config.ANALYTICS_MAX_STALENESS
+        self._dirty = threading.Event()
+        self._dirty.set()
+        self._stopping = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self.refreshes = 0
+        self.last_refresh = None
+
+    def mark_dirty(self):
+        self._dirty.set()
+
+    def refresh(self):
+        """Rebuild the snapshot unless another thread is already doing it"""
+        if not self._refresh_lock.acquire(blocking=False):
+            # Someone else is refreshing; wait for them rather than duplicating work
+            with self._refresh_lock:
+                return self.last_refresh
+        try:
+            if not ensure_schema():
+                return None
+            conn = get_db_connection()
+            if not conn:
+                return None
+            try:
+                # Cleared first so writes landing mid-rebuild mark it again;
+                # a failed rebuild puts the flag back for the next tick
+                self._dirty.clear()
+                try:
+                    self.last_refresh = refresh_snapshots(conn)
+                except Exception:
+                    self._dirty.set()
+                    raise
+                self.refreshes += 1
+                return self.last_refresh
+            finally:
+                conn.close()
+        finally:
+            self._refresh_lock.release()
+
+    def is_stale(self, snapshot_at):
+        if snapshot_at is None:
+            return True
+        return (datetime.now() - snapshot_at).total_seconds() > self.max_staleness
+
+    def _due(self):
+        if self._dirty.is_set() or self.last_refresh is None:
+            return True
+        # Refresh a tick early so readers never find the snapshot past the budget
+        age = (datetime.now() - self.last_refresh).total_seconds()
+        return age >= self.max_staleness - self.interval
+
+    def _loop(self):
+        while not self._stopping.wait(self.interval):
+            if not self._due():
+                continue
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Analytics refresh error: {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='analytics-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_refresher = AnalyticsRefresher()
+
+
+def get_analytics_refresher():
+    return _refresher
+
+
+def mark_analytics_dirty():
+    """Flag that applications, drives or companies changed since the last snapshot"""
+    _refresher.mark_dirty()
@@ -0,0 +1,14 @@
+from config import Config
+from utils.cache import TTLCache
+from utils.http_cache import bump
+
+
+# Totals behind the TPO application listing, keyed by (drive_id, status, search).
+# Per process: other workers see a write once their entry expires.
+application_totals = TTLCache(maxsize=256, ttl=Config.APPLICATION_COUNT_TTL)
+
+
+def invalidate_application_totals():
+    """Drop cached totals after writes that add applications or change status"""
+    application_totals.clear()
+    bump('applications')
@@ -1,19 +1,287 @@
 import pymysql
+import threading
+import time
+from collections import deque
+from pymysql.constants import SERVER_STATUS
 from config import Config
 
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+class PooledConnection:
+    """Thin wrapper that hands the raw connection back to the pool on close()"""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._closed = False
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        """Return the connection to the pool instead of closing the socket"""
+        if self._closed:
+            return
+        self._closed = True
+        self._pool.release(self._raw)
+
+    def __getattr__(self, name):
+        if self._closed:
+            raise pymysql.err.InterfaceError("Connection already returned to pool")
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """Thread-safe bounded pool of MySQL connections.
+
+    Idle connections are pinged before reuse once they have sat longer than
+    ``ping_interval`` seconds, and retired after ``max_uses`` checkouts or
+    ``max_lifetime`` seconds. When every connection is checked out, callers
+    wait up to ``timeout`` seconds for one to be released.
+    """
+
+    def __init__(self, connect, min_size=2, max_size=10, max_uses=1000,
+                 max_lifetime=3600, timeout=10, ping_interval=30):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition()
+        self._idle = deque()   # raw connections ready for checkout
+        self._meta = {}        # id(raw) -> {'created', 'uses', 'last_used'}
+        self._checked_out = 0
+        self._closed = False
+
+        self._waits = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._discarded = 0
+
+        for _ in range(self.min_size):
+            try:
+                raw = self._connect()
+            except Exception as e:
+                print(f"Connection pool warm-up failed: {e}")
+                break
+            self._idle.append(self._register(raw))
+
+    # ------------------------------------------------------------------
+    # internal helpers
+    # ------------------------------------------------------------------
+    def _total(self):
+        return self._checked_out + len(self._idle)
+
+    def _register(self, raw):
+        now = time.monotonic()
+        self._meta[id(raw)] = {'created': now, 'uses': 0, 'last_used': now}
+        self._created += 1
+        return raw
+
+    def _destroy(self, raw):
+        self._meta.pop(id(raw), None)
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _expired(self, raw, now):
+        meta = self._meta.get(id(raw))
+        if meta is None:
+            return True
+        if self.max_uses and meta['uses'] >= self.max_uses:
+            return True
+        if self.max_lifetime and now - meta['created'] >= self.max_lifetime:
+            return True
+        return False
+
+    def _alive(self, raw, now):
+        meta = self._meta.get(id(raw))
+        if meta and now - meta['last_used'] < self.ping_interval:
+            return True
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------------
+    # public API
+    # ------------------------------------------------------------------
+    def acquire(self, timeout=None):
+        """Check out a connection, opening a new one if the pool has room"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        wait_started = None
+
+        while True:
+            raw = None
+            open_new = False
+            with self._cond:
+                while not self._idle and self._total() >= self.max_size:
+                    if not waited:
+                        waited = True
+                        wait_started = time.monotonic()
+                        self._waits += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        self._wait_time += time.monotonic() - wait_started
+                        raise PoolTimeout(
+                            f"No database connection available after {timeout}s"
+                        )
+                    self._cond.wait(remaining)
+
+                if waited:
+                    self._wait_time += time.monotonic() - wait_started
+                    waited = False
+
+                if self._idle:
+                    raw = self._idle.pop()
+                else:
+                    open_new = True
+                # Reserve the slot before doing any I/O outside the lock
+                self._checked_out += 1
+
+            if open_new:
+                try:
+                    raw = self._connect()
+                    with self._cond:
+                        self._register(raw)
+                except Exception:
+                    with self._cond:
+                        self._checked_out -= 1
+                        self._cond.notify()
+                    raise
+            else:
+                now = time.monotonic()
+                if self._expired(raw, now) or not self._alive(raw, now):
+                    with self._cond:
+                        if self._expired(raw, now):
+                            self._recycled += 1
+                        else:
+                            self._discarded += 1
+                        self._destroy(raw)
+                        self._checked_out -= 1
+                        self._cond.notify()
+                    continue
+
+            with self._cond:
+                meta = self._meta[id(raw)]
+                meta['uses'] += 1
+                meta['last_used'] = time.monotonic()
+            return PooledConnection(self, raw)
+
+    def release(self, raw):
+        """Return a connection, rolling back any transaction left open"""
+        healthy = True
+        try:
+            if getattr(raw, 'server_status', 0) & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                raw.rollback()
+        except Exception:
+            healthy = False
+
+        with self._cond:
+            self._checked_out -= 1
+            now = time.monotonic()
+            if self._closed or not healthy or not getattr(raw, 'open', True):
+                self._discarded += 1
+                self._destroy(raw)
+            elif self._expired(raw, now):
+                self._recycled += 1
+                self._destroy(raw)
+            else:
+                self._meta[id(raw)]['last_used'] = now
+                self._idle.append(raw)
+            self._cond.notify()
+
+    def close(self):
+        """Close every idle connection; checked-out ones close on release"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._destroy(self._idle.pop())
+
+    def stats(self):
+        with self._cond:
+            return {
+                'checked_out': self._checked_out,
+                'idle': len(self._idle),
+                'total': self._total(),
+                'max_size': self.max_size,
+                'waits': self._waits,
+                'wait_time': round(self._wait_time, 6),
+                'timeouts': self._timeouts,
+                'created': self._created,
+                'recycled': self._recycled,
+                'discarded': self._discarded,
+            }
+
+
+def _connect():
+    return pymysql.connect(
+        host=Config.DB_HOST,
+        user=Config.DB_USER,
+        password=Config.DB_PASSWORD,
+        database=Config.DB_NAME,
+        port=Config.DB_PORT,
+        cursorclass=pymysql.cursors.DictCursor,
+        autocommit=False
+    )
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _connect,
+                    min_size=Config.DB_POOL_MIN_SIZE,
+                    max_size=Config.DB_POOL_MAX_SIZE,
+                    max_uses=Config.DB_POOL_MAX_USES,
+                    max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                    timeout=Config.DB_POOL_TIMEOUT,
+                    ping_interval=Config.DB_POOL_PING_INTERVAL,
+                )
+    return _pool
+
+
+def get_pool_stats():
+    """Pool statistics, or None if no connection has been requested yet"""
+    return _pool.stats() if _pool is not None else None
+
+
 def get_db_connection():
-    """Create and return database connection"""
+    """Check out a pooled database connection; close() returns it to the pool"""
     try:
-        connection = pymysql.connect(
-            host=Config.DB_HOST,
-            user=Config.DB_USER,
-            password=Config.DB_PASSWORD,
-            database=Config.DB_NAME,
-            port=Config.DB_PORT,
-            cursorclass=pymysql.cursors.DictCursor,
-            autocommit=False
-        )
-        return connection
+        return get_pool().acquire()
+    except PoolTimeout as e:
+        print(f"Database pool exhausted: {e}")
+        return None
     except pymysql.Error as e:
         print(f"Error connecting to MySQL: {e}")
         return None
@@ -42,3 +310,27 @@ def execute_query(query, params=None, fetch=False):
         return None
     finally:
         connection.close()
+
+
+def add_column_if_missing(cursor, table, column, definition):
+    """Add a column unless it already exists (MySQL has no ADD COLUMN IF NOT EXISTS)"""
+    cursor.execute("""
+        SELECT COUNT(*) as found FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    if cursor.fetchone()['found']:
+        return False
+    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+
+def add_index_if_missing(cursor, table, index, columns):
+    """Create an index unless one with the same name already exists"""
+    cursor.execute("""
+        SELECT COUNT(*) as found FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (table, index))
+    if cursor.fetchone()['found']:
+        return False
+    cursor.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+    return True
@@ -0,0 +1,119 @@
+import threading
+from config import Config
+from utils.db import get_db_connection, add_column_if_missing, add_index_if_missing
+from utils.schema import ensure, is_applied
+
+
+# Repairs application_count / round_count wherever they disagree with the base tables
+RECONCILE_QUERY = """
+    UPDATE placement_drives pd
+    LEFT JOIN (SELECT drive_id, COUNT(*) AS n FROM applications GROUP BY drive_id) a
+        ON a.drive_id = pd.id
+    LEFT JOIN (SELECT drive_id, COUNT(*) AS n FROM rounds GROUP BY drive_id) r
+        ON r.drive_id = pd.id
+    SET pd.application_count = COALESCE(a.n, 0),
+        pd.round_count = COALESCE(r.n, 0)
+    WHERE pd.application_count <> COALESCE(a.n, 0)
+       OR pd.round_count <> COALESCE(r.n, 0)
+"""
+
+
+def _add_counters(cursor):
+    add_column_if_missing(cursor, 'placement_drives', 'application_count', 'INT NOT NULL DEFAULT 0')
+    add_column_if_missing(cursor, 'placement_drives', 'round_count', 'INT NOT NULL DEFAULT 0')
+    # Student drive listing: status = 'active' AND application_deadline > NOW()
+    add_index_if_missing(cursor, 'placement_drives', 'idx_drives_status_deadline',
+                         'status, application_deadline')
+    # Backfill; a no-op once the counters are in step
+    cursor.execute(RECONCILE_QUERY)
+
+
+def ensure_drive_counters():
+    """Add and backfill the counters; run at startup, never from a request"""
+    return ensure('drive_counters', _add_counters)
+
+
+def drive_counters_ready():
+    """Whether handlers may read and maintain the counter columns"""
+    return is_applied('drive_counters')
+
+
+def increment_application_count(cursor, drive_id, delta=1):
+    """Adjust the counter inside the caller's transaction"""
+    cursor.execute("""
+        UPDATE placement_drives SET application_count = application_count + %s
+        WHERE id = %s
+    """, (delta, drive_id))
+
+
+def set_round_count(cursor, drive_id, count):
+    cursor.execute("UPDATE placement_drives SET round_count = %s WHERE id = %s", (count, drive_id))
+
+
+def reconcile(conn):
+    """Fix drifted counters in one statement; returns the number of drives repaired"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(RECONCILE_QUERY)
+        repaired = cursor.rowcount
+        conn.commit()
+        return repaired
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+class DriveCounterReconciler:
+    """Periodically recounts drive counters to repair drift from manual
+    edits or writes made outside the API."""
+
+    def __init__(self, interval=None):
+        self.interval = interval or Config.DRIVE_COUNTER_RECONCILE_INTERVAL
+        self._stopping = threading.Event()
+        self._thread = None
+        self.runs = 0
+        self.repaired = 0
+
+    def run_once(self):
+        if not ensure_drive_counters():
+            return 0
+        conn = get_db_connection()
+        if not conn:
+            return 0
+        try:
+            repaired = reconcile(conn)
+            self.runs += 1
+            self.repaired += repaired
+            if repaired:
+                print(f"Drive counters: repaired {repaired} drive(s)")
+            return repaired
+        finally:
+            conn.close()
+
+    def _loop(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Drive counter reconcile error: {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='drive-counter-reconciler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_reconciler = DriveCounterReconciler()
+
+
+def get_drive_counter_reconciler():
+    return _reconciler
@@ -0,0 +1,117 @@
+"""Eligibility rules for students against placement drives.
+
+Drive-independent checks (HOD approval, resume, CGPA on file) are computed
+once per student and drive thresholds once per drive, so evaluating one
+student against every drive, or one drive against every student, is a
+single pass over already-loaded rows.
+"""
+
+# Only the columns the rules need; handlers should not SELECT * for this
+STUDENT_COLUMNS = "s.id, s.user_id, s.is_approved, s.resume_url, s.cgpa, s.backlogs"
+DRIVE_COLUMNS = "pd.id, pd.min_cgpa, pd.max_backlogs"
+
+
+def _to_float(value):
+    return float(value) if value is not None else None
+
+
+def profile_issues(student):
+    """Issues that block a student from every drive"""
+    issues = []
+    if not student['is_approved']:
+        issues.append({'type': 'critical', 'code': 'not_approved',
+                       'message': 'Profile not approved by HOD'})
+    if not student['resume_url']:
+        issues.append({'type': 'critical', 'code': 'no_resume',
+                       'message': 'Resume not uploaded'})
+    if not student['cgpa']:
+        issues.append({'type': 'profile', 'code': 'no_cgpa',
+                       'message': 'CGPA not updated in profile'})
+    return issues
+
+
+def drive_issues(student, drive):
+    """Issues specific to one drive's CGPA and backlog thresholds"""
+    issues = []
+    cgpa = _to_float(student['cgpa'])
+    min_cgpa = _to_float(drive['min_cgpa']) or 0.0
+    if cgpa and cgpa < min_cgpa:
+        issues.append({
+            'type': 'eligibility', 'code': 'cgpa_below_min',
+            'message': f"CGPA too low (Required: {drive['min_cgpa']}, Yours: {student['cgpa']})"
+        })
+    backlogs = student['backlogs'] or 0
+    if drive['max_backlogs'] is not None and backlogs > drive['max_backlogs']:
+        issues.append({
+            'type': 'eligibility', 'code': 'too_many_backlogs',
+            'message': f"Too many backlogs (Allowed: {drive['max_backlogs']}, Yours: {student['backlogs']})"
+        })
+    return issues
+
+
+def evaluate(student, drive):
+    """Evaluate one pair; returns {'eligible': bool, 'issues': [...]}"""
+    issues = profile_issues(student) + drive_issues(student, drive)
+    return {'eligible': not issues, 'issues': issues}
+
+
+def evaluate_student(student, drives):
+    """Evaluate one student against many drives in one pass"""
+    base = profile_issues(student)
+    results = []
+    for drive in drives:
+        issues = base + drive_issues(student, drive)
+        results.append({'drive_id': drive['id'], 'eligible': not issues, 'issues': issues})
+    return results
+
+
+def evaluate_drive(drive, students, include_ineligible=False):
+    """Evaluate many students against one drive in one pass.
+
+    Eligibility is decided on plain columns first; issue lists are only
+    built for the ineligible students when ``include_ineligible`` is set.
+    """
+    min_cgpa = _to_float(drive['min_cgpa']) or 0.0
+    max_backlogs = drive['max_backlogs']
+    results = []
+    for student in students:
+        cgpa = _to_float(student['cgpa'])
+        eligible = (
+            bool(student['is_approved'])
+            and bool(student['resume_url'])
+            and bool(cgpa)
+            and cgpa >= min_cgpa
+            and (max_backlogs is None or (student['backlogs'] or 0) <= max_backlogs)
+        )
+        if eligible:
+            results.append({'student_id': student['id'], 'eligible': True, 'issues': []})
+        elif include_ineligible:
+            issues = profile_issues(student) + drive_issues(student, drive)
+            results.append({'student_id': student['id'], 'eligible': False, 'issues': issues})
+    return results
+
+
+def eligible_counts(drives, students):
+    """Eligible-student count per drive for the full students x drives matrix.
+
+    Students who fail a drive-independent check are dropped once up front,
+    and the rest are sorted by CGPA so each drive only scans students at or
+    above its cut-off.
+    """
+    candidates = sorted(
+        ((float(s['cgpa']), s['backlogs'] or 0) for s in students
+         if s['is_approved'] and s['resume_url'] and s['cgpa']),
+        reverse=True
+    )
+    counts = {}
+    for drive in drives:
+        min_cgpa = _to_float(drive['min_cgpa']) or 0.0
+        max_backlogs = drive['max_backlogs']
+        count = 0
+        for cgpa, backlogs in candidates:
+            if cgpa < min_cgpa:
+                break
+            if max_backlogs is None or backlogs <= max_backlogs:
+                count += 1
+        counts[drive['id']] = count
+    return counts
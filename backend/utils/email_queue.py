@@ -0,0 +1,397 @@
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from config import Config
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT UNIQUE,
+    to_email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    html TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_at REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (status, next_attempt_at);
+
+CREATE TABLE IF NOT EXISTS email_dead_letters (
+    id INTEGER PRIMARY KEY,
+    idempotency_key TEXT,
+    to_email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    html TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    failed_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS email_sent_keys (
+    idempotency_key TEXT PRIMARY KEY,
+    sent_at REAL NOT NULL
+);
+"""
+
+
+class EmailQueue:
+    """Persistent outbound email queue drained by a pool of worker threads.
+
+    Jobs live in a local SQLite file so they survive restarts. Failed sends
+    are retried with exponential backoff and moved to ``email_dead_letters``
+    after ``max_attempts``. An idempotency key (user + event) makes repeated
+    enqueues of the same message a no-op, including after it has been sent.
+
+    Several processes may share the file. A claimed job is leased for
+    ``lease`` seconds; only jobs whose lease ran out (the claiming process
+    died or hung mid-send) are claimed again, so longer than any send takes.
+    """
+
+    def __init__(self, path, transport, workers=2, max_attempts=5,
+                 base_delay=2.0, max_delay=300.0, poll_interval=1.0, lease=300.0):
+        self.path = path
+        self.transport = transport
+        self.worker_count = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.lease = lease
+
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._sent = 0
+        self._failed_attempts = 0
+        self._dead = 0
+        self._sent_times = deque(maxlen=10000)
+
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        # Queue files created before leases; their 'sending' rows count as expired
+        if 'claimed_at' not in [row['name'] for row in conn.execute("PRAGMA table_info(email_outbox)")]:
+            conn.execute("ALTER TABLE email_outbox ADD COLUMN claimed_at REAL")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # producer side
+    # ------------------------------------------------------------------
+    def enqueue(self, to_email, subject, html, idempotency_key=None):
+        """Persist an email for delivery; returns the job id, or None if duplicate"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if idempotency_key and conn.execute(
+                "SELECT 1 FROM email_sent_keys WHERE idempotency_key = ?",
+                (idempotency_key,)
+            ).fetchone():
+                conn.execute("COMMIT")
+                return None
+            cursor = conn.execute(
+                """INSERT OR IGNORE INTO email_outbox
+                   (idempotency_key, to_email, subject, html, status, next_attempt_at, created_at)
+                   VALUES (?, ?, ?, ?, 'pending', ?, ?)""",
+                (idempotency_key, to_email, subject, html, time.time(), time.time())
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if cursor.rowcount == 0:
+            return None
+        self._wakeup.set()
+        return cursor.lastrowid
+
+    def enqueue_many(self, messages, chunk_size=500):
+        """Persist many ``(to_email, subject, html, idempotency_key)`` in one transaction.
+
+        Returns the number of jobs queued; duplicates and keys that were
+        already sent are skipped as in enqueue().
+        """
+        messages = list(messages)
+        if not messages:
+            return 0
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            keys = [m[3] for m in messages if m[3]]
+            sent = set()
+            # SQLite caps bound parameters per statement, so look keys up in chunks
+            for i in range(0, len(keys), chunk_size):
+                chunk = keys[i:i + chunk_size]
+                sent.update(row[0] for row in conn.execute(
+                    f"SELECT idempotency_key FROM email_sent_keys "
+                    f"WHERE idempotency_key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ))
+            now = time.time()
+            before = conn.total_changes
+            conn.executemany(
+                """INSERT OR IGNORE INTO email_outbox
+                   (idempotency_key, to_email, subject, html, status, next_attempt_at, created_at)
+                   VALUES (?, ?, ?, ?, 'pending', ?, ?)""",
+                [(key, to_email, subject, html, now, now)
+                 for to_email, subject, html, key in messages if not key or key not in sent]
+            )
+            queued = conn.total_changes - before
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if queued:
+            self._wakeup.set()
+        return queued
+
+    # ------------------------------------------------------------------
+    # consumer side
+    # ------------------------------------------------------------------
+    def _claim(self):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                """SELECT * FROM email_outbox
+                   WHERE (status = 'pending' AND next_attempt_at <= ?)
+                      OR (status = 'sending' AND COALESCE(claimed_at, 0) <= ?)
+                   ORDER BY next_attempt_at LIMIT 1""",
+                (now, now - self.lease)
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE email_outbox SET status = 'sending', claimed_at = ? WHERE id = ?",
+                             (now, row['id']))
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _backoff(self, attempts):
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _deliver(self, job):
+        with self._stats_lock:
+            self._in_flight += 1
+        try:
+            ok = self.transport(job['to_email'], job['subject'], job['html'])
+            error = None if ok else 'transport returned failure'
+        except Exception as e:
+            ok, error = False, str(e)
+        finally:
+            with self._stats_lock:
+                self._in_flight -= 1
+
+        conn = self._conn()
+        now = time.time()
+        attempts = job['attempts'] + 1
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._record_outcome(conn, job, ok, error, attempts, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._stats_lock:
+            if ok:
+                self._sent += 1
+                self._sent_times.append(now)
+            else:
+                self._failed_attempts += 1
+                if attempts >= self.max_attempts:
+                    self._dead += 1
+                    print(f"Email to {job['to_email']} moved to dead letters: {error}")
+
+    def _record_outcome(self, conn, job, ok, error, attempts, now):
+        if ok:
+            if job['idempotency_key']:
+                conn.execute(
+                    "INSERT OR REPLACE INTO email_sent_keys (idempotency_key, sent_at) VALUES (?, ?)",
+                    (job['idempotency_key'], now)
+                )
+            conn.execute("DELETE FROM email_outbox WHERE id = ?", (job['id'],))
+        elif attempts >= self.max_attempts:
+            conn.execute(
+                """INSERT INTO email_dead_letters
+                   (id, idempotency_key, to_email, subject, html, attempts, last_error, created_at, failed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (job['id'], job['idempotency_key'], job['to_email'], job['subject'], job['html'],
+                 attempts, error, job['created_at'], now)
+            )
+            conn.execute("DELETE FROM email_outbox WHERE id = ?", (job['id'],))
+        else:
+            conn.execute(
+                """UPDATE email_outbox
+                   SET status = 'pending', attempts = ?, next_attempt_at = ?, last_error = ?,
+                       claimed_at = NULL
+                   WHERE id = ?""",
+                (attempts, now + self._backoff(attempts), error, job['id'])
+            )
+
+    def process_due(self, limit=None):
+        """Deliver due jobs on the calling thread; returns how many were attempted"""
+        done = 0
+        while limit is None or done < limit:
+            job = self._claim()
+            if job is None:
+                break
+            self._deliver(job)
+            done += 1
+        return done
+
+    def _worker(self):
+        while not self._stopping.is_set():
+            try:
+                job = self._claim()
+            except Exception as e:
+                print(f"Email queue claim error: {e}")
+                job = None
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            try:
+                self._deliver(job)
+            except Exception as e:
+                print(f"Email queue worker error: {e}")
+
+    def start(self):
+        with self._start_lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            for i in range(self.worker_count):
+                t = threading.Thread(target=self._worker, name=f"email-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def stop(self, drain=True, timeout=10.0):
+        """Stop the workers, optionally waiting for due jobs to be delivered first"""
+        deadline = time.time() + timeout
+        if drain:
+            while time.time() < deadline and (self.depth(due_only=True) or self._in_flight):
+                self._wakeup.set()
+                time.sleep(0.05)
+        self._stopping.set()
+        self._wakeup.set()
+        for t in self._threads:
+            t.join(max(0.0, deadline - time.time()))
+        self._threads = []
+
+    # ------------------------------------------------------------------
+    # observability
+    # ------------------------------------------------------------------
+    def depth(self, due_only=False):
+        query = "SELECT COUNT(*) FROM email_outbox WHERE status IN ('pending', 'sending')"
+        params = ()
+        if due_only:
+            query += " AND next_attempt_at <= ?"
+            params = (time.time(),)
+        return self._conn().execute(query, params).fetchone()[0]
+
+    def stats(self, window=60):
+        now = time.time()
+        with self._stats_lock:
+            recent = sum(1 for t in self._sent_times if now - t <= window)
+            stats = {
+                'in_flight': self._in_flight,
+                'sent': self._sent,
+                'failed_attempts': self._failed_attempts,
+                'dead': self._dead,
+                'workers': len(self._threads),
+            }
+        stats['depth'] = self.depth()
+        stats['dead_letters'] = self._conn().execute(
+            "SELECT COUNT(*) FROM email_dead_letters").fetchone()[0]
+        stats['throughput_per_min'] = round(recent * 60.0 / window, 2)
+        return stats
+
+
+def _resend_transport(to_email, subject, html_content):
+    from utils.email_service import send_email
+    return send_email(to_email, subject, html_content)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_email_queue():
+    """Return the process-wide email queue, starting its workers on first use"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                queue = EmailQueue(
+                    Config.EMAIL_QUEUE_PATH,
+                    _resend_transport,
+                    workers=Config.EMAIL_QUEUE_WORKERS,
+                    max_attempts=Config.EMAIL_QUEUE_MAX_ATTEMPTS,
+                    base_delay=Config.EMAIL_QUEUE_BASE_DELAY,
+                    lease=Config.EMAIL_QUEUE_LEASE,
+                )
+                queue.start()
+                _queue = queue
+    return _queue
+
+
+def stop_email_queue(timeout=None):
+    """Deliver what is due, up to ``timeout`` seconds, then stop the workers"""
+    if _queue is not None:
+        _queue.stop(drain=True, timeout=timeout or Config.EMAIL_DRAIN_TIMEOUT)
+
+
+def get_email_queue_stats():
+    """Queue statistics, or None if the queue has not been used yet"""
+    return _queue.stats() if _queue is not None else None
+
+
+def queue_email(to_email, subject, html_content, user_id=None, event=None):
+    """Enqueue an email for background delivery.
+
+    When both ``user_id`` and ``event`` are given they form the idempotency
+    key, so the same user is never sent the same event twice.
+    """
+    key = f"{user_id}:{event}" if user_id is not None and event else None
+    try:
+        return get_email_queue().enqueue(to_email, subject, html_content, idempotency_key=key)
+    except Exception as e:
+        print(f"Failed to queue email: {e}")
+        return None
+
+
+def queue_emails(messages):
+    """Enqueue ``(to_email, subject, html, user_id, event)`` tuples in one batch.
+
+    Idempotency keys are formed as in queue_email. Returns the number queued.
+    """
+    batch = [(to_email, subject, html, f"{user_id}:{event}" if user_id is not None and event else None)
+             for to_email, subject, html, user_id, event in messages]
+    if not batch:
+        return 0
+    try:
+        return get_email_queue().enqueue_many(batch)
+    except Exception as e:
+        print(f"Failed to queue emails: {e}")
+        return 0
@@ -239,3 +239,47 @@ def get_rejected_email(student_name, company_name, job_role):
     </html>
     """
     return html
+
+
+def get_imported_account_email(name, email, token, expires_hours):
+    """Account created by staff import; links to a single-use set-password page
+    rather than carrying any password"""
+    html = f"""
+    <html>
+    <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <div style="background: linear-gradient(135deg, #14B8A6 0%, #0EA5E9 100%); padding: 30px; text-align: center;">
+            <h1 style="color: white; margin: 0;">Your Placement Portal Account 🎓</h1>
+        </div>
+        
+        <div style="padding: 30px; background: #f9fafb;">
+            <h2 style="color: #1f2937;">Hello {name}!</h2>
+            
+            <p style="color: #4b5563; line-height: 1.6;">
+                Your college has created a Placement Portal account for you.
+            </p>
+            
+            <div style="background: white; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                <p style="margin: 5px 0;"><strong>Email:</strong> {email}</p>
+            </div>
+            
+            <p style="color: #4b5563;">
+                Please choose your password, then login and complete your profile.
+                This link works once and expires in {expires_hours} hours.
+            </p>
+            
+            <div style="text-align: center; margin: 30px 0;">
+                <a href="http://localhost:5173/set-password?token={token}" 
+                   style="background: #14B8A6; color: white; padding: 12px 30px; 
+                          text-decoration: none; border-radius: 6px; font-weight: bold;">
+                    Set Password
+                </a>
+            </div>
+        </div>
+        
+        <div style="text-align: center; padding: 20px; color: #9ca3af; font-size: 12px;">
+            <p>© 2025 Placement Portal. All rights reserved.</p>
+        </div>
+    </body>
+    </html>
+    """
+    return html
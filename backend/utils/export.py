@@ -0,0 +1,135 @@
+import csv
+import io
+import re
+import tempfile
+from decimal import Decimal
+import pymysql
+from flask import Response
+from openpyxl import Workbook
+from config import Config
+
+
+# (header, row key) for application exports, in sheet order
+APPLICATION_EXPORT_COLUMNS = [
+    ('Application ID', 'id'),
+    ('Enrollment Number', 'enrollment_number'),
+    ('First Name', 'first_name'),
+    ('Last Name', 'last_name'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Department', 'department_name'),
+    ('CGPA', 'cgpa'),
+    ('Backlogs', 'backlogs'),
+    ('Company', 'company_name'),
+    ('Job Role', 'job_role'),
+    ('Status', 'status'),
+    ('Current Round', 'current_round'),
+    ('Applied At', 'applied_at'),
+]
+
+APPLICATION_EXPORT_QUERY = """
+    SELECT
+        a.id, s.enrollment_number, s.first_name, s.last_name, u.email, s.phone,
+        d.name as department_name, s.cgpa, s.backlogs,
+        c.name as company_name, pd.job_role, a.status, a.current_round, a.applied_at
+    FROM applications a
+    JOIN students s ON a.student_id = s.id
+    JOIN users u ON s.user_id = u.id
+    JOIN departments d ON s.department_id = d.id
+    JOIN placement_drives pd ON a.drive_id = pd.id
+    JOIN companies c ON pd.company_id = c.id
+"""
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def iter_rows(cursor, batch_size=None):
+    """Yield rows from an unbuffered cursor without materialising the result"""
+    batch_size = batch_size or Config.EXPORT_BATCH_SIZE
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def csv_chunks(rows, columns, rows_per_chunk=500):
+    """Encode rows as CSV, yielding a chunk every ``rows_per_chunk`` rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so Excel opens the file as UTF-8
+    buffer.write('\ufeff')
+    writer.writerow([header for header, _ in columns])
+    for i, row in enumerate(rows, 1):
+        writer.writerow([row.get(key) for _, key in columns])
+        if i % rows_per_chunk == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _sheet_title(title):
+    # Excel forbids these characters in sheet names and caps them at 31 chars
+    return re.sub(r'[\\/*?:\[\]]', '-', title)[:31] or 'Sheet'
+
+
+def _cell(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def xlsx_chunks(rows, columns, sheet_title='Applications', chunk_size=64 * 1024):
+    """Write rows to a write-only workbook, then stream the saved file.
+
+    Write-only sheets flush rows to a temp file as they are appended, so
+    memory stays flat; the zip container can only be emitted once complete.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=_sheet_title(sheet_title))
+    sheet.append([header for header, _ in columns])
+    for row in rows:
+        sheet.append([_cell(row.get(key)) for _, key in columns])
+    with tempfile.SpooledTemporaryFile(max_size=Config.EXPORT_SPOOL_SIZE) as f:
+        workbook.save(f)
+        f.seek(0)
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def stream_export(conn, query, params, columns, export_format, filename, sheet_title='Applications'):
+    """Stream query results as a CSV or XLSX download.
+
+    Takes ownership of ``conn``: rows are read through a server-side cursor
+    while the response is sent, and the connection is released when the
+    body finishes or the client disconnects.
+    """
+    def generate():
+        cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+        try:
+            cursor.execute(query, params)
+            rows = iter_rows(cursor)
+            if export_format == 'csv':
+                yield from csv_chunks(rows, columns)
+            else:
+                yield from xlsx_chunks(rows, columns, sheet_title)
+        except Exception as e:
+            print(f"Export stream error: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    response = Response(generate(), mimetype=EXPORT_FORMATS[export_format], headers={
+        'Content-Disposition': f'attachment; filename="{filename}.{export_format}"',
+        'X-Accel-Buffering': 'no',
+    })
+    # Covers a body that is never iterated; close() is a no-op the second time
+    response.call_on_close(conn.close)
+    return response
@@ -0,0 +1,120 @@
+import hashlib
+import threading
+from datetime import datetime, timezone
+from functools import wraps
+from flask import request, make_response
+from flask_jwt_extended import get_jwt_identity
+from config import Config
+from utils.cache import TTLCache
+
+
+# Entity name -> version stamp, moved on by bump() after committed writes
+_versions = {}
+_versions_lock = threading.Lock()
+
+# Role -> cached responses; roles never share entries
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _role_ttls():
+    ttls = {}
+    for item in Config.HTTP_CACHE_ROLE_TTLS.split(','):
+        role, _, ttl = item.partition(':')
+        if role.strip() and ttl.strip():
+            ttls[role.strip()] = int(ttl)
+    return ttls
+
+
+ROLE_TTLS = _role_ttls()
+
+
+def bump(*entities):
+    """Invalidate cached responses built from ``entities``; call after commit"""
+    with _versions_lock:
+        for entity in entities:
+            _versions[entity] = _versions.get(entity, 0) + 1
+
+
+def versions(entities):
+    return tuple(_versions.get(entity, 0) for entity in entities)
+
+
+def _cache_for(role):
+    cache = _caches.get(role)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(role, TTLCache(
+                maxsize=Config.HTTP_CACHE_SIZE,
+                ttl=ROLE_TTLS.get(role, Config.HTTP_CACHE_TTL)
+            ))
+    return cache
+
+
+def _respond(entry, private):
+    response = make_response(entry['body'])
+    response.mimetype = entry['mimetype']
+    response.set_etag(entry['etag'])
+    response.last_modified = entry['last_modified']
+    response.headers['Cache-Control'] = f"{'private' if private else 'public'}, no-cache"
+    return response.make_conditional(request)
+
+
+def cached_response(*entities, per_user=False, public=False, ttl=None):
+    """Cache a GET view's successful responses and answer conditional requests.
+
+    ``entities`` name what the response is built from; a cached copy is used
+    only while none of them has been bumped since it was built, and for at
+    most the role's TTL otherwise. Entries are kept per role, and per user
+    as well with ``per_user`` for responses that include the caller's own
+    data. ``public`` views are cached once for everyone and must not need a
+    JWT. The ETag is a digest of the body, so it stays strong when an expired
+    entry is rebuilt, and If-None-Match / If-Modified-Since get a 304.
+
+    Goes below ``@jwt_required()`` so the identity is available.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if public:
+                role, user_id = 'public', None
+            else:
+                identity = get_jwt_identity() or {}
+                role = identity.get('role')
+                user_id = identity.get('user_id') if per_user else None
+
+            cache = _cache_for(role)
+            key = (request.path, request.query_string, user_id)
+            # Taken before the view runs, so a write landing meanwhile leaves
+            # the entry stale rather than marking old data current
+            stamps = versions(entities)
+            entry = cache.get(key)
+            if entry is not None and entry['stamps'] == stamps:
+                return _respond(entry, not public)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+
+            body = response.get_data()
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+            if entry is not None and entry['etag'] == etag:
+                last_modified = entry['last_modified']
+            entry = {'stamps': stamps, 'etag': etag, 'last_modified': last_modified,
+                     'body': body, 'mimetype': response.mimetype}
+            cache.set(key, entry, ttl)
+            return _respond(entry, not public)
+        return wrapper
+    return decorator
+
+
+def clear_http_cache():
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.clear()
+
+
+def get_http_cache_stats():
+    with _caches_lock:
+        return {role: cache.stats() for role, cache in _caches.items()}
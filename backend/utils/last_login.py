@@ -0,0 +1,110 @@
+import atexit
+import threading
+from datetime import datetime
+from config import Config
+from utils.db import get_db_connection
+
+
+# Users updated per statement
+CHUNK_SIZE = 500
+
+
+def _update_query(count):
+    values = " UNION ALL ".join(["SELECT %s AS id, %s AS last_login"] * count)
+    return f"""
+        UPDATE users u
+        JOIN ({values}) v ON v.id = u.id
+        SET u.last_login = v.last_login
+    """
+
+
+class LastLoginFlusher:
+    """Collects logins in memory and writes last_login for every user seen
+    since the previous flush in one statement, so logging in costs no write
+    transaction. Only the latest time per user is kept."""
+
+    def __init__(self, interval=None):
+        self.interval = interval or Config.LAST_LOGIN_FLUSH_INTERVAL
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+        self.flushes = 0
+        self.written = 0
+
+    def record(self, user_id, when=None):
+        when = when or datetime.now()
+        with self._lock:
+            if when > self._pending.get(user_id, when.min):
+                self._pending[user_id] = when
+
+    def _restore(self, batch):
+        # Put back what failed unless a newer login arrived meanwhile
+        with self._lock:
+            for user_id, when in batch.items():
+                if when > self._pending.get(user_id, when.min):
+                    self._pending[user_id] = when
+
+    def run_once(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        conn = get_db_connection()
+        if not conn:
+            self._restore(batch)
+            return 0
+        try:
+            cursor = conn.cursor()
+            rows = sorted(batch.items())
+            for i in range(0, len(rows), CHUNK_SIZE):
+                chunk = rows[i:i + CHUNK_SIZE]
+                cursor.execute(_update_query(len(chunk)), [value for row in chunk for value in row])
+            conn.commit()
+            self.flushes += 1
+            self.written += len(rows)
+            return len(rows)
+        except Exception:
+            conn.rollback()
+            self._restore(batch)
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _loop(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Last login flush error: {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name='last-login-flusher', daemon=True)
+        self._thread.start()
+        # Logins recorded since the last tick would otherwise be lost on exit
+        atexit.register(self.stop)
+
+    def stop(self, timeout=5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            self.run_once()
+        except Exception as e:
+            print(f"Last login flush error: {e}")
+
+    def stats(self):
+        return {'pending': len(self._pending), 'flushes': self.flushes, 'written': self.written}
+
+
+_flusher = LastLoginFlusher()
+
+
+def get_last_login_flusher():
+    return _flusher
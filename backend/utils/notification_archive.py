@@ -0,0 +1,222 @@
+import json
+import threading
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from config import Config
+from utils.db import get_db_connection, add_index_if_missing
+from utils.schema import ensure, is_applied
+
+
+ARCHIVE_FIELDS = ('id', 'title', 'message', 'type', 'related_entity_type', 'related_entity_id', 'created_at')
+
+
+def _add_archive(cursor):
+    # One compressed chunk per user per month; re-archiving merges into it
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS notification_archive (
+            user_id INT NOT NULL,
+            month CHAR(7) NOT NULL,
+            first_id INT NOT NULL,
+            last_id INT NOT NULL,
+            notification_count INT NOT NULL,
+            payload MEDIUMBLOB NOT NULL,
+            archived_at DATETIME NOT NULL,
+            PRIMARY KEY (user_id, month),
+            INDEX idx_notification_archive_user_last (user_id, last_id)
+        )
+    """)
+    # The retention sweep walks read notifications oldest first
+    add_index_if_missing(cursor, 'notifications', 'idx_notifications_read_created', 'is_read, created_at')
+
+
+def ensure_notification_archive():
+    """Create the archive table and sweep index; run at startup, never from a request"""
+    return ensure('notification_archive', _add_archive)
+
+
+def notification_archive_ready():
+    return is_applied('notification_archive')
+
+
+def pack(notifications):
+    """Compress notification dicts, newest first, into an archive payload"""
+    rows = sorted(notifications, key=lambda n: n['id'], reverse=True)
+    return zlib.compress(json.dumps(rows, default=str, separators=(',', ':')).encode('utf-8'))
+
+
+def unpack(payload):
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+
+def archive_batch(cursor, cutoff, limit):
+    """Move up to ``limit`` read notifications created before ``cutoff`` into
+    the archive, inside the caller's transaction. Returns rows moved."""
+    cursor.execute("""
+        SELECT id, user_id, title, message, type, related_entity_type, related_entity_id, created_at
+        FROM notifications
+        WHERE is_read = 1 AND created_at < %s
+        ORDER BY created_at, id
+        LIMIT %s
+        FOR UPDATE
+    """, (cutoff, limit))
+    rows = cursor.fetchall()
+    if not rows:
+        return 0
+
+    groups = defaultdict(list)
+    for row in rows:
+        entry = {field: row[field] for field in ARCHIVE_FIELDS}
+        entry['created_at'] = row['created_at'].isoformat()
+        groups[(row['user_id'], row['created_at'].strftime('%Y-%m'))].append(entry)
+
+    # Merge into chunks archived by earlier runs, locking them first
+    keys = sorted(groups)
+    cursor.execute(f"""
+        SELECT user_id, month, payload FROM notification_archive
+        WHERE (user_id, month) IN ({','.join(['(%s, %s)'] * len(keys))})
+        FOR UPDATE
+    """, [value for key in keys for value in key])
+    for existing in cursor.fetchall():
+        groups[(existing['user_id'], existing['month'])].extend(unpack(existing['payload']))
+
+    now = datetime.now()
+    chunks = []
+    for user_id, month in keys:
+        entries = groups[(user_id, month)]
+        ids = [entry['id'] for entry in entries]
+        chunks.append((user_id, month, min(ids), max(ids), len(entries), pack(entries), now))
+    cursor.executemany("""
+        INSERT INTO notification_archive
+            (user_id, month, first_id, last_id, notification_count, payload, archived_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            first_id = VALUES(first_id), last_id = VALUES(last_id),
+            notification_count = VALUES(notification_count),
+            payload = VALUES(payload), archived_at = VALUES(archived_at)
+    """, chunks)
+
+    ids = [row['id'] for row in rows]
+    cursor.execute(f"DELETE FROM notifications WHERE id IN ({','.join(['%s'] * len(ids))})", ids)
+    return len(rows)
+
+
+def archived_page(cursor, user_id, before_id=None, limit=20):
+    """Archived notifications for a user, newest first, with ids below ``before_id``.
+
+    Reads the chunk ranges first and then only the payloads that can hold
+    the page, newest chunk first. Chunks may overlap in id, so reading stops
+    once the next chunk cannot contain anything newer than the page's
+    oldest entry. Returns ``(notifications, next_before_id)``.
+    """
+    params = [user_id]
+    condition = ""
+    if before_id is not None:
+        condition = "AND first_id < %s"
+        params.append(before_id)
+    cursor.execute(f"""
+        SELECT month, last_id FROM notification_archive
+        WHERE user_id = %s {condition}
+        ORDER BY last_id DESC
+    """, params)
+    chunks = cursor.fetchall()
+
+    collected = []
+    for chunk in chunks:
+        if len(collected) >= limit and chunk['last_id'] < collected[limit - 1]['id']:
+            break
+        cursor.execute("SELECT payload FROM notification_archive WHERE user_id = %s AND month = %s",
+                       (user_id, chunk['month']))
+        row = cursor.fetchone()
+        if row:
+            collected.extend(n for n in unpack(row['payload'])
+                             if before_id is None or n['id'] < before_id)
+            collected.sort(key=lambda n: n['id'], reverse=True)
+
+    page = collected[:limit]
+    for notification in page:
+        notification['is_read'] = 1
+    next_before_id = page[-1]['id'] if len(page) == limit else None
+    return page, next_before_id
+
+
+def archive_read_notifications(retention_days=None, batch_size=None, max_batches=None):
+    """Archive read notifications past the retention window in batches,
+    committing each; returns the number of notifications moved"""
+    if not ensure_notification_archive():
+        return 0
+    retention_days = retention_days or Config.NOTIFICATION_RETENTION_DAYS
+    batch_size = batch_size or Config.NOTIFICATION_ARCHIVE_BATCH_SIZE
+    cutoff = datetime.now() - timedelta(days=retention_days)
+
+    conn = get_db_connection()
+    if not conn:
+        return 0
+    moved = 0
+    batches = 0
+    try:
+        cursor = conn.cursor()
+        while max_batches is None or batches < max_batches:
+            try:
+                count = archive_batch(cursor, cutoff, batch_size)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            moved += count
+            batches += 1
+            if count < batch_size:
+                break
+        return moved
+    finally:
+        cursor.close()
+        conn.close()
+
+
+class NotificationArchiver:
+    """Periodically moves read notifications older than the retention window
+    out of the hot table into compressed per-user monthly chunks."""
+
+    def __init__(self, interval=None):
+        self.interval = interval or Config.NOTIFICATION_ARCHIVE_INTERVAL
+        self._stopping = threading.Event()
+        self._thread = None
+        self.runs = 0
+        self.archived = 0
+
+    def run_once(self):
+        moved = archive_read_notifications()
+        self.runs += 1
+        self.archived += moved
+        if moved:
+            print(f"Notification archive: moved {moved} notification(s)")
+        return moved
+
+    def _loop(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Notification archive error: {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='notification-archiver', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        return {'runs': self.runs, 'archived': self.archived}
+
+
+_archiver = NotificationArchiver()
+
+
+def get_notification_archiver():
+    return _archiver
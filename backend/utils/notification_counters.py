@@ -0,0 +1,154 @@
+import threading
+from collections import Counter
+from config import Config
+from utils.db import get_db_connection, add_index_if_missing
+from utils.schema import ensure, is_applied
+
+
+# Adds counters for users that have notifications but no counter row yet
+INSERT_MISSING_QUERY = """
+    INSERT IGNORE INTO notification_counters (user_id, unread_count)
+    SELECT user_id, SUM(is_read = 0) FROM notifications GROUP BY user_id
+"""
+
+# Repairs counters wherever they disagree with the notifications table
+RECONCILE_QUERY = """
+    UPDATE notification_counters c
+    LEFT JOIN (
+        SELECT user_id, COUNT(*) AS n FROM notifications WHERE is_read = 0 GROUP BY user_id
+    ) u ON u.user_id = c.user_id
+    SET c.unread_count = COALESCE(u.n, 0)
+    WHERE c.unread_count <> COALESCE(u.n, 0)
+"""
+
+
+def _add_counters(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS notification_counters (
+            user_id INT PRIMARY KEY,
+            unread_count INT NOT NULL DEFAULT 0
+        )
+    """)
+    # Backfill, reconcile and the fallback count read unread rows per user
+    add_index_if_missing(cursor, 'notifications', 'idx_notifications_user_read', 'user_id, is_read')
+    cursor.execute(INSERT_MISSING_QUERY)
+    cursor.execute(RECONCILE_QUERY)
+
+
+def ensure_notification_counters():
+    """Create and backfill the counters; run at startup, never from a request"""
+    return ensure('notification_counters', _add_counters)
+
+
+def notification_counters_ready():
+    """Whether handlers may read and maintain the counters table"""
+    return is_applied('notification_counters')
+
+
+def increment_unread(cursor, user_ids):
+    """Count new unread notifications inside the caller's transaction.
+
+    ``user_ids`` has one entry per notification; rows are touched in user
+    order so concurrent bulk inserts lock counters in the same order.
+    """
+    counts = sorted(Counter(user_ids).items())
+    if counts:
+        cursor.executemany("""
+            INSERT INTO notification_counters (user_id, unread_count) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE unread_count = unread_count + VALUES(unread_count)
+        """, counts)
+
+
+def decrement_unread(cursor, user_id, count):
+    """Take ``count`` notifications that were just marked read off the counter"""
+    if count:
+        cursor.execute("""
+            UPDATE notification_counters SET unread_count = GREATEST(unread_count - %s, 0)
+            WHERE user_id = %s
+        """, (count, user_id))
+
+
+def get_unread_count(cursor, user_id):
+    """Unread notifications for a user: a primary-key read of the counter,
+    or a COUNT(*) when the counters table is unavailable"""
+    if notification_counters_ready():
+        cursor.execute("SELECT unread_count FROM notification_counters WHERE user_id = %s", (user_id,))
+        row = cursor.fetchone()
+        return int(row['unread_count']) if row else 0
+    cursor.execute("""
+        SELECT COUNT(*) as unread_count
+        FROM notifications
+        WHERE user_id = %s AND is_read = 0
+    """, (user_id,))
+    return int(cursor.fetchone()['unread_count'] or 0)
+
+
+def reconcile(conn):
+    """Fix drifted or missing counters; returns the number of users repaired"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(INSERT_MISSING_QUERY)
+        repaired = cursor.rowcount
+        cursor.execute(RECONCILE_QUERY)
+        repaired += cursor.rowcount
+        conn.commit()
+        return repaired
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+class NotificationCounterReconciler:
+    """Periodically recounts unread notifications to repair counters that
+    drifted through manual edits or writes made outside the API."""
+
+    def __init__(self, interval=None):
+        self.interval = interval or Config.NOTIFICATION_COUNTER_RECONCILE_INTERVAL
+        self._stopping = threading.Event()
+        self._thread = None
+        self.runs = 0
+        self.repaired = 0
+
+    def run_once(self):
+        if not ensure_notification_counters():
+            return 0
+        conn = get_db_connection()
+        if not conn:
+            return 0
+        try:
+            repaired = reconcile(conn)
+            self.runs += 1
+            self.repaired += repaired
+            if repaired:
+                print(f"Notification counters: repaired {repaired} user(s)")
+            return repaired
+        finally:
+            conn.close()
+
+    def _loop(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Notification counter reconcile error: {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='notification-counter-reconciler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_reconciler = NotificationCounterReconciler()
+
+
+def get_notification_counter_reconciler():
+    return _reconciler
@@ -0,0 +1,233 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from config import Config
+from utils.cache import TTLCache
+
+
+class Subscription:
+    """One connected client; events are buffered until the stream drains them"""
+
+    def __init__(self, user_id, maxlen):
+        self.user_id = user_id
+        self.events = deque(maxlen=maxlen)
+        self.ready = threading.Event()
+        self.reset = False     # replay impossible; the client must refetch
+        self.closed = False
+        self._waker = None     # set while a coroutine is waiting
+
+    def notify(self):
+        self.ready.set()
+        waker = self._waker
+        if waker is not None:
+            waker()
+
+    def wait(self, timeout):
+        """Block until events arrive; returns them, or None once ``timeout`` passes"""
+        if not self.ready.wait(timeout):
+            return None
+        return self._drain()
+
+    async def wait_async(self, timeout):
+        """wait() for event loops: suspends the coroutine instead of a thread"""
+        if not self.ready.is_set():
+            loop = asyncio.get_running_loop()
+            woken = asyncio.Event()
+
+            def wake():
+                try:
+                    loop.call_soon_threadsafe(woken.set)
+                except RuntimeError:
+                    pass   # loop already closed during shutdown
+
+            self._waker = wake
+            try:
+                # Re-check: a publish may have landed before the waker was set
+                if not self.ready.is_set():
+                    await asyncio.wait_for(woken.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                self._waker = None
+        return self._drain()
+
+    def _drain(self):
+        self.ready.clear()
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+        return events
+
+
+class UserLog:
+    """The last few events published to one user, for Last-Event-ID replay"""
+
+    def __init__(self, size):
+        self.events = deque(maxlen=size)
+        self.evicted_upto = 0   # newest event id pushed out of the buffer
+
+    def append(self, event):
+        if len(self.events) == self.events.maxlen:
+            self.evicted_upto = self.events[0]['id']
+        self.events.append(event)
+
+
+class NotificationHub:
+    """In-process pub/sub for per-user notification events.
+
+    Idle subscribers sit on a threading.Event and cost nothing; work is
+    only done when something is published, so load follows events rather
+    than connected clients. Each event gets a process-wide sequence number
+    and the last ``replay`` events per user are kept, so a client that
+    reconnects with Last-Event-ID gets what it missed, or a reset when that
+    history is gone. The hub also caches each user's unread count, kept
+    current by the events themselves.
+
+    Events only reach subscribers connected to the same process.
+    """
+
+    def __init__(self, replay=50, max_users=50000, ttl=3600, queue_size=500):
+        self.queue_size = queue_size
+        self.replay = replay
+        self.max_users = max_users
+        # Millisecond-based ids keep growing across restarts, so ids issued by
+        # an earlier process are recognisably older than anything kept here
+        self.first_id = int(time.time() * 1000)
+        self._seq = itertools.count(self.first_id)
+        self._lock = threading.Lock()
+        self._subscribers = {}      # user_id -> set of Subscription
+        self._logs = OrderedDict()  # user_id -> UserLog, least recently published first
+        self._forgotten_upto = 0    # newest event id in any log dropped to bound memory
+        self._unread = TTLCache(maxsize=max_users, ttl=ttl)
+        self._closed = False
+        self.published = 0
+        self.delivered = 0
+
+    # ------------------------------------------------------------------
+    # subscribers
+    # ------------------------------------------------------------------
+    def subscribe(self, user_id, last_event_id=None):
+        """Register a client, queueing anything it missed since ``last_event_id``"""
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            subscription.closed = self._closed
+            if last_event_id is not None:
+                log = self._logs.get(user_id)
+                if last_event_id < self.first_id - 1 or last_event_id < (
+                        log.evicted_upto if log else self._forgotten_upto):
+                    subscription.reset = True
+                elif log:
+                    subscription.events.extend(e for e in log.events if e['id'] > last_event_id)
+                    if subscription.events:
+                        subscription.notify()
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscription.closed = True
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    # ------------------------------------------------------------------
+    # publishers
+    # ------------------------------------------------------------------
+    def publish(self, user_id, event_type, data, unread_delta=0):
+        self.publish_many([(user_id, event_type, data, unread_delta)])
+
+    def publish_many(self, items):
+        """Publish ``(user_id, event_type, data, unread_delta)`` tuples under one lock"""
+        woken = set()
+        with self._lock:
+            for user_id, event_type, data, unread_delta in items:
+                unread = self._unread.get(user_id)
+                if unread is not None and unread_delta:
+                    unread = max(0, unread + unread_delta)
+                    self._unread.set(user_id, unread)
+                event = {'id': next(self._seq), 'event': event_type,
+                         'data': dict(data, unread_count=unread)}
+
+                log = self._logs.get(user_id)
+                if log is None:
+                    log = self._logs[user_id] = UserLog(self.replay)
+                    if len(self._logs) > self.max_users:
+                        _, dropped = self._logs.popitem(last=False)
+                        self._forgotten_upto = max(self._forgotten_upto, dropped.events[-1]['id'])
+                else:
+                    self._logs.move_to_end(user_id)
+                log.append(event)
+                self.published += 1
+
+                for subscription in self._subscribers.get(user_id, ()):
+                    if len(subscription.events) == self.queue_size:
+                        # A client this far behind has lost events; make it refetch
+                        subscription.reset = True
+                    subscription.events.append(event)
+                    woken.add(subscription)
+            self.delivered += len(woken)
+        for subscription in woken:
+            subscription.notify()
+
+    # ------------------------------------------------------------------
+    # unread counter cache
+    # ------------------------------------------------------------------
+    def unread(self, user_id):
+        """Cached unread count, or None if this process does not know it"""
+        return self._unread.get(user_id)
+
+    def set_unread(self, user_id, count, notify=False):
+        with self._lock:
+            self._unread.set(user_id, count)
+        if notify:
+            self.publish(user_id, 'unread', {})
+
+    def close(self):
+        """Wake every subscriber so streams can finish during shutdown"""
+        with self._lock:
+            self._closed = True
+            subscriptions = [s for subs in self._subscribers.values() for s in subs]
+        for subscription in subscriptions:
+            subscription.closed = True
+            subscription.notify()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': sum(len(s) for s in self._subscribers.values()),
+                'users': len(self._subscribers),
+                'published': self.published,
+                'delivered': self.delivered,
+                'unread_cached': len(self._unread),
+            }
+
+
+def format_sse(event):
+    """Encode a hub event as a server-sent event frame; events without an id
+    leave the client's Last-Event-ID alone"""
+    frame = f"id: {event['id']}\n" if event.get('id') is not None else ""
+    return f"{frame}event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+
+_hub = NotificationHub(
+    replay=Config.NOTIFICATION_REPLAY_SIZE,
+    max_users=Config.NOTIFICATION_HUB_USERS,
+    ttl=Config.NOTIFICATION_STREAM_MAX_AGE,
+)
+
+
+def get_notification_hub():
+    return _hub
+
+
+def get_notification_hub_stats():
+    return _hub.stats()
@@ -0,0 +1,179 @@
+import time
+from datetime import datetime
+from flask import g, has_request_context
+from utils.notification_hub import get_notification_hub, format_sse
+from utils.notification_counters import notification_counters_ready, increment_unread, get_unread_count
+
+
+NOTIFICATION_COLUMNS = ('user_id', 'title', 'message', 'type', 'related_entity_type', 'related_entity_id')
+
+# Rows per statement; PyMySQL sends each chunk as one multi-row INSERT
+CHUNK_SIZE = 1000
+
+LIST_COLUMNS = "id, title, message, type, related_entity_type, related_entity_id, is_read, created_at"
+
+
+def insert_notifications(cursor, values):
+    """Insert ``(user_id, title, message, type, related_entity_type,
+    related_entity_id)`` rows inside the caller's transaction, counting
+    them on the recipients' unread counters in the same transaction.
+
+    The rows are also held on the request until publish_pending() pushes
+    them to live clients, which callers do once they have committed.
+    """
+    values = list(values)
+    for i in range(0, len(values), CHUNK_SIZE):
+        cursor.executemany("""
+            INSERT INTO notifications (user_id, title, message, type, related_entity_type, related_entity_id)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, values[i:i + CHUNK_SIZE])
+    if values and notification_counters_ready():
+        increment_unread(cursor, [row[0] for row in values])
+    if has_request_context():
+        g.setdefault('pending_notifications', []).extend(values)
+    return len(values)
+
+
+def insert_notification(cursor, user_id, title, message, type='info',
+                        related_entity_type=None, related_entity_id=None):
+    return insert_notifications(cursor, [(
+        user_id, title, message, type, related_entity_type, related_entity_id
+    )])
+
+
+def publish_pending():
+    """Push notifications inserted during this request to connected clients"""
+    if not has_request_context():
+        return 0
+    pending = g.pop('pending_notifications', [])
+    if not pending:
+        return 0
+    created_at = datetime.now().isoformat()
+    get_notification_hub().publish_many([
+        (row[0], 'notification', dict(zip(NOTIFICATION_COLUMNS[1:], row[1:]), created_at=created_at), 1)
+        for row in pending
+    ])
+    return len(pending)
+
+
+def probe_notifications(cursor, user_id):
+    """``(latest notification id, unread count)`` for a user in one round trip:
+    an index probe on (user_id, id) and a counter read. Cheap enough to run
+    on every poll to decide whether anything changed."""
+    if notification_counters_ready():
+        cursor.execute("""
+            SELECT
+                (SELECT MAX(id) FROM notifications WHERE user_id = %s) AS latest_id,
+                (SELECT unread_count FROM notification_counters WHERE user_id = %s) AS unread_count
+        """, (user_id, user_id))
+        row = cursor.fetchone()
+        return row['latest_id'], int(row['unread_count'] or 0)
+    cursor.execute("SELECT MAX(id) AS latest_id FROM notifications WHERE user_id = %s", (user_id,))
+    return cursor.fetchone()['latest_id'], get_unread_count(cursor, user_id)
+
+
+def list_notifications(cursor, user_id, before_id=None, after_id=None, limit=20):
+    """Keyset page of a user's notifications, newest first.
+
+    ``after_id`` returns the oldest ``limit`` notifications newer than it, so
+    a client catching up can repeat with the newest id it got; otherwise the
+    newest ``limit`` below ``before_id``. Returns ``(rows, has_more)``.
+    """
+    if after_id is not None:
+        cursor.execute(f"""
+            SELECT {LIST_COLUMNS} FROM notifications
+            WHERE user_id = %s AND id > %s
+            ORDER BY id
+            LIMIT %s
+        """, (user_id, after_id, limit + 1))
+        rows = cursor.fetchall()
+        return rows[:limit][::-1], len(rows) > limit
+
+    params = [user_id]
+    condition = ""
+    if before_id is not None:
+        condition = "AND id < %s"
+        params.append(before_id)
+    cursor.execute(f"""
+        SELECT {LIST_COLUMNS} FROM notifications
+        WHERE user_id = %s {condition}
+        ORDER BY id DESC
+        LIMIT %s
+    """, params + [limit + 1])
+    rows = cursor.fetchall()
+    return rows[:limit], len(rows) > limit
+
+
+class EventStream:
+    """Server-sent event frames for one subscription.
+
+    Opens with a ``ready`` event carrying the unread count (and ``reset``
+    when the client's Last-Event-ID can no longer be replayed), then relays
+    hub events, sending a comment every ``heartbeat`` seconds so proxies
+    keep the connection open and dead clients are noticed. Ends after
+    ``max_age`` so clients reconnect and re-authenticate.
+
+    Iterating it blocks a request thread between events; ``async for``
+    (the ASGI entry point) waits on the event loop instead.
+    """
+
+    def __init__(self, subscription, unread_count, heartbeat, max_age, retry_ms=5000):
+        self.subscription = subscription
+        self.unread_count = unread_count
+        self.heartbeat = heartbeat
+        self.max_age = max_age
+        self.retry_ms = retry_ms
+        self._deadline = None
+
+    def _opening(self):
+        self._deadline = time.monotonic() + self.max_age
+        frames = [f"retry: {self.retry_ms}\n\n",
+                  format_sse({'id': None, 'event': 'ready',
+                              'data': {'unread_count': self.unread_count, 'reset': self.subscription.reset}})]
+        self.subscription.reset = False
+        return frames
+
+    def _open(self):
+        return not self.subscription.closed and time.monotonic() < self._deadline
+
+    def _timeout(self):
+        return min(self.heartbeat, max(0, self._deadline - time.monotonic()))
+
+    def _frames(self, events):
+        subscription = self.subscription
+        if subscription.reset:
+            # Drop what is queued and have the client refetch, resuming after it
+            subscription.reset = False
+            return [format_sse({'id': events[-1]['id'] if events else None, 'event': 'reset',
+                                'data': {'unread_count': get_notification_hub().unread(subscription.user_id)}})]
+        if events is None:
+            return [": keepalive\n\n"]
+        return [format_sse(event) for event in events]
+
+    def __iter__(self):
+        try:
+            yield from self._opening()
+            while self._open():
+                yield from self._frames(self.subscription.wait(self._timeout()))
+        finally:
+            self.close()
+
+    async def __aiter__(self):
+        try:
+            for frame in self._opening():
+                yield frame
+            while self._open():
+                for frame in self._frames(await self.subscription.wait_async(self._timeout())):
+                    yield frame
+        finally:
+            self.close()
+
+    def close(self):
+        """Unsubscribe and end the stream; the server calls this when the
+        response finishes or the client goes away"""
+        get_notification_hub().unsubscribe(self.subscription)
+        self.subscription.notify()
+
+
+def stream_events(subscription, unread_count, heartbeat, max_age, retry_ms=5000):
+    return EventStream(subscription, unread_count, heartbeat, max_age, retry_ms)
@@ -0,0 +1,190 @@
+import math
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from config import Config
+
+
+class PasswordHasherBusy(Exception):
+    """Raised instead of queueing when too many hashes are already pending"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Password hasher busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def hash_rounds(hashed):
+    """Cost factor of a bcrypt hash (``$2b$12$...`` -> 12), or None if unreadable"""
+    try:
+        return int(hashed.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+# Module-level so the pool can pickle them
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _hash_all(passwords, rounds):
+    return [_hash(password, rounds) for password in passwords]
+
+
+def _verify(password, hashed, rounds=None):
+    """Check a password; with ``rounds``, also rehash it when the stored hash
+    used a different cost. Returns ``(ok, new_hash or None)``."""
+    try:
+        ok = bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    except Exception as e:
+        print(f"Password verification error: {e}")
+        return False, None
+    if ok and rounds is not None and hash_rounds(hashed) != rounds:
+        return True, _hash(password, rounds)
+    return ok, None
+
+
+def _noop():
+    return None
+
+
+class PasswordHasher:
+    """Runs bcrypt on a process pool so logins neither hold the GIL nor queue
+    behind each other on request threads.
+
+    At most ``max_pending`` hashes may be queued or running; past that,
+    callers get PasswordHasherBusy with a Retry-After estimate instead of
+    waiting. ``processes=0`` hashes on the calling thread.
+    """
+
+    def __init__(self, processes=None, rounds=None, max_pending=None):
+        self.processes = Config.PASSWORD_HASH_PROCESSES if processes is None else processes
+        self.rounds = rounds or Config.BCRYPT_ROUNDS
+        self.max_pending = max_pending or Config.PASSWORD_HASH_MAX_PENDING
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._latency = 0.25   # seconds per hash including queueing, moving average
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _on_pool(self, work):
+        """Run ``work(executor)``. A worker that died (OOM kill, crash) breaks
+        the pool for good, so it is replaced and the work retried once."""
+        executor = self._get_executor()
+        try:
+            return work(executor)
+        except BrokenProcessPool:
+            print("Password hashing pool broke; starting a new one")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            return work(self._get_executor())
+
+    def start(self):
+        """Spawn the workers up front so the first logins skip the start-up cost"""
+        if self.processes:
+            executor = self._get_executor()
+            for future in [executor.submit(_noop) for _ in range(self.processes)]:
+                future.result()
+
+    def retry_after(self):
+        """Seconds a rejected caller would roughly have waited for its hash"""
+        return max(1, math.ceil(self._latency))
+
+    @contextmanager
+    def _admit(self, timed=True):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordHasherBusy(self.retry_after())
+        with self._lock:
+            self._pending += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+                if timed:
+                    self._latency += 0.1 * (elapsed - self._latency)
+            self._slots.release()
+
+    def _run(self, fn, *args):
+        with self._admit():
+            if self.processes:
+                return self._on_pool(lambda executor: executor.submit(fn, *args).result())
+            return fn(*args)
+
+    def hash(self, password):
+        return self._run(_hash, password, self.rounds)
+
+    def hash_many(self, passwords, rounds=None, chunk_size=50):
+        """Hash a batch such as an import under a single admission slot.
+
+        Work goes to the pool one chunk per worker at a time, so logins
+        arriving meanwhile queue behind at most one wave, not the batch.
+        """
+        rounds = rounds or self.rounds
+        passwords = list(passwords)
+        chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+
+        def hash_chunks(executor):
+            hashes = []
+            for i in range(0, len(chunks), self.processes):
+                futures = [executor.submit(_hash_all, chunk, rounds) for chunk in chunks[i:i + self.processes]]
+                for future in futures:
+                    hashes.extend(future.result())
+            return hashes
+
+        # Not timed: a batch says nothing about how long one login waits
+        with self._admit(timed=False):
+            if not self.processes:
+                return _hash_all(passwords, rounds)
+            return self._on_pool(hash_chunks)
+
+    def verify(self, password, hashed):
+        return self._run(_verify, password, hashed)[0]
+
+    def verify_and_update(self, password, hashed):
+        """Check a password, rehashing it at the configured cost when the
+        stored hash used another; returns ``(ok, new_hash or None)``"""
+        ok, new_hash = self._run(_verify, password, hashed, self.rounds)
+        if new_hash:
+            self.rehashed += 1
+        return ok, new_hash
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def stats(self):
+        return {'processes': self.processes, 'rounds': self.rounds, 'pending': self._pending,
+                'max_pending': self.max_pending, 'completed': self.completed,
+                'rejected': self.rejected, 'rehashed': self.rehashed}
+
+
+_hasher = PasswordHasher()
+
+
+def get_password_hasher():
+    return _hasher
@@ -0,0 +1,51 @@
+from flask import g, has_request_context
+from config import Config
+from utils.cache import TTLCache
+
+
+# role -> (query, column) giving the id a handler scopes its queries by
+ROLE_LOOKUPS = {
+    'student': ("SELECT id FROM students WHERE user_id = %s", 'id'),
+    'hod': ("SELECT department_id FROM hods WHERE user_id = %s", 'department_id'),
+    'tpo': ("SELECT id FROM tpos WHERE user_id = %s", 'id'),
+}
+
+_principals = TTLCache(maxsize=Config.PRINCIPAL_CACHE_SIZE, ttl=Config.PRINCIPAL_CACHE_TTL)
+
+
+def resolve_principal(cursor, identity):
+    """Map a JWT identity to its role id: student id, HOD department id or TPO id.
+
+    Memoised for the request in flask.g and cached per process, so the
+    profile lookup runs on ``cursor`` only on a cold cache. Returns None when
+    the profile row does not exist; misses are not cached.
+    """
+    role = identity.get('role')
+    key = (role, identity.get('user_id'))
+    if role not in ROLE_LOOKUPS:
+        return None
+
+    memo = g.setdefault('principals', {}) if has_request_context() else {}
+    if key in memo:
+        return memo[key]
+
+    value = _principals.get(key)
+    if value is None:
+        query, column = ROLE_LOOKUPS[role]
+        cursor.execute(query, (key[1],))
+        row = cursor.fetchone()
+        value = row[column] if row else None
+        if value is not None:
+            _principals.set(key, value)
+
+    memo[key] = value
+    return value
+
+
+def invalidate_principal(user_id):
+    """Forget cached role ids for a user after their profile changes"""
+    _principals.invalidate_where(lambda key: key[1] == user_id)
+
+
+def get_principal_cache_stats():
+    return _principals.stats()
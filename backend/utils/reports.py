@@ -0,0 +1,398 @@
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+import zipfile
+from xml.sax.saxutils import escape
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from config import Config
+
+
+# Bump when a template's layout changes so cached PDFs are re-rendered
+TEMPLATE_VERSION = 1
+
+# ============================================
+# CONTENT-ADDRESSED CACHE
+# ============================================
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+def report_key(kind, data):
+    """Hash of the template and every input, so unchanged reports hit the cache"""
+    payload = json.dumps([kind, TEMPLATE_VERSION, data], sort_keys=True, default=_json_default)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def report_path(key, cache_dir=None):
+    cache_dir = cache_dir or Config.REPORT_CACHE_DIR
+    return os.path.join(cache_dir, key[:2], f"{key}.pdf")
+
+
+# ============================================
+# RENDERING (runs in worker processes)
+# ============================================
+
+_templates = None
+
+
+def _build_templates():
+    """Fonts, styles and page templates, built once per process and reused"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Frame, PageTemplate, TableStyle
+
+    sheet = getSampleStyleSheet()
+    width, height = A4
+
+    def header_footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont('Helvetica-Bold', 10)
+        canvas.drawString(18 * mm, height - 12 * mm, "Training & Placement Cell")
+        canvas.setFont('Helvetica', 8)
+        canvas.drawRightString(width - 18 * mm, 10 * mm, f"Page {doc.page}")
+        canvas.restoreState()
+
+    frame = Frame(18 * mm, 16 * mm, width - 36 * mm, height - 36 * mm, id='body')
+    return {
+        'colors': colors,
+        'mm': mm,
+        'page_size': A4,
+        'page_template': PageTemplate(id='report', frames=[frame], onPage=header_footer),
+        'title': sheet['Title'],
+        'heading': sheet['Heading2'],
+        'body': sheet['BodyText'],
+        'table': TableStyle([
+            ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 9),
+            ('FONT', (0, 1), (-1, -1), 'Helvetica', 8),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0f766e')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
+            ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#d1d5db')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]),
+    }
+
+
+def _get_templates():
+    global _templates
+    if _templates is None:
+        _templates = _build_templates()
+    return _templates
+
+
+def _table_document(buffer, title, subtitle, summary, header, rows):
+    from reportlab.platypus import BaseDocTemplate, Paragraph, Spacer, Table
+
+    t = _get_templates()
+    doc = BaseDocTemplate(buffer, pagesize=t['page_size'], title=title, invariant=1)
+    doc.addPageTemplates([t['page_template']])
+    # Paragraph parses markup, so names like "AT&T" must be escaped
+    story = [Paragraph(escape(title), t['title']), Paragraph(escape(subtitle), t['heading'])]
+    story += [Paragraph(escape(line), t['body']) for line in summary]
+    story.append(Spacer(1, 4 * t['mm']))
+    table = Table([header] + rows, repeatRows=1)
+    table.setStyle(t['table'])
+    story.append(table)
+    doc.build(story)
+
+
+def _render_drive_results(buffer, data):
+    drive = data['drive']
+    by_status = {}
+    for a in data['applications']:
+        by_status[a['status']] = by_status.get(a['status'], 0) + 1
+    _table_document(
+        buffer,
+        f"{drive['company_name']} - {drive['job_role']}",
+        "Drive result sheet",
+        [f"Applicants: {len(data['applications'])}",
+         "  ".join(f"{status.title()}: {count}" for status, count in sorted(by_status.items()))],
+        ['Enrollment', 'Name', 'Department', 'CGPA', 'Round', 'Status'],
+        [[a['enrollment_number'], f"{a['first_name']} {a['last_name']}", a['department_name'],
+          a['cgpa'] if a['cgpa'] is not None else '-', a['current_round'], a['status'].title()]
+         for a in data['applications']]
+    )
+
+
+def _render_department_placements(buffer, data):
+    students = data['students']
+    placed = sum(1 for s in students if s['placed_company'])
+    _table_document(
+        buffer,
+        f"{data['department']['name']} placement report",
+        f"Generated for {data['generated_on']}",
+        [f"Students: {len(students)}  Placed: {placed}",
+         f"Placement rate: {placed / len(students) * 100:.1f}%" if students else "No students"],
+        ['Enrollment', 'Name', 'CGPA', 'Applications', 'Placed at'],
+        [[s['enrollment_number'], f"{s['first_name']} {s['last_name']}",
+          s['cgpa'] if s['cgpa'] is not None else '-', s['application_count'],
+          s['placed_company'] or '-']
+         for s in students]
+    )
+
+
+def _render_letter(buffer, data, heading, paragraphs):
+    """Single-page letter drawn straight on the canvas; far cheaper than platypus"""
+    from reportlab.pdfgen import canvas as pdf_canvas
+
+    t = _get_templates()
+    mm = t['mm']
+    width, height = t['page_size']
+    c = pdf_canvas.Canvas(buffer, pagesize=t['page_size'], invariant=1)
+    c.setTitle(heading)
+    c.setFillColor(t['colors'].HexColor('#0f766e'))
+    c.rect(0, height - 28 * mm, width, 28 * mm, stroke=0, fill=1)
+    c.setFillColor(t['colors'].white)
+    c.setFont('Helvetica-Bold', 16)
+    c.drawString(20 * mm, height - 17 * mm, data['company_name'])
+    c.setFillColor(t['colors'].black)
+    c.setFont('Helvetica-Bold', 14)
+    c.drawString(20 * mm, height - 45 * mm, heading)
+    c.setFont('Helvetica', 10)
+    c.drawRightString(width - 20 * mm, height - 45 * mm, data['issued_on'])
+    y = height - 60 * mm
+    for text in paragraphs:
+        text_object = c.beginText(20 * mm, y)
+        text_object.setFont('Helvetica', 11)
+        for line in _wrap(text, 90):
+            text_object.textLine(line)
+        c.drawText(text_object)
+        y = text_object.getY() - 6 * mm
+    c.setFont('Helvetica-Oblique', 9)
+    c.drawString(20 * mm, 20 * mm, "Issued through the Training & Placement Cell")
+    c.showPage()
+    c.save()
+
+
+def _wrap(text, width):
+    line, lines = "", []
+    for word in text.split():
+        if line and len(line) + len(word) + 1 > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}".strip()
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _render_offer_letter(buffer, data):
+    # Drives may be posted without a package
+    compensation = (f"INR {float(data['package_ctc']):,.0f} (CTC)" if data['package_ctc'] is not None
+                    else "as per the offer terms shared by the company")
+    _render_letter(buffer, data, "Offer of Employment", [
+        f"Dear {data['first_name']} {data['last_name']} ({data['enrollment_number']}),",
+        f"We are pleased to offer you the position of {data['job_role']} at "
+        f"{data['company_name']}, based in {data['location']}.",
+        f"Your annual compensation will be {compensation}.",
+        "Please confirm your acceptance with the Training & Placement Cell within seven days.",
+    ])
+
+
+def _render_admit_card(buffer, data):
+    _render_letter(buffer, data, "Admit Card", [
+        f"Candidate: {data['first_name']} {data['last_name']} ({data['enrollment_number']})",
+        f"Role: {data['job_role']}",
+        f"You are admitted to round {data['current_round']} of the {data['company_name']} "
+        f"selection process.",
+        "Carry this card and your college ID to every round.",
+    ])
+
+
+RENDERERS = {
+    'drive_results': _render_drive_results,
+    'department_placements': _render_department_placements,
+    'offer_letter': _render_offer_letter,
+    'admit_card': _render_admit_card,
+}
+
+
+def render_to_file(job):
+    """Render one (kind, data, path) job; writes atomically, returns (path, error)"""
+    kind, data, path = job
+    try:
+        buffer = io.BytesIO()
+        RENDERERS[kind](buffer, data)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+        return path, None
+    except Exception as e:
+        return path, str(e)
+
+
+# ============================================
+# BATCH ENGINE
+# ============================================
+
+class ReportEngine:
+    """Renders report batches on a process pool behind a content-addressed cache.
+
+    Each worker builds its templates once (pool initializer) and reuses them
+    for every document it renders; cached reports never reach the pool.
+    """
+
+    def __init__(self, processes=None, cache_dir=None):
+        self.processes = processes or Config.REPORT_PROCESSES
+        self.cache_dir = os.path.abspath(cache_dir or Config.REPORT_CACHE_DIR)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.rendered = 0
+        self.cache_hits = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_get_templates
+                )
+            return self._executor
+
+    def render_batch(self, kind, items):
+        """Render one document per data dict; returns [(key, path, error)] in order"""
+        if kind not in RENDERERS:
+            raise ValueError(f"Unknown report kind: {kind}")
+        results, jobs = [], []
+        for data in items:
+            key = report_key(kind, data)
+            path = report_path(key, self.cache_dir)
+            results.append([key, path, None])
+            if os.path.exists(path):
+                self.cache_hits += 1
+            else:
+                jobs.append((len(results) - 1, (kind, data, path)))
+
+        if len(jobs) == 1:
+            # Not worth a round trip to the pool
+            outcomes = [render_to_file(jobs[0][1])]
+        elif jobs:
+            chunksize = max(1, len(jobs) // (self.processes * 4))
+            outcomes = self._get_executor().map(render_to_file, [job for _, job in jobs],
+                                                chunksize=chunksize)
+        else:
+            outcomes = []
+        for (index, _), (_, error) in zip(jobs, outcomes):
+            results[index][2] = error
+            if not error:
+                self.rendered += 1
+        return [tuple(r) for r in results]
+
+    def render(self, kind, data):
+        key, path, error = self.render_batch(kind, [data])[0]
+        if error:
+            raise RuntimeError(f"Report rendering failed: {error}")
+        return path
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def stats(self):
+        return {'rendered': self.rendered, 'cache_hits': self.cache_hits,
+                'processes': self.processes}
+
+
+_engine = ReportEngine()
+
+
+def get_report_engine():
+    return _engine
+
+
+def zip_reports(results, names):
+    """Bundle rendered PDFs into one zip (stored, PDFs are already compressed)"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        for (_, path, error), name in zip(results, names):
+            if not error:
+                archive.write(path, name)
+    buffer.seek(0)
+    return buffer
+
+
+# ============================================
+# DATA LOADERS
+# ============================================
+
+def load_drive(cursor, drive_id):
+    cursor.execute("""
+        SELECT pd.id, pd.job_role, pd.location, pd.package_ctc, c.name as company_name
+        FROM placement_drives pd
+        JOIN companies c ON pd.company_id = c.id
+        WHERE pd.id = %s
+    """, (drive_id,))
+    return cursor.fetchone()
+
+
+def load_drive_applicants(cursor, drive_id, status=None):
+    query = """
+        SELECT a.id, a.status, a.current_round, s.enrollment_number, s.first_name,
+               s.last_name, s.cgpa, d.name as department_name
+        FROM applications a
+        JOIN students s ON a.student_id = s.id
+        JOIN departments d ON s.department_id = d.id
+        WHERE a.drive_id = %s
+    """
+    params = [drive_id]
+    if status:
+        query += " AND a.status = %s"
+        params.append(status)
+    cursor.execute(query + " ORDER BY s.enrollment_number", tuple(params))
+    return cursor.fetchall()
+
+
+def load_department_report(cursor, department_id):
+    cursor.execute("SELECT id, name FROM departments WHERE id = %s", (department_id,))
+    department = cursor.fetchone()
+    if not department:
+        return None
+    cursor.execute("""
+        SELECT s.id, s.enrollment_number, s.first_name, s.last_name, s.cgpa,
+               COUNT(a.id) as application_count,
+               MAX(CASE WHEN a.status = 'selected' THEN c.name END) as placed_company
+        FROM students s
+        LEFT JOIN applications a ON a.student_id = s.id
+        LEFT JOIN placement_drives pd ON a.drive_id = pd.id
+        LEFT JOIN companies c ON pd.company_id = c.id
+        WHERE s.department_id = %s
+        GROUP BY s.id
+        ORDER BY s.enrollment_number
+    """, (department_id,))
+    return {'department': department, 'students': cursor.fetchall(),
+            'generated_on': date.today().isoformat()}
+
+
+def letter_items(drive, applicants):
+    """Per-student data for offer letters / admit cards; the date is part of the key"""
+    issued_on = date.today().strftime('%d %B %Y')
+    return [{
+        'application_id': a['id'],
+        'enrollment_number': a['enrollment_number'],
+        'first_name': a['first_name'],
+        'last_name': a['last_name'],
+        'current_round': a['current_round'],
+        'company_name': drive['company_name'],
+        'job_role': drive['job_role'],
+        'location': drive['location'],
+        'package_ctc': drive['package_ctc'],
+        'issued_on': issued_on,
+    } for a in applicants]
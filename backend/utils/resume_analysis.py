@@ -0,0 +1,132 @@
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from utils.cache import TTLCache
+
+
+# Bump when either prompt changes so cached results from the old prompt are ignored
+PROMPT_VERSION = 1
+
+_model = None
+_model_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=Config.GEMINI_MAX_CONCURRENCY,
+                               thread_name_prefix='gemini')
+_cache = TTLCache(maxsize=Config.RESUME_ANALYSIS_CACHE_SIZE,
+                  ttl=Config.RESUME_ANALYSIS_CACHE_TTL)
+
+DEFAULTS = {
+    'resumeScore': 0,
+    'scoreRationale': 'Score not available',
+    'importantInfo': [],
+    'improvementSuggestions': [],
+    'overallSuitability': 'Analysis not available',
+    'skillsGapAnalysis': 'Skills gap analysis not available',
+    'feedback': 'Feedback not available',
+}
+
+
+def get_model():
+    """Return the Gemini model client, configuring it once per process"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import google.generativeai as genai
+                genai.configure(api_key=Config.GEMINI_API_KEY)
+                _model = genai.GenerativeModel('gemini-pro')
+    return _model
+
+
+def cache_key(resume_content, job_role):
+    """Content-addressed key: (text hash, normalized role, prompt version)"""
+    digest = hashlib.sha256(resume_content.encode('utf-8')).hexdigest()
+    role = ' '.join(job_role.lower().split())
+    return (digest, role, PROMPT_VERSION)
+
+
+def build_score_prompt(resume_content, job_role):
+    return f"""You are an expert resume reviewer. Analyze the following resume content against the specified job role.
+
+Resume Content:
+{resume_content}
+
+Job Role: {job_role}
+
+Provide your analysis in the following JSON format:
+{{
+    "importantInfo": ["list", "of", "important", "information", "extracted", "from", "resume"],
+    "resumeScore": <number from 0 to 100>,
+    "scoreRationale": "brief explanation for the score",
+    "improvementSuggestions": ["suggestion 1", "suggestion 2", "suggestion 3"]
+}}
+
+Important: Return ONLY valid JSON, no additional text or markdown formatting."""
+
+
+def build_analysis_prompt(resume_content, job_role):
+    return f"""You are a career advisor. Analyze the following resume content against the specified job role and provide feedback.
+
+Resume Content:
+{resume_content}
+
+Job Role: {job_role}
+
+Provide your analysis in the following JSON format:
+{{
+    "overallSuitability": "assessment of overall suitability",
+    "skillsGapAnalysis": "analysis of skills gap",
+    "feedback": "specific feedback on how to improve"
+}}
+
+Important: Return ONLY valid JSON, no additional text or markdown formatting."""
+
+
+def parse_model_json(text):
+    """Parse a JSON reply, stripping a markdown code fence if present"""
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('```')[1]
+        if text.startswith('json'):
+            text = text[4:]
+        text = text.strip()
+    return json.loads(text)
+
+
+def analyze_resume_text(resume_content, job_role, model=None, use_cache=True):
+    """Score and analyze a resume, issuing both prompts concurrently.
+
+    Returns ``(result, cached)``. Raises ``json.JSONDecodeError`` if either
+    reply is not valid JSON, and propagates model errors unchanged.
+    """
+    key = cache_key(resume_content, job_role)
+    if use_cache:
+        cached = _cache.get(key)
+        if cached is not None:
+            return dict(cached), True
+
+    model = model or get_model()
+    score_future = _executor.submit(model.generate_content,
+                                    build_score_prompt(resume_content, job_role))
+    analysis_future = _executor.submit(model.generate_content,
+                                       build_analysis_prompt(resume_content, job_role))
+    score_text = score_future.result().text
+    analysis_text = analysis_future.result().text
+
+    try:
+        score_data = parse_model_json(score_text)
+        analysis_data = parse_model_json(analysis_text)
+    except json.JSONDecodeError:
+        print(f"Score response: {score_text}")
+        print(f"Analysis response: {analysis_text}")
+        raise
+
+    result = {**DEFAULTS, **score_data, **analysis_data}
+    if use_cache:
+        _cache.set(key, result)
+    return dict(result), False
+
+
+def get_analysis_cache():
+    return _cache
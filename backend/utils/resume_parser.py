@@ -0,0 +1,256 @@
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from config import Config
+from utils.db import get_db_connection, add_column_if_missing, add_index_if_missing
+from utils.schema import ensure, is_applied
+
+
+def _add_parse_columns(cursor):
+    add_column_if_missing(cursor, 'resumes', 'extracted_text', 'MEDIUMTEXT NULL')
+    add_column_if_missing(cursor, 'resumes', 'page_count', 'INT NULL')
+    add_column_if_missing(cursor, 'resumes', 'content_hash', 'CHAR(64) NULL')
+    add_column_if_missing(cursor, 'resumes', 'parsing_started_at', 'DATETIME NULL')
+    add_column_if_missing(cursor, 'resumes', 'parsed_at', 'DATETIME NULL')
+    add_column_if_missing(cursor, 'resumes', 'parsing_error', 'VARCHAR(255) NULL')
+    add_index_if_missing(cursor, 'resumes', 'idx_resumes_parsing_status', 'parsing_status, id')
+    add_index_if_missing(cursor, 'resumes', 'idx_resumes_content_hash', 'content_hash')
+
+
+def ensure_schema():
+    """Add the parsed-output columns to resumes; run by the worker at start"""
+    return ensure('resume_parse_jobs', _add_parse_columns)
+
+
+def schema_ready():
+    return is_applied('resume_parse_jobs')
+
+
+# ============================================
+# EXTRACTION (runs in worker processes)
+# ============================================
+
+def extract_text_from_bytes(data, extension):
+    """Return (text, page_count) for PDF or DOCX content"""
+    extension = extension.lower().lstrip('.')
+    if extension == 'pdf':
+        import PyPDF2
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        text = "".join((page.extract_text() or "") + "\n" for page in reader.pages)
+        return text, len(reader.pages)
+    if extension == 'docx':
+        import docx
+        document = docx.Document(io.BytesIO(data))
+        text = "\n".join(p.text for p in document.paragraphs)
+        return text, None
+    raise ValueError(f"Unsupported resume format: .{extension}")
+
+
+def extract_resume(file_path):
+    """Parse one resume file; returns a dict suitable for storing on the row"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    text, page_count = extract_text_from_bytes(data, os.path.splitext(file_path)[1])
+    return {
+        'extracted_text': text,
+        'page_count': page_count,
+        'content_hash': hashlib.sha256(data).hexdigest(),
+    }
+
+
+def _extract_safely(file_path):
+    try:
+        return extract_resume(file_path), None
+    except Exception as e:
+        return None, str(e)[:255]
+
+
+# ============================================
+# PIPELINE
+# ============================================
+
+def claim_pending(cursor, batch_size):
+    """Move up to batch_size pending resumes to 'processing' and return them"""
+    cursor.execute("""
+        SELECT id, file_path FROM resumes
+        WHERE parsing_status = 'pending'
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    """, (batch_size,))
+    rows = cursor.fetchall()
+    if rows:
+        placeholders = ','.join(['%s'] * len(rows))
+        cursor.execute(
+            f"""UPDATE resumes SET parsing_status = 'processing', parsing_started_at = %s
+                WHERE id IN ({placeholders})""",
+            [datetime.now()] + [r['id'] for r in rows]
+        )
+    return rows
+
+
+def requeue_stale(cursor, timeout_seconds):
+    """Return resumes stuck in 'processing' (e.g. a crashed worker) to the queue"""
+    cursor.execute("""
+        UPDATE resumes SET parsing_status = 'pending'
+        WHERE parsing_status = 'processing' AND parsing_started_at < %s
+    """, (datetime.now() - timedelta(seconds=timeout_seconds),))
+    return cursor.rowcount
+
+
+def store_results(cursor, results):
+    """Persist (resume_id, parsed, error) tuples with one statement per outcome"""
+    now = datetime.now()
+    done = [(p['extracted_text'], p['page_count'], p['content_hash'], now, rid)
+            for rid, p, err in results if p is not None]
+    failed = [(err, now, rid) for rid, p, err in results if p is None]
+    if done:
+        cursor.executemany("""
+            UPDATE resumes
+            SET parsing_status = 'done', extracted_text = %s, page_count = %s,
+                content_hash = %s, parsed_at = %s, parsing_error = NULL
+            WHERE id = %s
+        """, done)
+    if failed:
+        cursor.executemany("""
+            UPDATE resumes
+            SET parsing_status = 'failed', parsing_error = %s, parsed_at = %s
+            WHERE id = %s
+        """, failed)
+    return len(done), len(failed)
+
+
+class ResumeParsingWorker:
+    """Background thread that claims pending resumes in batches and parses
+    them on a process pool, since PDF text extraction is CPU-bound."""
+
+    def __init__(self, batch_size=None, processes=None, poll_interval=None,
+                 stale_after=None):
+        self.batch_size = batch_size or Config.RESUME_PARSER_BATCH_SIZE
+        self.processes = processes or Config.RESUME_PARSER_PROCESSES
+        self.poll_interval = poll_interval or Config.RESUME_PARSER_POLL_INTERVAL
+        self.stale_after = stale_after or Config.RESUME_PARSER_STALE_AFTER
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._executor = None
+        self.parsed = 0
+        self.failed = 0
+
+    def notify(self):
+        self._wakeup.set()
+
+    def run_once(self):
+        """Claim and process one batch; returns the number of resumes handled"""
+        conn = get_db_connection()
+        if not conn:
+            return 0
+        try:
+            cursor = conn.cursor()
+            requeue_stale(cursor, self.stale_after)
+            rows = claim_pending(cursor, self.batch_size)
+            conn.commit()
+            if not rows:
+                return 0
+
+            paths = [r['file_path'] for r in rows]
+            outcomes = list(self._get_executor().map(_extract_safely, paths))
+            results = [(r['id'], parsed, err) for r, (parsed, err) in zip(rows, outcomes)]
+
+            done, failed = store_results(cursor, results)
+            conn.commit()
+            self.parsed += done
+            self.failed += failed
+            return len(rows)
+        except Exception as e:
+            conn.rollback()
+            print(f"Resume parsing batch error: {e}")
+            return 0
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    def _loop(self):
+        while not self._stopping.is_set():
+            handled = self.run_once()
+            if handled < self.batch_size:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        if not ensure_schema():
+            print("Resume parsing worker not started: schema unavailable")
+            return
+        self._get_executor()
+        self._thread = threading.Thread(target=self._loop, name='resume-parser', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10.0):
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        return {'running': self._thread is not None, 'parsed': self.parsed, 'failed': self.failed}
+
+
+_worker = ResumeParsingWorker()
+
+
+def get_resume_worker():
+    return _worker
+
+
+def notify_resume_uploaded():
+    """Wake the parsing worker so a fresh upload is handled without waiting a poll"""
+    _worker.notify()
+
+
+# ============================================
+# READ SIDE
+# ============================================
+
+def find_parsed_text(cursor, content_hash=None, user_id=None):
+    """Return stored text for a file hash, or the user's latest parsed resume.
+
+    Returns None when nothing parsed is available so callers can fall back.
+    """
+    if not schema_ready():
+        return None
+    if content_hash:
+        cursor.execute("""
+            SELECT extracted_text FROM resumes
+            WHERE content_hash = %s AND parsing_status = 'done'
+            LIMIT 1
+        """, (content_hash,))
+    elif user_id:
+        cursor.execute("""
+            SELECT r.extracted_text FROM resumes r
+            JOIN students s ON r.student_id = s.id
+            WHERE s.user_id = %s AND r.parsing_status = 'done'
+            ORDER BY r.id DESC
+            LIMIT 1
+        """, (user_id,))
+    else:
+        return None
+    row = cursor.fetchone()
+    return row['extracted_text'] if row else None
@@ -0,0 +1,67 @@
+import threading
+from utils.db import get_db_connection, add_index_if_missing
+
+
+_applied = set()
+_lock = threading.Lock()
+
+
+def ensure(name, migrate):
+    """Run ``migrate(cursor)`` once per process and commit; returns success.
+
+    Used for additive DDL (indexes, summary tables, counter columns) that
+    features create on first use, since the repo ships no migration tool.
+    """
+    if name in _applied:
+        return True
+    with _lock:
+        if name in _applied:
+            return True
+        conn = get_db_connection()
+        if not conn:
+            return False
+        try:
+            cursor = conn.cursor()
+            migrate(cursor)
+            conn.commit()
+            _applied.add(name)
+            return True
+        except Exception as e:
+            conn.rollback()
+            print(f"Schema step '{name}' failed: {e}")
+            return False
+        finally:
+            cursor.close()
+            conn.close()
+
+
+def is_applied(name):
+    """Whether ``ensure(name, ...)`` has succeeded in this process.
+
+    Request handlers check this instead of calling ensure(): the DDL and
+    backfills run on a second connection and would wait on locks held by
+    the handler's own open transaction.
+    """
+    return name in _applied
+
+
+def _application_indexes(cursor):
+    # Keyset pagination walks (applied_at, id) newest first, optionally per drive/status
+    add_index_if_missing(cursor, 'applications', 'idx_applications_applied', 'applied_at, id')
+    add_index_if_missing(cursor, 'applications', 'idx_applications_drive_applied',
+                         'drive_id, applied_at, id')
+    add_index_if_missing(cursor, 'applications', 'idx_applications_status_applied',
+                         'status, applied_at, id')
+
+
+def ensure_application_indexes():
+    return ensure('application_indexes', _application_indexes)
+
+
+def _notification_indexes(cursor):
+    # Keyset pages and the latest-id probe walk a user's notifications by id
+    add_index_if_missing(cursor, 'notifications', 'idx_notifications_user_id', 'user_id, id')
+
+
+def ensure_notification_indexes():
+    return ensure('notification_indexes', _notification_indexes)
@@ -0,0 +1,362 @@
+import bisect
+import heapq
+import re
+import threading
+import time
+from config import Config
+from utils.db import get_db_connection
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Match quality per query term, multiplied by the field weight
+EXACT, PREFIX, FUZZY = 1.0, 0.7, 0.4
+MIN_PREFIX_LEN = 2   # single letters only match whole tokens
+MIN_FUZZY_LEN = 4    # shorter terms are too ambiguous for typo matching
+
+
+def _fuzzy(token):
+    # Identifiers like enrollment numbers are matched by prefix, not by typo
+    return len(token) >= MIN_FUZZY_LEN and token.isalpha()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower()) if text else []
+
+
+def _deletes(token):
+    """Every string one deletion away from token (SymSpell-style neighbourhood)"""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+class InvertedIndex:
+    """Token -> {doc_id: field weight} postings with prefix and one-edit typo lookup.
+
+    Queries are AND across terms; each term matches a token exactly, as a
+    prefix, or, when neither hits, within one insertion, deletion or
+    substitution. Not thread-safe on its own; SearchIndex serialises access.
+    """
+
+    def __init__(self, weights):
+        self.weights = weights
+        self.postings = {}
+        self.docs = {}
+        self.deletes = {}
+        self._vocabulary = None
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, doc_id, fields, scope=None):
+        self.remove(doc_id)
+        token_weights = {}
+        for field, text in fields.items():
+            weight = self.weights.get(field, 1.0)
+            for token in tokenize(text):
+                if weight > token_weights.get(token, 0):
+                    token_weights[token] = weight
+        for token, weight in token_weights.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                self._add_token(token)
+            posting[doc_id] = weight
+        self.docs[doc_id] = (tuple(token_weights), scope)
+
+    def remove(self, doc_id):
+        entry = self.docs.pop(doc_id, None)
+        if entry is None:
+            return
+        for token in entry[0]:
+            posting = self.postings[token]
+            posting.pop(doc_id, None)
+            if not posting:
+                del self.postings[token]
+                self._drop_token(token)
+
+    def _add_token(self, token):
+        self._vocabulary = None
+        if _fuzzy(token):
+            for variant in _deletes(token):
+                self.deletes.setdefault(variant, set()).add(token)
+
+    def _drop_token(self, token):
+        self._vocabulary = None
+        if _fuzzy(token):
+            for variant in _deletes(token):
+                tokens = self.deletes.get(variant)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self.deletes[variant]
+
+    def _prefixed(self, term):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, term)
+        for i in range(start, len(vocabulary)):
+            if not vocabulary[i].startswith(term):
+                break
+            yield vocabulary[i]
+
+    def expand(self, term):
+        """Tokens a query term matches, with their match quality"""
+        matches = {}
+        if term in self.postings:
+            matches[term] = EXACT
+        if len(term) >= MIN_PREFIX_LEN:
+            for token in self._prefixed(term):
+                matches.setdefault(token, PREFIX)
+        if not matches and _fuzzy(term):
+            candidates = set(self.deletes.get(term, ()))       # token has one extra char
+            for variant in _deletes(term):
+                if variant in self.postings:                    # token is missing one char
+                    candidates.add(variant)
+                candidates |= self.deletes.get(variant, set())  # one char substituted
+            for token in candidates:
+                matches[token] = FUZZY
+        return matches
+
+    def search(self, query, scope=None, limit=None):
+        """Doc ids matching every query term, best score first"""
+        scores = None
+        for term in tokenize(query):
+            term_scores = {}
+            for token, quality in self.expand(term).items():
+                for doc_id, weight in self.postings[token].items():
+                    score = quality * weight
+                    if score > term_scores.get(doc_id, 0):
+                        term_scores[doc_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: scores[d] + s for d, s in term_scores.items() if d in scores}
+            if not scores:
+                return []
+        if not scores:
+            return []
+        if scope is not None:
+            scores = {d: s for d, s in scores.items() if self.docs[d][1] == scope}
+        key = lambda d: (-scores[d], d)
+        if limit is not None and limit < len(scores):
+            return heapq.nsmallest(limit, scores, key=key)
+        return sorted(scores, key=key)
+
+
+class SearchIndex:
+    """An InvertedIndex over one table, loaded from MySQL and kept in sync.
+
+    ``load(cursor, ids)`` returns rows with ``id``, an optional ``scope`` and
+    the text fields named in ``weights``; ``ids`` is None for a full load.
+    Writers call touch() after committing so the next search re-reads just
+    those rows. A full rebuild also runs in the background once the index is
+    older than ``ttl``, which picks up writes made by other processes.
+    """
+
+    def __init__(self, name, weights, load, ttl=None):
+        self.name = name
+        self.weights = weights
+        self.load = load
+        self.ttl = ttl or Config.SEARCH_INDEX_TTL
+        self._index = None
+        self._built_at = 0
+        self._pending = set()
+        # Ids applied to the old index while a rebuild is loading; None when idle
+        self._applied_during_build = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self.builds = 0
+
+    def _fetch(self, ids=None):
+        conn = get_db_connection()
+        if not conn:
+            return None
+        try:
+            cursor = conn.cursor()
+            return self.load(cursor, ids)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _add_row(self, index, row):
+        fields = {f: row.get(f) for f in self.weights}
+        index.add(row['id'], fields, row.get('scope'))
+
+    def rebuild(self):
+        """Load every row into a fresh index and swap it in.
+
+        Rows touched and applied to the old index while the load runs may
+        have been read before their write, so they are queued again for the
+        new index.
+        """
+        with self._build_lock:
+            with self._lock:
+                self._applied_during_build = set()
+            try:
+                started = time.time()
+                rows = self._fetch()
+                if rows is None:
+                    return False
+                index = InvertedIndex(self.weights)
+                for row in rows:
+                    self._add_row(index, row)
+                with self._lock:
+                    self._index = index
+                    self._built_at = started
+                    self._pending |= self._applied_during_build
+                    self.builds += 1
+                return True
+            finally:
+                with self._lock:
+                    self._applied_during_build = None
+
+    def touch(self, *ids):
+        """Re-read these rows (inserted, updated or deleted) before the next search"""
+        with self._lock:
+            self._pending.update(ids)
+
+    def mark_stale(self):
+        """Force a full rebuild, e.g. after a write that changes many rows"""
+        with self._lock:
+            self._built_at = 0
+
+    def _apply_pending(self):
+        with self._lock:
+            ids, self._pending = self._pending, set()
+        if not ids:
+            return
+        rows = self._fetch(sorted(ids))
+        if rows is None:
+            with self._lock:
+                self._pending |= ids
+            return
+        with self._lock:
+            for doc_id in ids:
+                self._index.remove(doc_id)
+            for row in rows:
+                self._add_row(self._index, row)
+            if self._applied_during_build is not None:
+                self._applied_during_build |= ids
+
+    def _refresh_in_background(self):
+        if self._build_lock.locked():
+            return
+        threading.Thread(target=self.rebuild, name=f'search-{self.name}', daemon=True).start()
+
+    def search(self, query, scope=None, limit=None):
+        """Ranked ids, or None when the index cannot be loaded (callers fall back)"""
+        if self._index is None and not self.rebuild():
+            return None
+        if time.time() - self._built_at > self.ttl:
+            self._refresh_in_background()
+        self._apply_pending()
+        with self._lock:
+            return self._index.search(query, scope=scope, limit=limit or Config.SEARCH_MAX_RESULTS)
+
+    def stats(self):
+        index = self._index
+        return {
+            'documents': len(index) if index else 0,
+            'tokens': len(index.postings) if index else 0,
+            'pending': len(self._pending),
+            'age': round(time.time() - self._built_at, 1) if index else None,
+            'builds': self.builds,
+        }
+
+
+# ============================================
+# INDEXES
+# ============================================
+
+def in_condition(column, ids):
+    """SQL condition and params restricting column to ids (never matches when empty)"""
+    if not ids:
+        return "1 = 0", []
+    return f"{column} IN ({','.join(['%s'] * len(ids))})", list(ids)
+
+
+def rank_rows(rows, ids, key='id'):
+    """Order rows the way the index ranked their ids"""
+    rank = {doc_id: i for i, doc_id in enumerate(ids)}
+    rows.sort(key=lambda row: rank.get(row[key], len(rank)))
+    return rows
+
+
+def _id_filter(column, ids):
+    if ids is None:
+        return "", ()
+    condition, params = in_condition(column, ids)
+    return f" AND {condition}", tuple(params)
+
+
+def _load_drives(cursor, ids):
+    where, params = _id_filter('pd.id', ids)
+    cursor.execute(f"""
+        SELECT pd.id, pd.job_role, pd.location, c.name as company_name
+        FROM placement_drives pd
+        JOIN companies c ON pd.company_id = c.id
+        WHERE 1 = 1{where}
+    """, params)
+    return cursor.fetchall()
+
+
+def _load_companies(cursor, ids):
+    where, params = _id_filter('id', ids)
+    cursor.execute(f"SELECT id, name, industry FROM companies WHERE 1 = 1{where}", params)
+    return cursor.fetchall()
+
+
+def _load_students(cursor, ids):
+    where, params = _id_filter('id', ids)
+    cursor.execute(f"""
+        SELECT id, department_id as scope, first_name, last_name, enrollment_number
+        FROM students WHERE 1 = 1{where}
+    """, params)
+    return cursor.fetchall()
+
+
+_indexes = {
+    'drives': SearchIndex('drives', {'company_name': 1.0, 'job_role': 1.0, 'location': 0.5},
+                          _load_drives),
+    'companies': SearchIndex('companies', {'name': 1.0, 'industry': 0.6}, _load_companies),
+    'students': SearchIndex('students',
+                            {'first_name': 1.0, 'last_name': 1.0, 'enrollment_number': 1.0},
+                            _load_students),
+}
+
+
+def get_search_index(name):
+    return _indexes[name]
+
+
+def search_ids(name, query, scope=None):
+    """Ranked ids matching query, or None if the caller should fall back to LIKE.
+
+    Falls back for queries with no searchable tokens, and for ones matching
+    more than SEARCH_MAX_RESULTS rows: the callers' SQL filters apply after
+    the ids are chosen, so a capped list could drop rows the filters keep.
+    """
+    if not tokenize(query):
+        return None
+    limit = Config.SEARCH_MAX_RESULTS
+    try:
+        ids = _indexes[name].search(query, scope=scope, limit=limit + 1)
+    except Exception as e:
+        print(f"Search index '{name}' error: {e}")
+        return None
+    if ids is not None and len(ids) > limit:
+        return None
+    return ids
+
+
+def touch_search(name, *ids):
+    _indexes[name].touch(*ids)
+
+
+def mark_search_stale(name):
+    _indexes[name].mark_stale()
+
+
+def get_search_stats():
+    return {name: index.stats() for name, index in _indexes.items()}
@@ -0,0 +1,256 @@
+from datetime import datetime
+from utils.email_service import (
+    get_shortlisted_email,
+    get_selected_email,
+    get_rejected_email
+)
+from utils.email_queue import queue_emails
+from utils.notifications import insert_notifications
+
+
+STATUSES = ('applied', 'shortlisted', 'selected', 'rejected', 'on_hold')
+
+# status -> statuses an application may move to from it
+TRANSITIONS = {
+    'applied': {'shortlisted', 'selected', 'rejected', 'on_hold'},
+    'shortlisted': {'selected', 'rejected', 'on_hold'},
+    'on_hold': {'applied', 'shortlisted', 'selected', 'rejected'},
+    # Reconsidering a rejection, or revoking / deferring an offer
+    'rejected': {'shortlisted', 'on_hold'},
+    'selected': {'rejected', 'on_hold'},
+}
+
+NOTIFICATION_MESSAGES = {
+    'shortlisted': 'Congratulations! You have been shortlisted for {job_role} at {company_name}.',
+    'selected': '🎉 Congratulations! You have been SELECTED for {job_role} at {company_name}!',
+    'rejected': 'Your application for {job_role} at {company_name} has been rejected.',
+    'on_hold': 'Your application for {job_role} at {company_name} is on hold.',
+}
+
+# Outcomes reported per requested application id
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+INVALID_TRANSITION = 'invalid_transition'
+NOT_FOUND = 'not_found'
+
+# Outcomes of round promotion / rejection
+PROMOTED = 'promoted'
+REJECTED = 'rejected'
+NOT_IN_ROUND = 'not_in_round'
+FINAL_ROUND = 'final_round'
+CLOSED = 'closed'
+
+# Ids per statement; keeps IN lists to a sane packet size
+CHUNK_SIZE = 1000
+
+APPLICATIONS_FOR_UPDATE = """
+    SELECT a.id, a.status, a.drive_id, a.current_round, pd.total_rounds, s.user_id, s.first_name, s.last_name, u.email,
+           pd.job_role, pd.package_ctc, c.name as company_name
+    FROM applications a
+    JOIN students s ON a.student_id = s.id
+    JOIN users u ON s.user_id = u.id
+    JOIN placement_drives pd ON a.drive_id = pd.id
+    JOIN companies c ON pd.company_id = c.id
+    WHERE a.id IN ({})
+    FOR UPDATE
+"""
+
+
+def can_transition(current_status, new_status):
+    return new_status in TRANSITIONS.get(current_status, ())
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _placeholders(items):
+    return ','.join(['%s'] * len(items))
+
+
+def lock_applications(cursor, application_ids):
+    """Fetch and row-lock applications with what notifications need, keyed by id"""
+    rows = {}
+    for chunk in _chunks(application_ids):
+        cursor.execute(APPLICATIONS_FOR_UPDATE.format(_placeholders(chunk)), chunk)
+        for row in cursor.fetchall():
+            rows[row['id']] = row
+    return rows
+
+
+def notify_status(cursor, applications, new_status):
+    """Insert one in-app notification per application with a multi-row insert"""
+    template = NOTIFICATION_MESSAGES.get(new_status)
+    if not template or not applications:
+        return 0
+    notification_type = 'success' if new_status == 'selected' else 'info'
+    return insert_notifications(cursor, [(
+        app['user_id'],
+        'Application Status Update',
+        template.format(job_role=app['job_role'], company_name=app['company_name']),
+        notification_type,
+        'application',
+        app['id']
+    ) for app in applications])
+
+
+def _update_status(cursor, ids, new_status, current_round=None):
+    """Returns the updated_at written"""
+    updated_at = datetime.now()
+    for chunk in _chunks(ids):
+        if current_round is None:
+            cursor.execute(
+                f"UPDATE applications SET status = %s, updated_at = %s WHERE id IN ({_placeholders(chunk)})",
+                [new_status, updated_at] + chunk
+            )
+        else:
+            cursor.execute(
+                f"UPDATE applications SET status = %s, current_round = %s, updated_at = %s "
+                f"WHERE id IN ({_placeholders(chunk)})",
+                [new_status, current_round, updated_at] + chunk
+            )
+    return updated_at
+
+
+def transition_applications(cursor, application_ids, new_status, check_transitions=True):
+    """Move applications to ``new_status`` in a fixed number of statements.
+
+    Locks the rows, checks each against TRANSITIONS (unless
+    ``check_transitions`` is false, as for the single-application endpoint,
+    which has always allowed any status), updates the valid ones
+    with a single UPDATE and inserts their notifications in one multi-row
+    insert, all inside the caller's transaction. Returns ``(results,
+    changed)``: results maps every requested id to ``(outcome, status it
+    was in)`` and changed holds the rows that moved, to be handed to
+    queue_status_emails once the caller has committed.
+    """
+    application_ids = list(dict.fromkeys(application_ids))
+    rows = lock_applications(cursor, application_ids)
+
+    results = {}
+    changed = []
+    for application_id in application_ids:
+        row = rows.get(application_id)
+        if row is None:
+            results[application_id] = (NOT_FOUND, None)
+        elif row['status'] == new_status:
+            results[application_id] = (UNCHANGED, row['status'])
+        elif check_transitions and not can_transition(row['status'], new_status):
+            results[application_id] = (INVALID_TRANSITION, row['status'])
+        else:
+            results[application_id] = (UPDATED, row['status'])
+            changed.append(row)
+
+    updated_at = _update_status(cursor, [row['id'] for row in changed], new_status)
+    for row in changed:
+        row['updated_at'] = updated_at
+    notify_status(cursor, changed, new_status)
+    return results, changed
+
+
+def _round_candidates(cursor, drive_id, round_number, application_ids):
+    """Lock the applications and split off those that are open in ``round_number``"""
+    application_ids = list(dict.fromkeys(application_ids))
+    rows = lock_applications(cursor, application_ids)
+    results = {}
+    candidates = []
+    for application_id in application_ids:
+        row = rows.get(application_id)
+        if row is None or row['drive_id'] != drive_id:
+            results[application_id] = (NOT_FOUND, None)
+        elif row['status'] in ('selected', 'rejected'):
+            results[application_id] = (CLOSED, row['status'])
+        elif (row['current_round'] or 0) != round_number:
+            results[application_id] = (NOT_IN_ROUND, row['status'])
+        else:
+            candidates.append(row)
+    return results, candidates
+
+
+def promote_round(cursor, drive_id, round_number, application_ids):
+    """Move applications in ``round_number`` of a drive on to the next round.
+
+    Candidates in the drive's last round cannot be promoted; promoting into
+    the last round selects them. Everything happens in one UPDATE and one
+    notification insert inside the caller's transaction. Returns ``(results,
+    promoted)`` with results mapping each id to ``(outcome, status)``.
+    """
+    results, candidates = _round_candidates(cursor, drive_id, round_number, application_ids)
+    promoted = []
+    for row in candidates:
+        if round_number >= row['total_rounds']:
+            results[row['id']] = (FINAL_ROUND, row['status'])
+        else:
+            promoted.append(row)
+    if not promoted:
+        return results, promoted
+
+    new_round = round_number + 1
+    new_status = 'shortlisted' if new_round < promoted[0]['total_rounds'] else 'selected'
+    _update_status(cursor, [row['id'] for row in promoted], new_status, current_round=new_round)
+
+    if new_status == 'selected':
+        message, notification_type = 'Congratulations! You have been SELECTED!', 'success'
+    else:
+        message, notification_type = f'You have been shortlisted for Round {new_round}.', 'info'
+    insert_notifications(cursor, [
+        (row['user_id'], 'Round Update', message, notification_type, 'application', row['id'])
+        for row in promoted
+    ])
+    for row in promoted:
+        results[row['id']] = (PROMOTED, new_status)
+    return results, promoted
+
+
+def reject_round(cursor, drive_id, round_number, application_ids, feedback=''):
+    """Reject applications in ``round_number`` of a drive with one UPDATE and
+    one notification insert; returns ``(results, rejected)`` like promote_round"""
+    results, rejected = _round_candidates(cursor, drive_id, round_number, application_ids)
+    if not rejected:
+        return results, rejected
+
+    _update_status(cursor, [row['id'] for row in rejected], 'rejected')
+    message = 'Unfortunately, you were not selected for the next round.'
+    if feedback:
+        message += f' Feedback: {feedback}'
+    insert_notifications(cursor, [
+        (row['user_id'], 'Application Update', message, 'warning', 'application', row['id'])
+        for row in rejected
+    ])
+    for row in rejected:
+        results[row['id']] = (REJECTED, 'rejected')
+    return results, rejected
+
+
+def status_email(application, new_status, round_name='Next Round'):
+    """(subject, html) for a status change, or None when it sends no email"""
+    student_name = f"{application['first_name']} {application['last_name']}"
+    if new_status == 'shortlisted':
+        return "You're Shortlisted! ⭐", get_shortlisted_email(
+            student_name, application['company_name'], application['job_role'], round_name)
+    if new_status == 'selected':
+        package = f"{float(application['package_ctc'])/100000:.1f} LPA" if application.get('package_ctc') else "N/A"
+        return "🎉 Congratulations! You're SELECTED!", get_selected_email(
+            student_name, application['company_name'], application['job_role'], package)
+    if new_status == 'rejected':
+        return "Application Update", get_rejected_email(
+            student_name, application['company_name'], application['job_role'])
+    return None
+
+
+def queue_status_emails(applications, new_status, round_name='Next Round'):
+    """Render and enqueue status emails for committed changes in one batch.
+
+    The idempotency key includes the updated_at the transition wrote, so a
+    retried enqueue is suppressed but a later move back into the same status
+    (rejected, reopened, rejected again) still sends.
+    """
+    messages = []
+    for app in applications:
+        email = status_email(app, new_status, round_name)
+        if email and app.get('email'):
+            subject, html = email
+            messages.append((app['email'], subject, html, app['user_id'],
+                             f"application_status:{app['id']}:{new_status}:{app['updated_at']:%Y%m%d%H%M%S%f}"))
+    return queue_emails(messages)
@@ -0,0 +1,317 @@
+import csv
+import io
+import re
+import secrets
+from datetime import datetime
+import pymysql
+from openpyxl import load_workbook
+from config import Config
+from utils.account_setup import ensure_account_setup, issue_tokens
+from utils.db import get_db_connection
+from utils.email_service import get_imported_account_email
+from utils.email_queue import queue_emails
+from utils.passwords import get_password_hasher
+
+
+IMPORT_FORMATS = ('csv', 'xlsx')
+REQUIRED_COLUMNS = ('email', 'first_name', 'last_name', 'enrollment_number')
+OPTIONAL_COLUMNS = ('department', 'phone', 'password')
+
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# Values per IN (...) when checking for existing accounts
+LOOKUP_CHUNK_SIZE = 1000
+
+EXISTING_QUERY = """
+    SELECT 'email' AS field, email AS value FROM users WHERE email IN ({emails})
+    UNION ALL
+    SELECT 'enrollment_number', enrollment_number FROM students WHERE enrollment_number IN ({enrollments})
+"""
+
+
+class ImportFormatError(ValueError):
+    """The upload cannot be read as a student sheet at all"""
+
+
+def _header(value):
+    return str(value or '').strip().lower().replace(' ', '_')
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets hand back enrollment and phone numbers as floats
+        value = int(value)
+    return str(value).strip()
+
+
+def _check_headers(headers):
+    missing = [column for column in REQUIRED_COLUMNS if column not in headers]
+    if missing:
+        raise ImportFormatError(f"Missing column(s): {', '.join(missing)}")
+
+
+def read_rows(stream, import_format):
+    """Yield ``(row_number, {column: text})`` from a CSV or XLSX upload, one
+    row at a time; row numbers match the sheet, header being row 1"""
+    if import_format == 'csv':
+        reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+        headers = [_header(h) for h in next(reader, [])]
+        _check_headers(headers)
+        for number, values in enumerate(reader, start=2):
+            if any(v.strip() for v in values):
+                yield number, {h: _cell(v) for h, v in zip(headers, values)}
+    elif import_format == 'xlsx':
+        try:
+            workbook = load_workbook(stream, read_only=True, data_only=True)
+        except Exception as e:
+            raise ImportFormatError(f"Not a readable XLSX file: {e}")
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [_header(h) for h in next(rows, ())]
+            _check_headers(headers)
+            for number, values in enumerate(rows, start=2):
+                if any(v is not None and str(v).strip() for v in values):
+                    yield number, {h: _cell(v) for h, v in zip(headers, values)}
+        finally:
+            workbook.close()
+    else:
+        raise ImportFormatError(f"Unsupported format; use one of: {', '.join(IMPORT_FORMATS)}")
+
+
+def resolve_department(value, departments):
+    """Department id from an id, code or name cell, or None"""
+    if value.isdigit() and int(value) in departments['ids']:
+        return int(value)
+    return departments['codes'].get(value.lower()) or departments['names'].get(value.lower())
+
+
+def load_departments(cursor):
+    cursor.execute("SELECT id, name, code FROM departments")
+    rows = cursor.fetchall()
+    return {
+        'ids': {row['id'] for row in rows},
+        'codes': {row['code'].lower(): row['id'] for row in rows if row['code']},
+        'names': {row['name'].lower(): row['id'] for row in rows if row['name']},
+    }
+
+
+def validate_rows(rows, departments, department_id=None, max_rows=None):
+    """Check each row as it streams past; returns ``(students, errors)``.
+
+    ``department_id`` pins every row to one department (HOD imports); rows
+    naming another department are rejected. Duplicates within the file are
+    caught here, duplicates against the database by find_existing().
+    """
+    max_rows = max_rows or Config.IMPORT_MAX_ROWS
+    students, errors = [], []
+    seen_emails, seen_enrollments = {}, {}
+    for count, (number, row) in enumerate(rows, start=1):
+        if count > max_rows:
+            raise ImportFormatError(f"Too many rows; the limit is {max_rows}")
+        problems = [f"{column} is required" for column in REQUIRED_COLUMNS if not row.get(column)]
+        email = row.get('email', '').lower()
+        enrollment = row.get('enrollment_number', '')
+
+        if email and not EMAIL_PATTERN.match(email):
+            problems.append("email is not valid")
+        elif email in seen_emails:
+            problems.append(f"email repeats row {seen_emails[email]}")
+        if enrollment and enrollment in seen_enrollments:
+            problems.append(f"enrollment_number repeats row {seen_enrollments[enrollment]}")
+
+        department = row.get('department', '')
+        resolved = resolve_department(department, departments) if department else None
+        if department and resolved is None:
+            problems.append(f"unknown department '{department}'")
+        elif department_id is not None:
+            if resolved is not None and resolved != department_id:
+                problems.append("department is not yours")
+            resolved = department_id
+        elif resolved is None:
+            problems.append("department is required")
+
+        password = row.get('password', '')
+        if password and len(password) < 6:
+            problems.append("password must be at least 6 characters")
+
+        if problems:
+            errors.append({'row': number, 'email': email or None, 'errors': problems})
+            continue
+        seen_emails[email] = number
+        seen_enrollments[enrollment] = number
+        students.append({
+            'row': number,
+            'email': email,
+            'first_name': row['first_name'],
+            'last_name': row['last_name'],
+            'enrollment_number': enrollment,
+            'department_id': resolved,
+            'phone': row.get('phone', ''),
+            'password': password or None,
+        })
+    return students, errors
+
+
+def find_existing(cursor, students):
+    """Emails and enrollment numbers already registered, found with one
+    set-based query per chunk rather than a lookup per student"""
+    emails, enrollments = set(), set()
+    for i in range(0, len(students), LOOKUP_CHUNK_SIZE):
+        chunk = students[i:i + LOOKUP_CHUNK_SIZE]
+        placeholders = ','.join(['%s'] * len(chunk))
+        cursor.execute(
+            EXISTING_QUERY.format(emails=placeholders, enrollments=placeholders),
+            [s['email'] for s in chunk] + [s['enrollment_number'] for s in chunk]
+        )
+        for row in cursor.fetchall():
+            (emails if row['field'] == 'email' else enrollments).add(row['value'])
+    return emails, enrollments
+
+
+def _insert(cursor, students, approved_by):
+    """Insert users then students for a chunk and issue each a set-password
+    token (stored on the student as ``token``); returns {email: user_id}"""
+    cursor.executemany(
+        "INSERT INTO users (email, password_hash, role, is_verified, must_change_password) "
+        "VALUES (%s, %s, 'student', %s, %s)",
+        [(s['email'], s['password_hash'], True, True) for s in students]
+    )
+    # Read the ids back rather than trusting consecutive auto-increment values
+    cursor.execute(
+        f"SELECT id, email FROM users WHERE email IN ({','.join(['%s'] * len(students))})",
+        [s['email'] for s in students]
+    )
+    user_ids = {row['email']: row['id'] for row in cursor.fetchall()}
+
+    approved_at = datetime.now() if approved_by else None
+    cursor.executemany("""
+        INSERT INTO students
+        (user_id, department_id, enrollment_number, first_name, last_name, phone,
+         is_approved, approved_at, approved_by)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, [(user_ids[s['email']], s['department_id'], s['enrollment_number'], s['first_name'],
+           s['last_name'], s['phone'], bool(approved_by), approved_at, approved_by) for s in students])
+
+    tokens = issue_tokens(cursor, [user_ids[s['email']] for s in students])
+    for s in students:
+        s['token'] = tokens[user_ids[s['email']]]
+    return user_ids
+
+
+def insert_students(conn, students, approved_by=None):
+    """Insert one chunk in a transaction; returns ``(user_ids, errors)``.
+
+    If the chunk collides with an account registered since the duplicate
+    check, it is retried a row at a time so only the colliding rows fail.
+    """
+    cursor = conn.cursor()
+    try:
+        try:
+            user_ids = _insert(cursor, students, approved_by)
+            conn.commit()
+            return user_ids, []
+        except pymysql.err.IntegrityError:
+            conn.rollback()
+
+        user_ids, errors = {}, []
+        for student in students:
+            try:
+                user_ids.update(_insert(cursor, [student], approved_by))
+                conn.commit()
+            except pymysql.err.IntegrityError:
+                conn.rollback()
+                errors.append({'row': student['row'], 'email': student['email'],
+                               'errors': ["email or enrollment_number is already registered"]})
+        return user_ids, errors
+    finally:
+        cursor.close()
+
+
+def import_students(conn, rows, department_id=None, approved_by=None, dry_run=False, chunk_size=None):
+    """Validate, de-duplicate, hash and insert students from ``rows``.
+
+    Rows are inserted ``chunk_size`` at a time, each chunk in its own
+    transaction, so one bad chunk does not undo the rest. Where the sheet has
+    no password a random one is hashed and never disclosed; either way the
+    student is mailed a single-use set-password link and must change the
+    password before using the portal. Passwords are hashed at
+    IMPORT_BCRYPT_ROUNDS. Rows whose email could not be queued are listed
+    under ``email_failed``. Returns the report.
+    """
+    chunk_size = chunk_size or Config.IMPORT_CHUNK_SIZE
+    cursor = conn.cursor()
+    try:
+        students, errors = validate_rows(rows, load_departments(cursor), department_id)
+        total = len(students) + len(errors)
+        emails, enrollments = find_existing(cursor, students) if students else (set(), set())
+    finally:
+        cursor.close()
+
+    fresh = []
+    for student in students:
+        problems = []
+        if student['email'] in emails:
+            problems.append("email is already registered")
+        if student['enrollment_number'] in enrollments:
+            problems.append("enrollment_number is already registered")
+        if problems:
+            errors.append({'row': student['row'], 'email': student['email'], 'errors': problems})
+        else:
+            fresh.append(student)
+
+    created, email_failed = 0, []
+    if not dry_run:
+        hasher = get_password_hasher()
+        for i in range(0, len(fresh), chunk_size):
+            chunk = fresh[i:i + chunk_size]
+            passwords = [student['password'] or secrets.token_urlsafe(24) for student in chunk]
+            for student, password_hash in zip(chunk, hasher.hash_many(passwords, Config.IMPORT_BCRYPT_ROUNDS)):
+                student['password_hash'] = password_hash
+
+            user_ids, chunk_errors = insert_students(conn, chunk, approved_by)
+            errors.extend(chunk_errors)
+            created += len(user_ids)
+            inserted = [s for s in chunk if s['email'] in user_ids]
+            # One transaction: the user ids are new, so anything short of all is a failure
+            if queue_emails([
+                (s['email'], 'Your Placement Portal account',
+                 get_imported_account_email(f"{s['first_name']} {s['last_name']}", s['email'],
+                                            s['token'], Config.PASSWORD_SET_TOKEN_TTL_HOURS),
+                 user_ids[s['email']], 'account_imported')
+                for s in inserted
+            ]) < len(inserted):
+                email_failed.extend({'row': s['row'], 'email': s['email']} for s in inserted)
+
+    errors.sort(key=lambda error: error['row'])
+    return {
+        'total': total,
+        'valid': len(fresh),
+        'created': created,
+        'failed': len(errors),
+        'dry_run': dry_run,
+        'errors': errors,
+        'email_failed': email_failed,
+    }
+
+
+def import_upload(upload, department_id=None, approved_by=None, dry_run=False):
+    """Run import_students() on an uploaded file; raises ImportFormatError
+    for files that cannot be read and returns None without a database"""
+    filename = upload.filename or ''
+    import_format = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if import_format not in IMPORT_FORMATS:
+        raise ImportFormatError(f"Unsupported format; use one of: {', '.join(IMPORT_FORMATS)}")
+
+    # Normally done at startup; runs before this import opens its own connection
+    if not dry_run and not ensure_account_setup():
+        return None
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        return import_students(conn, read_rows(upload.stream, import_format),
+                               department_id, approved_by, dry_run)
+    finally:
+        conn.close()
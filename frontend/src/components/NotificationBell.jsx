@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import api from '../services/api';
+import { subscribeNotifications } from '../services/notificationStream';
 
 const NotificationBell = () => {
     const navigate = useNavigate();
@@ -12,11 +13,37 @@ const NotificationBell = () => {
 
     useEffect(() => {
         fetchNotifications();
-        // Fetch every 30 seconds
-        const interval = setInterval(fetchNotifications, 30000);
-        return () => clearInterval(interval);
+        const unsubscribe = subscribeNotifications(handleStreamEvent);
+        // Slow resync in case an event was published by another server process
+        const interval = setInterval(fetchNotifications, 300000);
+        return () => {
+            unsubscribe();
+            clearInterval(interval);
+        };
     }, []);
 
+    const applyUnreadCount = (data, fallback) => {
+        setUnreadCount((count) => (data.unread_count ?? fallback(count)));
+    };
+
+    const handleStreamEvent = (type, data) => {
+        if (type === 'ready') {
+            applyUnreadCount(data, (count) => count);
+            if (data.reset) fetchNotifications();
+        } else if (type === 'notification') {
+            applyUnreadCount(data, (count) => count + 1);
+            // Live notifications carry no row id; clicking one refetches the list
+            setNotifications((prev) => [{ ...data, id: null, is_read: 0 }, ...prev].slice(0, 20));
+        } else if (type === 'read') {
+            applyUnreadCount(data, (count) => (data.all ? 0 : Math.max(0, count - 1)));
+            setNotifications((prev) => prev.map((notif) =>
+                data.all || notif.id === data.notification_id ? { ...notif, is_read: 1 } : notif
+            ));
+        } else if (type === 'reset') {
+            fetchNotifications();
+        }
+    };
+
     // Close dropdown when clicking outside
     useEffect(() => {
         const handleClickOutside = (event) => {
@@ -41,8 +68,8 @@ const NotificationBell = () => {
 
     const markAsRead = async (notificationId) => {
         try {
+            // The stream confirms with a 'read' event carrying the new unread count
             await api.post(`/student/notifications/${notificationId}/read`);
-            fetchNotifications();
         } catch (error) {
             console.error('Error marking as read:', error);
         }
@@ -52,7 +79,6 @@ const NotificationBell = () => {
         setLoading(true);
         try {
             await api.post('/student/notifications/read-all');
-            fetchNotifications();
         } catch (error) {
             console.error('Error marking all as read:', error);
         } finally {
@@ -124,11 +150,13 @@ const NotificationBell = () => {
                                 <p>No notifications yet</p>
                             </div>
                         ) : (
-                            notifications.map((notif) => (
+                            notifications.map((notif, index) => (
                                 <div
-                                    key={notif.id}
+                                    key={notif.id ?? `live-${index}`}
                                     onClick={() => {
-                                        if (!notif.is_read) markAsRead(notif.id);
+                                        if (notif.is_read) return;
+                                        if (notif.id) markAsRead(notif.id);
+                                        else fetchNotifications();
                                     }}
                                     className={`p-4 border-b hover:bg-gray-50 cursor-pointer transition ${!notif.is_read ? 'bg-blue-50' : ''
                                         }`}
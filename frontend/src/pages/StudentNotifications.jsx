@@ -10,6 +10,11 @@ const StudentNotifications = () => {
     const [notifications, setNotifications] = useState([]);
     const [loading, setLoading] = useState(true);
     const [filter, setFilter] = useState('all');
+    const [nextBeforeId, setNextBeforeId] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [archived, setArchived] = useState([]);
+    const [archiveCursor, setArchiveCursor] = useState(undefined); // undefined: not loaded yet
+    const [loadingArchive, setLoadingArchive] = useState(false);
 
     useEffect(() => {
         fetchNotifications();
@@ -19,6 +24,7 @@ const StudentNotifications = () => {
         try {
             const response = await api.get('/student/notifications');
             setNotifications(response.data.notifications);
+            setNextBeforeId(response.data.next_before_id);
         } catch (error) {
             console.error('Error fetching notifications:', error);
             toast.error('Failed to load notifications');
@@ -27,6 +33,21 @@ const StudentNotifications = () => {
         }
     };
 
+    const loadMore = async () => {
+        setLoadingMore(true);
+        try {
+            const response = await api.get('/student/notifications', {
+                params: { before_id: nextBeforeId }
+            });
+            setNotifications((prev) => [...prev, ...response.data.notifications]);
+            setNextBeforeId(response.data.next_before_id);
+        } catch (error) {
+            toast.error('Failed to load more notifications');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const markAllAsRead = async () => {
         try {
             await api.post('/student/notifications/read-all');
@@ -37,6 +58,21 @@ const StudentNotifications = () => {
         }
     };
 
+    const loadArchived = async () => {
+        setLoadingArchive(true);
+        try {
+            const response = await api.get('/student/notifications/archive', {
+                params: archiveCursor ? { before_id: archiveCursor } : {}
+            });
+            setArchived((prev) => [...prev, ...response.data.notifications]);
+            setArchiveCursor(response.data.next_before_id);
+        } catch (error) {
+            toast.error('Failed to load archived notifications');
+        } finally {
+            setLoadingArchive(false);
+        }
+    };
+
     const formatDate = (date) => {
         return new Date(date).toLocaleString('en-IN', {
             day: 'numeric',
@@ -132,6 +168,57 @@ const StudentNotifications = () => {
                         ))}
                     </div>
                 )}
+
+                {!loading && nextBeforeId && (
+                    <div className="text-center mt-4">
+                        <button
+                            onClick={loadMore}
+                            disabled={loadingMore}
+                            className="text-teal-600 hover:text-teal-700 font-semibold disabled:opacity-50"
+                        >
+                            {loadingMore ? 'Loading...' : 'Load more'}
+                        </button>
+                    </div>
+                )}
+
+                {/* Archived history (read notifications past the retention window) */}
+                {!loading && !nextBeforeId && filter !== 'unread' && (
+                    <div className="mt-8">
+                        {archived.length > 0 && (
+                            <>
+                                <h2 className="text-lg font-semibold text-gray-700 mb-3">Archived</h2>
+                                <div className="space-y-3">
+                                    {archived.map((notif) => (
+                                        <div key={`archived-${notif.id}`} className="bg-white rounded-lg shadow p-6 opacity-80">
+                                            <div className="flex gap-4">
+                                                <span className="text-3xl">{getIcon(notif.type)}</span>
+                                                <div className="flex-1">
+                                                    <h3 className="text-lg font-bold text-gray-800 mb-2">{notif.title}</h3>
+                                                    <p className="text-gray-700 mb-3">{notif.message}</p>
+                                                    <p className="text-sm text-gray-500">{formatDate(notif.created_at)}</p>
+                                                </div>
+                                            </div>
+                                        </div>
+                                    ))}
+                                </div>
+                            </>
+                        )}
+                        {archiveCursor !== null && (
+                            <div className="text-center mt-4">
+                                <button
+                                    onClick={loadArchived}
+                                    disabled={loadingArchive}
+                                    className="text-teal-600 hover:text-teal-700 font-semibold disabled:opacity-50"
+                                >
+                                    {loadingArchive ? 'Loading...' : archived.length ? 'Load more' : 'Show older notifications'}
+                                </button>
+                            </div>
+                        )}
+                        {archiveCursor === null && archived.length === 0 && (
+                            <p className="text-center text-gray-500 mt-4">No older notifications</p>
+                        )}
+                    </div>
+                )}
             </main>
         </div>
     );
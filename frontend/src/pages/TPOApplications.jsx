@@ -14,6 +14,9 @@ const TPOApplications = () => {
     const [filter, setFilter] = useState('all');
     const [search, setSearch] = useState('');
     const [selectedApps, setSelectedApps] = useState([]);
+    const [total, setTotal] = useState(0);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     const driveIdFilter = searchParams.get('drive_id');
 
@@ -21,20 +24,53 @@ const TPOApplications = () => {
         fetchApplications();
     }, [filter, driveIdFilter, search]);
 
-    const fetchApplications = async () => {
+    const fetchApplications = async (cursor = null) => {
         try {
             const params = new URLSearchParams();
             if (filter !== 'all') params.append('status', filter);
             if (driveIdFilter) params.append('drive_id', driveIdFilter);
             if (search) params.append('search', search);
+            if (cursor) params.append('cursor', cursor);
+            params.append('fields', 'status,first_name,last_name,enrollment_number,department_name,company_name,job_role,package_ctc,cgpa');
 
             const response = await api.get(`/tpo/applications?${params.toString()}`);
-            setApplications(response.data.applications);
+            setApplications((prev) => (cursor ? [...prev, ...response.data.applications] : response.data.applications));
+            setTotal(response.data.total);
+            setNextCursor(response.data.next_cursor);
         } catch (error) {
             console.error('Error fetching applications:', error);
             toast.error('Failed to load applications');
         } finally {
             setLoading(false);
+            setLoadingMore(false);
+        }
+    };
+
+    const loadMore = () => {
+        if (!nextCursor || loadingMore) return;
+        setLoadingMore(true);
+        fetchApplications(nextCursor);
+    };
+
+    const exportApplications = async (format) => {
+        try {
+            const params = new URLSearchParams({ format });
+            if (filter !== 'all') params.append('status', filter);
+            if (driveIdFilter) params.append('drive_id', driveIdFilter);
+            if (search) params.append('search', search);
+
+            const response = await api.get(`/tpo/applications/export?${params.toString()}`, {
+                responseType: 'blob'
+            });
+            const url = window.URL.createObjectURL(response.data);
+            const link = document.createElement('a');
+            link.href = url;
+            link.download = `applications.${format}`;
+            link.click();
+            window.URL.revokeObjectURL(url);
+        } catch (error) {
+            console.error('Error exporting applications:', error);
+            toast.error('Failed to export applications');
         }
     };
 
@@ -88,11 +124,15 @@ const TPOApplications = () => {
         }
 
         try {
-            await api.post('/tpo/applications/bulk-update', {
+            const response = await api.post('/tpo/applications/bulk-update', {
                 application_ids: selectedApps,
                 status: newStatus
             });
-            toast.success(`${selectedApps.length} applications updated!`);
+            const { count, skipped } = response.data;
+            toast.success(`${count} applications updated!`);
+            if (skipped) {
+                toast(`${skipped} skipped (already ${newStatus} or not allowed)`);
+            }
             setSelectedApps([]);
             fetchApplications();
         } catch (error) {
@@ -157,6 +197,22 @@ const TPOApplications = () => {
                         className="w-full px-4 py-2 border rounded-lg focus:ring-2 focus:ring-teal-500"
                     />
 
+                    {/* Export */}
+                    <div className="flex gap-2 justify-end">
+                        <button
+                            onClick={() => exportApplications('csv')}
+                            className="px-4 py-2 border rounded-lg text-gray-700 hover:bg-gray-50 transition"
+                        >
+                            Export CSV
+                        </button>
+                        <button
+                            onClick={() => exportApplications('xlsx')}
+                            className="px-4 py-2 bg-teal-600 text-white rounded-lg hover:bg-teal-700 transition"
+                        >
+                            Export Excel
+                        </button>
+                    </div>
+
                     {/* Status Filters */}
                     <div className="flex gap-2 overflow-x-auto">
                         <button
@@ -164,7 +220,7 @@ const TPOApplications = () => {
                             className={`px-4 py-2 rounded-lg font-semibold whitespace-nowrap ${filter === 'all' ? 'bg-teal-600 text-white' : 'bg-gray-100 text-gray-700'
                                 }`}
                         >
-                            All ({applications.length})
+                            All ({total})
                         </button>
                         <button
                             onClick={() => setFilter('applied')}
@@ -342,6 +398,17 @@ const TPOApplications = () => {
                                 </tbody>
                             </table>
                         </div>
+                        {nextCursor && (
+                            <div className="p-4 text-center border-t">
+                                <button
+                                    onClick={loadMore}
+                                    disabled={loadingMore}
+                                    className="text-teal-600 hover:text-teal-700 font-semibold disabled:opacity-50"
+                                >
+                                    {loadingMore ? 'Loading...' : `Load more (${applications.length} of ${total})`}
+                                </button>
+                            </div>
+                        )}
                     </div>
                 )}
             </main>
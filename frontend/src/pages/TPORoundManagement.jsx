@@ -11,7 +11,9 @@ const TPORoundManagement = () => {
     const [loading, setLoading] = useState(true);
     const [drive, setDrive] = useState(null);
     const [rounds, setRounds] = useState([]);
+    const [applicationsById, setApplicationsById] = useState({});
     const [selectedRound, setSelectedRound] = useState(0);
+    const [selectedApps, setSelectedApps] = useState([]);
 
     useEffect(() => {
         fetchRounds();
@@ -22,6 +24,9 @@ const TPORoundManagement = () => {
             const response = await api.get(`/tpo/drives/${driveId}/rounds`);
             setDrive(response.data.drive);
             setRounds(response.data.rounds);
+            setApplicationsById(
+                Object.fromEntries((response.data.applications || []).map((app) => [app.id, app]))
+            );
             if (response.data.rounds.length > 0) {
                 setSelectedRound(0);
             }
@@ -33,12 +38,24 @@ const TPORoundManagement = () => {
         }
     };
 
-    const handlePromote = async (applicationId) => {
-        if (!window.confirm('Promote this student to the next round?')) return;
+    const reportResults = (data, verb) => {
+        toast.success(`${data.count} ${data.count === 1 ? 'student' : 'students'} ${verb}`);
+        if (data.skipped) {
+            toast(`${data.skipped} skipped (not open in this round)`);
+        }
+    };
+
+    const handlePromote = async (applicationIds) => {
+        const label = applicationIds.length === 1 ? 'this student' : `${applicationIds.length} students`;
+        if (!window.confirm(`Promote ${label} to the next round?`)) return;
 
         try {
-            await api.post(`/tpo/applications/${applicationId}/promote`);
-            toast.success('Student promoted to next round!');
+            const response = await api.post(
+                `/tpo/drives/${driveId}/rounds/${currentRound.round_number}/promote`,
+                { application_ids: applicationIds }
+            );
+            reportResults(response.data, 'promoted');
+            setSelectedApps([]);
             fetchRounds();
         } catch (error) {
             console.error('Error promoting:', error);
@@ -46,20 +63,32 @@ const TPORoundManagement = () => {
         }
     };
 
-    const handleReject = async (applicationId) => {
+    const handleReject = async (applicationIds) => {
         const feedback = prompt('Reason for rejection (optional):');
         if (feedback === null) return; // Cancelled
 
         try {
-            await api.post(`/tpo/applications/${applicationId}/reject-round`, { feedback });
-            toast.success('Student rejected');
+            const response = await api.post(
+                `/tpo/drives/${driveId}/rounds/${currentRound.round_number}/reject`,
+                { application_ids: applicationIds, feedback }
+            );
+            reportResults(response.data, 'rejected');
+            setSelectedApps([]);
             fetchRounds();
         } catch (error) {
             console.error('Error rejecting:', error);
-            toast.error('Failed to reject');
+            toast.error(error.response?.data?.error || 'Failed to reject');
         }
     };
 
+    const toggleSelectApp = (appId) => {
+        setSelectedApps(prev =>
+            prev.includes(appId)
+                ? prev.filter(id => id !== appId)
+                : [...prev, appId]
+        );
+    };
+
     if (loading) {
         return (
             <div className="min-h-screen flex items-center justify-center">
@@ -69,7 +98,15 @@ const TPORoundManagement = () => {
     }
 
     const currentRound = rounds[selectedRound];
-    const applications = currentRound?.applications || [];
+    const applications = (currentRound?.application_ids || []).map((id) => applicationsById[id]);
+    // Only candidates still open in this round can be promoted or rejected from it
+    const openApps = applications.filter((app) =>
+        app.current_round === currentRound?.round_number && app.status !== 'rejected' && app.status !== 'selected'
+    );
+    const openIds = new Set(openApps.map((app) => app.id));
+    const toggleSelectAll = () => {
+        setSelectedApps(selectedApps.length === openApps.length ? [] : openApps.map((app) => app.id));
+    };
 
     return (
         <div className="min-h-screen bg-gray-50">
@@ -96,7 +133,7 @@ const TPORoundManagement = () => {
                         {rounds.map((round, index) => (
                             <button
                                 key={round.id}
-                                onClick={() => setSelectedRound(index)}
+                                onClick={() => { setSelectedRound(index); setSelectedApps([]); }}
                                 className={`px-6 py-3 rounded-lg font-semibold whitespace-nowrap transition ${selectedRound === index
                                         ? 'bg-teal-600 text-white'
                                         : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
@@ -104,7 +141,7 @@ const TPORoundManagement = () => {
                             >
                                 Round {round.round_number}: {round.round_name}
                                 <span className="ml-2 text-sm opacity-75">
-                                    ({round.applications?.length || 0})
+                                    ({round.application_count || 0})
                                 </span>
                             </button>
                         ))}
@@ -121,11 +158,39 @@ const TPORoundManagement = () => {
                         <p className="text-gray-600">Students will appear here once they reach this round.</p>
                     </div>
                 ) : (
+                    <>
+                    {selectedApps.length > 0 && (
+                        <div className="bg-teal-50 border border-teal-200 rounded-lg p-4 mb-4 flex items-center justify-between">
+                            <span className="font-semibold text-teal-800">{selectedApps.length} selected</span>
+                            <div className="flex gap-2">
+                                <button
+                                    onClick={() => handlePromote(selectedApps)}
+                                    className="bg-green-600 text-white px-4 py-2 rounded-lg hover:bg-green-700 transition text-sm font-semibold"
+                                >
+                                    ✓ Promote Selected
+                                </button>
+                                <button
+                                    onClick={() => handleReject(selectedApps)}
+                                    className="bg-red-600 text-white px-4 py-2 rounded-lg hover:bg-red-700 transition text-sm font-semibold"
+                                >
+                                    ✗ Reject Selected
+                                </button>
+                            </div>
+                        </div>
+                    )}
                     <div className="bg-white rounded-lg shadow overflow-hidden">
                         <div className="overflow-x-auto">
                             <table className="w-full">
                                 <thead className="bg-gray-50 border-b">
                                     <tr>
+                                        <th className="px-6 py-3 text-left">
+                                            <input
+                                                type="checkbox"
+                                                checked={openApps.length > 0 && selectedApps.length === openApps.length}
+                                                onChange={toggleSelectAll}
+                                                disabled={openApps.length === 0}
+                                            />
+                                        </th>
                                         <th className="px-6 py-3 text-left text-xs font-semibold text-gray-600 uppercase">Student</th>
                                         <th className="px-6 py-3 text-left text-xs font-semibold text-gray-600 uppercase">Department</th>
                                         <th className="px-6 py-3 text-left text-xs font-semibold text-gray-600 uppercase">CGPA</th>
@@ -136,6 +201,14 @@ const TPORoundManagement = () => {
                                 <tbody className="divide-y">
                                     {applications.map((app) => (
                                         <tr key={app.id} className="hover:bg-gray-50">
+                                            <td className="px-6 py-4">
+                                                <input
+                                                    type="checkbox"
+                                                    checked={selectedApps.includes(app.id)}
+                                                    onChange={() => toggleSelectApp(app.id)}
+                                                    disabled={!openIds.has(app.id)}
+                                                />
+                                            </td>
                                             <td className="px-6 py-4">
                                                 <div>
                                                     <p className="font-semibold text-gray-800">
@@ -154,16 +227,16 @@ const TPORoundManagement = () => {
                                                 </span>
                                             </td>
                                             <td className="px-6 py-4">
-                                                {app.status !== 'rejected' && app.status !== 'selected' && (
+                                                {openIds.has(app.id) && (
                                                     <div className="flex gap-2">
                                                         <button
-                                                            onClick={() => handlePromote(app.id)}
+                                                            onClick={() => handlePromote([app.id])}
                                                             className="bg-green-600 text-white px-4 py-2 rounded-lg hover:bg-green-700 transition text-sm font-semibold"
                                                         >
                                                             ✓ Promote
                                                         </button>
                                                         <button
-                                                            onClick={() => handleReject(app.id)}
+                                                            onClick={() => handleReject([app.id])}
                                                             className="bg-red-600 text-white px-4 py-2 rounded-lg hover:bg-red-700 transition text-sm font-semibold"
                                                         >
                                                             ✗ Reject
@@ -183,6 +256,7 @@ const TPORoundManagement = () => {
                             </table>
                         </div>
                     </div>
+                    </>
                 )}
             </main>
         </div>
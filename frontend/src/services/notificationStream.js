@@ -0,0 +1,70 @@
+import { API_BASE_URL } from './api';
+
+// Reads the notification event stream with fetch rather than EventSource so
+// the JWT can travel in the Authorization header instead of the URL.
+// Reconnects with Last-Event-ID, backing off while the server is unreachable.
+export const subscribeNotifications = (onEvent) => {
+    let stopped = false;
+    let controller = null;
+    let lastEventId = null;
+    let retryMs = 5000;
+    let failures = 0;
+
+    const dispatch = (frame) => {
+        let type = 'message';
+        let data = '';
+        for (const line of frame.split('\n')) {
+            if (!line || line.startsWith(':')) continue; // keepalive comment
+            const colon = line.indexOf(':');
+            const field = colon === -1 ? line : line.slice(0, colon);
+            const value = colon === -1 ? '' : line.slice(colon + 1).replace(/^ /, '');
+            if (field === 'id') lastEventId = value;
+            else if (field === 'event') type = value;
+            else if (field === 'data') data += value;
+            else if (field === 'retry') retryMs = Number(value) || retryMs;
+        }
+        if (data) onEvent(type, JSON.parse(data));
+    };
+
+    const connect = async () => {
+        while (!stopped) {
+            controller = new AbortController();
+            try {
+                const headers = { Authorization: `Bearer ${localStorage.getItem('token')}` };
+                if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+                const response = await fetch(`${API_BASE_URL}/student/notifications/stream`, {
+                    headers,
+                    signal: controller.signal,
+                });
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                failures = 0;
+
+                const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+                let buffer = '';
+                for (;;) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    buffer += value;
+                    let boundary;
+                    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                        dispatch(buffer.slice(0, boundary));
+                        buffer = buffer.slice(boundary + 2);
+                    }
+                }
+            } catch (error) {
+                if (stopped) return;
+                failures += 1;
+                console.warn('Notification stream interrupted:', error.message);
+            }
+            if (stopped) return;
+            const delay = Math.min(retryMs * 2 ** Math.min(failures, 4), 60000);
+            await new Promise((resolve) => setTimeout(resolve, delay));
+        }
+    };
+
+    connect();
+    return () => {
+        stopped = true;
+        controller?.abort();
+    };
+};